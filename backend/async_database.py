@@ -0,0 +1,346 @@
+"""Asyncio FalkorDB client with the GraphConnection method surface.
+
+Every FastAPI endpoint is ``async def`` but used to call the synchronous
+``db`` singleton directly, blocking the event loop for the duration of each
+graph round trip. AsyncGraphConnection wraps that singleton:
+
+    adb = AsyncGraphConnection(db)
+    projects = await adb.get_all_projects_with_details()   # native asyncio
+    result = await adb.query("MATCH (n) RETURN count(n)")   # native asyncio
+    details = await adb.get_project_timeline(name)          # offloaded
+
+- Read-only explorer / knowledge / thread methods and the query primitives
+  (``query``, ``ro_query``, ``query_many``) run natively on
+  ``falkordb.asyncio`` over a bounded ``redis.asyncio`` connection pool, so a
+  single worker can serve many concurrent requests without holding threads.
+- Any other GraphConnection method is available under the same name as a
+  coroutine that runs the sync method on a dedicated, bounded executor
+  (never the default threadpool shared with FastAPI's sync dependencies).
+
+When the wrapped connection has an explicitly assigned ``graph`` handle
+(tests, scripts) the native path is bypassed and the sync method is
+offloaded instead, so mocks keep working unchanged.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Optional
+
+from db_metrics import count_rows, query_metrics
+from db_result_helpers import iter_dicts, result_to_dicts, result_single, result_value
+from graph_pool import _is_connection_error
+from redis.exceptions import ResponseError
+import database
+from database import GraphConnection
+
+
+class AsyncGraphConnection:
+    """Async facade over GraphConnection (see module docstring)."""
+
+    def __init__(self, sync: Optional[GraphConnection] = None, offload_workers: Optional[int] = None):
+        self.sync = sync if sync is not None else database.db
+        # Explicitly assigned async graph handle (tests). When set, native
+        # methods use it instead of opening a client.
+        self.graph = None
+        self._client = None
+        self._graph = None
+        self._client_lock = asyncio.Lock()
+        pool_max = getattr(self.sync, "pool_max", 16)
+        if not isinstance(pool_max, int):
+            pool_max = 16
+        self.max_connections = int(os.getenv("FALKORDB_ASYNC_POOL_MAX", pool_max * 4))
+        self.pool_timeout = float(os.getenv("FALKORDB_POOL_TIMEOUT", 30))
+        self.offload_workers = offload_workers or int(os.getenv("FALKORDB_ASYNC_OFFLOAD_WORKERS", pool_max))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.offload_workers, thread_name_prefix="graph-offload",
+        )
+
+    # =========================================================================
+    # CLIENT / POOL
+    # =========================================================================
+
+    def _native(self) -> bool:
+        if self.graph is not None:
+            return True
+        return isinstance(self.sync, GraphConnection) and self.sync.graph is None
+
+    def _open_client(self):
+        """Build the asyncio FalkorDB client (blocking: probes cluster mode)."""
+        from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+        from redis.asyncio import BlockingConnectionPool
+
+        sync = self.sync
+        kwargs = {
+            "host": sync.host,
+            "port": sync.port,
+            "max_connections": self.max_connections,
+            "timeout": self.pool_timeout,
+            "socket_timeout": 15,
+            "socket_connect_timeout": 10,
+            "decode_responses": True,
+        }
+        if sync.username:
+            kwargs["username"] = sync.username
+        if sync.password:
+            kwargs["password"] = sync.password
+        client = AsyncFalkorDB(connection_pool=BlockingConnectionPool(**kwargs))
+        return client, client.select_graph(sync.graph_name)
+
+    async def connect(self):
+        """Return the async graph handle, opening the client on first use."""
+        if self.graph is not None:
+            return self.graph
+        if self._graph is None:
+            async with self._client_lock:
+                if self._graph is None:
+                    self._client, self._graph = await asyncio.to_thread(self._open_client)
+        return self._graph
+
+    async def close(self):
+        client, self._client, self._graph = self._client, None, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Warning: Async FalkorDB client close failed: {e}")
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """Async pool occupancy and offload executor size."""
+        pool = getattr(getattr(self._client, "connection", None), "connection_pool", None)
+        return {
+            "native": self._native(),
+            "connected": self._graph is not None,
+            "max_connections": self.max_connections,
+            "in_use": len(getattr(pool, "_in_use_connections", ()) or ()),
+            "idle": len(getattr(pool, "_available_connections", ()) or ()),
+            "offload_workers": self.offload_workers,
+        }
+
+    async def _execute_with_retry(self, query_func, max_retries=2):
+        """Await ``query_func()``; retry on connection errors.
+
+        redis.asyncio drops a broken socket from its pool when a command
+        fails on it, so a plain retry picks up a fresh connection.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                return await query_func()
+            except Exception as e:
+                if attempt < max_retries and _is_connection_error(e):
+                    continue
+                raise
+
+    # =========================================================================
+    # QUERY PRIMITIVES
+    # =========================================================================
+
+    async def query(self, q: str, params: dict = None):
+        """Run a Cypher query and return the QueryResult."""
+        if not self._native():
+            return await self.run_sync(lambda: self.sync.connect().query(q, params))
+        async def _query():
+            graph = await self.connect()
+            return await graph.query(q, params)
+        return await self._execute_with_retry(_query)
+
+    async def ro_query(self, q: str, params: dict = None):
+        """Run a read-only Cypher query (GRAPH.RO_QUERY)."""
+        if not self._native():
+            return await self.run_sync(lambda: self.sync.connect().ro_query(q, params))
+        async def _query():
+            graph = await self.connect()
+            return await graph.ro_query(q, params)
+        return await self._execute_with_retry(_query)
+
+    async def query_many(self, queries: list, read_only: bool = True) -> list:
+        """Async counterpart of GraphConnection.query_many (one round trip)."""
+        if not self._native():
+            return await self.run_sync(self.sync.query_many, queries, read_only)
+        normalized = [
+            (q, None) if isinstance(q, str) else (q[0], q[1] if len(q) > 1 else None)
+            for q in queries
+        ]
+        if not normalized:
+            return []
+
+        async def _query():
+            graph = await self.connect()
+            if self.graph is not None:
+                return [await graph.query(q, params) for q, params in normalized]
+            from falkordb.asyncio.query_result import QueryResult as AsyncQueryResult
+            pipe = graph.client.connection.pipeline(transaction=False)
+            command = "GRAPH.RO_QUERY" if read_only else "GRAPH.QUERY"
+            for q, params in normalized:
+                pipe.execute_command(
+                    command, graph.name, graph._build_params_header(params) + q, "--compact"
+                )
+            responses = await pipe.execute(raise_on_error=False)
+            results = []
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+                result = AsyncQueryResult(graph)
+                await result.parse(response)
+                results.append(result)
+            return results
+
+        return await self._execute_with_retry(_query)
+
+    async def _read(self, name: str, q: str, params: dict = None, shape=result_to_dicts, *args):
+        """Run a single read query natively, or offload the sync method ``name``."""
+        if not self._native():
+            return await self.run_sync(getattr(self.sync, name), *args)
+        t0 = time.perf_counter()
+        try:
+            result = shape(await self.ro_query(q, params))
+        except Exception:
+            query_metrics.record(f"async.{name}", time.perf_counter() - t0, error=True, cypher=q)
+            raise
+        method = f"async.{name}"
+        query_metrics.record(
+            method, time.perf_counter() - t0,
+            rows=count_rows(result), payload_bytes=query_metrics.payload_bytes(method, result), cypher=q,
+        )
+        return result
+
+    # =========================================================================
+    # OFFLOADING
+    # =========================================================================
+
+    async def run_sync(self, func, *args, **kwargs):
+        """Run a blocking callable on the dedicated offload executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on this class: expose the
+        # rest of the GraphConnection surface as offloaded coroutines.
+        if name.startswith("__") or name == "sync":
+            raise AttributeError(name)
+        attr = getattr(self.sync, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _offloaded(*args, **kwargs):
+            return await self.run_sync(attr, *args, **kwargs)
+        return _offloaded
+
+    # =========================================================================
+    # NATIVE READ METHODS (graph / explorer / threads / knowledge endpoints)
+    # =========================================================================
+
+    async def verify_connection(self):
+        """Verify the connection and return database info"""
+        return await self._read(
+            "verify_connection", "RETURN 1 AS test", None,
+            lambda r: result_value(r, "test") == 1,
+        )
+
+    async def get_node_count(self):
+        """Get count of all nodes in the database"""
+        return await self._read(
+            "get_node_count", "MATCH (n) RETURN count(n) AS count", None,
+            lambda r: result_value(r, "count"),
+        )
+
+    async def get_relationship_count(self):
+        """Get count of all relationships in the database"""
+        return await self._read(
+            "get_relationship_count", "MATCH ()-[r]->() RETURN count(r) AS count", None,
+            lambda r: result_value(r, "count"),
+        )
+
+    async def get_graph_data(self, properties: Optional[list[str]] = None):
+        """Get all nodes and relationships for visualization"""
+        if not self._native():
+            return await self.run_sync(self.sync.get_graph_data, properties)
+        params = database._graph_export_params(properties)
+        try:
+            nodes_result, rels_result = await self.query_many([
+                (database._GRAPH_NODES_QUERY, params), (database._GRAPH_RELATIONSHIPS_QUERY, params),
+            ])
+        except ResponseError:
+            nodes_result, rels_result = await self.query_many([
+                (database._GRAPH_EXPORT_LEGACY_QUERIES[database._GRAPH_NODES_QUERY], params),
+                (database._GRAPH_EXPORT_LEGACY_QUERIES[database._GRAPH_RELATIONSHIPS_QUERY], params),
+            ])
+        return database._graph_data_payload(iter_dicts(nodes_result), iter_dicts(rels_result), properties)
+
+    async def get_graph_clusters(self) -> dict:
+        """Level-of-detail graph view (labels and aggregated edges)"""
+        if not self._native():
+            return await self.run_sync(self.sync.get_graph_clusters)
+        labels_result, edges_result = await self.query_many([
+            database._GRAPH_LABEL_CLUSTERS_QUERY, database._GRAPH_CLUSTER_EDGES_QUERY,
+        ])
+        return database._graph_clusters_payload(iter_dicts(labels_result), iter_dicts(edges_result))
+
+    async def get_all_projects_with_details(self) -> list[dict]:
+        return await self._read("get_all_projects_with_details", database._PROJECTS_WITH_DETAILS_QUERY)
+
+    async def get_all_concepts_with_details(self) -> list[dict]:
+        return await self._read("get_all_concepts_with_details", database._CONCEPTS_WITH_DETAILS_QUERY)
+
+    async def get_all_observations_with_details(self) -> list[dict]:
+        return await self._read("get_all_observations_with_details", database._OBSERVATIONS_WITH_DETAILS_QUERY)
+
+    async def get_all_actions_with_details(self) -> list[dict]:
+        return await self._read("get_all_actions_with_details", database._ACTIONS_WITH_DETAILS_QUERY)
+
+    async def get_all_competitors_with_details(self) -> list[dict]:
+        return await self._read("get_all_competitors_with_details", database._COMPETITORS_WITH_DETAILS_QUERY)
+
+    async def get_project_details(self, project_name: str) -> dict:
+        return await self._read(
+            "get_project_details", database._PROJECT_DETAILS_QUERY, {"name": project_name},
+            result_single, project_name,
+        )
+
+    async def get_concept_details(self, concept_name: str) -> dict:
+        return await self._read(
+            "get_concept_details", database._CONCEPT_DETAILS_QUERY, {"name": concept_name},
+            result_single, concept_name,
+        )
+
+    async def get_all_threads_summary(self) -> list[dict]:
+        return await self._read("get_all_threads_summary", database._THREADS_SUMMARY_QUERY)
+
+    async def get_verified_sources_library(self) -> list[dict]:
+        return await self._read("get_verified_sources_library", database._VERIFIED_SOURCES_LIBRARY_QUERY)
+
+    async def get_verified_source_details(self, source_id: str) -> dict:
+        return await self._read(
+            "get_verified_source_details", database._VERIFIED_SOURCE_DETAILS_QUERY,
+            {"source_id": source_id}, result_single, source_id,
+        )
+
+    async def get_expert_knowledge_map(self) -> list[dict]:
+        return await self._read("get_expert_knowledge_map", database._EXPERT_KNOWLEDGE_MAP_QUERY)
+
+    async def get_knowledge_stats(self) -> dict:
+        def _shape(result):
+            record = result_single(result)
+            return dict(record) if record else dict(database._EMPTY_KNOWLEDGE_STATS)
+        return await self._read("get_knowledge_stats", database._KNOWLEDGE_STATS_QUERY, None, _shape)
+
+
+async def aiter_sync(iterable: Iterable, executor: Optional[ThreadPoolExecutor] = None) -> AsyncIterator:
+    """Drive a blocking iterator from async code, one ``next()`` per executor hop.
+
+    Used for the SSE endpoints whose generators call the sync retriever: the
+    event loop stays free between events and the stream does not occupy a
+    slot in Starlette's default threadpool.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter(iterable)
+    sentinel = object()
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
@@ -0,0 +1,331 @@
+"""In-process, read-only snapshot of static catalog data (Layer 1/2).
+
+Every chat turn used to re-query the same product family metadata over the
+network (traits, materials, dimension modules, capacity rules, ...). The
+catalog only changes when the ingest pipeline or a ``database/*.py``
+migration runs, so it is loaded once with a handful of bulk queries, indexed
+by ProductFamily ID and served from memory:
+
+    snapshot = CatalogSnapshot.load(graph, version=read_graph_version(graph))
+    snapshot.product_traits("FAM_GDB")
+
+The snapshot is immutable: indexes are frozen (tuples / mappingproxy) and
+accessors hand out fresh list/dict copies, so callers that mutate results
+cannot corrupt shared state. GraphConnection swaps in a new snapshot
+atomically when the graph version counter (graph_version.py) changes.
+
+Accessor return shapes match the GraphConnection methods they back. The
+causal rules (DEMANDS_TRAIT / NEUTRALIZED_BY) are also compiled into a
+RuleIndex (rule_index.py) for TraitBasedEngine, and the sizing data
+(variants, CapacityRules, Strategies) into SizingTables (sizing_table.py),
+so both are rebuilt together with the snapshot.
+"""
+
+import time
+from types import MappingProxyType
+from typing import Optional
+
+from db_result_helpers import result_to_dicts
+from rule_index import RuleIndex
+from sizing_table import SizingTable, SizingTables
+
+
+# =============================================================================
+# BULK QUERIES (one per indexed collection)
+# =============================================================================
+
+_PRODUCT_TRAITS_QUERY = """
+    MATCH (pf:ProductFamily)-[r:HAS_TRAIT]->(t:PhysicalTrait)
+    RETURN pf.id AS pf_id, t.id AS id, t.name AS name, 'direct' AS source, r.primary AS is_primary
+    UNION
+    MATCH (pf:ProductFamily)-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(t:PhysicalTrait)
+    RETURN DISTINCT pf.id AS pf_id, t.id AS id, t.name AS name, m.code AS source, false AS is_primary
+"""
+
+_FAMILIES_WITH_TRAITS_QUERY = """
+    MATCH (pf:ProductFamily)
+    OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(dt:PhysicalTrait)
+    OPTIONAL MATCH (pf)-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(mt:PhysicalTrait)
+    WITH pf,
+         collect(DISTINCT dt.id) AS direct_trait_ids,
+         collect(DISTINCT dt.name) AS direct_trait_names,
+         collect(DISTINCT mt.id) AS material_trait_ids,
+         collect(DISTINCT mt.name) AS material_trait_names
+    RETURN pf.id AS product_id,
+           pf.name AS product_name,
+           pf.type AS product_type,
+           pf.selection_priority AS selection_priority,
+           pf.code_format AS code_format,
+           pf.default_frame_depth AS default_frame_depth,
+           direct_trait_ids,
+           direct_trait_names,
+           material_trait_ids,
+           material_trait_names,
+           direct_trait_ids + [x IN material_trait_ids WHERE NOT x IN direct_trait_ids] AS all_trait_ids
+    ORDER BY pf.selection_priority ASC
+"""
+
+_MATERIALS_QUERY = """
+    MATCH (pf:ProductFamily)-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+    RETURN pf.id AS pf_id, m.id AS id, m.name AS name, COALESCE(m.code, m.id) AS code
+    ORDER BY m.name
+"""
+
+_CONNECTION_OFFSETS_QUERY = """
+    MATCH (pf:ProductFamily)-[:HAS_VARIABLE_FEATURE]->
+          (f:VariableFeature {parameter_name: 'connection_type'})-[:HAS_OPTION]->
+          (o:FeatureOption)
+    RETURN pf.id AS pf_id, o.value AS code, o.length_offset_mm AS offset
+"""
+
+_DIMENSION_MODULES_QUERY = """
+    MATCH (pf:ProductFamily)-[:HAS_VARIANT]->(pv:ProductVariant)
+    RETURN pf.id AS pf_id,
+           pv.id AS id,
+           pv.width_mm AS width_mm,
+           pv.height_mm AS height_mm,
+           pv.reference_airflow_m3h AS reference_airflow_m3h,
+           pv.label AS label
+    ORDER BY pv.reference_airflow_m3h DESC
+"""
+
+_CAPACITY_RULES_QUERY = """
+    MATCH (pf:ProductFamily)-[:HAS_CAPACITY]->(cr:CapacityRule)
+    RETURN pf.id AS pf_id,
+           cr.id AS id,
+           cr.module_descriptor AS module_descriptor,
+           cr.input_requirement AS input_requirement,
+           cr.output_rating AS output_rating,
+           cr.assumption AS assumption,
+           cr.description AS description,
+           cr.capacity_per_component AS capacity_per_component,
+           cr.component_count_key AS component_count_key
+"""
+
+_OPTIMIZATION_STRATEGIES_QUERY = """
+    MATCH (pf:ProductFamily)-[:OPTIMIZATION_STRATEGY]->(s:Strategy)
+    RETURN pf.id AS pf_id,
+           s.id AS id,
+           s.name AS name,
+           s.sort_property AS sort_property,
+           s.sort_order AS sort_order,
+           s.description AS description,
+           s.primary_axis AS primary_axis,
+           s.secondary_axis AS secondary_axis,
+           s.expansion_unit AS expansion_unit
+"""
+
+
+# =============================================================================
+# FREEZE / THAW HELPERS
+# =============================================================================
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _group_by_family(rows: list[dict], dedupe: bool = False) -> dict[str, list[dict]]:
+    """Group bulk-query rows by their pf_id column (dropped from the row)."""
+    grouped: dict[str, list[dict]] = {}
+    seen: set = set()
+    for row in rows:
+        row = dict(row)
+        pf_id = row.pop("pf_id", None)
+        if pf_id is None:
+            continue
+        if dedupe:
+            key = (pf_id, tuple(sorted((k, repr(v)) for k, v in row.items())))
+            if key in seen:
+                continue
+            seen.add(key)
+        grouped.setdefault(pf_id, []).append(row)
+    return grouped
+
+
+def _normalize_pf_id(item_id: str) -> str:
+    return item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
+
+
+_CAUSAL_RULES_QUERY = """
+    MATCH (t:PhysicalTrait)-[r:NEUTRALIZED_BY]->(s:EnvironmentalStressor)
+    RETURN 'NEUTRALIZED_BY' AS rule_type,
+           t.id AS trait_id, t.name AS trait_name,
+           s.id AS stressor_id, s.name AS stressor_name,
+           r.severity AS severity,
+           r.explanation AS explanation
+    UNION ALL
+    MATCH (s:EnvironmentalStressor)-[r:DEMANDS_TRAIT]->(t:PhysicalTrait)
+    RETURN 'DEMANDS_TRAIT' AS rule_type,
+           t.id AS trait_id, t.name AS trait_name,
+           s.id AS stressor_id, s.name AS stressor_name,
+           r.severity AS severity,
+           r.explanation AS explanation
+"""
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+class CatalogSnapshot:
+    """Immutable, indexed catalog data keyed by ProductFamily ID."""
+
+    __slots__ = (
+        "version", "loaded_at", "load_ms",
+        "_product_traits", "_families_with_traits", "_code_formats",
+        "_materials", "_connection_offsets", "_dimension_modules",
+        "_capacity_rules", "_optimization_strategies", "_rule_index", "_sizing_tables",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        product_traits: dict,
+        families_with_traits: list,
+        code_formats: dict,
+        materials: dict,
+        connection_offsets: dict,
+        dimension_modules: dict,
+        capacity_rules: dict,
+        optimization_strategies: dict,
+        causal_rules: list = (),
+        load_ms: float = 0.0,
+    ):
+        set_ = object.__setattr__
+        set_(self, "version", version)
+        set_(self, "loaded_at", time.time())
+        set_(self, "load_ms", load_ms)
+        set_(self, "_product_traits", _freeze(product_traits))
+        set_(self, "_families_with_traits", _freeze(families_with_traits))
+        set_(self, "_code_formats", _freeze(code_formats))
+        set_(self, "_materials", _freeze(materials))
+        set_(self, "_connection_offsets", _freeze(connection_offsets))
+        set_(self, "_dimension_modules", _freeze(dimension_modules))
+        set_(self, "_capacity_rules", _freeze(capacity_rules))
+        set_(self, "_optimization_strategies", _freeze(optimization_strategies))
+        set_(self, "_rule_index", RuleIndex(families_with_traits, list(causal_rules), version))
+        set_(self, "_sizing_tables", SizingTables(
+            families_with_traits, dimension_modules, capacity_rules, optimization_strategies, version,
+        ))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable")
+
+    @classmethod
+    def load(cls, graph, version: int = 0) -> "CatalogSnapshot":
+        """Build a snapshot from the graph with one bulk query per collection."""
+        t0 = time.time()
+
+        families = result_to_dicts(graph.query(_FAMILIES_WITH_TRAITS_QUERY))
+        code_formats = {}
+        families_with_traits = []
+        for fam in families:
+            code_formats[fam["product_id"]] = {
+                "fmt": fam.pop("code_format", None),
+                "default_frame_depth": fam.pop("default_frame_depth", None),
+            }
+            families_with_traits.append(fam)
+
+        offsets: dict[str, dict[str, int]] = {}
+        for row in result_to_dicts(graph.query(_CONNECTION_OFFSETS_QUERY)):
+            by_code = offsets.setdefault(row["pf_id"], {})
+            if row["code"] is not None and row["code"] not in by_code:
+                by_code[row["code"]] = int(row["offset"]) if row["offset"] is not None else 0
+
+        strategies = {}
+        for pf_id, rows in _group_by_family(
+            result_to_dicts(graph.query(_OPTIMIZATION_STRATEGIES_QUERY))
+        ).items():
+            strategies[pf_id] = rows[0]
+
+        return cls(
+            version=version,
+            product_traits=_group_by_family(
+                result_to_dicts(graph.query(_PRODUCT_TRAITS_QUERY)), dedupe=True,
+            ),
+            families_with_traits=families_with_traits,
+            code_formats=code_formats,
+            materials=_group_by_family(result_to_dicts(graph.query(_MATERIALS_QUERY))),
+            connection_offsets=offsets,
+            dimension_modules=_group_by_family(result_to_dicts(graph.query(_DIMENSION_MODULES_QUERY))),
+            capacity_rules=_group_by_family(result_to_dicts(graph.query(_CAPACITY_RULES_QUERY))),
+            optimization_strategies=strategies,
+            causal_rules=result_to_dicts(graph.query(_CAUSAL_RULES_QUERY)),
+            load_ms=(time.time() - t0) * 1000,
+        )
+
+    # -------------------------------------------------------------------------
+    # Accessors (same shapes as the GraphConnection methods they back)
+    # -------------------------------------------------------------------------
+
+    def product_traits(self, product_family: str) -> list[dict]:
+        return _thaw(self._product_traits.get(_normalize_pf_id(product_family), ()))
+
+    def all_product_families_with_traits(self) -> list[dict]:
+        return _thaw(self._families_with_traits)
+
+    def available_materials(self, family_id: str) -> list:
+        return _thaw(self._materials.get(family_id, ()))
+
+    def connection_length_offset(self, family_id: str, connection_code: str) -> int:
+        return self._connection_offsets.get(family_id, MappingProxyType({})).get(connection_code, 0)
+
+    def product_family_code_format(self, family_id: str) -> Optional[dict]:
+        fmt = self._code_formats.get(family_id)
+        return _thaw(fmt) if fmt is not None else None
+
+    def available_dimension_modules(self, item_id: str) -> list[dict]:
+        return _thaw(self._dimension_modules.get(_normalize_pf_id(item_id), ()))
+
+    def capacity_rules(self, item_id: str) -> list[dict]:
+        return _thaw(self._capacity_rules.get(_normalize_pf_id(item_id), ()))
+
+    def optimization_strategy(self, item_id: str) -> Optional[dict]:
+        strategy = self._optimization_strategies.get(_normalize_pf_id(item_id))
+        return _thaw(strategy) if strategy is not None else None
+
+    def causal_rules_for_stressors(self, stressor_ids: list[str]) -> list[dict]:
+        return self._rule_index.rules_for(stressor_ids)
+
+    @property
+    def rule_index(self) -> RuleIndex:
+        """Causal rules and family trait sets compiled for this graph version."""
+        return self._rule_index
+
+    def sizing_table(self, item_id: str) -> Optional[SizingTable]:
+        """Precomputed sizing table of a product family (None without variants, capacity or strategy)."""
+        return self._sizing_tables.table(item_id)
+
+    def products_with_higher_capacity(self, blocked_pf_id: str, module_descriptor: str,
+                                      min_output_rating: float,
+                                      required_trait_ids: Optional[list[str]] = None) -> list[dict]:
+        return self._sizing_tables.products_with_higher_capacity(
+            blocked_pf_id, module_descriptor, min_output_rating, required_trait_ids,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_ms": round(self.load_ms, 1),
+            "product_families": len(self._families_with_traits),
+            "families_with_traits": len(self._product_traits),
+            "families_with_materials": len(self._materials),
+            "dimension_modules": sum(len(v) for v in self._dimension_modules.values()),
+            "capacity_rules": sum(len(v) for v in self._capacity_rules.values()),
+            "optimization_strategies": len(self._optimization_strategies),
+            "causal_rules": self._rule_index.rule_count,
+            "sizing_tables": self._sizing_tables.stats()["families"],
+        }
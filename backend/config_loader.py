@@ -8,10 +8,13 @@ import re
 from pathlib import Path
 from typing import Optional, Any
 from dataclasses import dataclass, field
+from functools import cached_property
 
 import yaml
 from pydantic import BaseModel, Field
 
+from keyword_matcher import KeywordMatcher
+
 
 # =============================================================================
 # PYDANTIC MODELS FOR CONFIGURATION VALIDATION
@@ -339,19 +342,65 @@ class DomainConfig:
         keywords.extend(self.option_codes)
         return list(set(keywords))
 
+    @cached_property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """Every keyword lookup of this config in one automaton, compiled on first use.
+
+        Payloads are tuples whose first element names the lookup ("search",
+        "policy", "material", ...) followed by list indexes into this config.
+        """
+        matcher = KeywordMatcher()
+        for keyword in self.get_all_search_keywords():
+            matcher.add(keyword, ("search", keyword))
+        for i, policy in enumerate(self.policies):
+            for keyword in policy.triggers.keywords:
+                matcher.add(keyword, ("policy", i))
+        for i, mat in enumerate(self.material_hierarchy):
+            matcher.add(mat.code, ("material", i))
+            matcher.add(mat.full_name, ("material", i))
+        for i, env in enumerate(self.demanding_environments):
+            for name in [env.name] + list(env.aliases):
+                matcher.add(name, ("environment", i))
+        for i, prod in enumerate(self.product_capabilities):
+            matcher.add(prod.family, ("capability", i))
+            for j, warning in enumerate(prod.warning_applications):
+                for k, trigger in enumerate(warning.trigger):
+                    matcher.add(trigger, ("capability_trigger", i, j, k))
+        for i, warn in enumerate(self.installation_warnings):
+            for trigger in warn.trigger:
+                matcher.add(trigger, ("install_trigger", i))
+            matcher.add(warn.condition, ("install_condition", i))
+            for j, prod in enumerate(warn.products_affected):
+                matcher.add(prod, ("install_product", i, j))
+        matcher.add("no insulation", ("no_insulation",))
+        matcher.add("bez izolacji", ("no_insulation",))
+        for i, acc in enumerate(self.accessory_compatibility):
+            matcher.add(acc.accessory, ("accessory", i))
+            for j, incompat in enumerate(acc.NOT_compatible_with):
+                matcher.add(incompat, ("accessory_incompat", i, j))
+        return matcher.build()
+
+    def match_search_keywords(self, query: str) -> list[str]:
+        """Configured search keywords present in the query, in order of appearance."""
+        found = []
+        for _, _, payload in self.keyword_matcher.scan(query):
+            if payload[0] == "search" and payload[1] not in found:
+                found.append(payload[1])
+        return found
+
+    def _first_hit(self, hits: set, kind: str, accept=None) -> Optional[tuple]:
+        """Lowest-index hit of ``kind`` (first in config order), indexes only."""
+        matches = [p[1:] for p in hits if p[0] == kind and (accept is None or accept(p[1:]))]
+        return min(matches) if matches else None
+
     def get_active_policies_for_query(self, query: str) -> list[ReasoningPolicy]:
         """Get policies that are triggered by the query."""
-        query_lower = query.lower()
+        hits = self.keyword_matcher.payloads(query)
         active = []
 
-        for policy in self.policies:
-            triggered = False
-
+        for i, policy in enumerate(self.policies):
             # Check keyword triggers
-            for keyword in policy.triggers.keywords:
-                if keyword.lower() in query_lower:
-                    triggered = True
-                    break
+            triggered = ("policy", i) in hits
 
             # Check pattern triggers
             if not triggered:
@@ -508,31 +557,19 @@ class DomainConfig:
 
     def check_material_environment_mismatch(self, query: str) -> Optional[dict]:
         """Check if query has a material-environment mismatch."""
-        query_lower = query.lower()
+        hits = self.keyword_matcher.payloads(query)
 
-        # Find requested material
-        requested_material = None
-        for mat in self.material_hierarchy:
-            if mat.code.lower() in query_lower or mat.full_name.lower() in query_lower:
-                requested_material = mat
-                break
-
-        if not requested_material:
+        # Find requested material (first in hierarchy order)
+        material_hit = self._first_hit(hits, "material")
+        if not material_hit:
             return None
+        requested_material = self.material_hierarchy[material_hit[0]]
 
         # Find mentioned environment
-        detected_environment = None
-        for env in self.demanding_environments:
-            all_names = [env.name.lower()] + [a.lower() for a in env.aliases]
-            for name in all_names:
-                if name in query_lower:
-                    detected_environment = env
-                    break
-            if detected_environment:
-                break
-
-        if not detected_environment:
+        environment_hit = self._first_hit(hits, "environment")
+        if not environment_hit:
             return None
+        detected_environment = self.demanding_environments[environment_hit[0]]
 
         # Check if material is suitable
         if requested_material.code not in detected_environment.required_materials:
@@ -549,54 +586,49 @@ class DomainConfig:
 
     def check_product_application_mismatch(self, query: str) -> Optional[dict]:
         """Check if query has a product-application mismatch."""
-        query_lower = query.lower()
-
-        for prod in self.product_capabilities:
-            if prod.family.lower() not in query_lower:
-                continue
-
-            for warning in prod.warning_applications:
-                for trigger in warning.trigger:
-                    if trigger.lower() in query_lower:
-                        return {
-                            "product": prod.family,
-                            "trigger": trigger,
-                            "message": warning.message,
-                            "alternative": warning.alternative
-                        }
+        hits = self.keyword_matcher.payloads(query)
+
+        # Product family mentioned together with one of its warning triggers
+        trigger_hit = self._first_hit(hits, "capability_trigger", lambda h: ("capability", h[0]) in hits)
+        if trigger_hit:
+            i, j, k = trigger_hit
+            prod = self.product_capabilities[i]
+            warning = prod.warning_applications[j]
+            return {
+                "product": prod.family,
+                "trigger": warning.trigger[k],
+                "message": warning.message,
+                "alternative": warning.alternative
+            }
 
         # Check installation warnings
-        for warn in self.installation_warnings:
-            trigger_found = any(t.lower() in query_lower for t in warn.trigger)
-            condition_met = warn.condition.lower() in query_lower or "no insulation" in query_lower or "bez izolacji" in query_lower
-
-            if trigger_found and condition_met:
-                for prod in warn.products_affected:
-                    if prod.lower() in query_lower:
-                        return {
-                            "product": prod,
-                            "trigger": ", ".join(warn.trigger),
-                            "message": warn.message,
-                            "alternative": warn.alternative
-                        }
+        no_insulation = ("no_insulation",) in hits
+        product_hit = self._first_hit(hits, "install_product", lambda h: (
+            ("install_trigger", h[0]) in hits
+            and (("install_condition", h[0]) in hits or no_insulation)
+        ))
+        if product_hit:
+            warn = self.installation_warnings[product_hit[0]]
+            return {
+                "product": warn.products_affected[product_hit[1]],
+                "trigger": ", ".join(warn.trigger),
+                "message": warn.message,
+                "alternative": warn.alternative
+            }
 
         return None
 
     def check_accessory_compatibility(self, query: str) -> Optional[dict]:
         """Check if query has an accessory compatibility issue."""
-        query_lower = query.lower()
-
-        for acc in self.accessory_compatibility:
-            if acc.accessory.lower() not in query_lower:
-                continue
-
-            for incompat in acc.NOT_compatible_with:
-                if incompat.lower() in query_lower:
-                    return {
-                        "accessory": acc.accessory,
-                        "product": incompat,
-                        "reason": acc.reason
-                    }
+        hits = self.keyword_matcher.payloads(query)
+        incompat_hit = self._first_hit(hits, "accessory_incompat", lambda h: ("accessory", h[0]) in hits)
+        if incompat_hit:
+            acc = self.accessory_compatibility[incompat_hit[0]]
+            return {
+                "accessory": acc.accessory,
+                "product": acc.NOT_compatible_with[incompat_hit[1]],
+                "reason": acc.reason
+            }
 
         return None
 
@@ -0,0 +1,197 @@
+"""Token-budgeted packing of the context blocks that go into a synthesis prompt.
+
+The synthesis prompt is assembled from many independently produced blocks
+(configuration search results, past cases, the technical state, graph
+policies, material warnings, ...). A ``ContextPacker`` collects them as
+named sections with a priority, an optional per-section token budget and a
+``required`` flag, then packs them:
+
+    packer = ContextPacker(budget=8000)
+    packer.add("graph_policies", policies_text, required=True)
+    packer.add("configuration", config_context, priority=1, budget=1500)
+    packer.add("retrieval", past_cases, priority=4, budget=1500)
+    packed = packer.pack()
+    prompt_context = packed.text("configuration", "retrieval", sep="\\n\\n")
+    timings.update(packed.timings())     # ctx_tokens_<section>, ctx_tokens_total, ...
+
+1. Facts (lines of at least ``min_fact_chars`` characters) already stated
+   in a more important section are removed from the less important one;
+   required sections are never edited but their facts count as already
+   stated. Repeats within one section (e.g. identical table rows) are kept.
+2. Optional sections over their own budget are cut at a line boundary.
+3. While the total is over ``budget``, optional sections are cut or
+   dropped, least important (highest ``priority`` number) first.
+
+Required sections (safety-critical policies, the locked technical state)
+are always kept verbatim, even if they alone exceed the budget. Sections
+render in the order they were added, whatever their priority.
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Token budget for the packed context/policy blocks of a synthesis prompt
+SYNTHESIS_CONTEXT_TOKENS = int(os.getenv("SYNTHESIS_CONTEXT_TOKENS", 8000))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count: ~4 ASCII characters per token, one per non-ASCII character.
+
+    Tokenizers split diacritics, emoji and box-drawing characters into
+    separate tokens, so counting them individually keeps the estimate on the
+    conservative side for the Polish/German prompts and emoji markers.
+    """
+    if not text:
+        return 0
+    non_ascii = len(text) - len(text.encode("ascii", "ignore"))
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+_FACT_STRIP_RE = re.compile(r"[*_`]")
+_FACT_SPACE_RE = re.compile(r"\s+")
+
+
+def _fact_key(line: str) -> str:
+    """Normalized form of a line for duplicate detection (markup, bullets, case, spacing)."""
+    line = _FACT_STRIP_RE.sub("", line).strip(" \t-•>#|")
+    return _FACT_SPACE_RE.sub(" ", line).lower()
+
+
+@dataclass
+class ContextSection:
+    name: str
+    text: str
+    priority: int = 5
+    budget: Optional[int] = None
+    required: bool = False
+    original_tokens: int = 0
+    tokens: int = 0
+    duplicate_lines: int = 0
+    truncated: bool = False
+
+
+class PackedContext:
+    """Packed sections, in insertion order, with their token accounting."""
+
+    def __init__(self, sections: list[ContextSection]):
+        self.sections = {s.name: s for s in sections}
+
+    def __getitem__(self, name: str) -> str:
+        section = self.sections.get(name)
+        return section.text if section else ""
+
+    def text(self, *names: str, sep: str = "\n") -> str:
+        """Join the non-empty packed sections (all, or only ``names``) in insertion order."""
+        wanted = set(names) if names else None
+        return sep.join(
+            s.text for s in self.sections.values()
+            if s.text and (wanted is None or s.name in wanted)
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(s.tokens for s in self.sections.values())
+
+    @property
+    def original_tokens(self) -> int:
+        return sum(s.original_tokens for s in self.sections.values())
+
+    def timings(self, prefix: str = "ctx_tokens_") -> dict[str, int]:
+        """Flat ``<prefix><section>`` token counts plus ``total`` and ``saved``."""
+        out = {f"{prefix}{s.name}": s.tokens for s in self.sections.values() if s.original_tokens}
+        out[f"{prefix}total"] = self.total_tokens
+        out[f"{prefix}saved"] = self.original_tokens - self.total_tokens
+        return out
+
+
+class ContextPacker:
+    """Collects named prompt sections and packs them into a token budget."""
+
+    def __init__(self, budget: Optional[int] = None,
+                 estimator: Callable[[str], int] = estimate_tokens,
+                 min_fact_chars: int = 32):
+        self.budget = budget
+        self.estimate = estimator
+        self.min_fact_chars = min_fact_chars
+        self._sections: list[ContextSection] = []
+
+    def add(self, name: str, text: Optional[str], priority: int = 5,
+            budget: Optional[int] = None, required: bool = False) -> "ContextPacker":
+        """Add a section; lower ``priority`` numbers are more important."""
+        if any(s.name == name for s in self._sections):
+            raise ValueError(f"Context section already added: {name}")
+        self._sections.append(ContextSection(
+            name=name, text=text or "", priority=priority, budget=budget, required=required,
+        ))
+        return self
+
+    def pack(self) -> PackedContext:
+        sections = [ContextSection(**vars(s)) for s in self._sections]
+        for s in sections:
+            s.original_tokens = s.tokens = self.estimate(s.text)
+
+        # Most important first: required sections, then by priority, then insertion order
+        by_importance = sorted(
+            range(len(sections)),
+            key=lambda i: (not sections[i].required, sections[i].priority, i),
+        )
+
+        seen: set[str] = set()
+        for i in by_importance:
+            self._dedupe(sections[i], seen)
+
+        for s in sections:
+            if s.budget is not None and not s.required and s.tokens > s.budget:
+                self._truncate(s, s.budget)
+
+        if self.budget is not None:
+            over = sum(s.tokens for s in sections) - self.budget
+            for i in reversed(by_importance):
+                if over <= 0:
+                    break
+                s = sections[i]
+                if s.required or not s.tokens:
+                    continue
+                before = s.tokens
+                self._truncate(s, s.tokens - over)
+                over -= before - s.tokens
+
+        return PackedContext(sections)
+
+    def _dedupe(self, section: ContextSection, seen: set[str]):
+        """Drop lines stated by an earlier section in ``seen``, then add this section's facts."""
+        kept, own = [], set()
+        for line in section.text.split("\n"):
+            key = _fact_key(line)
+            if len(key) >= self.min_fact_chars:
+                if key in seen and not section.required:
+                    section.duplicate_lines += 1
+                    continue
+                own.add(key)
+            kept.append(line)
+        seen |= own
+        if section.duplicate_lines:
+            section.text = "\n".join(kept)
+            section.tokens = self.estimate(section.text)
+
+    def _truncate(self, section: ContextSection, budget: int):
+        """Keep leading lines within ``budget`` tokens; drop the section if no content fits."""
+        if section.tokens <= budget:
+            return
+        lines = section.text.split("\n")
+        room = budget - (self.estimate(f"[… {len(lines)} more lines omitted for length]") + 1)
+        kept, used = [], 0
+        for line in lines:
+            cost = self.estimate(line) + 1
+            if used + cost > room:
+                break
+            kept.append(line)
+            used += cost
+        omitted = len(lines) - len(kept)
+        marker = f"[… {omitted} more lines omitted for length]"
+        section.text = "\n".join(kept + [marker]) if any(line.strip() for line in kept) else ""
+        section.tokens = self.estimate(section.text)
+        section.truncated = True
@@ -1,32 +1,77 @@
 import os
+import threading
 import time
+from contextlib import contextmanager
 from typing import Optional
-from falkordb import FalkorDB
-from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
-from db_result_helpers import result_to_dicts, result_single, result_value
+from falkordb import FalkorDB, Graph, QueryResult
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError, TimeoutError as RedisTimeoutError
+from db_result_helpers import iter_dicts, iter_rows, result_to_dicts, result_single, result_value
+from graph_pool import GraphConnectionPool, PooledGraph
+from db_metrics import count_rows, method_name_of, query_metrics
+from query_cache import QueryCache
+from catalog_snapshot import CatalogSnapshot
+from graph_version import bump_graph_version, read_graph_version
+from rule_index import RuleIndex
+from sizing_table import SizingTable
 from dotenv import load_dotenv
-from functools import lru_cache
+from functools import lru_cache, wraps
 
 load_dotenv(dotenv_path="../.env")
 
-# Simple TTL cache for expensive queries
-_query_cache = {}
-_cache_ttl = 300  # 5 minutes
+# Bounded LRU + TTL cache for expensive read queries (namespaced per method).
+# Write methods on GraphConnection invalidate it via @_invalidates_cache.
+_query_cache = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", 2048)),
+    max_bytes=int(float(os.getenv("QUERY_CACHE_MAX_MB", 64)) * 1024 * 1024),
+    ttl=float(os.getenv("QUERY_CACHE_TTL", 300)),  # 5 minutes
+)
 
 
-def _get_cached(key: str):
-    """Get value from cache if not expired."""
-    if key in _query_cache:
-        value, timestamp = _query_cache[key]
-        if time.time() - timestamp < _cache_ttl:
-            return value
-        del _query_cache[key]
-    return None
+def _get_cached(namespace: str, key: str = ""):
+    """Get value from cache if present and not expired."""
+    return _query_cache.get(namespace, key)
 
 
-def _set_cached(key: str, value):
+def _set_cached(namespace: str, key: str, value):
     """Store value in cache."""
-    _query_cache[key] = (value, time.time())
+    _query_cache.set(namespace, key, value)
+
+
+# Callbacks run after every GraphConnection write (e.g. response cache busting).
+_write_listeners = []
+
+
+def on_graph_write(callback):
+    """Register ``callback()`` to run after each GraphConnection write method."""
+    _write_listeners.append(callback)
+    return callback
+
+
+def _invalidates_cache(*namespaces: str, catalog: bool = False):
+    """Decorator for write methods: drop cached reads after the write runs.
+
+    With no namespaces the whole cache is cleared — catalog writes are rare
+    and may touch any cached Layer 1/2 data. ``catalog=True`` also bumps the
+    graph version, so the catalog snapshot (and the rule index and sizing
+    tables built on it) reloads. Listeners registered with ``on_graph_write``
+    run afterwards.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                _query_cache.invalidate(*namespaces)
+                if catalog:
+                    self._mark_catalog_changed(source=func.__name__)
+                for listener in _write_listeners:
+                    try:
+                        listener()
+                    except Exception as e:
+                        print(f"⚠️ Graph write listener failed: {e}")
+        return wrapper
+    return decorator
 
 VECTOR_INDEX_NAME = "concept_embeddings"
 
@@ -86,6 +131,603 @@ def _format_display_label(name: str, max_length: int = 18) -> str:
     return name[:max_length-2] + ".."
 VECTOR_DIMENSIONS = 3072
 
+# Queries shared by single-item methods and their batch (query_many) variants
+_VARIANT_WEIGHT_QUERY = """
+    MATCH (v:ProductVariant)
+    WHERE v.name = $name OR v.name CONTAINS $name
+    RETURN v.weight_kg AS weight_kg,
+           v.weight_kg_short AS weight_kg_short,
+           v.weight_kg_long AS weight_kg_long,
+           v.housing_length_mm AS housing_length_mm,
+           v.housing_length_short_mm AS housing_length_short_mm,
+           v.housing_length_long_mm AS housing_length_long_mm
+    LIMIT 1
+"""
+
+_AVAILABLE_MATERIALS_QUERY = """
+    MATCH (pf:ProductFamily {id: $fid})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+    RETURN m.id AS id, m.name AS name, COALESCE(m.code, m.id) AS code
+    ORDER BY m.name
+"""
+
+_FAMILY_MATERIALS_WITH_CLASS_QUERY = """
+    MATCH (pf:ProductFamily {id: $fid})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+    RETURN m.id AS id, m.name AS name,
+           COALESCE(m.code, m.id) AS code,
+           m.corrosion_class AS corrosion_class
+    ORDER BY m.name
+"""
+
+_APPLICATION_PROPERTIES_QUERY = """
+    MATCH (a:Application {id: $app_id})
+    RETURN a.typical_chlorine_ppm AS typical_chlorine_ppm
+"""
+
+_VARIABLE_FEATURES_QUERY = """
+    MATCH (pf:ProductFamily)-[:HAS_VARIABLE_FEATURE]->(f:VariableFeature {is_variable: true})
+    WHERE pf.id = 'FAM_' + $family
+       OR pf.name CONTAINS $family
+       OR f.applies_to = $family
+
+    OPTIONAL MATCH (f)-[:SELECTION_DEPENDS_ON]->(d:Discriminator)
+    OPTIONAL MATCH (f)-[:HAS_OPTION]->(o:FeatureOption)
+
+    WITH f, d, collect({
+        id: o.id,
+        name: o.name,
+        value: o.value,
+        description: o.description,
+        is_default: o.is_default,
+        // Enhanced UX fields
+        display_label: o.display_label,
+        benefit: o.benefit,
+        use_case: o.use_case,
+        is_recommended: o.is_recommended
+    }) AS options
+
+    RETURN f.id AS feature_id,
+           COALESCE(f.feature_name, f.name) AS feature_name,
+           f.description AS feature_description,
+           COALESCE(f.question, d.question) AS question,
+           COALESCE(f.why_needed, d.why_needed) AS why_needed,
+           COALESCE(f.parameter_name, d.parameter_name) AS parameter_name,
+           [opt IN options WHERE opt.id IS NOT NULL] AS options,
+           COALESCE(f.auto_resolve, false) AS auto_resolve,
+           f.default_value AS default_value
+    ORDER BY f.feature_name
+"""
+
+# TraitBasedEngine lookups (also pipelined together by get_engine_context)
+_APPLICATIONS_QUERY = """
+    MATCH (app:Application)
+    OPTIONAL MATCH (app)-[:HAS_RISK]->(risk:Risk)
+    OPTIONAL MATCH (app)-[:REQUIRES_RESISTANCE]->(req:Requirement)
+    WITH app,
+         collect(DISTINCT {id: risk.id, name: risk.name, severity: risk.severity, desc: risk.desc}) AS risks,
+         collect(DISTINCT {id: req.id, name: req.name, desc: req.desc}) AS requirements
+    RETURN app.id AS id,
+           app.name AS name,
+           app.keywords AS keywords,
+           [r IN risks WHERE r.id IS NOT NULL] AS risks,
+           [r IN requirements WHERE r.id IS NOT NULL] AS requirements
+    ORDER BY app.name
+"""
+
+_REQUIRED_PARAMETERS_QUERY = """
+    MATCH (pf:ProductFamily)-[r:REQUIRES_PARAMETER]->(param:Parameter)
+    WHERE pf.id = 'FAM_' + $family OR pf.name CONTAINS $family
+    OPTIONAL MATCH (param)-[:ASKED_VIA]->(q:Question)
+    RETURN param.id AS param_id,
+           param.name AS param_name,
+           param.type AS param_type,
+           param.unit AS param_unit,
+           r.reason AS reason,
+           q.id AS question_id,
+           q.text AS question_text,
+           q.intent AS intent,
+           q.priority AS priority
+    ORDER BY q.priority
+"""
+
+_ENVIRONMENT_HIERARCHY_QUERY = """
+    MATCH (env:Environment {id: $env_id})
+    OPTIONAL MATCH (env)-[:IS_A*0..5]->(parent:Environment)
+    RETURN collect(DISTINCT env.id) + collect(DISTINCT parent.id) AS env_chain
+"""
+
+_PRODUCT_TRAITS_QUERY = """
+    MATCH (pf:ProductFamily {id: $pf_id})-[r:HAS_TRAIT]->(t:PhysicalTrait)
+    RETURN t.id AS id, t.name AS name, 'direct' AS source, r.primary AS is_primary
+    UNION
+    MATCH (pf:ProductFamily {id: $pf_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(t:PhysicalTrait)
+    RETURN DISTINCT t.id AS id, t.name AS name, m.code AS source, false AS is_primary
+"""
+
+_LOGIC_GATES_QUERY = """
+    MATCH (g:LogicGate)-[:MONITORS]->(s:EnvironmentalStressor)
+    WHERE s.id IN $stressor_ids
+    OPTIONAL MATCH (g)-[:REQUIRES_DATA]->(p:Parameter)
+    WITH g, s, collect({
+        param_id: p.id,
+        name: p.name,
+        property_key: p.property_key,
+        priority: p.priority,
+        question: p.question,
+        unit: p.unit
+    }) AS params
+    RETURN g.id AS gate_id,
+           g.name AS gate_name,
+           g.condition_logic AS condition_logic,
+           g.physics_explanation AS physics_explanation,
+           s.id AS stressor_id,
+           s.name AS stressor_name,
+           params
+    ORDER BY g.id
+"""
+
+_HARD_CONSTRAINTS_QUERY = """
+    MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_HARD_CONSTRAINT]->(hc:HardConstraint)
+    RETURN hc.id AS id,
+           hc.property_key AS property_key,
+           hc.operator AS operator,
+           hc.value AS value,
+           hc.error_msg AS error_msg
+"""
+
+_INSTALLATION_CONSTRAINTS_QUERY = """
+    MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_INSTALLATION_CONSTRAINT]->(ic:InstallationConstraint)
+    RETURN ic.id AS id,
+           ic.constraint_type AS constraint_type,
+           ic.dimension_key AS dimension_key,
+           ic.factor_property AS factor_property,
+           ic.comparison_key AS comparison_key,
+           ic.list_property AS list_property,
+           ic.input_key AS input_key,
+           ic.cross_property AS cross_property,
+           ic.material_context_key AS material_context_key,
+           ic.context_match_key AS context_match_key,
+           ic.cross_rel_type AS cross_rel_type,
+           ic.cross_node_match_property AS cross_node_match_property,
+           ic.operator AS operator,
+           ic.severity AS severity,
+           ic.error_msg AS error_msg,
+           pf.service_access_factor AS service_access_factor,
+           pf.service_access_type AS service_access_type,
+           pf.service_warning AS service_warning,
+           pf.allowed_environments AS allowed_environments,
+           pf.construction_type AS construction_type,
+           ic.valid_set AS valid_set
+"""
+
+_OPTIMIZATION_STRATEGY_QUERY = """
+    MATCH (pf:ProductFamily {id: $pf_id})-[:OPTIMIZATION_STRATEGY]->(s:Strategy)
+    RETURN s.id AS id,
+           s.name AS name,
+           s.sort_property AS sort_property,
+           s.sort_order AS sort_order,
+           s.description AS description,
+           s.primary_axis AS primary_axis,
+           s.secondary_axis AS secondary_axis,
+           s.expansion_unit AS expansion_unit
+    LIMIT 1
+"""
+
+_CAPACITY_RULES_QUERY = """
+    MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_CAPACITY]->(cr:CapacityRule)
+    RETURN cr.id AS id,
+           cr.module_descriptor AS module_descriptor,
+           cr.input_requirement AS input_requirement,
+           cr.output_rating AS output_rating,
+           cr.assumption AS assumption,
+           cr.description AS description,
+           cr.capacity_per_component AS capacity_per_component,
+           cr.component_count_key AS component_count_key
+"""
+
+_ACCESSORY_CODES_QUERY = """
+    MATCH (a:Accessory)
+    RETURN a.id AS id,
+           replace(a.id, 'ACC_', '') AS code,
+           a.name AS name
+    ORDER BY a.id
+"""
+
+# Read-only explorer / knowledge queries (shared with AsyncGraphConnection)
+_PROJECTS_WITH_DETAILS_QUERY = """
+    MATCH (p:Project)
+    OPTIONAL MATCH (p)-[:HAS_OBSERVATION]->(o:Observation)
+    OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
+    WITH p, count(DISTINCT o) AS observations_count, collect(DISTINCT c.name) AS concepts
+    RETURN p.name AS name, p.customer AS customer, p.date AS date,
+           p.summary AS summary, observations_count, concepts
+    ORDER BY p.name
+"""
+
+_CONCEPTS_WITH_DETAILS_QUERY = """
+    MATCH (c:Concept)
+    OPTIONAL MATCH (o:Observation)-[:RELATES_TO]->(c)
+    OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
+    WITH c, count(DISTINCT o) AS observations_count, count(DISTINCT a) AS actions_count
+    RETURN c.name AS name, c.description AS description,
+           observations_count, actions_count
+    ORDER BY c.name
+"""
+
+_OBSERVATIONS_WITH_DETAILS_QUERY = """
+    MATCH (o:Observation)
+    OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
+    OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
+    OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
+    WITH o, p.name AS project, collect(DISTINCT c.name) AS concepts,
+         collect(DISTINCT a.description) AS actions
+    RETURN o.description AS description, o.context AS context,
+           project, concepts, actions
+    ORDER BY project, o.description
+"""
+
+_ACTIONS_WITH_DETAILS_QUERY = """
+    MATCH (a:Action)
+    OPTIONAL MATCH (o:Observation)-[:LED_TO]->(a)
+    OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
+    WITH a, count(DISTINCT o) AS observations_count,
+         collect(DISTINCT p.name) AS projects
+    RETURN a.description AS description, a.outcome AS outcome,
+           observations_count, projects
+    ORDER BY a.description
+"""
+
+_COMPETITORS_WITH_DETAILS_QUERY = """
+    MATCH (cp:CompetitorProduct)
+    OPTIONAL MATCH (cp)-[:EQUIVALENT_TO]->(p:Product)
+    WITH cp, collect({
+        sku: p.sku,
+        name: p.name,
+        price: p.price
+    }) AS equivalents
+    RETURN cp.name AS name, cp.manufacturer AS manufacturer, equivalents
+    ORDER BY cp.manufacturer, cp.name
+"""
+
+_PROJECT_DETAILS_QUERY = """
+    MATCH (p:Project {name: $name})
+    OPTIONAL MATCH (p)-[:HAS_OBSERVATION]->(o:Observation)
+    OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
+    OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
+    WITH p, o, collect(DISTINCT c.name) AS obs_concepts,
+         collect(DISTINCT {description: a.description, outcome: a.outcome}) AS obs_actions
+    WITH p, collect({
+        description: o.description,
+        context: o.context,
+        concepts: obs_concepts,
+        actions: obs_actions
+    }) AS observations
+    RETURN p.name AS name, p.customer AS customer, p.date AS date,
+           p.summary AS summary, observations
+"""
+
+_CONCEPT_DETAILS_QUERY = """
+    MATCH (c:Concept {name: $name})
+    OPTIONAL MATCH (o:Observation)-[:RELATES_TO]->(c)
+    OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
+    OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
+    WITH c, collect(DISTINCT {
+        description: o.description,
+        project: p.name,
+        actions: collect(DISTINCT a.description)
+    }) AS observations
+    RETURN c.name AS name, c.description AS description, observations
+"""
+
+_THREADS_SUMMARY_QUERY = """
+    MATCH (p:Project)
+    OPTIONAL MATCH (e:Event)-[:PART_OF]->(p)
+    OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
+    OPTIONAL MATCH (e)-[:REPORTED]->(obs:Observation)
+    OPTIONAL MATCH (e)-[:PROPOSED]->(act:Action)
+    OPTIONAL MATCH (obs)-[:RELATES_TO]->(c1:Concept)
+    OPTIONAL MATCH (act)-[:RELATES_TO]->(c2:Concept)
+
+    WITH p,
+         count(DISTINCT e) AS event_count,
+         count(DISTINCT obs) AS observation_count,
+         count(DISTINCT act) AS action_count,
+         collect(DISTINCT person.name) AS participants,
+         collect(DISTINCT e.date) AS dates,
+         collect(DISTINCT c1.name) + collect(DISTINCT c2.name) AS all_concepts
+
+    RETURN p.name AS name,
+           p.customer AS customer,
+           p.summary AS summary,
+           event_count,
+           observation_count,
+           action_count,
+           participants,
+           [d IN dates WHERE d IS NOT NULL | d] AS dates,
+           [c IN all_concepts WHERE c IS NOT NULL][0..5] AS key_concepts
+    ORDER BY p.name
+"""
+
+_VERIFIED_SOURCES_LIBRARY_QUERY = """
+    MATCH (vs:VerifiedSource)
+    OPTIONAL MATCH (kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs)
+    OPTIONAL MATCH (e:Event)-[:SUGGESTS]->(kc)
+    OPTIONAL MATCH (e)-[:PART_OF]->(p:Project)
+    OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
+    OPTIONAL MATCH (vs)-[alias:ALIASED_AS]->()
+
+    WITH vs,
+         count(DISTINCT p) AS project_count,
+         count(DISTINCT kc) AS mention_count,
+         collect(DISTINCT p.name) AS projects,
+         collect(DISTINCT person.name) AS experts,
+         collect(DISTINCT alias.pattern) AS aliases
+
+    RETURN id(vs) AS id,
+           vs.name AS name,
+           vs.type AS type,
+           vs.description AS description,
+           project_count,
+           mention_count,
+           projects[0..5] AS recent_projects,
+           experts[0..3] AS top_experts,
+           aliases AS known_aliases
+    ORDER BY mention_count DESC
+"""
+
+_VERIFIED_SOURCE_DETAILS_QUERY = """
+    MATCH (vs:VerifiedSource)
+    WHERE id(vs) = $source_id
+    OPTIONAL MATCH (kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs)
+    OPTIONAL MATCH (e:Event)-[:SUGGESTS]->(kc)
+    OPTIONAL MATCH (e)-[:PART_OF]->(p:Project)
+    OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
+
+    WITH vs, kc, e, p, person
+    ORDER BY e.date DESC
+
+    WITH vs,
+         collect(DISTINCT {
+             project: p.name,
+             event_date: e.date,
+             sender: person.name,
+             citation: kc.citation,
+             context: kc.context
+         }) AS mentions
+
+    RETURN id(vs) AS id,
+           vs.name AS name,
+           vs.type AS type,
+           vs.description AS description,
+           mentions
+"""
+
+_EXPERT_KNOWLEDGE_MAP_QUERY = """
+    MATCH (p:Person)<-[:SENT_BY]-(e:Event)-[:SUGGESTS]->(kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs:VerifiedSource)
+    WITH p, vs, count(DISTINCT e) AS usage_count
+    ORDER BY usage_count DESC
+    WITH p, collect({source: vs.name, type: vs.type, usage_count: usage_count}) AS sources
+    RETURN p.name AS expert_name,
+           p.email AS expert_email,
+           size(sources) AS source_count,
+           sources[0..5] AS top_sources
+    ORDER BY source_count DESC
+    LIMIT 20
+"""
+
+_KNOWLEDGE_STATS_QUERY = """
+    MATCH (kc:KnowledgeCandidate)
+    WITH count(CASE WHEN kc.status = 'pending' THEN 1 END) AS pending,
+         count(CASE WHEN kc.status = 'verified' THEN 1 END) AS verified,
+         count(CASE WHEN kc.status = 'rejected' THEN 1 END) AS rejected,
+         count(kc) AS total_candidates
+    OPTIONAL MATCH (vs:VerifiedSource)
+    WITH pending, verified, rejected, total_candidates, count(vs) AS total_sources
+    OPTIONAL MATCH (p:Project)
+    WITH pending, verified, rejected, total_candidates, total_sources, count(p) AS total_projects
+    RETURN pending, verified, rejected, total_candidates, total_sources, total_projects
+"""
+
+# Graph visualization export. Properties are projected server-side so large
+# vector properties (embeddings) never leave FalkorDB; ``$include`` (optional
+# whitelist) narrows the projection further. Paged variants seek by internal
+# node id (``id(n) > $after``) so each page is a bounded read; relationship
+# pages take the next ``$limit`` source nodes and all of their outgoing edges
+# (an edge-id cursor would rescan every earlier edge on each page).
+GRAPH_EXPORT_EXCLUDED_PROPERTIES = ["embedding"]
+
+_NODE_PROJECTION = """
+    RETURN id(n) AS id, labels(n) AS labels,
+           [k IN keys(n) WHERE NOT k IN $exclude AND ($include IS NULL OR k IN $include) | [k, n[k]]] AS properties
+"""
+
+_RELATIONSHIP_PROJECTION = """
+    RETURN id(r) AS id, type(r) AS type, id(a) AS source, id(b) AS target,
+           [k IN keys(r) WHERE NOT k IN $exclude AND ($include IS NULL OR k IN $include) | [k, r[k]]] AS properties
+"""
+
+# Fallback for FalkorDB builds without dynamic property access (``n[k]``):
+# full property maps, projected client-side.
+_NODE_PROJECTION_LEGACY = """
+    RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties
+"""
+
+_RELATIONSHIP_PROJECTION_LEGACY = """
+    RETURN id(r) AS id, type(r) AS type, id(a) AS source, id(b) AS target, properties(r) AS properties
+"""
+
+_GRAPH_NODES_QUERY = "MATCH (n)" + _NODE_PROJECTION
+
+_GRAPH_RELATIONSHIPS_QUERY = "MATCH (a)-[r]->(b)" + _RELATIONSHIP_PROJECTION
+
+_GRAPH_NODES_PAGE_QUERY = (
+    "MATCH (n) WHERE id(n) > $after" + _NODE_PROJECTION + "ORDER BY id LIMIT $limit"
+)
+
+_RELATIONSHIPS_BY_SOURCE_PAGE = """
+    MATCH (a) WHERE id(a) > $after
+    WITH a ORDER BY id(a) LIMIT $limit
+    OPTIONAL MATCH (a)-[r]->(b)
+"""
+
+_GRAPH_RELATIONSHIPS_PAGE_QUERY = (
+    _RELATIONSHIPS_BY_SOURCE_PAGE + _RELATIONSHIP_PROJECTION + "ORDER BY source, id"
+)
+
+_GRAPH_EXPORT_LEGACY_QUERIES = {
+    _GRAPH_NODES_QUERY: "MATCH (n)" + _NODE_PROJECTION_LEGACY,
+    _GRAPH_RELATIONSHIPS_QUERY: "MATCH (a)-[r]->(b)" + _RELATIONSHIP_PROJECTION_LEGACY,
+    _GRAPH_NODES_PAGE_QUERY: (
+        "MATCH (n) WHERE id(n) > $after" + _NODE_PROJECTION_LEGACY + "ORDER BY id LIMIT $limit"
+    ),
+    _GRAPH_RELATIONSHIPS_PAGE_QUERY: (
+        _RELATIONSHIPS_BY_SOURCE_PAGE + _RELATIONSHIP_PROJECTION_LEGACY + "ORDER BY source, id"
+    ),
+}
+
+# Level-of-detail view: one cluster per primary label, edges aggregated by
+# (source label, type, target label).
+_GRAPH_LABEL_CLUSTERS_QUERY = """
+    MATCH (n)
+    RETURN labels(n)[0] AS label, count(n) AS count
+    ORDER BY count DESC
+"""
+
+_GRAPH_CLUSTER_EDGES_QUERY = """
+    MATCH (a)-[r]->(b)
+    RETURN labels(a)[0] AS source, type(r) AS type, labels(b)[0] AS target, count(r) AS count
+    ORDER BY count DESC
+"""
+
+
+def _graph_export_params(properties: Optional[list[str]] = None) -> dict:
+    return {"exclude": GRAPH_EXPORT_EXCLUDED_PROPERTIES, "include": list(properties) if properties else None}
+
+
+def _query_graph_export(graph, query: str, params: dict):
+    """Run a projected export query, falling back to full property maps
+    when the server rejects dynamic property access."""
+    try:
+        return graph.query(query, params)
+    except ResponseError:
+        legacy = _GRAPH_EXPORT_LEGACY_QUERIES.get(query)
+        if legacy is None:
+            raise
+        return graph.query(legacy, params)
+
+
+def _projected_properties(value, include: Optional[list[str]] = None) -> dict:
+    """Projected ``[[key, value], ...]`` pairs (or a plain map) as a dict."""
+    if isinstance(value, dict):
+        props = dict(value)
+    elif isinstance(value, list):
+        props = {pair[0]: pair[1] for pair in value if isinstance(pair, (list, tuple)) and len(pair) == 2}
+    else:
+        return {}
+    for key in GRAPH_EXPORT_EXCLUDED_PROPERTIES:
+        props.pop(key, None)
+    if include:
+        props = {k: v for k, v in props.items() if k in include}
+    return props
+
+
+def _node_payload(record: dict, include: Optional[list[str]] = None) -> dict:
+    node_props = _projected_properties(record.get("properties"), include)
+    name = node_props.get("name") or node_props.get("title") or node_props.get("id") or f"Node {record.get('id', '?')}"
+    return {
+        "id": str(record.get("id", "")),
+        "label": record["labels"][0] if record.get("labels") else "Node",
+        "name": str(name),
+        "properties": node_props
+    }
+
+
+def _relationship_payload(record: dict, include: Optional[list[str]] = None) -> dict:
+    return {
+        "id": str(record.get("id", "")),
+        "type": record.get("type", ""),
+        "source": str(record.get("source", "")),
+        "target": str(record.get("target", "")),
+        "properties": _projected_properties(record.get("properties"), include)
+    }
+
+
+def _graph_data_payload(node_records, rel_records, include: Optional[list[str]] = None) -> dict:
+    """Shape raw node/relationship rows (any iterable of dicts) for the graph visualization."""
+    return {
+        "nodes": [_node_payload(r, include) for r in node_records],
+        "relationships": [_relationship_payload(r, include) for r in rel_records],
+    }
+
+
+def _graph_clusters_payload(label_records, edge_records) -> dict:
+    """Label-aggregated clusters for the zoomed-out graph view."""
+    nodes = []
+    for record in label_records:
+        label = record.get("label") or "Node"
+        nodes.append({
+            "id": f"cluster:{label}",
+            "label": label,
+            "name": label,
+            "count": record.get("count", 0),
+            "properties": {"count": record.get("count", 0)},
+        })
+    relationships = []
+    for record in edge_records:
+        source = record.get("source") or "Node"
+        target = record.get("target") or "Node"
+        rel_type = record.get("type", "")
+        relationships.append({
+            "id": f"cluster:{source}-{rel_type}->{target}",
+            "type": rel_type,
+            "source": f"cluster:{source}",
+            "target": f"cluster:{target}",
+            "count": record.get("count", 0),
+            "properties": {"count": record.get("count", 0)},
+        })
+    return {"lod": "clusters", "nodes": nodes, "relationships": relationships}
+
+
+_EMPTY_KNOWLEDGE_STATS = {
+    "pending": 0, "verified": 0, "rejected": 0,
+    "total_candidates": 0, "total_sources": 0, "total_projects": 0
+}
+
+_CORROSION_CLASS_RANK = {"C3": 3, "C4": 4, "C5": 5, "C5.1": 5.1}
+
+
+def _select_variant_weight(record: Optional[dict], variant_name: str, housing_length: int = None):
+    """Pick the weight for a ProductVariant record (see get_variant_weight)."""
+    if not record:
+        return None
+    r = dict(record)
+    # v4.1: Check dual weights FIRST (more precise than legacy weight_kg)
+    # Legacy weight_kg is always the short weight and was set before
+    # dual-weight support was added. Dual weights take priority.
+    if r.get("weight_kg_short") is not None and r.get("weight_kg_long") is not None:
+        if housing_length and r.get("housing_length_long_mm"):
+            threshold = (r["housing_length_short_mm"] or 0) + (r["housing_length_long_mm"] or 0)
+            if threshold > 0:
+                midpoint = threshold / 2
+                selected = r["weight_kg_long"] if housing_length >= midpoint else r["weight_kg_short"]
+                print(f"⚖️ [WEIGHT] {variant_name}: len={housing_length} midpoint={midpoint} → {'long' if housing_length >= midpoint else 'short'}={selected}kg")
+                return selected
+        # No housing_length provided: return short weight as safe default
+        return r["weight_kg_short"]
+    # Single-weight product (e.g., GDP) — no dual-weight data available
+    if r.get("weight_kg") is not None:
+        return r["weight_kg"]
+    return None
+
+
+def _filter_by_corrosion_class(materials, min_corrosion_class: str) -> list:
+    """Keep materials meeting the minimum corrosion class (C3 < C4 < C5 < C5.1)."""
+    min_rank = _CORROSION_CLASS_RANK.get(min_corrosion_class, 5)
+    return [
+        m for m in materials
+        if _CORROSION_CLASS_RANK.get(m.get("corrosion_class", ""), 0) >= min_rank
+    ]
+
+
 class GraphConnection:
     def __init__(self):
         self.host = os.getenv("FALKORDB_HOST", "localhost")
@@ -93,41 +735,190 @@ class GraphConnection:
         self.username = os.getenv("FALKORDB_USERNAME", None)
         self.password = os.getenv("FALKORDB_PASSWORD", None)
         self.graph_name = os.getenv("FALKORDB_GRAPH", "hvac")
+        self.pool_min = int(os.getenv("FALKORDB_POOL_MIN", 2))
+        self.pool_max = int(os.getenv("FALKORDB_POOL_MAX", 16))
+        self.pool_timeout = float(os.getenv("FALKORDB_POOL_TIMEOUT", 30))
+        self.pool_health_check_interval = float(os.getenv("FALKORDB_POOL_HEALTH_CHECK_INTERVAL", 30))
         self._db = None
+        # Explicitly assigned graph handle (tests, one-off scripts). When set,
+        # it bypasses the pool entirely — same behaviour as before pooling.
         self.graph = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # In-memory catalog snapshot (enabled by warmup / load_catalog_snapshot)
+        self._catalog: Optional[CatalogSnapshot] = None
+        self._catalog_lock = threading.Lock()
+        self._catalog_checked_at = 0.0
+        self.catalog_check_interval = float(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", 5))
+
+    def _open_client(self):
+        """Open a dedicated FalkorDB client and select the graph (pool factory)."""
+        kwargs = {
+            "host": self.host,
+            "port": self.port,
+            "socket_timeout": 15,
+            "socket_connect_timeout": 10,
+        }
+        if self.username:
+            kwargs["username"] = self.username
+        if self.password:
+            kwargs["password"] = self.password
+        client = FalkorDB(**kwargs)
+        return client, client.select_graph(self.graph_name)
+
+    def _get_pool(self) -> GraphConnectionPool:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = GraphConnectionPool(
+                        self._open_client,
+                        min_size=self.pool_min,
+                        max_size=self.pool_max,
+                        timeout=self.pool_timeout,
+                        health_check_interval=self.pool_health_check_interval,
+                    )
+        return self._pool
 
     def connect(self):
-        if not self.graph:
-            kwargs = {
-                "host": self.host,
-                "port": self.port,
-                "socket_timeout": 15,
-                "socket_connect_timeout": 10,
-            }
-            if self.username:
-                kwargs["username"] = self.username
-            if self.password:
-                kwargs["password"] = self.password
-            self._db = FalkorDB(**kwargs)
-            self.graph = self._db.select_graph(self.graph_name)
-        return self.graph
+        """Return a graph handle.
+
+        Inside ``_execute_with_retry`` this is the connection leased by the
+        current thread; elsewhere a PooledGraph that borrows a pooled
+        connection per query.
+        """
+        if self.graph is not None:
+            return self.graph
+        pool = self._get_pool()
+        leased = pool.current()
+        if leased is not None:
+            return leased
+        return PooledGraph(pool)
+
+    @contextmanager
+    def _lease(self):
+        """Hold one pooled connection for the duration of the block."""
+        if self.graph is not None:
+            yield self.graph
+            return
+        with self._get_pool().connection() as graph:
+            yield graph
+
+    def pool_stats(self) -> dict:
+        """Connection pool utilization and checkout wait-time stats."""
+        if self._pool is None:
+            return {"enabled": self.graph is None, "size": 0, "in_use": 0, "checkouts": 0}
+        return {"enabled": True, **self._pool.stats()}
+
+    def query_stats(self) -> dict:
+        """Per-method call counts, latency, rows, payload bytes and retries."""
+        return query_metrics.stats()
+
+    def cache_stats(self) -> dict:
+        """Query cache hit/miss/eviction counters and occupancy."""
+        return _query_cache.stats()
+
+    def invalidate_cache(self, *namespaces: str) -> int:
+        """Drop cached reads (all namespaces when none given)."""
+        return _query_cache.invalidate(*namespaces)
+
+    # =========================================================================
+    # CATALOG SNAPSHOT + GRAPH VERSION
+    # =========================================================================
+
+    def get_graph_version(self) -> int:
+        """Current catalog version counter (see graph_version.py)."""
+        def _query():
+            return read_graph_version(self.connect())
+        return self._execute_with_retry(_query)
+
+    @_invalidates_cache()
+    def bump_graph_version(self, source: str = "") -> int:
+        """Mark catalog data as changed; snapshots and cached reads reload."""
+        def _query():
+            return bump_graph_version(self.connect(), source=source)
+        version = self._execute_with_retry(_query)
+        self._catalog_checked_at = 0.0
+        return version
+
+    def _mark_catalog_changed(self, source: str):
+        """Bump the graph version after a catalog write; the snapshot is re-checked on next use."""
+        try:
+            self._execute_with_retry(lambda: bump_graph_version(self.connect(), source=source))
+        except Exception as e:
+            print(f"⚠️ Graph version bump after {source} failed: {e}")
+        self._catalog_checked_at = 0.0
+
+    def load_catalog_snapshot(self) -> CatalogSnapshot:
+        """(Re)load the catalog snapshot and swap it in atomically."""
+        def _query():
+            graph = self.connect()
+            return CatalogSnapshot.load(graph, version=read_graph_version(graph))
+        snapshot = self._execute_with_retry(_query)
+        self._catalog = snapshot
+        self._catalog_checked_at = time.monotonic()
+        return snapshot
+
+    def catalog_snapshot(self) -> Optional[CatalogSnapshot]:
+        """Return the current catalog snapshot, or None when not enabled.
+
+        At most every ``catalog_check_interval`` seconds one caller compares
+        the graph version counter and reloads on change; concurrent callers
+        keep using the previous snapshot meanwhile.
+        """
+        snapshot = self._catalog
+        if snapshot is None:
+            return None
+        if time.monotonic() - self._catalog_checked_at < self.catalog_check_interval:
+            return snapshot
+        if not self._catalog_lock.acquire(blocking=False):
+            return snapshot
+        try:
+            if time.monotonic() - self._catalog_checked_at >= self.catalog_check_interval:
+                self._catalog_checked_at = time.monotonic()
+                version = self.get_graph_version()
+                if version != snapshot.version:
+                    snapshot = self.load_catalog_snapshot()
+                    print(f"✓ Catalog snapshot reloaded (graph version {version})")
+        except Exception as e:
+            print(f"Warning: Catalog snapshot refresh failed: {e}")
+        finally:
+            self._catalog_lock.release()
+        return self._catalog
+
+    def catalog_stats(self) -> dict:
+        """Catalog snapshot version and index sizes."""
+        snapshot = self._catalog
+        if snapshot is None:
+            return {"enabled": False}
+        return {"enabled": True, **snapshot.stats()}
 
     def warmup(self):
         """Pre-connect and warm up connection. Call on server start."""
         import time
         t = time.time()
-        graph = self.connect()
         try:
+            if self.graph is None:
+                self._get_pool().fill()
+            graph = self.connect()
             graph.query("RETURN 1")
             elapsed = time.time() - t
-            print(f"✓ FalkorDB connection warmed up in {elapsed:.2f}s")
+            print(f"✓ FalkorDB connection pool warmed up in {elapsed:.2f}s ({self.pool_min}-{self.pool_max} connections)")
             self.get_all_applications()
             print("✓ Applications cache loaded")
+            snapshot = self.load_catalog_snapshot()
+            print(f"✓ Catalog snapshot loaded in {snapshot.load_ms:.0f}ms (graph version {snapshot.version})")
         except Exception as e:
             print(f"⚠ FalkorDB warmup failed: {e}")
 
     def reconnect(self):
-        """Force reconnection by resetting graph reference."""
+        """Replace the current thread's pooled connection.
+
+        Only the connection leased by the calling thread is rebuilt — other
+        workers keep their sockets. Falls back to resetting the explicitly
+        assigned graph handle when pooling is bypassed.
+        """
+        if self._pool is not None and self._pool.current() is not None:
+            return self._pool.reconnect()
         self._db = None
         self.graph = None
         return self.connect()
@@ -135,32 +926,100 @@ class GraphConnection:
     def close(self):
         self._db = None
         self.graph = None
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
 
     def _execute_with_retry(self, query_func, max_retries=2):
-        """Execute a query function with automatic retry on connection failure."""
-        last_error = None
-        for attempt in range(max_retries + 1):
-            try:
-                return query_func()
-            except (RedisConnectionError, RedisTimeoutError) as e:
-                last_error = e
-                if attempt < max_retries:
-                    # Connection is stale, reconnect and retry
-                    self.reconnect()
-                else:
-                    raise
-            except Exception as e:
-                # Check if it's a connection-related error by message
-                error_msg = str(e).lower()
-                if "defunct" in error_msg or "connection" in error_msg:
-                    last_error = e
-                    if attempt < max_retries:
-                        self.reconnect()
-                    else:
-                        raise
+        """Execute a query function with automatic retry on connection failure.
+
+        The whole call (including retries) runs on one leased pool connection,
+        so ``self.connect()`` inside ``query_func`` returns that connection and
+        ``reconnect()`` only replaces it. Latency, rows, payload size and
+        retries are recorded per calling method in ``db_metrics``.
+        """
+        method = method_name_of(query_func)
+        retries = 0
+        t0 = time.perf_counter()
+        try:
+            with self._lease():
+                last_error = None
+                for attempt in range(max_retries + 1):
+                    try:
+                        result = query_func()
+                        break
+                    except (RedisConnectionError, RedisTimeoutError) as e:
+                        last_error = e
+                        if attempt < max_retries:
+                            # Connection is stale, reconnect and retry
+                            retries += 1
+                            self.reconnect()
+                        else:
+                            raise
+                    except Exception as e:
+                        # Check if it's a connection-related error by message
+                        error_msg = str(e).lower()
+                        if "defunct" in error_msg or "connection" in error_msg:
+                            last_error = e
+                            if attempt < max_retries:
+                                retries += 1
+                                self.reconnect()
+                            else:
+                                raise
+                        else:
+                            raise
                 else:
-                    raise
-        raise last_error
+                    raise last_error
+        except Exception:
+            query_metrics.record(method, time.perf_counter() - t0, retries=retries, error=True)
+            raise
+        query_metrics.record(
+            method, time.perf_counter() - t0,
+            rows=count_rows(result), payload_bytes=query_metrics.payload_bytes(method, result), retries=retries,
+        )
+        return result
+
+    def query_many(self, queries: list, read_only: bool = True) -> list:
+        """Run several independent Cypher queries in one network round trip.
+
+        The queries are sent as GRAPH.RO_QUERY commands (GRAPH.QUERY when
+        ``read_only=False``) over a single non-transactional Redis pipeline.
+
+        Args:
+            queries: Cypher strings or ``(cypher, params)`` tuples
+            read_only: Use GRAPH.RO_QUERY (default) so a stray write fails fast
+
+        Returns:
+            List of QueryResult objects in the same order as ``queries``
+        """
+        normalized = [
+            (q, None) if isinstance(q, str) else (q[0], q[1] if len(q) > 1 else None)
+            for q in queries
+        ]
+        if not normalized:
+            return []
+
+        def _query():
+            graph = self.connect()
+            if not isinstance(graph, Graph):
+                # Explicitly assigned handle (tests, scripts) — no pipeline
+                return [graph.query(q, params) for q, params in normalized]
+            pipe = graph.client.connection.pipeline(transaction=False)
+            command = "GRAPH.RO_QUERY" if read_only else "GRAPH.QUERY"
+            for q, params in normalized:
+                pipe.execute_command(
+                    command, graph.name, graph._build_params_header(params) + q, "--compact"
+                )
+            responses = pipe.execute(raise_on_error=False)
+            results = []
+            for response in responses:
+                if isinstance(response, Exception):
+                    raise response
+                results.append(QueryResult(graph, response))
+            return results
+
+        return self._execute_with_retry(_query)
 
     def verify_connection(self):
         """Verify the connection and return database info"""
@@ -186,6 +1045,7 @@ class GraphConnection:
             return result_value(result, "count")
         return self._execute_with_retry(_query)
 
+    @_invalidates_cache(catalog=True)
     def clear_graph(self):
         """Delete all nodes and relationships from the database"""
         def _query():
@@ -194,49 +1054,89 @@ class GraphConnection:
             return True
         return self._execute_with_retry(_query)
 
-    def get_graph_data(self):
-        """Get all nodes and relationships for visualization"""
+    def get_graph_data(self, properties: Optional[list[str]] = None):
+        """Get all nodes and relationships for visualization.
+
+        Args:
+            properties: Optional whitelist of property keys to return
+                (embeddings are always excluded server-side)
+        """
+        params = _graph_export_params(properties)
+
         def _query():
             graph = self.connect()
-            # Get all nodes
-            nodes_result = graph.query("""
-                MATCH (n)
-                RETURN id(n) AS id, labels(n) AS labels, properties(n) AS properties
-            """)
-            nodes = []
-            for record in result_to_dicts(nodes_result):
-                node_props = record.get("properties", {})
-                if isinstance(node_props, dict):
-                    node_props = dict(node_props)
-                else:
-                    node_props = {}
-                # Exclude embedding vectors from visualization (they're huge)
-                node_props.pop("embedding", None)
-                name = node_props.get("name") or node_props.get("title") or node_props.get("id") or f"Node {record.get('id', '?')}"
-                nodes.append({
-                    "id": str(record.get("id", "")),
-                    "label": record["labels"][0] if record.get("labels") else "Node",
-                    "name": str(name),
-                    "properties": node_props
-                })
+            nodes_result = _query_graph_export(graph, _GRAPH_NODES_QUERY, params)
+            rels_result = _query_graph_export(graph, _GRAPH_RELATIONSHIPS_QUERY, params)
+            return _graph_data_payload(iter_dicts(nodes_result), iter_dicts(rels_result), properties)
+        return self._execute_with_retry(_query)
 
-            # Get all relationships
-            rels_result = graph.query("""
-                MATCH (a)-[r]->(b)
-                RETURN id(r) AS id, type(r) AS type, id(a) AS source, id(b) AS target, properties(r) AS properties
-            """)
-            relationships = []
-            for record in result_to_dicts(rels_result):
-                rel_props = record.get("properties", {})
-                relationships.append({
-                    "id": str(record.get("id", "")),
-                    "type": record.get("type", ""),
-                    "source": str(record.get("source", "")),
-                    "target": str(record.get("target", "")),
-                    "properties": dict(rel_props) if isinstance(rel_props, dict) else {}
-                })
+    def get_graph_data_page(self, kind: str = "nodes", after: int = -1, limit: int = 1000,
+                            properties: Optional[list[str]] = None) -> dict:
+        """One page of the graph export, ordered by internal node id.
+
+        Node pages hold up to ``limit`` nodes. Relationship pages hold the
+        outgoing edges of the next ``limit`` source nodes, so both kinds use
+        a node-id cursor and each page is a bounded seek.
 
-            return {"nodes": nodes, "relationships": relationships}
+        Args:
+            kind: "nodes" or "relationships"
+            after: Internal node id cursor; only nodes (or edges whose source
+                node) with a larger id are returned
+            limit: Nodes (or source nodes) per page
+            properties: Optional property whitelist (see get_graph_data)
+
+        Returns:
+            Dict with "items" (node/relationship payloads) and "next_after"
+            (cursor for the next page, or None when exhausted)
+        """
+        if kind not in ("nodes", "relationships"):
+            raise ValueError(f"Unknown graph export kind: {kind}")
+        nodes = kind == "nodes"
+        query = _GRAPH_NODES_PAGE_QUERY if nodes else _GRAPH_RELATIONSHIPS_PAGE_QUERY
+        shape = _node_payload if nodes else _relationship_payload
+        cursor_key = "id" if nodes else "source"
+        params = {**_graph_export_params(properties), "after": after, "limit": limit}
+
+        def _query():
+            graph = self.connect()
+            result = _query_graph_export(graph, query, params)
+            items = []
+            last_id = None
+            scanned = 0
+            for record in iter_dicts(result):
+                if record.get(cursor_key) != last_id:
+                    last_id = record.get(cursor_key)
+                    scanned += 1
+                if record.get("id") is None:
+                    continue  # source node without outgoing edges
+                items.append(shape(record, properties))
+            next_after = last_id if scanned >= limit else None
+            return {"items": items, "next_after": next_after}
+        return self._execute_with_retry(_query)
+
+    def iter_graph_data(self, page_size: int = 1000, properties: Optional[list[str]] = None):
+        """Yield ``(kind, item)`` for every node, then every relationship.
+
+        Pages through the graph with get_graph_data_page so at most one page
+        is held in memory (used by the NDJSON export).
+        """
+        for kind in ("nodes", "relationships"):
+            after = -1
+            while True:
+                page = self.get_graph_data_page(kind, after=after, limit=page_size, properties=properties)
+                for item in page["items"]:
+                    yield kind, item
+                if page["next_after"] is None:
+                    break
+                after = page["next_after"]
+
+    def get_graph_clusters(self) -> dict:
+        """Level-of-detail graph view: nodes aggregated by label, edges by label pair and type."""
+        def _query():
+            graph = self.connect()
+            labels_result = graph.query(_GRAPH_LABEL_CLUSTERS_QUERY)
+            edges_result = graph.query(_GRAPH_CLUSTER_EDGES_QUERY)
+            return _graph_clusters_payload(iter_dicts(labels_result), iter_dicts(edges_result))
         return self._execute_with_retry(_query)
 
     def fetch_graph_neighborhood(self, node_id: str, depth: int = 1, max_nodes: int = 50) -> dict:
@@ -291,7 +1191,7 @@ class GraphConnection:
             node_ids = {center_record["id"]}
 
             neighbor_count = 0
-            for record in result_to_dicts(neighbor_result):
+            for record in iter_dicts(neighbor_result):
                 neighbor_count += 1
                 node_props = record.get("properties", {})
                 if isinstance(node_props, dict):
@@ -325,7 +1225,7 @@ class GraphConnection:
                 """, params={"node_ids": node_id_list})
 
                 relationships = []
-                for record in result_to_dicts(rels_result):
+                for record in iter_dicts(rels_result):
                     rel_props = record.get("properties", {})
                     relationships.append({
                         "id": str(record.get("id", "")),
@@ -383,6 +1283,9 @@ class GraphConnection:
         return self._execute_with_retry(_query)
 
     # Generic Node/Relationship Creation
+    # Per-row ingest writes: the ingestors call bump_graph_version() once per
+    # batch, which drops cached reads, notifies write listeners and reloads
+    # the catalog snapshot, so these methods do none of that per row.
     def create_node(self, label: str, properties: dict) -> dict:
         """Create or merge a node with given label and properties.
 
@@ -576,15 +1479,7 @@ class GraphConnection:
         """Get all projects with observation counts and related concepts."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (p:Project)
-                OPTIONAL MATCH (p)-[:HAS_OBSERVATION]->(o:Observation)
-                OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
-                WITH p, count(DISTINCT o) AS observations_count, collect(DISTINCT c.name) AS concepts
-                RETURN p.name AS name, p.customer AS customer, p.date AS date,
-                       p.summary AS summary, observations_count, concepts
-                ORDER BY p.name
-            """)
+            result = graph.query(_PROJECTS_WITH_DETAILS_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -592,15 +1487,7 @@ class GraphConnection:
         """Get all concepts with related observation and action counts."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (c:Concept)
-                OPTIONAL MATCH (o:Observation)-[:RELATES_TO]->(c)
-                OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
-                WITH c, count(DISTINCT o) AS observations_count, count(DISTINCT a) AS actions_count
-                RETURN c.name AS name, c.description AS description,
-                       observations_count, actions_count
-                ORDER BY c.name
-            """)
+            result = graph.query(_CONCEPTS_WITH_DETAILS_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -608,17 +1495,7 @@ class GraphConnection:
         """Get all observations with project, concepts, and actions."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (o:Observation)
-                OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
-                OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
-                OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
-                WITH o, p.name AS project, collect(DISTINCT c.name) AS concepts,
-                     collect(DISTINCT a.description) AS actions
-                RETURN o.description AS description, o.context AS context,
-                       project, concepts, actions
-                ORDER BY project, o.description
-            """)
+            result = graph.query(_OBSERVATIONS_WITH_DETAILS_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -626,16 +1503,7 @@ class GraphConnection:
         """Get all actions with related observations and outcomes."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (a:Action)
-                OPTIONAL MATCH (o:Observation)-[:LED_TO]->(a)
-                OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
-                WITH a, count(DISTINCT o) AS observations_count,
-                     collect(DISTINCT p.name) AS projects
-                RETURN a.description AS description, a.outcome AS outcome,
-                       observations_count, projects
-                ORDER BY a.description
-            """)
+            result = graph.query(_ACTIONS_WITH_DETAILS_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -643,17 +1511,7 @@ class GraphConnection:
         """Get all competitor products with their equivalent products."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (cp:CompetitorProduct)
-                OPTIONAL MATCH (cp)-[:EQUIVALENT_TO]->(p:Product)
-                WITH cp, collect({
-                    sku: p.sku,
-                    name: p.name,
-                    price: p.price
-                }) AS equivalents
-                RETURN cp.name AS name, cp.manufacturer AS manufacturer, equivalents
-                ORDER BY cp.manufacturer, cp.name
-            """)
+            result = graph.query(_COMPETITORS_WITH_DETAILS_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -661,22 +1519,7 @@ class GraphConnection:
         """Get full project details with all related data."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (p:Project {name: $name})
-                OPTIONAL MATCH (p)-[:HAS_OBSERVATION]->(o:Observation)
-                OPTIONAL MATCH (o)-[:RELATES_TO]->(c:Concept)
-                OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
-                WITH p, o, collect(DISTINCT c.name) AS obs_concepts,
-                     collect(DISTINCT {description: a.description, outcome: a.outcome}) AS obs_actions
-                WITH p, collect({
-                    description: o.description,
-                    context: o.context,
-                    concepts: obs_concepts,
-                    actions: obs_actions
-                }) AS observations
-                RETURN p.name AS name, p.customer AS customer, p.date AS date,
-                       p.summary AS summary, observations
-            """, params={"name": project_name})
+            result = graph.query(_PROJECT_DETAILS_QUERY, params={"name": project_name})
             return result_single(result)
         return self._execute_with_retry(_query)
 
@@ -684,18 +1527,7 @@ class GraphConnection:
         """Get full concept details with related observations and actions."""
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (c:Concept {name: $name})
-                OPTIONAL MATCH (o:Observation)-[:RELATES_TO]->(c)
-                OPTIONAL MATCH (o)-[:LED_TO]->(a:Action)
-                OPTIONAL MATCH (p:Project)-[:HAS_OBSERVATION]->(o)
-                WITH c, collect(DISTINCT {
-                    description: o.description,
-                    project: p.name,
-                    actions: collect(DISTINCT a.description)
-                }) AS observations
-                RETURN c.name AS name, c.description AS description, observations
-            """, params={"name": concept_name})
+            result = graph.query(_CONCEPT_DETAILS_QUERY, params={"name": concept_name})
             return result_single(result)
         return self._execute_with_retry(_query)
 
@@ -969,6 +1801,7 @@ class GraphConnection:
         return self._execute_with_retry(_query)
 
 
+    @_invalidates_cache()
     def delete_project(self, project_name: str) -> dict:
         """Delete a project and ALL its related data from the graph.
 
@@ -1057,34 +1890,7 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (p:Project)
-                OPTIONAL MATCH (e:Event)-[:PART_OF]->(p)
-                OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
-                OPTIONAL MATCH (e)-[:REPORTED]->(obs:Observation)
-                OPTIONAL MATCH (e)-[:PROPOSED]->(act:Action)
-                OPTIONAL MATCH (obs)-[:RELATES_TO]->(c1:Concept)
-                OPTIONAL MATCH (act)-[:RELATES_TO]->(c2:Concept)
-
-                WITH p,
-                     count(DISTINCT e) AS event_count,
-                     count(DISTINCT obs) AS observation_count,
-                     count(DISTINCT act) AS action_count,
-                     collect(DISTINCT person.name) AS participants,
-                     collect(DISTINCT e.date) AS dates,
-                     collect(DISTINCT c1.name) + collect(DISTINCT c2.name) AS all_concepts
-
-                RETURN p.name AS name,
-                       p.customer AS customer,
-                       p.summary AS summary,
-                       event_count,
-                       observation_count,
-                       action_count,
-                       participants,
-                       [d IN dates WHERE d IS NOT NULL | d] AS dates,
-                       [c IN all_concepts WHERE c IS NOT NULL][0..5] AS key_concepts
-                ORDER BY p.name
-            """)
+            result = graph.query(_THREADS_SUMMARY_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -1251,6 +2057,7 @@ class GraphConnection:
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
+    @_invalidates_cache()
     def verify_knowledge_candidate(
         self,
         candidate_id: str,
@@ -1339,32 +2146,7 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (vs:VerifiedSource)
-                OPTIONAL MATCH (kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs)
-                OPTIONAL MATCH (e:Event)-[:SUGGESTS]->(kc)
-                OPTIONAL MATCH (e)-[:PART_OF]->(p:Project)
-                OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
-                OPTIONAL MATCH (vs)-[alias:ALIASED_AS]->()
-
-                WITH vs,
-                     count(DISTINCT p) AS project_count,
-                     count(DISTINCT kc) AS mention_count,
-                     collect(DISTINCT p.name) AS projects,
-                     collect(DISTINCT person.name) AS experts,
-                     collect(DISTINCT alias.pattern) AS aliases
-
-                RETURN id(vs) AS id,
-                       vs.name AS name,
-                       vs.type AS type,
-                       vs.description AS description,
-                       project_count,
-                       mention_count,
-                       projects[0..5] AS recent_projects,
-                       experts[0..3] AS top_experts,
-                       aliases AS known_aliases
-                ORDER BY mention_count DESC
-            """)
+            result = graph.query(_VERIFIED_SOURCES_LIBRARY_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -1379,32 +2161,7 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (vs:VerifiedSource)
-                WHERE id(vs) = $source_id
-                OPTIONAL MATCH (kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs)
-                OPTIONAL MATCH (e:Event)-[:SUGGESTS]->(kc)
-                OPTIONAL MATCH (e)-[:PART_OF]->(p:Project)
-                OPTIONAL MATCH (e)-[:SENT_BY]->(person:Person)
-
-                WITH vs, kc, e, p, person
-                ORDER BY e.date DESC
-
-                WITH vs,
-                     collect(DISTINCT {
-                         project: p.name,
-                         event_date: e.date,
-                         sender: person.name,
-                         citation: kc.citation,
-                         context: kc.context
-                     }) AS mentions
-
-                RETURN id(vs) AS id,
-                       vs.name AS name,
-                       vs.type AS type,
-                       vs.description AS description,
-                       mentions
-            """, params={"source_id": source_id})
+            result = graph.query(_VERIFIED_SOURCE_DETAILS_QUERY, params={"source_id": source_id})
             return result_single(result)
         return self._execute_with_retry(_query)
 
@@ -1436,6 +2193,7 @@ class GraphConnection:
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
+    @_invalidates_cache()
     def delete_knowledge_candidate(self, candidate_id: str) -> bool:
         """Delete a KnowledgeCandidate node.
 
@@ -1463,18 +2221,7 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (p:Person)<-[:SENT_BY]-(e:Event)-[:SUGGESTS]->(kc:KnowledgeCandidate)-[:RESOLVED_TO]->(vs:VerifiedSource)
-                WITH p, vs, count(DISTINCT e) AS usage_count
-                ORDER BY usage_count DESC
-                WITH p, collect({source: vs.name, type: vs.type, usage_count: usage_count}) AS sources
-                RETURN p.name AS expert_name,
-                       p.email AS expert_email,
-                       size(sources) AS source_count,
-                       sources[0..5] AS top_sources
-                ORDER BY source_count DESC
-                LIMIT 20
-            """)
+            result = graph.query(_EXPERT_KNOWLEDGE_MAP_QUERY)
             return result_to_dicts(result)
         return self._execute_with_retry(_query)
 
@@ -1486,23 +2233,9 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (kc:KnowledgeCandidate)
-                WITH count(CASE WHEN kc.status = 'pending' THEN 1 END) AS pending,
-                     count(CASE WHEN kc.status = 'verified' THEN 1 END) AS verified,
-                     count(CASE WHEN kc.status = 'rejected' THEN 1 END) AS rejected,
-                     count(kc) AS total_candidates
-                OPTIONAL MATCH (vs:VerifiedSource)
-                WITH pending, verified, rejected, total_candidates, count(vs) AS total_sources
-                OPTIONAL MATCH (p:Project)
-                WITH pending, verified, rejected, total_candidates, total_sources, count(p) AS total_projects
-                RETURN pending, verified, rejected, total_candidates, total_sources, total_projects
-            """)
+            result = graph.query(_KNOWLEDGE_STATS_QUERY)
             record = result_single(result)
-            return dict(record) if record else {
-                "pending": 0, "verified": 0, "rejected": 0,
-                "total_candidates": 0, "total_sources": 0, "total_projects": 0
-            }
+            return dict(record) if record else dict(_EMPTY_KNOWLEDGE_STATS)
         return self._execute_with_retry(_query)
 
     # ========================================
@@ -1919,7 +2652,7 @@ class GraphConnection:
                     LIMIT 10
                 """, params={"term": search_term})
             results = []
-            for record in result_to_dicts(result):
+            for record in iter_dicts(result):
                 record["categories"] = [c for c in record.get("categories", []) if c.get("type")]
                 results.append(record)
             return results
@@ -2202,6 +2935,7 @@ class GraphConnection:
             print(f"Warning: Could not create learned rules index: {e}")
             return False
 
+    @_invalidates_cache()
     def save_learned_rule(self, trigger_text: str, rule_text: str,
                           embedding: list[float], context: str = None,
                           confirmed_by: str = "expert") -> dict:
@@ -2356,6 +3090,7 @@ class GraphConnection:
 
         return self._execute_with_retry(_query)
 
+    @_invalidates_cache()
     def delete_learned_rule(self, trigger: str, rule: str) -> bool:
         """Delete a specific learned rule."""
         def _query():
@@ -2400,30 +3135,17 @@ class GraphConnection:
         Note: Results are cached for 5 minutes to reduce query overhead.
         """
         # Check cache first
-        cached = _get_cached("all_applications")
+        cached = _get_cached("applications")
         if cached is not None:
             return cached
 
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (app:Application)
-                OPTIONAL MATCH (app)-[:HAS_RISK]->(risk:Risk)
-                OPTIONAL MATCH (app)-[:REQUIRES_RESISTANCE]->(req:Requirement)
-                WITH app,
-                     collect(DISTINCT {id: risk.id, name: risk.name, severity: risk.severity, desc: risk.desc}) AS risks,
-                     collect(DISTINCT {id: req.id, name: req.name, desc: req.desc}) AS requirements
-                RETURN app.id AS id,
-                       app.name AS name,
-                       app.keywords AS keywords,
-                       [r IN risks WHERE r.id IS NOT NULL] AS risks,
-                       [r IN requirements WHERE r.id IS NOT NULL] AS requirements
-                ORDER BY app.name
-            """)
+            result = graph.query(_APPLICATIONS_QUERY)
             return result_to_dicts(result)
 
         result = self._execute_with_retry(_query)
-        _set_cached("all_applications", result)
+        _set_cached("applications", "", result)
         return result
 
     def match_application_by_keywords(self, keywords: list[str]) -> Optional[dict]:
@@ -2554,8 +3276,7 @@ class GraphConnection:
 
         Note: Results are cached for 5 minutes per application.
         """
-        cache_key = f"app_requirements_{application_id}"
-        cached = _get_cached(cache_key)
+        cached = _get_cached("app_requirements", application_id)
         if cached is not None:
             return cached
 
@@ -2574,7 +3295,7 @@ class GraphConnection:
             return record['requirements'] if record else []
 
         result = self._execute_with_retry(_query)
-        _set_cached(cache_key, result)
+        _set_cached("app_requirements", application_id, result)
         return result
 
     def get_materials_meeting_requirements(self, application_id: str) -> list[dict]:
@@ -2814,62 +3535,63 @@ class GraphConnection:
         Note: Results are cached for 5 minutes per product family.
         """
         # Check cache first
-        cache_key = f"variable_features_{product_family}"
-        cached = _get_cached(cache_key)
+        cached = _get_cached("variable_features", product_family)
         if cached is not None:
             return cached
 
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (pf:ProductFamily)-[:HAS_VARIABLE_FEATURE]->(f:VariableFeature {is_variable: true})
-                WHERE pf.id = 'FAM_' + $family
-                   OR pf.name CONTAINS $family
-                   OR f.applies_to = $family
-
-                OPTIONAL MATCH (f)-[:SELECTION_DEPENDS_ON]->(d:Discriminator)
-                OPTIONAL MATCH (f)-[:HAS_OPTION]->(o:FeatureOption)
-
-                WITH f, d, collect({
-                    id: o.id,
-                    name: o.name,
-                    value: o.value,
-                    description: o.description,
-                    is_default: o.is_default,
-                    // Enhanced UX fields
-                    display_label: o.display_label,
-                    benefit: o.benefit,
-                    use_case: o.use_case,
-                    is_recommended: o.is_recommended
-                }) AS options
-
-                RETURN f.id AS feature_id,
-                       COALESCE(f.feature_name, f.name) AS feature_name,
-                       f.description AS feature_description,
-                       COALESCE(f.question, d.question) AS question,
-                       COALESCE(f.why_needed, d.why_needed) AS why_needed,
-                       COALESCE(f.parameter_name, d.parameter_name) AS parameter_name,
-                       [opt IN options WHERE opt.id IS NOT NULL] AS options,
-                       COALESCE(f.auto_resolve, false) AS auto_resolve,
-                       f.default_value AS default_value
-                ORDER BY f.feature_name
-            """, params={"family": product_family})
+            result = graph.query(_VARIABLE_FEATURES_QUERY, params={"family": product_family})
             return result_to_dicts(result)
 
         try:
             result = self._execute_with_retry(_query)
-            _set_cached(cache_key, result)
+            _set_cached("variable_features", product_family, result)
             return result
         except Exception as e:
             print(f"Warning: Could not get variable features: {e}")
             return []
 
+    def get_variable_features_many(self, product_families: list[str]) -> dict[str, list[dict]]:
+        """Batch variant of get_variable_features.
+
+        Cached families are answered locally; the rest are fetched in one
+        pipelined round trip.
+
+        Returns:
+            Dict mapping each requested product family to its feature list
+        """
+        features = {}
+        missing = []
+        for family in dict.fromkeys(f for f in product_families if f):
+            cached = _get_cached("variable_features", family)
+            if cached is not None:
+                features[family] = cached
+            else:
+                missing.append(family)
+        if not missing:
+            return features
+        try:
+            results = self.query_many([
+                (_VARIABLE_FEATURES_QUERY, {"family": family}) for family in missing
+            ])
+        except Exception as e:
+            print(f"Warning: Could not get variable features: {e}")
+            return {**features, **{family: [] for family in missing}}
+        for family, result in zip(missing, results):
+            features[family] = result_to_dicts(result)
+            _set_cached("variable_features", family, features[family])
+        return features
+
     def get_connection_length_offset(self, family_id: str, connection_code: str) -> int:
         """Get housing length offset for a connection type.
 
         Flange connections add ~50mm to the base housing length.
         Returns the offset in mm (0 for PG, 50 for Flange).
         """
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.connection_length_offset(family_id, connection_code)
         def _query():
             graph = self.connect()
             result = graph.query("""
@@ -2892,28 +3614,58 @@ class GraphConnection:
 
         Returns list of dicts with 'id', 'name', 'code' for each linked Material.
         """
-        cache_key = f"avail_mat_{family_id}"
-        cached = _get_cached(cache_key)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.available_materials(family_id)
+        cached = _get_cached("available_materials", family_id)
         if cached is not None:
             return cached
 
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (pf:ProductFamily {id: $fid})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
-                RETURN m.id AS id, m.name AS name, COALESCE(m.code, m.id) AS code
-                ORDER BY m.name
-            """, params={"fid": family_id})
+            result = graph.query(_AVAILABLE_MATERIALS_QUERY, params={"fid": family_id})
             return result_to_dicts(result)
 
         try:
             materials = self._execute_with_retry(_query)
-            _set_cached(cache_key, materials)
+            _set_cached("available_materials", family_id, materials)
             return materials
         except Exception as e:
             print(f"Warning: Could not get available materials: {e}")
             return []
 
+    def get_available_materials_many(self, family_ids: list[str]) -> dict[str, list]:
+        """Batch variant of get_available_materials.
+
+        Served from the catalog snapshot / cache when possible; remaining
+        families are fetched in one pipelined round trip.
+        """
+        unique_ids = list(dict.fromkeys(f for f in family_ids if f))
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return {fid: snapshot.available_materials(fid) for fid in unique_ids}
+        materials = {}
+        missing = []
+        for fid in unique_ids:
+            cached = _get_cached("available_materials", fid)
+            if cached is not None:
+                materials[fid] = cached
+            else:
+                missing.append(fid)
+        if not missing:
+            return materials
+        try:
+            results = self.query_many([
+                (_AVAILABLE_MATERIALS_QUERY, {"fid": fid}) for fid in missing
+            ])
+        except Exception as e:
+            print(f"Warning: Could not get available materials: {e}")
+            return {**materials, **{fid: [] for fid in missing}}
+        for fid, result in zip(missing, results):
+            materials[fid] = result_to_dicts(result)
+            _set_cached("available_materials", fid, materials[fid])
+        return materials
+
     def get_materials_by_corrosion_class(self, family_id: str, min_corrosion_class: str) -> list:
         """Get materials available for a product family that meet a minimum corrosion class.
 
@@ -2921,28 +3673,15 @@ class GraphConnection:
         Corrosion hierarchy: C3 < C4 < C5 < C5.1
         Returns list of dicts with 'id', 'name', 'code', 'corrosion_class'.
         """
-        # Map corrosion classes to numeric for >= comparison
-        class_rank = {"C3": 3, "C4": 4, "C5": 5, "C5.1": 5.1}
-        min_rank = class_rank.get(min_corrosion_class, 5)
-
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (pf:ProductFamily {id: $fid})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
-                RETURN m.id AS id, m.name AS name,
-                       COALESCE(m.code, m.id) AS code,
-                       m.corrosion_class AS corrosion_class
-                ORDER BY m.name
-            """, params={"fid": family_id})
+            result = graph.query(_FAMILY_MATERIALS_WITH_CLASS_QUERY, params={"fid": family_id})
             return result_to_dicts(result)
 
         try:
             all_materials = self._execute_with_retry(_query)
             # Filter to materials meeting the minimum corrosion class
-            return [
-                m for m in all_materials
-                if class_rank.get(m.get("corrosion_class", ""), 0) >= min_rank
-            ]
+            return _filter_by_corrosion_class(all_materials, min_corrosion_class)
         except Exception as e:
             print(f"Warning: Could not get materials by corrosion class: {e}")
             return []
@@ -2957,8 +3696,8 @@ class GraphConnection:
         Returns:
             Dict with reference_airflow_m3h and label, or empty dict if not found.
         """
-        cache_key = f"ref_airflow_{product_family or 'any'}_{width_mm}x{height_mm}"
-        cached = _get_cached(cache_key)
+        cache_key = f"{product_family or 'any'}_{width_mm}x{height_mm}"
+        cached = _get_cached("reference_airflow", cache_key)
         if cached is not None:
             return cached
 
@@ -3010,7 +3749,7 @@ class GraphConnection:
 
         try:
             result = self._execute_with_retry(_query)
-            _set_cached(cache_key, result)
+            _set_cached("reference_airflow", cache_key, result)
             return result
         except Exception as e:
             print(f"Warning: Could not get reference airflow: {e}")
@@ -3088,38 +3827,8 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (v:ProductVariant)
-                WHERE v.name = $name OR v.name CONTAINS $name
-                RETURN v.weight_kg AS weight_kg,
-                       v.weight_kg_short AS weight_kg_short,
-                       v.weight_kg_long AS weight_kg_long,
-                       v.housing_length_mm AS housing_length_mm,
-                       v.housing_length_short_mm AS housing_length_short_mm,
-                       v.housing_length_long_mm AS housing_length_long_mm
-                LIMIT 1
-            """, params={"name": variant_name})
-            record = result_single(result)
-            if not record:
-                return None
-            r = dict(record)
-            # v4.1: Check dual weights FIRST (more precise than legacy weight_kg)
-            # Legacy weight_kg is always the short weight and was set before
-            # dual-weight support was added. Dual weights take priority.
-            if r.get("weight_kg_short") is not None and r.get("weight_kg_long") is not None:
-                if housing_length and r.get("housing_length_long_mm"):
-                    threshold = (r["housing_length_short_mm"] or 0) + (r["housing_length_long_mm"] or 0)
-                    if threshold > 0:
-                        midpoint = threshold / 2
-                        selected = r["weight_kg_long"] if housing_length >= midpoint else r["weight_kg_short"]
-                        print(f"⚖️ [WEIGHT] {variant_name}: len={housing_length} midpoint={midpoint} → {'long' if housing_length >= midpoint else 'short'}={selected}kg")
-                        return selected
-                # No housing_length provided: return short weight as safe default
-                return r["weight_kg_short"]
-            # Single-weight product (e.g., GDP) — no dual-weight data available
-            if r.get("weight_kg") is not None:
-                return r["weight_kg"]
-            return None
+            result = graph.query(_VARIANT_WEIGHT_QUERY, params={"name": variant_name})
+            return _select_variant_weight(result_single(result), variant_name, housing_length)
 
         try:
             return self._execute_with_retry(_query)
@@ -3127,6 +3836,30 @@ class GraphConnection:
             print(f"Warning: Could not get variant weight for {variant_name}: {e}")
             return None
 
+    def get_variant_weights(self, requests: list[tuple]) -> list:
+        """Batch variant of get_variant_weight — one round trip for all tags.
+
+        Args:
+            requests: List of ``(variant_name, housing_length)`` tuples
+                (housing_length may be None)
+
+        Returns:
+            List of weights in kg (None where not found), in request order
+        """
+        if not requests:
+            return []
+        try:
+            results = self.query_many([
+                (_VARIANT_WEIGHT_QUERY, {"name": name}) for name, _ in requests
+            ])
+        except Exception as e:
+            print(f"Warning: Could not get variant weights: {e}")
+            return [None] * len(requests)
+        return [
+            _select_variant_weight(result_single(result), name, housing_length)
+            for (name, housing_length), result in zip(requests, results)
+        ]
+
     def get_default_length_variant(self, family_id: str) -> int | None:
         """Get the default (shortest) length variant for a product family.
 
@@ -3157,6 +3890,9 @@ class GraphConnection:
         Returns dict with 'fmt' and 'default_frame_depth' (for GDP-style codes
         where the length field represents frame depth, not housing length).
         """
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.product_family_code_format(family_id)
         def _query():
             graph = self.connect()
             result = graph.query("""
@@ -3279,21 +4015,7 @@ class GraphConnection:
         """
         def _query():
             graph = self.connect()
-            result = graph.query("""
-                MATCH (pf:ProductFamily)-[r:REQUIRES_PARAMETER]->(param:Parameter)
-                WHERE pf.id = 'FAM_' + $family OR pf.name CONTAINS $family
-                OPTIONAL MATCH (param)-[:ASKED_VIA]->(q:Question)
-                RETURN param.id AS param_id,
-                       param.name AS param_name,
-                       param.type AS param_type,
-                       param.unit AS param_unit,
-                       r.reason AS reason,
-                       q.id AS question_id,
-                       q.text AS question_text,
-                       q.intent AS intent,
-                       q.priority AS priority
-                ORDER BY q.priority
-            """, params={"family": product_family})
+            result = graph.query(_REQUIRED_PARAMETERS_QUERY, params={"family": product_family})
             return result_to_dicts(result)
 
         return self._execute_with_retry(_query)
@@ -4064,93 +4786,99 @@ class GraphConnection:
 
     def get_expert_conversations(self, limit: int = 50, offset: int = 0) -> dict:
         """List all conversations with turn counts and review status."""
-        graph = self.connect()
-        # Count total
-        total_result = graph.query("""
-            MATCH (p:ActiveProject)
-            WHERE (p)-[:HAS_TURN]->(:ConversationTurn)
-            RETURN count(p) AS total
-        """)
-        total = result_value(total_result, "total")
-
-        # Paginated list
-        result = graph.query("""
-            MATCH (p:ActiveProject)
-            WHERE (p)-[:HAS_TURN]->(:ConversationTurn)
-            OPTIONAL MATCH (p)-[:HAS_TURN]->(ct:ConversationTurn)
-            OPTIONAL MATCH (p)-[:HAS_REVIEW]->(er:ExpertReview)
-            WITH p,
-                 count(DISTINCT ct) AS turn_count,
-                 max(ct.created_at) AS last_activity,
-                 count(DISTINCT er) > 0 AS has_review,
-                 head(collect(DISTINCT er.overall_score)) AS review_score
-            RETURN p.session_id AS session_id,
-                   p.name AS project_name,
-                   p.detected_family AS detected_family,
-                   p.locked_material AS locked_material,
-                   turn_count,
-                   last_activity,
-                   has_review,
-                   review_score
-            ORDER BY last_activity DESC
-            SKIP $offset LIMIT $limit
-        """, params={"limit": limit, "offset": offset})
-        conversations = result_to_dicts(result)
-        return {"conversations": conversations, "total": total}
+        def _query():
+            graph = self.connect()
+            # Count total
+            total_result = graph.query("""
+                MATCH (p:ActiveProject)
+                WHERE (p)-[:HAS_TURN]->(:ConversationTurn)
+                RETURN count(p) AS total
+            """)
+            total = result_value(total_result, "total")
+
+            # Paginated list
+            result = graph.query("""
+                MATCH (p:ActiveProject)
+                WHERE (p)-[:HAS_TURN]->(:ConversationTurn)
+                OPTIONAL MATCH (p)-[:HAS_TURN]->(ct:ConversationTurn)
+                OPTIONAL MATCH (p)-[:HAS_REVIEW]->(er:ExpertReview)
+                WITH p,
+                     count(DISTINCT ct) AS turn_count,
+                     max(ct.created_at) AS last_activity,
+                     count(DISTINCT er) > 0 AS has_review,
+                     head(collect(DISTINCT er.overall_score)) AS review_score
+                RETURN p.session_id AS session_id,
+                       p.name AS project_name,
+                       p.detected_family AS detected_family,
+                       p.locked_material AS locked_material,
+                       turn_count,
+                       last_activity,
+                       has_review,
+                       review_score
+                ORDER BY last_activity DESC
+                SKIP $offset LIMIT $limit
+            """, params={"limit": limit, "offset": offset})
+            conversations = result_to_dicts(result)
+            return {"conversations": conversations, "total": total}
+        return self._execute_with_retry(_query)
 
     def get_conversation_detail(self, session_id: str) -> dict:
         """Get full conversation turns + expert reviews for a session."""
-        graph = self.connect()
-        # Project metadata
-        proj_result = graph.query("""
-            MATCH (p:ActiveProject {session_id: $sid})
-            RETURN p.session_id AS session_id,
-                   p.name AS project_name,
-                   p.detected_family AS detected_family,
-                   p.locked_material AS locked_material,
-                   p.resolved_params AS resolved_params
-        """, params={"sid": session_id})
-        proj = result_single(proj_result) or {
-            "session_id": session_id, "project_name": None,
-            "detected_family": None, "locked_material": None, "resolved_params": None
-        }
+        def _query():
+            graph = self.connect()
+            # Project metadata
+            proj_result = graph.query("""
+                MATCH (p:ActiveProject {session_id: $sid})
+                RETURN p.session_id AS session_id,
+                       p.name AS project_name,
+                       p.detected_family AS detected_family,
+                       p.locked_material AS locked_material,
+                       p.resolved_params AS resolved_params
+            """, params={"sid": session_id})
+            proj = result_single(proj_result) or {
+                "session_id": session_id, "project_name": None,
+                "detected_family": None, "locked_material": None, "resolved_params": None
+            }
 
-        # Conversation turns (include judge_results if saved)
-        turns_result = graph.query("""
-            MATCH (p:ActiveProject {session_id: $sid})-[:HAS_TURN]->(ct:ConversationTurn)
-            RETURN ct.id AS id, ct.role AS role, ct.message AS message,
-                   ct.turn_number AS turn_number, ct.created_at AS created_at,
-                   ct.judge_results AS judge_results
-            ORDER BY ct.turn_number ASC
-        """, params={"sid": session_id})
-        turns = result_to_dicts(turns_result)
-
-        # Expert reviews (include provider + turn_number for per-judge reviews)
-        reviews_result = graph.query("""
-            MATCH (p:ActiveProject {session_id: $sid})-[:HAS_REVIEW]->(er:ExpertReview)
-            RETURN er.id AS id, er.reviewer AS reviewer, er.comment AS comment,
-                   er.overall_score AS overall_score,
-                   er.dimension_scores AS dimension_scores,
-                   er.provider AS provider,
-                   er.turn_number AS turn_number,
-                   er.created_at AS created_at
-            ORDER BY er.created_at DESC
-        """, params={"sid": session_id})
-        reviews = result_to_dicts(reviews_result)
-
-        return {**proj, "turns": turns, "reviews": reviews}
+            # Conversation turns (include judge_results if saved)
+            turns_result = graph.query("""
+                MATCH (p:ActiveProject {session_id: $sid})-[:HAS_TURN]->(ct:ConversationTurn)
+                RETURN ct.id AS id, ct.role AS role, ct.message AS message,
+                       ct.turn_number AS turn_number, ct.created_at AS created_at,
+                       ct.judge_results AS judge_results
+                ORDER BY ct.turn_number ASC
+            """, params={"sid": session_id})
+            turns = result_to_dicts(turns_result)
+
+            # Expert reviews (include provider + turn_number for per-judge reviews)
+            reviews_result = graph.query("""
+                MATCH (p:ActiveProject {session_id: $sid})-[:HAS_REVIEW]->(er:ExpertReview)
+                RETURN er.id AS id, er.reviewer AS reviewer, er.comment AS comment,
+                       er.overall_score AS overall_score,
+                       er.dimension_scores AS dimension_scores,
+                       er.provider AS provider,
+                       er.turn_number AS turn_number,
+                       er.created_at AS created_at
+                ORDER BY er.created_at DESC
+            """, params={"sid": session_id})
+            reviews = result_to_dicts(reviews_result)
+
+            return {**proj, "turns": turns, "reviews": reviews}
+        return self._execute_with_retry(_query)
 
     def save_judge_results(self, session_id: str, turn_number: int,
                            judge_results: str) -> bool:
         """Save judge results JSON on an assistant ConversationTurn node."""
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (p:ActiveProject {session_id: $sid})-[:HAS_TURN]->(ct:ConversationTurn)
-            WHERE ct.role = 'assistant' AND ct.turn_number = $tn
-            SET ct.judge_results = $jr
-            RETURN ct.id AS id
-        """, params={"sid": session_id, "tn": turn_number, "jr": judge_results})
-        return result_single(result) is not None
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (p:ActiveProject {session_id: $sid})-[:HAS_TURN]->(ct:ConversationTurn)
+                WHERE ct.role = 'assistant' AND ct.turn_number = $tn
+                SET ct.judge_results = $jr
+                RETURN ct.id AS id
+            """, params={"sid": session_id, "tn": turn_number, "jr": judge_results})
+            return result_single(result) is not None
+        return self._execute_with_retry(_query)
 
     def submit_expert_review(self, session_id: str, reviewer: str,
                              comment: str, overall_score: str,
@@ -4163,53 +4891,57 @@ class GraphConnection:
         import time
         suffix = f"_{provider}" if provider else ""
         review_id = f"REVIEW_{session_id}_{reviewer}_{int(time.time())}{suffix}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (p:ActiveProject {session_id: $session_id})
-            CREATE (p)-[:HAS_REVIEW]->(er:ExpertReview {
-                id: $review_id,
-                session_id: $session_id,
-                reviewer: $reviewer,
-                comment: $comment,
-                overall_score: $overall_score,
-                dimension_scores: $dimension_scores,
-                provider: $provider,
-                turn_number: $turn_number,
-                created_at: timestamp()
-            })
-            RETURN properties(er) AS review
-        """, params={"session_id": session_id, "review_id": review_id, "reviewer": reviewer, "comment": comment, "overall_score": overall_score, "dimension_scores": dimension_scores, "provider": provider, "turn_number": turn_number})
-        record = result_single(result)
-        return dict(record["review"]) if record else {}
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (p:ActiveProject {session_id: $session_id})
+                CREATE (p)-[:HAS_REVIEW]->(er:ExpertReview {
+                    id: $review_id,
+                    session_id: $session_id,
+                    reviewer: $reviewer,
+                    comment: $comment,
+                    overall_score: $overall_score,
+                    dimension_scores: $dimension_scores,
+                    provider: $provider,
+                    turn_number: $turn_number,
+                    created_at: timestamp()
+                })
+                RETURN properties(er) AS review
+            """, params={"session_id": session_id, "review_id": review_id, "reviewer": reviewer, "comment": comment, "overall_score": overall_score, "dimension_scores": dimension_scores, "provider": provider, "turn_number": turn_number})
+            record = result_single(result)
+            return dict(record["review"]) if record else {}
+        return self._execute_with_retry(_query)
 
     def get_expert_reviews_summary(self) -> dict:
         """Get aggregate stats for expert reviews."""
-        graph = self.connect()
-        stats_result = graph.query("""
-            MATCH (er:ExpertReview)
-            WITH count(er) AS total,
-                 count(CASE WHEN er.overall_score = 'thumbs_up' THEN 1 END) AS positive,
-                 count(CASE WHEN er.overall_score = 'thumbs_down' THEN 1 END) AS negative
-            RETURN total, positive, negative
-        """)
-        stats = result_single(stats_result) or {
-            "total": 0, "positive": 0, "negative": 0
-        }
+        def _query():
+            graph = self.connect()
+            stats_result = graph.query("""
+                MATCH (er:ExpertReview)
+                WITH count(er) AS total,
+                     count(CASE WHEN er.overall_score = 'thumbs_up' THEN 1 END) AS positive,
+                     count(CASE WHEN er.overall_score = 'thumbs_down' THEN 1 END) AS negative
+                RETURN total, positive, negative
+            """)
+            stats = result_single(stats_result) or {
+                "total": 0, "positive": 0, "negative": 0
+            }
+
+            recent_result = graph.query("""
+                MATCH (er:ExpertReview)
+                OPTIONAL MATCH (p:ActiveProject {session_id: er.session_id})
+                RETURN er.id AS id, er.session_id AS session_id,
+                       er.reviewer AS reviewer, er.comment AS comment,
+                       er.overall_score AS overall_score,
+                       er.created_at AS created_at,
+                       p.detected_family AS detected_family
+                ORDER BY er.created_at DESC
+                LIMIT 20
+            """)
+            recent = result_to_dicts(recent_result)
 
-        recent_result = graph.query("""
-            MATCH (er:ExpertReview)
-            OPTIONAL MATCH (p:ActiveProject {session_id: er.session_id})
-            RETURN er.id AS id, er.session_id AS session_id,
-                   er.reviewer AS reviewer, er.comment AS comment,
-                   er.overall_score AS overall_score,
-                   er.created_at AS created_at,
-                   p.detected_family AS detected_family
-            ORDER BY er.created_at DESC
-            LIMIT 20
-        """)
-        recent = result_to_dicts(recent_result)
-
-        return {**stats, "recent": recent}
+            return {**stats, "recent": recent}
+        return self._execute_with_retry(_query)
 
     # =========================================================================
     # TRAIT-BASED REASONING QUERIES (Layer 2.5: Trait Engine)
@@ -4224,24 +4956,26 @@ class GraphConnection:
         Returns:
             List of stressor dicts with id, name, description, matched_keyword
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (s:EnvironmentalStressor)
-            WHERE s.keywords IS NOT NULL
-            WITH s, [kw IN s.keywords WHERE ANY(qkw IN $keywords WHERE
-                toLower(qkw) = toLower(kw)
-                OR (size(kw) >= 3 AND toLower(qkw) STARTS WITH toLower(kw))
-            )] AS matched
-            WHERE size(matched) > 0
-            RETURN s.id AS id,
-                   s.name AS name,
-                   s.description AS description,
-                   s.category AS category,
-                   matched AS matched_keywords,
-                   size(matched) AS match_count
-            ORDER BY match_count DESC
-        """, {"keywords": keywords})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (s:EnvironmentalStressor)
+                WHERE s.keywords IS NOT NULL
+                WITH s, [kw IN s.keywords WHERE ANY(qkw IN $keywords WHERE
+                    toLower(qkw) = toLower(kw)
+                    OR (size(kw) >= 3 AND toLower(qkw) STARTS WITH toLower(kw))
+                )] AS matched
+                WHERE size(matched) > 0
+                RETURN s.id AS id,
+                       s.name AS name,
+                       s.description AS description,
+                       s.category AS category,
+                       matched AS matched_keywords,
+                       size(matched) AS match_count
+                ORDER BY match_count DESC
+            """, {"keywords": keywords})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_stressors_for_application(self, app_id: str) -> list[dict]:
         """Get stressors linked to an application/environment via EXPOSES_TO.
@@ -4255,21 +4989,23 @@ class GraphConnection:
         Returns:
             List of stressor dicts (deduplicated by stressor ID)
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (ctx {id: $app_id})
-            OPTIONAL MATCH (ctx)-[:IS_A*0..5]->(parent)
-            WITH collect(DISTINCT ctx) + collect(DISTINCT parent) AS contexts
-            UNWIND contexts AS c
-            MATCH (c)-[:EXPOSES_TO]->(s:EnvironmentalStressor)
-            RETURN DISTINCT s.id AS id,
-                   s.name AS name,
-                   s.description AS description,
-                   s.category AS category,
-                   c.name AS source_context,
-                   labels(c)[0] AS source_type
-        """, {"app_id": app_id})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (ctx {id: $app_id})
+                OPTIONAL MATCH (ctx)-[:IS_A*0..5]->(parent)
+                WITH collect(DISTINCT ctx) + collect(DISTINCT parent) AS contexts
+                UNWIND contexts AS c
+                MATCH (c)-[:EXPOSES_TO]->(s:EnvironmentalStressor)
+                RETURN DISTINCT s.id AS id,
+                       s.name AS name,
+                       s.description AS description,
+                       s.category AS category,
+                       c.name AS source_context,
+                       labels(c)[0] AS source_type
+            """, {"app_id": app_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def resolve_environment_hierarchy(self, env_id: str) -> list[str]:
         """Resolve an environment ID to itself + all IS_A parents.
@@ -4278,30 +5014,37 @@ class GraphConnection:
         Used by constraint checking: if product allows ENV_INDOOR,
         it also allows ENV_KITCHEN (child environment).
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (env:Environment {id: $env_id})
-            OPTIONAL MATCH (env)-[:IS_A*0..5]->(parent:Environment)
-            RETURN collect(DISTINCT env.id) + collect(DISTINCT parent.id) AS env_chain
-        """, {"env_id": env_id})
-        record = result_single(result)
-        if record and record["env_chain"]:
-            return list(dict.fromkeys(record["env_chain"]))
-        return [env_id]
+        def _query():
+            graph = self.connect()
+            result = graph.query(_ENVIRONMENT_HIERARCHY_QUERY, {"env_id": env_id})
+            record = result_single(result)
+            if record and record["env_chain"]:
+                return list(dict.fromkeys(record["env_chain"]))
+            return [env_id]
+        return self._execute_with_retry(_query)
 
     def get_environment_keywords(self) -> dict[str, list[str]]:
         """Read environment keywords from graph.
 
         Replaces hardcoded env_keywords dict in engine.
         Each Environment node has a 'keywords' property.
+
+        Note: Results are cached for 5 minutes.
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (env:Environment)
-            WHERE env.keywords IS NOT NULL
-            RETURN env.id AS env_id, env.keywords AS keywords
-        """)
-        return {r["env_id"]: r["keywords"] for r in result_to_dicts(result)}
+        cached = _get_cached("environment_keywords")
+        if cached is not None:
+            return cached
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (env:Environment)
+                WHERE env.keywords IS NOT NULL
+                RETURN env.id AS env_id, env.keywords AS keywords
+            """)
+            keywords = dict(iter_rows(result))
+            _set_cached("environment_keywords", "", keywords)
+            return keywords
+        return self._execute_with_retry(_query)
 
     def get_causal_rules_for_stressors(self, stressor_ids: list[str]) -> list[dict]:
         """Get all causal rules (NEUTRALIZED_BY, DEMANDS_TRAIT) for given stressors.
@@ -4314,25 +5057,123 @@ class GraphConnection:
         """
         if not stressor_ids:
             return []
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (t:PhysicalTrait)-[r:NEUTRALIZED_BY]->(s:EnvironmentalStressor)
-            WHERE s.id IN $stressor_ids
-            RETURN 'NEUTRALIZED_BY' AS rule_type,
-                   t.id AS trait_id, t.name AS trait_name,
-                   s.id AS stressor_id, s.name AS stressor_name,
-                   r.severity AS severity,
-                   r.explanation AS explanation
-            UNION ALL
-            MATCH (s:EnvironmentalStressor)-[r:DEMANDS_TRAIT]->(t:PhysicalTrait)
-            WHERE s.id IN $stressor_ids
-            RETURN 'DEMANDS_TRAIT' AS rule_type,
-                   t.id AS trait_id, t.name AS trait_name,
-                   s.id AS stressor_id, s.name AS stressor_name,
-                   r.severity AS severity,
-                   r.explanation AS explanation
-        """, {"stressor_ids": stressor_ids})
-        return result_to_dicts(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.causal_rules_for_stressors(stressor_ids)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (t:PhysicalTrait)-[r:NEUTRALIZED_BY]->(s:EnvironmentalStressor)
+                WHERE s.id IN $stressor_ids
+                RETURN 'NEUTRALIZED_BY' AS rule_type,
+                       t.id AS trait_id, t.name AS trait_name,
+                       s.id AS stressor_id, s.name AS stressor_name,
+                       r.severity AS severity,
+                       r.explanation AS explanation
+                UNION ALL
+                MATCH (s:EnvironmentalStressor)-[r:DEMANDS_TRAIT]->(t:PhysicalTrait)
+                WHERE s.id IN $stressor_ids
+                RETURN 'DEMANDS_TRAIT' AS rule_type,
+                       t.id AS trait_id, t.name AS trait_name,
+                       s.id AS stressor_id, s.name AS stressor_name,
+                       r.severity AS severity,
+                       r.explanation AS explanation
+            """, {"stressor_ids": stressor_ids})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
+
+    def rule_index(self) -> Optional[RuleIndex]:
+        """Causal rules compiled for the current graph version, or None without a catalog snapshot."""
+        snapshot = self.catalog_snapshot()
+        return snapshot.rule_index if snapshot is not None else None
+
+    def sizing_table(self, item_id: str) -> Optional[SizingTable]:
+        """Precomputed sizing table of a product family, or None without a catalog snapshot."""
+        snapshot = self.catalog_snapshot()
+        return snapshot.sizing_table(item_id) if snapshot is not None else None
+
+    def get_engine_context(self, stressor_ids: list[str], product_family: Optional[str] = None,
+                           environment_id: Optional[str] = None) -> dict:
+        """Batch query: the graph lookups of one TraitBasedEngine verdict.
+
+        Everything the engine reads for a (stressor set, product family) pair
+        is fetched in one pipelined round trip; collections served by the
+        catalog snapshot or the query cache are answered locally.
+
+        Args:
+            stressor_ids: Detected EnvironmentalStressor IDs
+            product_family: Optional ProductFamily ID or code being evaluated
+            environment_id: Optional installation Environment ID
+
+        Returns:
+            Dict with logic_gates, applications, accessory_codes and, when
+            given, environment_chain plus the family's product_traits,
+            hard_constraints, installation_constraints, optimization_strategy,
+            capacity_rules, variable_features and required_parameters
+        """
+        context = {}
+        pending = []  # (key, query, params, shape)
+
+        if stressor_ids:
+            pending.append(("logic_gates", _LOGIC_GATES_QUERY, {"stressor_ids": list(stressor_ids)}, result_to_dicts))
+        else:
+            context["logic_gates"] = []
+        applications = _get_cached("applications")
+        if applications is not None:
+            context["applications"] = applications
+        else:
+            pending.append(("applications", _APPLICATIONS_QUERY, None, result_to_dicts))
+        pending.append(("accessory_codes", _ACCESSORY_CODES_QUERY, None, result_to_dicts))
+
+        if environment_id:
+            def env_chain(result):
+                record = result_single(result)
+                if record and record["env_chain"]:
+                    return list(dict.fromkeys(record["env_chain"]))
+                return [environment_id]
+            pending.append(("environment_chain", _ENVIRONMENT_HIERARCHY_QUERY, {"env_id": environment_id}, env_chain))
+
+        if product_family:
+            pf_id = product_family if product_family.startswith("FAM_") else f"FAM_{product_family.upper()}"
+            pf_code = pf_id[len("FAM_"):]
+            pending.append(("hard_constraints", _HARD_CONSTRAINTS_QUERY, {"pf_id": pf_id}, result_to_dicts))
+            pending.append(("installation_constraints", _INSTALLATION_CONSTRAINTS_QUERY, {"pf_id": pf_id},
+                            result_to_dicts))
+            pending.append(("required_parameters", _REQUIRED_PARAMETERS_QUERY, {"family": pf_code}, result_to_dicts))
+
+            snapshot = self.catalog_snapshot()
+            if snapshot is not None:
+                context["product_traits"] = snapshot.product_traits(pf_id)
+                context["optimization_strategy"] = snapshot.optimization_strategy(pf_id)
+                context["capacity_rules"] = snapshot.capacity_rules(pf_id)
+            else:
+                traits = _get_cached("product_traits", pf_id)
+                if traits is not None:
+                    context["product_traits"] = traits
+                else:
+                    pending.append(("product_traits", _PRODUCT_TRAITS_QUERY, {"pf_id": pf_id}, result_to_dicts))
+                pending.append(("optimization_strategy", _OPTIMIZATION_STRATEGY_QUERY, {"pf_id": pf_id},
+                                result_single))
+                pending.append(("capacity_rules", _CAPACITY_RULES_QUERY, {"pf_id": pf_id}, result_to_dicts))
+
+            features = _get_cached("variable_features", pf_code)
+            if features is not None:
+                context["variable_features"] = features
+            else:
+                pending.append(("variable_features", _VARIABLE_FEATURES_QUERY, {"family": pf_code}, result_to_dicts))
+
+        results = self.query_many([(query, params) for _, query, params, _ in pending])
+        for (key, _, _, shape), result in zip(pending, results):
+            context[key] = shape(result)
+
+        fetched = {key for key, _, _, _ in pending}
+        if "applications" in fetched:
+            _set_cached("applications", "", context["applications"])
+        if "product_traits" in fetched:
+            _set_cached("product_traits", pf_id, context["product_traits"])
+        if "variable_features" in fetched:
+            _set_cached("variable_features", pf_code, context["variable_features"])
+        return context
 
     def get_product_traits(self, product_family: str) -> list[dict]:
         """Get all PhysicalTraits for a product family (direct + via material).
@@ -4342,17 +5183,23 @@ class GraphConnection:
 
         Returns:
             List of trait dicts with id, name, source ('direct' or material code), primary flag
+
+        Note: Results are cached for 5 minutes per product family.
         """
         pf_id = product_family if product_family.startswith("FAM_") else f"FAM_{product_family.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[r:HAS_TRAIT]->(t:PhysicalTrait)
-            RETURN t.id AS id, t.name AS name, 'direct' AS source, r.primary AS is_primary
-            UNION
-            MATCH (pf:ProductFamily {id: $pf_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(t:PhysicalTrait)
-            RETURN DISTINCT t.id AS id, t.name AS name, m.code AS source, false AS is_primary
-        """, {"pf_id": pf_id})
-        return result_to_dicts(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.product_traits(pf_id)
+        cached = _get_cached("product_traits", pf_id)
+        if cached is not None:
+            return cached
+        def _query():
+            graph = self.connect()
+            result = graph.query(_PRODUCT_TRAITS_QUERY, {"pf_id": pf_id})
+            traits = result_to_dicts(result)
+            _set_cached("product_traits", pf_id, traits)
+            return traits
+        return self._execute_with_retry(_query)
 
     def get_all_product_families_with_traits(self) -> list[dict]:
         """Batch query: all product families with their trait sets.
@@ -4361,28 +5208,33 @@ class GraphConnection:
             List of dicts with product_id, product_name, product_type,
             direct_trait_ids, material_trait_ids, all_trait_ids
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily)
-            OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(dt:PhysicalTrait)
-            OPTIONAL MATCH (pf)-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(mt:PhysicalTrait)
-            WITH pf,
-                 collect(DISTINCT dt.id) AS direct_trait_ids,
-                 collect(DISTINCT dt.name) AS direct_trait_names,
-                 collect(DISTINCT mt.id) AS material_trait_ids,
-                 collect(DISTINCT mt.name) AS material_trait_names
-            RETURN pf.id AS product_id,
-                   pf.name AS product_name,
-                   pf.type AS product_type,
-                   pf.selection_priority AS selection_priority,
-                   direct_trait_ids,
-                   direct_trait_names,
-                   material_trait_ids,
-                   material_trait_names,
-                   direct_trait_ids + [x IN material_trait_ids WHERE NOT x IN direct_trait_ids] AS all_trait_ids
-            ORDER BY pf.selection_priority ASC
-        """)
-        return result_to_dicts(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.all_product_families_with_traits()
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (pf:ProductFamily)
+                OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(dt:PhysicalTrait)
+                OPTIONAL MATCH (pf)-[:AVAILABLE_IN_MATERIAL]->(m:Material)-[:PROVIDES_TRAIT]->(mt:PhysicalTrait)
+                WITH pf,
+                     collect(DISTINCT dt.id) AS direct_trait_ids,
+                     collect(DISTINCT dt.name) AS direct_trait_names,
+                     collect(DISTINCT mt.id) AS material_trait_ids,
+                     collect(DISTINCT mt.name) AS material_trait_names
+                RETURN pf.id AS product_id,
+                       pf.name AS product_name,
+                       pf.type AS product_type,
+                       pf.selection_priority AS selection_priority,
+                       direct_trait_ids,
+                       direct_trait_names,
+                       material_trait_ids,
+                       material_trait_names,
+                       direct_trait_ids + [x IN material_trait_ids WHERE NOT x IN direct_trait_ids] AS all_trait_ids
+                ORDER BY pf.selection_priority ASC
+            """)
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
 
     def get_goals_by_keywords(self, keywords: list[str]) -> list[dict]:
@@ -4394,22 +5246,24 @@ class GraphConnection:
         Returns:
             List of goal dicts with id, name, description, required_trait_id, required_trait_name
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (g:FunctionalGoal)-[:REQUIRES_TRAIT]->(t:PhysicalTrait)
-            WHERE g.keywords IS NOT NULL
-            WITH g, t, [kw IN g.keywords WHERE ANY(qkw IN $keywords WHERE toLower(qkw) = toLower(kw))] AS matched
-            WHERE size(matched) > 0
-            RETURN g.id AS id,
-                   g.name AS name,
-                   g.description AS description,
-                   t.id AS required_trait_id,
-                   t.name AS required_trait_name,
-                   matched AS matched_keywords,
-                   size(matched) AS match_count
-            ORDER BY match_count DESC
-        """, {"keywords": keywords})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (g:FunctionalGoal)-[:REQUIRES_TRAIT]->(t:PhysicalTrait)
+                WHERE g.keywords IS NOT NULL
+                WITH g, t, [kw IN g.keywords WHERE ANY(qkw IN $keywords WHERE toLower(qkw) = toLower(kw))] AS matched
+                WHERE size(matched) > 0
+                RETURN g.id AS id,
+                       g.name AS name,
+                       g.description AS description,
+                       t.id AS required_trait_id,
+                       t.name AS required_trait_name,
+                       matched AS matched_keywords,
+                       size(matched) AS match_count
+                ORDER BY match_count DESC
+            """, {"keywords": keywords})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
 
     # =========================================================================
@@ -4428,29 +5282,11 @@ class GraphConnection:
         """
         if not stressor_ids:
             return []
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (g:LogicGate)-[:MONITORS]->(s:EnvironmentalStressor)
-            WHERE s.id IN $stressor_ids
-            OPTIONAL MATCH (g)-[:REQUIRES_DATA]->(p:Parameter)
-            WITH g, s, collect({
-                param_id: p.id,
-                name: p.name,
-                property_key: p.property_key,
-                priority: p.priority,
-                question: p.question,
-                unit: p.unit
-            }) AS params
-            RETURN g.id AS gate_id,
-                   g.name AS gate_name,
-                   g.condition_logic AS condition_logic,
-                   g.physics_explanation AS physics_explanation,
-                   s.id AS stressor_id,
-                   s.name AS stressor_name,
-                   params
-            ORDER BY g.id
-        """, {"stressor_ids": stressor_ids})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_LOGIC_GATES_QUERY, {"stressor_ids": stressor_ids})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_gates_triggered_by_context(self, context_ids: list[str]) -> list[dict]:
         """Get LogicGate nodes triggered by Application/Environment contexts.
@@ -4464,30 +5300,32 @@ class GraphConnection:
         """
         if not context_ids:
             return []
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (ctx)-[:TRIGGERS_GATE]->(g:LogicGate)-[:MONITORS]->(s:EnvironmentalStressor)
-            WHERE ctx.id IN $context_ids
-            OPTIONAL MATCH (g)-[:REQUIRES_DATA]->(p:Parameter)
-            WITH ctx, g, s, collect({
-                param_id: p.id,
-                name: p.name,
-                property_key: p.property_key,
-                priority: p.priority,
-                question: p.question,
-                unit: p.unit
-            }) AS params
-            RETURN g.id AS gate_id,
-                   g.name AS gate_name,
-                   g.condition_logic AS condition_logic,
-                   g.physics_explanation AS physics_explanation,
-                   s.id AS stressor_id,
-                   s.name AS stressor_name,
-                   ctx.id AS context_id,
-                   params
-            ORDER BY g.id
-        """, {"context_ids": context_ids})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (ctx)-[:TRIGGERS_GATE]->(g:LogicGate)-[:MONITORS]->(s:EnvironmentalStressor)
+                WHERE ctx.id IN $context_ids
+                OPTIONAL MATCH (g)-[:REQUIRES_DATA]->(p:Parameter)
+                WITH ctx, g, s, collect({
+                    param_id: p.id,
+                    name: p.name,
+                    property_key: p.property_key,
+                    priority: p.priority,
+                    question: p.question,
+                    unit: p.unit
+                }) AS params
+                RETURN g.id AS gate_id,
+                       g.name AS gate_name,
+                       g.condition_logic AS condition_logic,
+                       g.physics_explanation AS physics_explanation,
+                       s.id AS stressor_id,
+                       s.name AS stressor_name,
+                       ctx.id AS context_id,
+                       params
+                ORDER BY g.id
+            """, {"context_ids": context_ids})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_hard_constraints(self, item_id: str) -> list[dict]:
         """Get HardConstraint nodes for a product family.
@@ -4499,16 +5337,11 @@ class GraphConnection:
             List of constraint dicts with id, property_key, operator, value, error_msg
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_HARD_CONSTRAINT]->(hc:HardConstraint)
-            RETURN hc.id AS id,
-                   hc.property_key AS property_key,
-                   hc.operator AS operator,
-                   hc.value AS value,
-                   hc.error_msg AS error_msg
-        """, {"pf_id": pf_id})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_HARD_CONSTRAINTS_QUERY, {"pf_id": pf_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_installation_constraints(self, item_id: str) -> list[dict]:
         """Get InstallationConstraint nodes for a product family.
@@ -4517,32 +5350,11 @@ class GraphConnection:
         ProductFamily properties (service_access_factor, allowed_environments, etc).
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_INSTALLATION_CONSTRAINT]->(ic:InstallationConstraint)
-            RETURN ic.id AS id,
-                   ic.constraint_type AS constraint_type,
-                   ic.dimension_key AS dimension_key,
-                   ic.factor_property AS factor_property,
-                   ic.comparison_key AS comparison_key,
-                   ic.list_property AS list_property,
-                   ic.input_key AS input_key,
-                   ic.cross_property AS cross_property,
-                   ic.material_context_key AS material_context_key,
-                   ic.context_match_key AS context_match_key,
-                   ic.cross_rel_type AS cross_rel_type,
-                   ic.cross_node_match_property AS cross_node_match_property,
-                   ic.operator AS operator,
-                   ic.severity AS severity,
-                   ic.error_msg AS error_msg,
-                   pf.service_access_factor AS service_access_factor,
-                   pf.service_access_type AS service_access_type,
-                   pf.service_warning AS service_warning,
-                   pf.allowed_environments AS allowed_environments,
-                   pf.construction_type AS construction_type,
-                   ic.valid_set AS valid_set
-        """, {"pf_id": pf_id})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_INSTALLATION_CONSTRAINTS_QUERY, {"pf_id": pf_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_material_property(self, item_id: str, material_code: str, property_name: str):
         """Get a single property from a Material node linked to a ProductFamily.
@@ -4551,13 +5363,15 @@ class GraphConnection:
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
         mat_id = material_code if material_code.startswith("MAT_") else f"MAT_{material_code.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material {id: $mat_id})
-            RETURN m[$property_name] AS value
-        """, {"pf_id": pf_id, "mat_id": mat_id, "property_name": property_name})
-        record = result_single(result)
-        return record["value"] if record else None
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (pf:ProductFamily {id: $pf_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material {id: $mat_id})
+                RETURN m[$property_name] AS value
+            """, {"pf_id": pf_id, "mat_id": mat_id, "property_name": property_name})
+            record = result_single(result)
+            return record["value"] if record else None
+        return self._execute_with_retry(_query)
 
     def get_related_node_property(self, pf_id: str, rel_type: str,
                                    match_prop: str, match_val,
@@ -4568,15 +5382,17 @@ class GraphConnection:
         Property names come from graph IC metadata (trusted, not user input).
         """
         pf_id = pf_id if pf_id.startswith("FAM_") else f"FAM_{pf_id.upper()}"
-        graph = self.connect()
-        result = graph.query(f"""
-            MATCH (pf:ProductFamily {{id: $pf_id}})-[:{rel_type}]->(node)
-            WHERE node.{match_prop} = $match_val
-            RETURN node.{target_prop} AS value
-            LIMIT 1
-        """, {"pf_id": pf_id, "match_val": match_val})
-        record = result_single(result)
-        return record["value"] if record else None
+        def _query():
+            graph = self.connect()
+            result = graph.query(f"""
+                MATCH (pf:ProductFamily {{id: $pf_id}})-[:{rel_type}]->(node)
+                WHERE node.{match_prop} = $match_val
+                RETURN node.{target_prop} AS value
+                LIMIT 1
+            """, {"pf_id": pf_id, "match_val": match_val})
+            record = result_single(result)
+            return record["value"] if record else None
+        return self._execute_with_retry(_query)
 
     def find_compatible_variants(self, pf_id: str, rel_type: str,
                                   match_prop: str, threshold_prop: str,
@@ -4587,15 +5403,17 @@ class GraphConnection:
         variant alternatives (e.g. longer housing that fits a given depth).
         """
         pf_id = pf_id if pf_id.startswith("FAM_") else f"FAM_{pf_id.upper()}"
-        graph = self.connect()
-        result = graph.query(f"""
-            MATCH (pf:ProductFamily {{id: $pf_id}})-[:{rel_type}]->(node)
-            WHERE node.{threshold_prop} >= $min_threshold
-            RETURN node.{match_prop} AS variant_value,
-                   node.{threshold_prop} AS threshold
-            ORDER BY node.{match_prop} ASC
-        """, {"pf_id": pf_id, "min_threshold": min_threshold})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(f"""
+                MATCH (pf:ProductFamily {{id: $pf_id}})-[:{rel_type}]->(node)
+                WHERE node.{threshold_prop} >= $min_threshold
+                RETURN node.{match_prop} AS variant_value,
+                       node.{threshold_prop} AS threshold
+                ORDER BY node.{match_prop} ASC
+            """, {"pf_id": pf_id, "min_threshold": min_threshold})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_application_properties(self, app_id: str) -> dict:
         """Get properties from an Application node (e.g. typical_chlorine_ppm).
@@ -4603,12 +5421,11 @@ class GraphConnection:
         Returns dict of application properties or empty dict if not found.
         """
         full_id = app_id if app_id.startswith("APP_") else f"APP_{app_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (a:Application {id: $app_id})
-            RETURN a.typical_chlorine_ppm AS typical_chlorine_ppm
-        """, {"app_id": full_id})
-        return result_single(result) or {}
+        def _query():
+            graph = self.connect()
+            result = graph.query(_APPLICATION_PROPERTIES_QUERY, {"app_id": full_id})
+            return result_single(result) or {}
+        return self._execute_with_retry(_query)
 
     # =========================================================================
     # v3.3: Alternative product search for installation constraint violations
@@ -4635,39 +5452,41 @@ class GraphConnection:
         dm_prop = f"{dimension_key}_mm"
         trait_ids = required_trait_ids or []
         trait_count = len(trait_ids)
-        graph = self.connect()
-        result = graph.query(f"""
-            MATCH (pf:ProductFamily)
-            WHERE pf.id <> $blocked_pf_id
-              AND pf.service_access_factor IS NOT NULL
-            WITH pf, $dim_value * (1.0 + pf.service_access_factor) AS required_space
-            WHERE required_space <= $available_space
-            OPTIONAL MATCH (pf)-[:HAS_VARIANT]->(pv:ProductVariant)
-            WHERE pv.{dm_prop} = toInteger($dim_value)
-            WITH pf, required_space, count(pv) AS matching_sizes
-            WHERE matching_sizes > 0
-            // v3.5: Trait qualification — only return alternatives with required traits
-            WITH pf, required_space
-            OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
-            WHERE t.id IN $trait_ids
-            WITH pf, required_space, count(t) AS matched_traits
-            WHERE $trait_count = 0 OR matched_traits >= $trait_count
-            RETURN pf.id AS product_id,
-                   pf.name AS product_name,
-                   pf.type AS product_type,
-                   pf.selection_priority AS selection_priority,
-                   pf.service_access_factor AS service_access_factor,
-                   pf.service_access_type AS service_access_type,
-                   required_space AS required_space_mm
-            ORDER BY pf.selection_priority ASC
-        """, {
-            "blocked_pf_id": pf_id,
-            "dim_value": dim_value,
-            "available_space": available_space,
-            "trait_ids": trait_ids,
-            "trait_count": trait_count,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(f"""
+                MATCH (pf:ProductFamily)
+                WHERE pf.id <> $blocked_pf_id
+                  AND pf.service_access_factor IS NOT NULL
+                WITH pf, $dim_value * (1.0 + pf.service_access_factor) AS required_space
+                WHERE required_space <= $available_space
+                OPTIONAL MATCH (pf)-[:HAS_VARIANT]->(pv:ProductVariant)
+                WHERE pv.{dm_prop} = toInteger($dim_value)
+                WITH pf, required_space, count(pv) AS matching_sizes
+                WHERE matching_sizes > 0
+                // v3.5: Trait qualification — only return alternatives with required traits
+                WITH pf, required_space
+                OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
+                WHERE t.id IN $trait_ids
+                WITH pf, required_space, count(t) AS matched_traits
+                WHERE $trait_count = 0 OR matched_traits >= $trait_count
+                RETURN pf.id AS product_id,
+                       pf.name AS product_name,
+                       pf.type AS product_type,
+                       pf.selection_priority AS selection_priority,
+                       pf.service_access_factor AS service_access_factor,
+                       pf.service_access_type AS service_access_type,
+                       required_space AS required_space_mm
+                ORDER BY pf.selection_priority ASC
+            """, {
+                "blocked_pf_id": pf_id,
+                "dim_value": dim_value,
+                "available_space": available_space,
+                "trait_ids": trait_ids,
+                "trait_count": trait_count,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def find_alternatives_for_environment_constraint(
         self,
@@ -4688,31 +5507,33 @@ class GraphConnection:
         trait_count = len(trait_ids)
         # v3.6: Support env chain (IS_A hierarchy)
         env_chain = required_environments or ([required_environment.strip()] if required_environment else [])
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily)
-            WHERE pf.id <> $blocked_pf_id
-              AND pf.allowed_environments IS NOT NULL
-              AND ANY(env IN $env_chain WHERE env IN pf.allowed_environments)
-            // v3.5: Trait qualification
-            WITH pf
-            OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
-            WHERE t.id IN $trait_ids
-            WITH pf, count(t) AS matched_traits
-            WHERE $trait_count = 0 OR matched_traits >= $trait_count
-            RETURN pf.id AS product_id,
-                   pf.name AS product_name,
-                   pf.type AS product_type,
-                   pf.selection_priority AS selection_priority,
-                   pf.allowed_environments AS allowed_environments
-            ORDER BY pf.selection_priority ASC
-        """, {
-            "blocked_pf_id": pf_id,
-            "env_chain": env_chain,
-            "trait_ids": trait_ids,
-            "trait_count": trait_count,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (pf:ProductFamily)
+                WHERE pf.id <> $blocked_pf_id
+                  AND pf.allowed_environments IS NOT NULL
+                  AND ANY(env IN $env_chain WHERE env IN pf.allowed_environments)
+                // v3.5: Trait qualification
+                WITH pf
+                OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
+                WHERE t.id IN $trait_ids
+                WITH pf, count(t) AS matched_traits
+                WHERE $trait_count = 0 OR matched_traits >= $trait_count
+                RETURN pf.id AS product_id,
+                       pf.name AS product_name,
+                       pf.type AS product_type,
+                       pf.selection_priority AS selection_priority,
+                       pf.allowed_environments AS allowed_environments
+                ORDER BY pf.selection_priority ASC
+            """, {
+                "blocked_pf_id": pf_id,
+                "env_chain": env_chain,
+                "trait_ids": trait_ids,
+                "trait_count": trait_count,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def find_material_alternatives_for_threshold(
         self,
@@ -4726,21 +5547,23 @@ class GraphConnection:
         Ordered by threshold value DESC (best first).
         """
         full_pf_id = pf_id if pf_id.startswith("FAM_") else f"FAM_{pf_id.upper()}"
-        graph = self.connect()
-        result = graph.query(f"""
-            MATCH (pf:ProductFamily {{id: $pf_id}})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
-            WHERE m.{cross_property} IS NOT NULL
-              AND m.{cross_property} >= $required_value
-            RETURN m.id AS material_id,
-                   m.code AS material_code,
-                   m.name AS material_name,
-                   m.{cross_property} AS threshold_value
-            ORDER BY m.{cross_property} DESC
-        """, {
-            "pf_id": full_pf_id,
-            "required_value": required_value,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(f"""
+                MATCH (pf:ProductFamily {{id: $pf_id}})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+                WHERE m.{cross_property} IS NOT NULL
+                  AND m.{cross_property} >= $required_value
+                RETURN m.id AS material_id,
+                       m.code AS material_code,
+                       m.name AS material_name,
+                       m.{cross_property} AS threshold_value
+                ORDER BY m.{cross_property} DESC
+            """, {
+                "pf_id": full_pf_id,
+                "required_value": required_value,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def find_other_products_for_material_threshold(
         self,
@@ -4760,36 +5583,38 @@ class GraphConnection:
         pf_id = blocked_pf_id if blocked_pf_id.startswith("FAM_") else f"FAM_{blocked_pf_id.upper()}"
         trait_ids = required_trait_ids or []
         trait_count = len(trait_ids)
-        graph = self.connect()
-        result = graph.query(f"""
-            MATCH (pf:ProductFamily)-[:AVAILABLE_IN_MATERIAL]->(m:Material)
-            WHERE pf.id <> $blocked_pf_id
-              AND m.{cross_property} IS NOT NULL
-              AND m.{cross_property} >= $required_value
-            WITH pf, collect({{
-                code: m.code,
-                name: m.name,
-                threshold: m.{cross_property}
-            }}) AS qualifying_materials
-            WHERE size(qualifying_materials) > 0
-            // v3.5: Trait qualification
-            OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
-            WHERE t.id IN $trait_ids
-            WITH pf, qualifying_materials, count(t) AS matched_traits
-            WHERE $trait_count = 0 OR matched_traits >= $trait_count
-            RETURN pf.id AS product_id,
-                   pf.name AS product_name,
-                   pf.type AS product_type,
-                   pf.selection_priority AS selection_priority,
-                   qualifying_materials
-            ORDER BY pf.selection_priority ASC
-        """, {
-            "blocked_pf_id": pf_id,
-            "required_value": required_value,
-            "trait_ids": trait_ids,
-            "trait_count": trait_count,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(f"""
+                MATCH (pf:ProductFamily)-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+                WHERE pf.id <> $blocked_pf_id
+                  AND m.{cross_property} IS NOT NULL
+                  AND m.{cross_property} >= $required_value
+                WITH pf, collect({{
+                    code: m.code,
+                    name: m.name,
+                    threshold: m.{cross_property}
+                }}) AS qualifying_materials
+                WHERE size(qualifying_materials) > 0
+                // v3.5: Trait qualification
+                OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
+                WHERE t.id IN $trait_ids
+                WITH pf, qualifying_materials, count(t) AS matched_traits
+                WHERE $trait_count = 0 OR matched_traits >= $trait_count
+                RETURN pf.id AS product_id,
+                       pf.name AS product_name,
+                       pf.type AS product_type,
+                       pf.selection_priority AS selection_priority,
+                       qualifying_materials
+                ORDER BY pf.selection_priority ASC
+            """, {
+                "blocked_pf_id": pf_id,
+                "required_value": required_value,
+                "trait_ids": trait_ids,
+                "trait_count": trait_count,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def find_products_with_higher_capacity(
         self,
@@ -4807,34 +5632,41 @@ class GraphConnection:
         Ordered by selection_priority ASC (preferred first).
         """
         pf_id = blocked_pf_id if blocked_pf_id.startswith("FAM_") else f"FAM_{blocked_pf_id.upper()}"
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.products_with_higher_capacity(
+                pf_id, module_descriptor, min_output_rating, required_trait_ids,
+            )
         trait_ids = required_trait_ids or []
         trait_count = len(trait_ids)
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily)-[:HAS_CAPACITY]->(cr:CapacityRule)
-            WHERE pf.id <> $blocked_pf_id
-              AND cr.module_descriptor = $module_descriptor
-              AND cr.output_rating > $min_output_rating
-            // v3.5: Trait qualification
-            WITH pf, cr
-            OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
-            WHERE t.id IN $trait_ids
-            WITH pf, cr, count(t) AS matched_traits
-            WHERE $trait_count = 0 OR matched_traits >= $trait_count
-            RETURN pf.id AS product_id,
-                   pf.name AS product_name,
-                   pf.selection_priority AS selection_priority,
-                   cr.output_rating AS output_rating,
-                   cr.description AS description
-            ORDER BY pf.selection_priority ASC
-        """, {
-            "blocked_pf_id": pf_id,
-            "module_descriptor": module_descriptor,
-            "min_output_rating": min_output_rating,
-            "trait_ids": trait_ids,
-            "trait_count": trait_count,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (pf:ProductFamily)-[:HAS_CAPACITY]->(cr:CapacityRule)
+                WHERE pf.id <> $blocked_pf_id
+                  AND cr.module_descriptor = $module_descriptor
+                  AND cr.output_rating > $min_output_rating
+                // v3.5: Trait qualification
+                WITH pf, cr
+                OPTIONAL MATCH (pf)-[:HAS_TRAIT]->(t:PhysicalTrait)
+                WHERE t.id IN $trait_ids
+                WITH pf, cr, count(t) AS matched_traits
+                WHERE $trait_count = 0 OR matched_traits >= $trait_count
+                RETURN pf.id AS product_id,
+                       pf.name AS product_name,
+                       pf.selection_priority AS selection_priority,
+                       cr.output_rating AS output_rating,
+                       cr.description AS description
+                ORDER BY pf.selection_priority ASC
+            """, {
+                "blocked_pf_id": pf_id,
+                "module_descriptor": module_descriptor,
+                "min_output_rating": min_output_rating,
+                "trait_ids": trait_ids,
+                "trait_count": trait_count,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_dependency_rules_for_stressors(self, stressor_ids: list[str]) -> list[dict]:
         """Get DependencyRule nodes triggered by given stressors.
@@ -4848,23 +5680,25 @@ class GraphConnection:
         """
         if not stressor_ids:
             return []
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (dr:DependencyRule)-[:TRIGGERED_BY_STRESSOR]->(s:EnvironmentalStressor)
-            WHERE s.id IN $stressor_ids
-            MATCH (dr)-[:UPSTREAM_REQUIRES_TRAIT]->(ut:PhysicalTrait)
-            MATCH (dr)-[:DOWNSTREAM_PROVIDES_TRAIT]->(dt:PhysicalTrait)
-            RETURN dr.id AS id,
-                   dr.dependency_type AS dependency_type,
-                   dr.description AS description,
-                   ut.id AS upstream_trait_id,
-                   ut.name AS upstream_trait_name,
-                   dt.id AS downstream_trait_id,
-                   dt.name AS downstream_trait_name,
-                   s.id AS stressor_id,
-                   s.name AS stressor_name
-        """, {"stressor_ids": stressor_ids})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (dr:DependencyRule)-[:TRIGGERED_BY_STRESSOR]->(s:EnvironmentalStressor)
+                WHERE s.id IN $stressor_ids
+                MATCH (dr)-[:UPSTREAM_REQUIRES_TRAIT]->(ut:PhysicalTrait)
+                MATCH (dr)-[:DOWNSTREAM_PROVIDES_TRAIT]->(dt:PhysicalTrait)
+                RETURN dr.id AS id,
+                       dr.dependency_type AS dependency_type,
+                       dr.description AS description,
+                       ut.id AS upstream_trait_id,
+                       ut.name AS upstream_trait_name,
+                       dt.id AS downstream_trait_id,
+                       dt.name AS downstream_trait_name,
+                       s.id AS stressor_id,
+                       s.name AS stressor_name
+            """, {"stressor_ids": stressor_ids})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_optimization_strategy(self, item_id: str) -> dict | None:
         """Get optimization Strategy for a product family.
@@ -4876,20 +5710,14 @@ class GraphConnection:
             Strategy dict with id, name, sort_property, sort_order, description — or None
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:OPTIMIZATION_STRATEGY]->(s:Strategy)
-            RETURN s.id AS id,
-                   s.name AS name,
-                   s.sort_property AS sort_property,
-                   s.sort_order AS sort_order,
-                   s.description AS description,
-                   s.primary_axis AS primary_axis,
-                   s.secondary_axis AS secondary_axis,
-                   s.expansion_unit AS expansion_unit
-            LIMIT 1
-        """, {"pf_id": pf_id})
-        return result_single(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.optimization_strategy(pf_id)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_OPTIMIZATION_STRATEGY_QUERY, {"pf_id": pf_id})
+            return result_single(result)
+        return self._execute_with_retry(_query)
 
     def get_size_determined_properties(
         self, module_id: str, product_family_id: str
@@ -4907,29 +5735,31 @@ class GraphConnection:
             if product_family_id.startswith("FAM_")
             else f"FAM_{product_family_id.upper()}"
         )
-        graph = self.connect()
-        # v4.0: Check ProductVariant directly for cartridge_count
-        if module_id.startswith("PV_"):
-            pv_result = graph.query("""
-                MATCH (pv:ProductVariant {id: $module_id})
-                WHERE pv.cartridge_count IS NOT NULL
-                RETURN 'capacity_units' AS key,
-                       pv.cartridge_count AS value,
-                       'cartridges' AS display_name
-            """, {"module_id": module_id})
-            pv_props = result_to_dicts(pv_result)
-            if pv_props:
-                return pv_props
-
-        # Legacy: DimensionModule → SizeProperty path
-        result = graph.query("""
-            MATCH (dm:DimensionModule {id: $module_id})-[:DETERMINES_PROPERTY]->(sp:SizeProperty)
-            WHERE sp.for_family = $pf_id OR sp.for_family IS NULL
-            RETURN sp.key AS key,
-                   sp.value AS value,
-                   sp.display_name AS display_name
-        """, {"module_id": module_id, "pf_id": pf_id})
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            # v4.0: Check ProductVariant directly for cartridge_count
+            if module_id.startswith("PV_"):
+                pv_result = graph.query("""
+                    MATCH (pv:ProductVariant {id: $module_id})
+                    WHERE pv.cartridge_count IS NOT NULL
+                    RETURN 'capacity_units' AS key,
+                           pv.cartridge_count AS value,
+                           'cartridges' AS display_name
+                """, {"module_id": module_id})
+                pv_props = result_to_dicts(pv_result)
+                if pv_props:
+                    return pv_props
+
+            # Legacy: DimensionModule → SizeProperty path
+            result = graph.query("""
+                MATCH (dm:DimensionModule {id: $module_id})-[:DETERMINES_PROPERTY]->(sp:SizeProperty)
+                WHERE sp.for_family = $pf_id OR sp.for_family IS NULL
+                RETURN sp.key AS key,
+                       sp.value AS value,
+                       sp.display_name AS display_name
+            """, {"module_id": module_id, "pf_id": pf_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_capacity_rules(self, item_id: str) -> list[dict]:
         """Get CapacityRule nodes for a product family.
@@ -4942,19 +5772,14 @@ class GraphConnection:
             output_rating, assumption, description
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_CAPACITY]->(cr:CapacityRule)
-            RETURN cr.id AS id,
-                   cr.module_descriptor AS module_descriptor,
-                   cr.input_requirement AS input_requirement,
-                   cr.output_rating AS output_rating,
-                   cr.assumption AS assumption,
-                   cr.description AS description,
-                   cr.capacity_per_component AS capacity_per_component,
-                   cr.component_count_key AS component_count_key
-        """, {"pf_id": pf_id})
-        return result_to_dicts(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.capacity_rules(pf_id)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_CAPACITY_RULES_QUERY, {"pf_id": pf_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
 
     def get_available_dimension_modules(self, item_id: str) -> list[dict]:
@@ -4971,17 +5796,22 @@ class GraphConnection:
             List of dicts with id, width_mm, height_mm, reference_airflow_m3h, label
         """
         pf_id = item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_VARIANT]->(pv:ProductVariant)
-            RETURN pv.id AS id,
-                   pv.width_mm AS width_mm,
-                   pv.height_mm AS height_mm,
-                   pv.reference_airflow_m3h AS reference_airflow_m3h,
-                   pv.label AS label
-            ORDER BY pv.reference_airflow_m3h DESC
-        """, {"pf_id": pf_id})
-        return result_to_dicts(result)
+        snapshot = self.catalog_snapshot()
+        if snapshot is not None:
+            return snapshot.available_dimension_modules(pf_id)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                MATCH (pf:ProductFamily {id: $pf_id})-[:HAS_VARIANT]->(pv:ProductVariant)
+                RETURN pv.id AS id,
+                       pv.width_mm AS width_mm,
+                       pv.height_mm AS height_mm,
+                       pv.reference_airflow_m3h AS reference_airflow_m3h,
+                       pv.label AS label
+                ORDER BY pv.reference_airflow_m3h DESC
+            """, {"pf_id": pf_id})
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def validate_spatial_feasibility(
         self,
@@ -5008,50 +5838,52 @@ class GraphConnection:
         if not pf_ids or airflow <= 0:
             return []
 
-        graph = self.connect()
-        result = graph.query("""
-            UNWIND $pf_ids AS pf_id
-            MATCH (pf:ProductFamily {id: pf_id})-[:HAS_VARIANT]->(pv:ProductVariant)
-            WHERE ($explicit_width = 0 OR pv.width_mm = $explicit_width)
-              AND ($explicit_height = 0 OR pv.height_mm = $explicit_height)
-              AND ($max_width = 0 OR pv.width_mm <= $max_width)
-              AND ($max_height = 0 OR pv.height_mm <= $max_height)
-
-            WITH pf, pv, pv.reference_airflow_m3h AS effective_airflow
-
-            ORDER BY effective_airflow DESC
-            WITH pf, collect({w: pv.width_mm, h: pv.height_mm, af: effective_airflow})[0] AS best
-            WHERE best.af IS NOT NULL AND best.af > 0
-
-            WITH pf, best,
-                 toInteger(ceil(toFloat($airflow) / best.af)) AS modules_needed
-
-            WITH pf, best, modules_needed,
-                 CASE WHEN $max_width > 0
-                      THEN toInteger(floor(toFloat($max_width) / best.w))
-                      ELSE modules_needed END AS max_horizontal,
-                 CASE WHEN $max_height > 0
-                      THEN toInteger(floor(toFloat($max_height) / best.h))
-                      ELSE modules_needed END AS max_vertical
-
-            WHERE modules_needed <= max_horizontal * max_vertical
-
-            RETURN pf.id AS product_family_id,
-                   modules_needed,
-                   best.af AS airflow_per_module,
-                   best.w AS module_width,
-                   best.h AS module_height,
-                   max_horizontal * max_vertical AS max_modules_fitting
-            ORDER BY modules_needed ASC
-        """, {
-            "pf_ids": pf_ids,
-            "airflow": airflow,
-            "max_width": max_width,
-            "max_height": max_height,
-            "explicit_width": explicit_width,
-            "explicit_height": explicit_height,
-        })
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query("""
+                UNWIND $pf_ids AS pf_id
+                MATCH (pf:ProductFamily {id: pf_id})-[:HAS_VARIANT]->(pv:ProductVariant)
+                WHERE ($explicit_width = 0 OR pv.width_mm = $explicit_width)
+                  AND ($explicit_height = 0 OR pv.height_mm = $explicit_height)
+                  AND ($max_width = 0 OR pv.width_mm <= $max_width)
+                  AND ($max_height = 0 OR pv.height_mm <= $max_height)
+
+                WITH pf, pv, pv.reference_airflow_m3h AS effective_airflow
+
+                ORDER BY effective_airflow DESC
+                WITH pf, collect({w: pv.width_mm, h: pv.height_mm, af: effective_airflow})[0] AS best
+                WHERE best.af IS NOT NULL AND best.af > 0
+
+                WITH pf, best,
+                     toInteger(ceil(toFloat($airflow) / best.af)) AS modules_needed
+
+                WITH pf, best, modules_needed,
+                     CASE WHEN $max_width > 0
+                          THEN toInteger(floor(toFloat($max_width) / best.w))
+                          ELSE modules_needed END AS max_horizontal,
+                     CASE WHEN $max_height > 0
+                          THEN toInteger(floor(toFloat($max_height) / best.h))
+                          ELSE modules_needed END AS max_vertical
+
+                WHERE modules_needed <= max_horizontal * max_vertical
+
+                RETURN pf.id AS product_family_id,
+                       modules_needed,
+                       best.af AS airflow_per_module,
+                       best.w AS module_width,
+                       best.h AS module_height,
+                       max_horizontal * max_vertical AS max_modules_fitting
+                ORDER BY modules_needed ASC
+            """, {
+                "pf_ids": pf_ids,
+                "airflow": airflow,
+                "max_width": max_width,
+                "max_height": max_height,
+                "explicit_width": explicit_width,
+                "explicit_height": explicit_height,
+            })
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
     def get_all_accessory_codes(self) -> list[dict]:
         """Get all known accessory codes from the graph.
@@ -5059,15 +5891,11 @@ class GraphConnection:
         Returns:
             List of dicts with code (from ID) and name for each Accessory node.
         """
-        graph = self.connect()
-        result = graph.query("""
-            MATCH (a:Accessory)
-            RETURN a.id AS id,
-                   replace(a.id, 'ACC_', '') AS code,
-                   a.name AS name
-            ORDER BY a.id
-        """)
-        return result_to_dicts(result)
+        def _query():
+            graph = self.connect()
+            result = graph.query(_ACCESSORY_CODES_QUERY)
+            return result_to_dicts(result)
+        return self._execute_with_retry(_query)
 
 
     # ========================================
@@ -5087,8 +5915,7 @@ class GraphConnection:
         Returns:
             List of candidate-shaped dicts matching the KnowledgeCandidate interface.
         """
-        cache_key = "graph_rules_as_candidates"
-        cached = _get_cached(cache_key)
+        cached = _get_cached("graph_rules_as_candidates")
         if cached is not None:
             return cached
 
@@ -5174,7 +6001,7 @@ class GraphConnection:
             return result_to_dicts(result)
 
         result = self._execute_with_retry(_query)
-        _set_cached(cache_key, result)
+        _set_cached("graph_rules_as_candidates", "", result)
         return result
 
 
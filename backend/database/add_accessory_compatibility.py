@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
@@ -225,6 +226,7 @@ def main():
         create_accessory_nodes(graph)
         create_compatibility_relationships(graph)
         verify_compatibility(graph)
+        bump_graph_version(graph, source="add_accessory_compatibility")
 
         print("\n" + "=" * 60)
         print("COMPATIBILITY SCHEMA COMPLETE")
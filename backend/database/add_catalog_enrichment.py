@@ -18,6 +18,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
@@ -409,6 +410,7 @@ def main():
         update_option_nodes(graph)
         add_transition_pieces(graph)
         verify_schema(graph)
+        bump_graph_version(graph, source="add_catalog_enrichment")
 
         print("\n" + "=" * 60)
         print("CATALOG ENRICHMENT COMPLETE")
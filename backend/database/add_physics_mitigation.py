@@ -21,6 +21,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
@@ -340,6 +341,7 @@ def main():
         create_physics_relationships(graph)
         link_products_to_features(graph)
         verify_physics_model(graph)
+        bump_graph_version(graph, source="add_physics_mitigation")
 
         print("\n" + "=" * 60)
         print("PHYSICS SCHEMA COMPLETE")
@@ -20,6 +20,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 _script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -137,6 +138,7 @@ def main():
 
     try:
         add_powder_coating(graph)
+        bump_graph_version(graph, source="add_powder_coating")
         print("\n✅ Powder Coating application seeded successfully")
     except Exception as e:
         print(f"\nError: {e}")
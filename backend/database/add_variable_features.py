@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
@@ -192,6 +193,7 @@ def main():
         print("Connected successfully!")
 
         add_variable_features(graph)
+        bump_graph_version(graph, source="add_variable_features")
 
         print("\n" + "=" * 60)
         print("SCHEMA UPDATE COMPLETE")
@@ -66,6 +66,8 @@ def apply_polis_constraint():
     else:
         print("[INFO] No existing length variants found to mark as incompatible")
 
+    db.bump_graph_version(source="apply_geometric_constraints")
+
     print("\n[DONE] Geometric constraint for Polis option applied successfully!")
     print("       The Physical Constraint Validator will now block configurations")
     print("       where Polis is requested with space limits under 900mm.")
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
@@ -226,6 +227,7 @@ def main():
         fix_cross_sell_relationships(graph)
         enhance_option_display_labels(graph)
         verify_changes(graph)
+        bump_graph_version(graph, source="fix_inventory_logic")
 
         print("\n" + "=" * 60)
         print("INVENTORY FIX COMPLETE")
@@ -18,6 +18,7 @@ import os
 import sys
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from graph_version import bump_graph_version
 
 load_dotenv(dotenv_path="../.env")
 
@@ -1068,6 +1069,7 @@ def main():
 
         create_indexes(graph)
         verify_trait_graph(graph)
+        bump_graph_version(graph, source="mh_hvac_traits")
 
         print("\n" + "=" * 60)
         print("TRAIT SEED v2.0 COMPLETE")
@@ -297,6 +297,9 @@ def main():
     # Verify
     verify(graph)
 
+    from graph_version import bump_graph_version
+    bump_graph_version(graph, source="migrate_neo4j_to_falkor")
+
     total_time = time.time() - start
     print(f"\n{'=' * 60}")
     print(f"Migration complete in {total_time:.1f}s")
@@ -17,6 +17,7 @@ from typing import Optional
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
+from graph_version import bump_graph_version
 
 load_dotenv(dotenv_path="../../.env")
 
@@ -653,6 +654,7 @@ def main():
     db = FalkorDB(host=host, port=port, password=password)
     graph = db.select_graph(graph_name)
     seed_hvac_data(graph)
+    bump_graph_version(graph, source="seed_hvac")
 
 
 if __name__ == "__main__":
@@ -22,41 +22,60 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 from db_result_helpers import result_to_dicts, result_single, result_value
+from embeddings import generate_embeddings_batch
+from graph_version import bump_graph_version
 from falkordb import FalkorDB
 
 load_dotenv(dotenv_path="../.env")
 
 # Embedding configuration - using Gemini to match existing infrastructure
-EMBEDDING_MODEL = "models/text-embedding-004"
 EMBEDDING_DIMENSIONS = 3072
 
+# Nodes written back per UNWIND query
+WRITE_BATCH_SIZE = 200
+
 # Vector index configuration
 APPLICATION_INDEX = "application_embeddings"
 RISK_INDEX = "risk_embeddings"
 SUBSTANCE_INDEX = "substance_embeddings"
 
 
-def get_embedding(text: str) -> list[float]:
-    """Generate embedding using Google's Gemini embedding model."""
+def write_embeddings(graph, label: str, items: list[tuple[str, str, str]]) -> int:
+    """Batch-embed ``items`` ``[(node_id, name, text)]`` and store the vectors.
+
+    Embeddings are requested through embeddings.generate_embeddings_batch
+    (batched requests, worker pool, rate limiting, retries); vectors are
+    written back with one UNWIND query per batch.
+    """
     try:
-        # Try new google.genai package first
-        from google import genai
-        client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"))
-        result = client.models.embed_content(
-            model="gemini-embedding-001",
-            contents=text
-        )
-        return list(result.embeddings[0].values)
-    except ImportError:
-        # Fallback to deprecated package
-        import google.generativeai as genai
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"))
-        result = genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=text,
-            task_type="retrieval_document"
-        )
-        return result['embedding']
+        embeddings = generate_embeddings_batch([text for _, _, text in items])
+    except Exception as e:
+        print(f"      Error embedding {label} nodes: {e}")
+        return 0
+
+    embedded_count = 0
+    for start in range(0, len(items), WRITE_BATCH_SIZE):
+        rows = [
+            {"id": node_id, "embedding": embedding, "text": text}
+            for (node_id, _, text), embedding in zip(
+                items[start:start + WRITE_BATCH_SIZE], embeddings[start:start + WRITE_BATCH_SIZE]
+            )
+        ]
+        try:
+            graph.query(f"""
+                UNWIND $rows AS row
+                MATCH (n:{label} {{id: row.id}})
+                SET n.embedding = row.embedding,
+                    n.embedding_text = row.text
+            """, {"rows": rows})
+        except Exception as e:
+            print(f"      Error storing {label} embeddings: {e}")
+            continue
+        for _, name, _ in items[start:start + WRITE_BATCH_SIZE]:
+            print(f"      Embedded: {name}")
+        embedded_count += len(rows)
+
+    return embedded_count
 
 
 def create_vector_indexes(graph):
@@ -102,7 +121,7 @@ def update_application_embeddings(graph):
         RETURN app.id AS id, app.name AS name, app.keywords AS keywords
     """)
 
-    applications = list(result)
+    applications = result_to_dicts(result)
 
     if not applications:
         print("   No Application nodes need embeddings (already embedded or none exist)")
@@ -110,7 +129,7 @@ def update_application_embeddings(graph):
 
     print(f"   Found {len(applications)} Application nodes to embed...")
 
-    embedded_count = 0
+    items = []
     for app in applications:
         app_id = app["id"]
         name = app["name"]
@@ -134,24 +153,9 @@ def update_application_embeddings(graph):
         if name in semantic_expansions:
             text_for_embedding += f" Related concepts: {semantic_expansions[name]}"
 
-        try:
-            embedding = get_embedding(text_for_embedding)
-
-            # Update the node with embedding
-            # Neo4j accepts float arrays directly as properties
-            graph.query("""
-                MATCH (app:Application {id: $id})
-                SET app.embedding = $embedding,
-                    app.embedding_text = $text
-            """, id=app_id, embedding=embedding, text=text_for_embedding)
-
-            embedded_count += 1
-            print(f"      Embedded: {name}")
-
-        except Exception as e:
-            print(f"      Error embedding {name}: {e}")
+        items.append((app_id, name, text_for_embedding))
 
-    return embedded_count
+    return write_embeddings(graph, "Application", items)
 
 
 def update_risk_embeddings(graph):
@@ -164,7 +168,7 @@ def update_risk_embeddings(graph):
         RETURN r.id AS id, r.name AS name, r.desc AS description, r.severity AS severity
     """)
 
-    risks = list(result)
+    risks = result_to_dicts(result)
 
     if not risks:
         print("   No Risk nodes need embeddings")
@@ -172,31 +176,16 @@ def update_risk_embeddings(graph):
 
     print(f"   Found {len(risks)} Risk nodes to embed...")
 
-    embedded_count = 0
+    items = []
     for risk in risks:
-        risk_id = risk["id"]
         name = risk["name"]
         description = risk["description"] or ""
         severity = risk["severity"] or ""
 
         text_for_embedding = f"Risk: {name}. {description}. Severity: {severity}"
+        items.append((risk["id"], name, text_for_embedding))
 
-        try:
-            embedding = get_embedding(text_for_embedding)
-
-            graph.query("""
-                MATCH (r:Risk {id: $id})
-                SET r.embedding = $embedding,
-                    r.embedding_text = $text
-            """, id=risk_id, embedding=embedding, text=text_for_embedding)
-
-            embedded_count += 1
-            print(f"      Embedded: {name}")
-
-        except Exception as e:
-            print(f"      Error embedding {name}: {e}")
-
-    return embedded_count
+    return write_embeddings(graph, "Risk", items)
 
 
 def update_substance_embeddings(graph):
@@ -209,7 +198,7 @@ def update_substance_embeddings(graph):
         RETURN s.id AS id, s.name AS name
     """)
 
-    substances = list(result)
+    substances = result_to_dicts(result)
 
     if not substances:
         print("   No Substance nodes need embeddings")
@@ -217,7 +206,7 @@ def update_substance_embeddings(graph):
 
     print(f"   Found {len(substances)} Substance nodes to embed...")
 
-    embedded_count = 0
+    items = []
     for sub in substances:
         sub_id = sub["id"]
         name = sub["name"]
@@ -234,23 +223,9 @@ def update_substance_embeddings(graph):
 
         context = substance_context.get(name, "")
         text_for_embedding = f"Substance: {name}. {context}" if context else f"Substance: {name}"
+        items.append((sub_id, name, text_for_embedding))
 
-        try:
-            embedding = get_embedding(text_for_embedding)
-
-            graph.query("""
-                MATCH (s:Substance {id: $id})
-                SET s.embedding = $embedding,
-                    s.embedding_text = $text
-            """, id=sub_id, embedding=embedding, text=text_for_embedding)
-
-            embedded_count += 1
-            print(f"      Embedded: {name}")
-
-        except Exception as e:
-            print(f"      Error embedding {name}: {e}")
-
-    return embedded_count
+    return write_embeddings(graph, "Substance", items)
 
 
 def main():
@@ -267,7 +242,7 @@ def main():
 
     # FalkorDB connects with defaults if env vars not set
 
-    print(f"\nConnecting to FalkorDB at {uri}...")
+    print(f"\nConnecting to FalkorDB at {host}:{port}...")
     db = FalkorDB(host=host, port=port, password=password)
     graph = db.select_graph(graph_name)
 
@@ -301,6 +276,7 @@ def main():
         print("STEP 4: Embedding Substance Nodes")
         print("-" * 40)
         sub_count = update_substance_embeddings(graph)
+        bump_graph_version(graph, source="update_embeddings")
 
         # Summary
         print("\n" + "=" * 60)
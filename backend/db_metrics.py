@@ -0,0 +1,191 @@
+"""Per-method latency metrics for the graph database layer.
+
+Every GraphConnection method funnels through ``_execute_with_retry`` and
+every SessionGraphManager query through ``_run_query`` / ``_run_write``;
+both record one observation per call here:
+
+    query_metrics.record("get_product_traits", seconds=0.012, rows=4,
+                         payload_bytes=1830, retries=0)
+
+Per method we keep the call count, error count, a latency histogram, rows
+returned, approximate payload bytes and retry count. Payload size is a deep
+walk of the result, so ``payload_bytes()`` only measures the first and then
+every ``QUERY_PAYLOAD_SAMPLE_EVERY``-th call of a method and scales the
+sample up; the byte counters are estimates, not exact totals. ``render_prometheus()``
+emits the Prometheus text exposition format served by ``GET /metrics``.
+
+Calls slower than ``SLOW_QUERY_MS`` (disabled when 0 / unset) are logged
+with their method name and, when available, the Cypher statement.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from query_cache import approx_size
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def method_name_of(query_func) -> str:
+    """Name of the GraphConnection method that defined a ``_query`` closure.
+
+    ``GraphConnection.get_node_count.<locals>._query`` -> ``get_node_count``
+    """
+    qualname = getattr(query_func, "__qualname__", None) or getattr(query_func, "__name__", "unknown")
+    return qualname.rsplit(".<locals>", 1)[0].rsplit(".", 1)[-1]
+
+
+def count_rows(value) -> int:
+    """Rows represented by a method's return value (or a raw QueryResult)."""
+    if value is None:
+        return 0
+    result_set = getattr(value, "result_set", None)
+    if result_set is not None:
+        return len(result_set)
+    if isinstance(value, (list, tuple, set)):
+        return len(value)
+    return 1
+
+
+class _MethodStats:
+    __slots__ = ("calls", "errors", "seconds", "rows", "payload_bytes", "retries", "buckets", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.payload_bytes = 0
+        self.retries = 0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+
+class QueryMetrics:
+    """Thread-safe per-method counters and latency histograms."""
+
+    def __init__(self, slow_query_ms: float = 0.0, payload_sample_every: int = 20):
+        self.slow_query_ms = slow_query_ms
+        self.payload_sample_every = max(1, int(payload_sample_every))
+        self._lock = threading.Lock()
+        self._methods: dict[str, _MethodStats] = {}
+        self._payload_calls: dict[str, int] = {}
+
+    def payload_bytes(self, method: str, value) -> int:
+        """Sampled payload size of ``value`` for one call of ``method``.
+
+        Returns ``approx_size(value) * payload_sample_every`` on sampled
+        calls and 0 otherwise, so the per-method sum stays an estimate of
+        the total without walking every result.
+        """
+        with self._lock:
+            n = self._payload_calls.get(method, 0)
+            self._payload_calls[method] = n + 1
+        if n % self.payload_sample_every:
+            return 0
+        return approx_size(value) * self.payload_sample_every
+
+    def record(self, method: str, seconds: float, rows: int = 0, payload_bytes: int = 0,
+               retries: int = 0, error: bool = False, cypher: Optional[str] = None):
+        """Record one call of ``method``."""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += rows
+            stats.payload_bytes += payload_bytes
+            stats.retries += retries
+            if error:
+                stats.errors += 1
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+                    break
+
+        if self.slow_query_ms and seconds * 1000 >= self.slow_query_ms:
+            statement = " ".join(cypher.split())[:500] if cypher else ""
+            logger.warning(
+                f"[SlowQuery] {method} took {seconds * 1000:.0f}ms "
+                f"(rows={rows}, bytes={payload_bytes}, retries={retries})"
+                + (f": {statement}" if statement else "")
+            )
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._payload_calls.clear()
+
+    def stats(self) -> dict:
+        """Per-method summary, slowest total time first."""
+        with self._lock:
+            items = [(name, s) for name, s in self._methods.items()]
+            summary = {
+                name: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "total_ms": round(s.seconds * 1000, 1),
+                    "avg_ms": round(s.seconds * 1000 / s.calls, 2) if s.calls else 0.0,
+                    "max_ms": round(s.max_seconds * 1000, 1),
+                    "rows": s.rows,
+                    "payload_bytes": s.payload_bytes,
+                    "retries": s.retries,
+                }
+                for name, s in items
+            }
+        return dict(sorted(summary.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (name, s.calls, s.errors, s.seconds, s.rows, s.payload_bytes, s.retries, list(s.buckets))
+                for name, s in sorted(self._methods.items())
+            ]
+
+        lines = []
+
+        def _counter(metric, help_text, index):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in snapshot:
+                lines.append(f'{metric}{{method="{_escape(row[0])}"}} {row[index]}')
+
+        _counter("graph_query_calls_total", "Graph database method calls.", 1)
+        _counter("graph_query_errors_total", "Graph database method calls that raised.", 2)
+        _counter("graph_query_rows_total", "Rows returned by graph database methods.", 4)
+        _counter("graph_query_payload_bytes_total", "Approximate bytes returned by graph database methods.", 5)
+        _counter("graph_query_retries_total", "Connection retries inside graph database methods.", 6)
+
+        metric = "graph_query_duration_seconds"
+        lines.append(f"# HELP {metric} Graph database method latency.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, calls, _, seconds, _, _, _, buckets in snapshot:
+            label = _escape(name)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{method="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{method="{label}",le="+Inf"}} {calls}')
+            lines.append(f'{metric}_sum{{method="{label}"}} {seconds:.6f}')
+            lines.append(f'{metric}_count{{method="{label}"}} {calls}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+query_metrics = QueryMetrics(
+    slow_query_ms=float(os.getenv("SLOW_QUERY_MS", 0)),
+    payload_sample_every=int(os.getenv("QUERY_PAYLOAD_SAMPLE_EVERY", 20)),
+)
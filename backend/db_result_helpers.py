@@ -11,10 +11,20 @@ Usage (post-migration):
     rows = result_to_dicts(result)          # replaces [dict(r) for r in result]
     row  = result_single(result)            # replaces dict(result.single()) if result.peek() else default
     val  = result_value(result, "count", 0) # replaces record["count"] if record else 0
+
+Lazy / columnar variants avoid building a dict for every row when the caller
+only streams over rows once, needs one column, or is happy with tuples:
+    for row in iter_dicts(result): ...      # one dict at a time
+    ids  = result_column(result, "id")      # one column as a list
+    for id_, name in iter_rows(result): ... # plain tuples (named=True → namedtuples)
+    if has_rows(result): ...                # emptiness check, no conversion
 """
 
 from __future__ import annotations
 
+from collections import namedtuple
+from typing import Iterator
+
 
 def _unwrap_value(val):
     """Convert FalkorDB Node/Edge objects to plain dicts.
@@ -37,6 +47,65 @@ def _unwrap_value(val):
     return val
 
 
+def _headers(result) -> list[str]:
+    return [h[1] for h in result.header]
+
+
+def has_rows(result) -> bool:
+    """True if ``result`` holds at least one row (without converting any)."""
+    return bool(getattr(result, 'result_set', None))
+
+
+def iter_dicts(result) -> Iterator[dict]:
+    """Lazily yield one dict per row (same shape as result_to_dicts).
+
+    Use when the rows are consumed once (loops, payload builders), so the
+    full list of dicts never coexists with the raw result set.
+    """
+    if not has_rows(result):
+        return
+    headers = _headers(result)
+    for row in result.result_set:
+        yield {h: _unwrap_value(row[i]) for i, h in enumerate(headers)}
+
+
+def iter_rows(result, named: bool = False) -> Iterator[tuple]:
+    """Lazily yield rows as tuples in column order.
+
+    With ``named=True`` rows are namedtuples whose fields are the column
+    names (invalid identifiers are renamed positionally, e.g. ``_0``).
+    """
+    if not has_rows(result):
+        return
+    if named:
+        row_type = namedtuple("Row", _headers(result), rename=True)
+        for row in result.result_set:
+            yield row_type._make(_unwrap_value(v) for v in row)
+    else:
+        for row in result.result_set:
+            yield tuple(_unwrap_value(v) for v in row)
+
+
+def result_to_tuples(result, named: bool = False) -> list[tuple]:
+    """Convert a QueryResult to a list of (named)tuples — see iter_rows."""
+    return list(iter_rows(result, named=named))
+
+
+def result_column(result, key: str | int = 0) -> list:
+    """Extract one column (by name or index) as a list.
+
+    Returns [] when the result is empty or the column does not exist.
+    """
+    if not has_rows(result):
+        return []
+    if isinstance(key, str):
+        headers = _headers(result)
+        if key not in headers:
+            return []
+        key = headers.index(key)
+    return [_unwrap_value(row[key]) for row in result.result_set]
+
+
 def result_to_dicts(result) -> list[dict]:
     """Convert a FalkorDB QueryResult to list[dict].
 
@@ -49,16 +118,7 @@ def result_to_dicts(result) -> list[dict]:
     Returns:
         List of dicts, one per row, with column names as keys.
     """
-    if not hasattr(result, 'result_set') or not result.result_set:
-        return []
-    headers = [h[1] for h in result.header]
-    rows = []
-    for row in result.result_set:
-        d = {}
-        for i, h in enumerate(headers):
-            d[h] = _unwrap_value(row[i])
-        rows.append(d)
-    return rows
+    return list(iter_dicts(result))
 
 
 def result_single(result) -> dict | None:
@@ -66,6 +126,7 @@ def result_single(result) -> dict | None:
 
     Replaces the Neo4j pattern: dict(result.single()) if result.peek() else {default}
     which appears ~15 times in database.py (including 3 peek() sites).
+    Only the first row is converted.
 
     Args:
         result: FalkorDB QueryResult.
@@ -73,14 +134,17 @@ def result_single(result) -> dict | None:
     Returns:
         First row as dict, or None if no results.
     """
-    rows = result_to_dicts(result)
-    return rows[0] if rows else None
+    if not has_rows(result):
+        return None
+    row = result.result_set[0]
+    return {h: _unwrap_value(row[i]) for i, h in enumerate(_headers(result))}
 
 
 def result_value(result, key: str, default=None):
     """Extract a single value from the first row.
 
     Replaces patterns like: record["count"] if record else 0
+    Only the requested cell is converted.
 
     Args:
         result: FalkorDB QueryResult.
@@ -90,7 +154,9 @@ def result_value(result, key: str, default=None):
     Returns:
         The value, or default.
     """
-    row = result_single(result)
-    if row is None:
+    if not has_rows(result):
+        return default
+    headers = _headers(result)
+    if key not in headers:
         return default
-    return row.get(key, default)
+    return _unwrap_value(result.result_set[0][headers.index(key)])
@@ -0,0 +1,93 @@
+"""Request-scoped latency budget for the chat pipelines.
+
+A ``Deadline`` is created when a request arrives and passed down to the
+stages that may block on FalkorDB or an LLM provider. Stages are either
+required (Scribe, the trait engine, synthesis) or optional (similar cases,
+vector retrieval, the engine's vector-search fallback, semantic rule
+expansion). Optional stages only run while there is budget left beyond the
+``reserve`` kept for the required tail of the pipeline; once it is spent
+they are skipped or abandoned and recorded as shed:
+
+    deadline = Deadline.from_env()
+    if deadline.allows("semantic_rules"):
+        rules = get_semantic_rules_expanded(concepts, deadline=deadline)
+    similar = stages.optional("similar_cases", deadline, default=[])
+    timings.update(deadline.timings())           # shed_<stage>: seconds into the request
+
+Required stages are never skipped or cut short: their provider calls keep
+the SDK's default timeout however much budget is left. A deadline without
+a budget (``seconds=None``) allows everything.
+"""
+
+import logging
+import math
+import os
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DEADLINE_S = float(os.getenv("REQUEST_DEADLINE_S", 45))
+REQUEST_DEADLINE_RESERVE_S = float(os.getenv("REQUEST_DEADLINE_RESERVE_S", 15))
+
+
+class Deadline:
+    """Time budget of one request plus the optional stages shed to keep it."""
+
+    def __init__(self, seconds: Optional[float] = None, reserve: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self.reserve = reserve
+        self._clock = clock
+        self._start = clock()
+        self._shed: dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "Deadline":
+        """Budget from REQUEST_DEADLINE_S (0 disables it) and REQUEST_DEADLINE_RESERVE_S."""
+        return cls(REQUEST_DEADLINE_S or None, REQUEST_DEADLINE_RESERVE_S)
+
+    def elapsed(self) -> float:
+        return self._clock() - self._start
+
+    def remaining(self) -> float:
+        """Seconds left in the whole budget (``inf`` when unbounded)."""
+        if self.seconds is None:
+            return math.inf
+        return self.seconds - self.elapsed()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def optional_timeout(self) -> Optional[float]:
+        """Seconds an optional stage may still take, or None when unbounded."""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.remaining() - self.reserve)
+
+    def allows(self, stage: str) -> bool:
+        """Whether optional ``stage`` may still run; records it as shed if not."""
+        timeout = self.optional_timeout()
+        if timeout is None or timeout > 0:
+            return True
+        self.shed(stage)
+        return False
+
+    def shed(self, stage: str):
+        """Record that optional ``stage`` was skipped or abandoned."""
+        if stage not in self._shed:
+            self._shed[stage] = self.elapsed()
+            logger.info(f"[Deadline] Shed optional stage {stage} after {self._shed[stage]:.2f}s")
+
+    @property
+    def shed_stages(self) -> list[str]:
+        return list(self._shed)
+
+    def timings(self) -> dict[str, float]:
+        """Flat timing entries: ``shed_<stage>`` (seconds into the request) and the budget."""
+        out = {f"shed_{stage}": round(at, 3) for stage, at in self._shed.items()}
+        if self.seconds is not None:
+            out["deadline_budget"] = self.seconds
+            out["deadline_remaining"] = round(self.remaining(), 3)
+        return out
+
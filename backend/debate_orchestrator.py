@@ -21,6 +21,7 @@ from typing import AsyncGenerator, Optional
 logger = logging.getLogger(__name__)
 
 from llm_providers import LLMProvider, LLMResponse
+from llm_routing import routing
 from test_generator_prompts import GENERATION_PROMPT, CRITIQUE_PROMPT, SYNTHESIS_PROMPT
 
 
@@ -146,10 +147,13 @@ class DebateOrchestrator:
         self._executor = ThreadPoolExecutor(max_workers=3)
 
     async def _run_provider(self, provider: LLMProvider, system_prompt: str, user_prompt: str) -> LLMResponse:
-        """Run a provider call in the thread pool."""
+        """Run a provider call in the thread pool, behind the provider's circuit breaker."""
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self._executor,
+            routing.guarded,
+            "debate",
+            provider.name,
             provider.generate,
             system_prompt,
             user_prompt,
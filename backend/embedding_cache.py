@@ -0,0 +1,203 @@
+"""Two-tier, content-addressed cache for embedding vectors.
+
+One streaming turn embeds the same user text several times (task
+embedding, stressor vector fallback, hybrid retrieval, semantic rules), and
+every call is a remote request for a 3072-dimension vector. The cache sits in
+front of ``embeddings.generate_embedding``:
+
+    cache = EmbeddingCache(max_entries=1024, path="/var/cache/embeddings.sqlite")
+    vector = cache.get("stainless housing for a pool", "gemini-embedding-001")
+    if vector is None:
+        vector = embed(...)
+        cache.set("stainless housing for a pool", "gemini-embedding-001", vector)
+    cache.set_many(zip(texts, vectors), "gemini-embedding-001")   # one disk transaction
+
+- Tier 1: in-process LRU of full-precision vectors.
+- Tier 2: SQLite file with float16-packed vectors (6 KB per 3072-d vector),
+  shared across workers and restarts. Disk hits are promoted to tier 1.
+
+Keys are SHA-256 of the embedding model plus the whitespace-normalized text,
+so the same text under a different model never collides, and queries that
+differ only in spacing share an entry. If the disk tier cannot be opened or
+written it is disabled with a warning and the memory tier keeps working.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(text: str, model: str) -> str:
+    """Content address of ``text`` under ``model``."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def pack_float16(vector) -> bytes:
+    return struct.pack(f"<{len(vector)}e", *vector)
+
+
+def unpack_float16(blob: bytes) -> list[float]:
+    return list(struct.unpack(f"<{len(blob) // 2}e", blob))
+
+
+class EmbeddingCache:
+    """Thread-safe memory LRU backed by an optional SQLite float16 store."""
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._lock = threading.Lock()         # memory tier and counters
+        self._disk_lock = threading.Lock()    # the SQLite connection
+        self._memory: "OrderedDict[str, tuple[float, ...]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._disk_errors = 0
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path: str):
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key TEXT PRIMARY KEY, model TEXT NOT NULL, dims INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._db = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"[EmbeddingCache] Disk tier disabled ({path}): {e}")
+            self._db = None
+
+    def _disk_failed(self, e: Exception):
+        """Disable the disk tier (call with ``_disk_lock`` held)."""
+        self._disk_errors += 1
+        logger.warning(f"[EmbeddingCache] Disk tier error, disabling: {e}")
+        try:
+            self._db.close()
+        except Exception:
+            pass
+        self._db = None
+
+    def get(self, text: str, model: str) -> Optional[list[float]]:
+        """Return the cached vector (a fresh list), or None on miss."""
+        key = embedding_key(text, model)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return list(vector)
+        row = None
+        with self._disk_lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    self._disk_failed(e)
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            vector = tuple(unpack_float16(row[0]))
+            self._remember(key, vector)
+            self._disk_hits += 1
+        return list(vector)
+
+    def set(self, text: str, model: str, vector: list[float]):
+        self.set_many([(text, vector)], model)
+
+    def set_many(self, items: Iterable[tuple[str, list[float]]], model: str):
+        """Store ``(text, vector)`` pairs; the disk tier writes them in one transaction.
+
+        Disk I/O runs outside the memory lock, so memory hits on request
+        threads never wait for a batch write to commit.
+        """
+        rows = [(embedding_key(text, model), tuple(vector)) for text, vector in items]
+        with self._lock:
+            for key, vector in rows:
+                self._remember(key, vector)
+        with self._disk_lock:
+            if self._db is None or not rows:
+                return
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, model, dims, vector) VALUES (?, ?, ?, ?)",
+                        [(key, model, len(vector), pack_float16(vector)) for key, vector in rows],
+                    )
+            except (sqlite3.Error, OverflowError, struct.error) as e:
+                self._disk_failed(e)
+
+    def _remember(self, key: str, vector: tuple):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self, disk: bool = False):
+        """Drop the memory tier (and the disk tier when ``disk`` is set)."""
+        with self._lock:
+            self._memory.clear()
+        if not disk:
+            return
+        with self._disk_lock:
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM embeddings")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self._disk_failed(e)
+
+    def reset_stats(self):
+        with self._lock:
+            self._memory_hits = self._disk_hits = self._misses = self._disk_errors = 0
+
+    def stats(self) -> dict:
+        disk_entries = None
+        with self._disk_lock:
+            if self._db is not None:
+                try:
+                    disk_entries = self._db.execute("SELECT count(*) FROM embeddings").fetchone()[0]
+                except sqlite3.Error:
+                    disk_entries = None
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_path": self.path if self._db is not None else None,
+                "disk_entries": disk_entries,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "disk_errors": self._disk_errors,
+                "hit_rate": round((self._memory_hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def render_prometheus(self) -> str:
+        """Hit/miss counters in the Prometheus text format (appended to /metrics)."""
+        with self._lock:
+            counts = (("memory", self._memory_hits), ("disk", self._disk_hits), ("miss", self._misses))
+        lines = [
+            "# HELP embedding_cache_lookups_total Embedding cache lookups by outcome.",
+            "# TYPE embedding_cache_lookups_total counter",
+        ]
+        for outcome, value in counts:
+            lines.append(f'embedding_cache_lookups_total{{outcome="{outcome}"}} {value}')
+        return "\n".join(lines) + "\n"
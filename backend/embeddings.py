@@ -1,8 +1,18 @@
 """Embedding generation using Gemini's embedding model."""
 
+import functools
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+import httpx
 from google import genai
+from google.genai import errors as genai_errors
 from dotenv import load_dotenv
+from deadline import Deadline
+from embedding_cache import EmbeddingCache
+from rate_limit import TokenBucket, backoff_delays
 
 load_dotenv(dotenv_path="../.env")
 
@@ -11,39 +21,139 @@ client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIMENSIONS = 3072
 
+# Batching / throughput limits for the embedding API.
+# EMBEDDING_BATCH_SIZE: contents per embed_content request (API max is 100).
+# EMBEDDING_WORKERS: concurrent batch requests.
+# EMBEDDING_RPM: client-side request budget per minute (0 disables limiting).
+# EMBEDDING_MAX_RETRIES: backoff retries for batch / ingest producers only;
+#   interactive generate_embedding calls fail fast.
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 100))
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", 4))
+EMBEDDING_RPM = float(os.getenv("EMBEDDING_RPM", 1500))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", 4))
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+_rate_limiter = TokenBucket(rate=EMBEDDING_RPM / 60.0) if EMBEDDING_RPM > 0 else None
+
+# Content-addressed vector cache (memory LRU + SQLite float16 store).
+# The disk tier defaults to the user cache dir ($XDG_CACHE_HOME or ~/.cache),
+# never the source tree; EMBEDDING_CACHE_PATH="" keeps the cache in memory only.
+_DEFAULT_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "synapseos" / "embeddings.sqlite"
+)
+embedding_cache = EmbeddingCache(
+    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", 1024)),
+    path=os.getenv("EMBEDDING_CACHE_PATH", str(_DEFAULT_CACHE_PATH)) or None,
+)
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, genai_errors.APIError):
+        return e.code in _RETRYABLE_STATUS
+    return isinstance(e, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def _embed_contents(contents: list[str], retries: int = 0,
+                    deadline: Optional[Deadline] = None) -> list[list[float]]:
+    """One embed_content request for ``contents`` (rate limited).
+
+    Retryable failures are retried up to ``retries`` times with backoff,
+    but never sleep past ``deadline``.
+    """
+    delays = backoff_delays(retries)
+    while True:
+        if _rate_limiter is not None:
+            _rate_limiter.acquire()
+        try:
+            result = client.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=contents,
+            )
+            embeddings = [list(e.values) for e in result.embeddings]
+            if len(embeddings) != len(contents):
+                raise ValueError(f"Embedding API returned {len(embeddings)} vectors for {len(contents)} contents")
+            return embeddings
+        except Exception as e:
+            delay = next(delays, None) if _is_retryable(e) else None
+            if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                raise
+            print(f"Warning: Embedding request failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
 
 def generate_embedding(text: str) -> list[float]:
     """Generate embedding for a single text using Gemini embedding model.
 
+    Used on the request path, so a failed request is not retried.
+
     Args:
         text: The text to embed
 
     Returns:
         A list of floats representing the embedding vector
     """
-    result = client.models.embed_content(
-        model=EMBEDDING_MODEL,
-        contents=text,
-    )
-    return list(result.embeddings[0].values)
+    cached = embedding_cache.get(text, EMBEDDING_MODEL)
+    if cached is not None:
+        return cached
+    embedding = _embed_contents([text])[0]
+    embedding_cache.set(text, EMBEDDING_MODEL, embedding)
+    return embedding
 
 
-def generate_embeddings_batch(texts: list[str]) -> list[list[float]]:
+def generate_embeddings_batch(texts: list[str], batch_size: Optional[int] = None,
+                              max_workers: Optional[int] = None, retries: Optional[int] = None,
+                              deadline: Optional[Deadline] = None) -> list[list[float]]:
     """Generate embeddings for multiple texts in a batch.
 
+    Cached texts are served from the embedding cache; the rest are
+    de-duplicated, split into requests of ``batch_size`` contents and sent
+    on a bounded worker pool under the shared rate limiter.
+
     Args:
         texts: List of texts to embed
+        batch_size: Contents per request (default EMBEDDING_BATCH_SIZE)
+        max_workers: Concurrent requests (default EMBEDDING_WORKERS)
+        retries: Backoff retries per request (default EMBEDDING_MAX_RETRIES;
+            pass 0 on the request path)
+        deadline: Optional Deadline; no retry sleeps past it
 
     Returns:
-        List of embedding vectors
+        List of embedding vectors, in the order of ``texts``
     """
     if not texts:
         return []
 
-    # Process each text individually since batch API varies
-    embeddings = []
-    for text in texts:
-        embedding = generate_embedding(text)
-        embeddings.append(embedding)
+    vectors: dict[str, list[float]] = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        cached = embedding_cache.get(text, EMBEDDING_MODEL)
+        if cached is not None:
+            vectors[text] = cached
+        else:
+            missing.append(text)
+
+    if missing:
+        batch_size = max(1, batch_size or EMBEDDING_BATCH_SIZE)
+        chunks = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        workers = max(1, min(max_workers or EMBEDDING_WORKERS, len(chunks)))
+        embed = functools.partial(
+            _embed_contents, retries=EMBEDDING_MAX_RETRIES if retries is None else retries, deadline=deadline,
+        )
+        if workers == 1:
+            results = [embed(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+                results = list(pool.map(embed, chunks))
+        for chunk, embeddings in zip(chunks, results):
+            vectors.update(zip(chunk, embeddings))
+        embedding_cache.set_many(((text, vectors[text]) for text in missing), EMBEDDING_MODEL)
+
+    return [list(vectors[text]) for text in texts]
+
 
-    return embeddings
+def embed_map(texts: Iterable[str], retries: Optional[int] = None,
+              deadline: Optional[Deadline] = None) -> dict[str, list[float]]:
+    """Batch-embed ``texts`` and return ``{text: vector}`` (retries as in generate_embeddings_batch)."""
+    unique = list(dict.fromkeys(texts))
+    return dict(zip(unique, generate_embeddings_batch(unique, retries=retries, deadline=deadline)))
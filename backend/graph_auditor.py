@@ -28,7 +28,7 @@ from graph_audit_prompts import (
     CRITIQUE_PROMPT,
     SYNTHESIS_PROMPT,
 )
-from db_result_helpers import result_to_dicts
+from db_result_helpers import has_rows, iter_dicts, result_single, result_to_dicts
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +42,7 @@ def build_graph_data_snapshot(db_connection) -> str:
     sections = []
 
     # 1. Product Families with materials
-    pf_records = result_to_dicts(graph.query("""
+    pf_result = graph.query("""
         MATCH (pf:ProductFamily)
         OPTIONAL MATCH (pf)-[r:AVAILABLE_IN_MATERIAL]->(m:Material)
         WITH pf, collect(DISTINCT {code: m.code, is_default: r.is_default, on_request: r.on_request}) AS materials
@@ -56,11 +56,11 @@ def build_graph_data_snapshot(db_connection) -> str:
         RETURN pf, materials, lengths, options, features,
                collect(DISTINCT sf.feature_name) AS standard_features
         ORDER BY pf.selection_priority
-    """))
+    """)
 
-    if pf_records:
+    if has_rows(pf_result):
         sections.append("## PRODUCT FAMILIES IN GRAPH (Layer 1)\n")
-        for i, rec in enumerate(pf_records, 1):
+        for i, rec in enumerate(iter_dicts(pf_result), 1):
             pf = rec["pf"]
             props = dict(pf) if hasattr(pf, '__iter__') else pf
             name = props.get("name", props.get("id", "Unknown"))
@@ -315,111 +315,111 @@ def build_graph_data_snapshot(db_connection) -> str:
         sections.append("")
 
     # 3. Materials table
-    mat_records = result_to_dicts(graph.query("""
+    mat_result = graph.query("""
         MATCH (m:Material)
         RETURN m.code AS code, m.name AS name,
                m.corrosion_class AS corrosion_class,
                m.steel_specification AS steel_spec
         ORDER BY m.code
-    """))
+    """)
 
-    if mat_records:
+    if has_rows(mat_result):
         sections.append("## MATERIALS IN GRAPH (Layer 1)\n")
         sections.append("| Code | Name | Corrosion Class | Steel Spec |")
         sections.append("|------|------|----------------|------------|")
-        for rec in mat_records:
+        for rec in iter_dicts(mat_result):
             sections.append(f"| {rec.get('code', '?')} | {rec.get('name', '?')} | {rec.get('corrosion_class', '?')} | {rec.get('steel_spec', '-')} |")
         sections.append("")
 
     # 4. Capacity rules (cartridge counts)
-    cap_records = result_to_dicts(graph.query("""
+    cap_result = graph.query("""
         MATCH (pf:ProductFamily)-[:HAS_CAPACITY]->(cr:CapacityRule)
         RETURN pf.name AS family,
                cr.module_descriptor AS module_descriptor,
                cr.cartridge_count AS cartridge_count,
                cr.capacity_per_component AS capacity_per_component
         ORDER BY pf.name, cr.module_descriptor
-    """))
+    """)
 
-    if cap_records:
+    if has_rows(cap_result):
         sections.append("## CAPACITY RULES (Layer 1)\n")
         sections.append("| Family | Module | Cartridge Count | Capacity/Component |")
         sections.append("|--------|--------|-----------------|--------------------|")
-        for rec in cap_records:
+        for rec in iter_dicts(cap_result):
             sections.append(f"| {rec.get('family', '?')} | {rec.get('module_descriptor', '?')} | {rec.get('cartridge_count', '?')} | {rec.get('capacity_per_component', '?')} |")
         sections.append("")
 
     # 5. Environments
-    env_records = result_to_dicts(graph.query("""
+    env_result = graph.query("""
         MATCH (e:Environment)
         RETURN e.id AS id, e.name AS name, e.keywords AS keywords,
                e.temperature_variation AS temp_var,
                e.humidity_exposure AS humidity
         ORDER BY e.id
-    """))
+    """)
 
-    if env_records:
+    if has_rows(env_result):
         sections.append("## ENVIRONMENTS (Layer 2)\n")
-        for rec in env_records:
+        for rec in iter_dicts(env_result):
             kw = rec.get("keywords", [])
             kw_str = f" (keywords: {', '.join(kw)})" if kw else ""
             sections.append(f"- **{rec.get('id', '?')}**: {rec.get('name', '?')}{kw_str}")
         sections.append("")
 
     # 6. Applications
-    app_records = result_to_dicts(graph.query("""
+    app_result = graph.query("""
         MATCH (a:Application)
         RETURN a.id AS id, a.name AS name, a.keywords AS keywords
         ORDER BY a.id
-    """))
+    """)
 
-    if app_records:
+    if has_rows(app_result):
         sections.append("## APPLICATIONS (Layer 2)\n")
-        for rec in app_records:
+        for rec in iter_dicts(app_result):
             kw = rec.get("keywords", [])
             kw_str = f" (keywords: {', '.join(kw)})" if kw else ""
             sections.append(f"- **{rec.get('id', '?')}**: {rec.get('name', '?')}{kw_str}")
         sections.append("")
 
     # 7. Environmental Stressors
-    stressor_records = result_to_dicts(graph.query("""
+    stressor_result = graph.query("""
         MATCH (es:EnvironmentalStressor)
         RETURN es.id AS id, es.name AS name, es.severity AS severity,
                es.demands AS demands
         ORDER BY es.id
-    """))
+    """)
 
-    if stressor_records:
+    if has_rows(stressor_result):
         sections.append("## ENVIRONMENTAL STRESSORS (Layer 2)\n")
-        for rec in stressor_records:
+        for rec in iter_dicts(stressor_result):
             demands = rec.get("demands", "N/A")
             sections.append(f"- **{rec.get('name', '?')}** ({rec.get('severity', '?')}): {demands}")
         sections.append("")
 
     # 8. Installation Constraints
-    ic_records = result_to_dicts(graph.query("""
+    ic_result = graph.query("""
         MATCH (ic:InstallationConstraint)
         RETURN ic.id AS id, ic.name AS name, ic.type AS type,
                ic.description AS description
         ORDER BY ic.id
-    """))
+    """)
 
-    if ic_records:
+    if has_rows(ic_result):
         sections.append("## INSTALLATION CONSTRAINTS (Layer 2)\n")
-        for rec in ic_records:
+        for rec in iter_dicts(ic_result):
             sections.append(f"- **{rec.get('name', '?')}** (type: {rec.get('type', '?')}): {rec.get('description', 'N/A')}")
         sections.append("")
 
     # 9. Dependency Rules
-    dep_records = result_to_dicts(graph.query("""
+    dep_result = graph.query("""
         MATCH (dr:DependencyRule)
         RETURN dr.id AS id, dr.name AS name, dr.description AS description
         ORDER BY dr.id
-    """))
+    """)
 
-    if dep_records:
+    if has_rows(dep_result):
         sections.append("## DEPENDENCY RULES (Layer 2)\n")
-        for rec in dep_records:
+        for rec in iter_dicts(dep_result):
             sections.append(f"- **{rec.get('name', '?')}**: {rec.get('description', 'N/A')}")
         sections.append("")
 
@@ -432,11 +432,11 @@ def build_graph_data_snapshot(db_connection) -> str:
     ]
     count_records = []
     for label in sorted(node_labels):
-        rows = result_to_dicts(graph.query(
+        row = result_single(graph.query(
             f"MATCH (n:{label}) RETURN '{label}' AS label, count(n) AS cnt"
         ))
-        if rows:
-            count_records.append(rows[0])
+        if row:
+            count_records.append(row)
 
     if count_records:
         sections.append("## NODE TYPE COUNTS\n")
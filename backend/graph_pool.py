@@ -0,0 +1,352 @@
+"""Bounded, thread-safe FalkorDB connection pool.
+
+GraphConnection used to share one FalkorDB client between every request and
+every ThreadPoolExecutor worker in the retriever, and a stale socket seen by
+one thread reset the handle for all of them. This pool hands out exclusive
+connections instead:
+
+    pool = GraphConnectionPool(factory, min_size=2, max_size=16)
+    with pool.connection() as graph:
+        graph.query("RETURN 1")
+
+- Checkout is bounded (``max_size``); callers wait up to ``timeout`` seconds.
+- Idle connections are PING-ed before reuse when they have been idle longer
+  than ``health_check_interval`` and transparently replaced when dead.
+- ``reconnect()`` replaces only the connection owned by the calling thread.
+- ``stats()`` reports utilization and checkout wait times.
+
+Checkouts are re-entrant per thread: nested ``connection()`` calls on the same
+thread reuse the already-leased connection, so db methods that call other db
+methods never deadlock on a small pool.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class PooledConnection:
+    """One FalkorDB client + selected graph owned by the pool."""
+
+    __slots__ = ("client", "graph", "created_at", "last_used", "uses")
+
+    def __init__(self, client, graph):
+        self.client = client
+        self.graph = graph
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+    def ping(self) -> bool:
+        """Return True when the underlying Redis connection answers PING."""
+        try:
+            conn = getattr(self.client, "connection", None)
+            if conn is not None:
+                return bool(conn.ping())
+            self.graph.query("RETURN 1")
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        conn = getattr(self.client, "connection", None)
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
+
+
+class _Lease:
+    """Per-thread checkout record (supports re-entrant checkouts)."""
+
+    __slots__ = ("conn", "depth")
+
+    def __init__(self, conn: PooledConnection):
+        self.conn = conn
+        self.depth = 1
+
+
+class GraphConnectionPool:
+    """Bounded pool of FalkorDB graph handles.
+
+    Args:
+        factory: Callable returning ``(client, graph)`` for a fresh connection.
+        min_size: Connections opened eagerly by ``fill()`` and kept when idle.
+        max_size: Hard upper bound on open connections.
+        timeout: Seconds a checkout waits for a free connection.
+        health_check_interval: Idle seconds after which a connection is
+            PING-ed before being handed out (0 = check on every checkout).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], tuple],
+        min_size: int = 1,
+        max_size: int = 16,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._factory = factory
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: list[PooledConnection] = []
+        self._size = 0  # open + being-opened connections
+        self._in_use = 0
+        self._closed = False
+        self._local = threading.local()
+
+        # Stats
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+        self._timeouts = 0
+        self._peak_in_use = 0
+        self._created = 0
+        self._reconnects = 0
+        self._health_check_failures = 0
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+
+    def _open(self) -> PooledConnection:
+        client, graph = self._factory()
+        with self._cond:
+            self._created += 1
+        return PooledConnection(client, graph)
+
+    def fill(self):
+        """Open connections until ``min_size`` are available (warmup)."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(conn)
+                self._cond.notify()
+
+    def _acquire(self) -> PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeoutError("FalkorDB connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout:.1f}s waiting for a FalkorDB "
+                        f"connection (pool max_size={self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            wait_s = time.monotonic() - start
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            self._total_wait_s += wait_s
+            self._max_wait_s = max(self._max_wait_s, wait_s)
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+
+        try:
+            if conn is None:
+                conn = self._open()
+            elif time.monotonic() - conn.last_used >= self.health_check_interval:
+                if not conn.ping():
+                    with self._cond:
+                        self._health_check_failures += 1
+                    logger.warning("[GraphPool] Stale connection failed health check, replacing")
+                    conn.close()
+                    conn = self._open()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        conn.uses += 1
+        return conn
+
+    def _release(self, conn: PooledConnection, discard: bool = False):
+        conn.last_used = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block.
+
+        Re-entrant: a thread that already holds a connection gets the same one.
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is not None:
+            lease.depth += 1
+            try:
+                yield lease.conn.graph
+            finally:
+                lease.depth -= 1
+            return
+
+        conn = self._acquire()
+        lease = _Lease(conn)
+        self._local.lease = lease
+        broken = False
+        try:
+            yield conn.graph
+        except Exception as e:
+            broken = _is_connection_error(e)
+            raise
+        finally:
+            self._local.lease = None
+            # The lease may have been swapped by reconnect()
+            self._release(lease.conn, discard=broken)
+
+    def current(self):
+        """Return the graph leased by the calling thread, or None."""
+        lease = getattr(self._local, "lease", None)
+        return lease.conn.graph if lease is not None else None
+
+    def reconnect(self):
+        """Replace the calling thread's connection with a fresh one.
+
+        Other threads keep their connections — one stale socket no longer
+        forces every worker to reconnect. Returns the new graph handle, or
+        None when the calling thread holds no lease.
+        """
+        lease = getattr(self._local, "lease", None)
+        if lease is None:
+            return None
+        lease.conn.close()
+        lease.conn = self._open()
+        lease.conn.uses += 1
+        with self._cond:
+            self._reconnects += 1
+        return lease.conn.graph
+
+    def close(self):
+        """Close idle connections; leased ones are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Snapshot of pool utilization and checkout wait times."""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "utilization": round(self._in_use / self.max_size, 3),
+                "peak_in_use": self._peak_in_use,
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._total_wait_s / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self._max_wait_s * 1000, 3),
+                "connections_created": self._created,
+                "reconnects": self._reconnects,
+                "health_check_failures": self._health_check_failures,
+            }
+
+
+class PooledGraph:
+    """Graph-like facade that borrows a pooled connection per call.
+
+    Returned by ``GraphConnection.connect()`` when the calling thread holds no
+    lease, so existing ``graph = db.connect(); graph.query(...)`` call sites
+    (trait engine, bulk_offer, migration scripts) use the pool unchanged.
+    """
+
+    def __init__(self, pool: GraphConnectionPool):
+        self._pool = pool
+
+    def query(self, q, params=None, timeout=None):
+        with self._pool.connection() as graph:
+            if timeout is None:
+                return graph.query(q, params)
+            return graph.query(q, params, timeout=timeout)
+
+    def ro_query(self, q, params=None, timeout=None):
+        with self._pool.connection() as graph:
+            if timeout is None:
+                return graph.ro_query(q, params)
+            return graph.ro_query(q, params, timeout=timeout)
+
+    def __getattr__(self, name):
+        # Less common Graph APIs (indexes, procedures) — borrow for the call.
+        # Data attributes (e.g. ``name``) are returned as they are.
+        with self._pool.connection() as graph:
+            attr = getattr(graph, name)
+        if not callable(attr):
+            return attr
+
+        def _call(*args, **kwargs):
+            with self._pool.connection() as graph:
+                return getattr(graph, name)(*args, **kwargs)
+        return _call
+
+
+def _is_connection_error(e: Exception) -> bool:
+    """Same classification as GraphConnection._execute_with_retry."""
+    try:
+        from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+        if isinstance(e, (RedisConnectionError, RedisTimeoutError)):
+            return True
+    except ImportError:
+        pass
+    if isinstance(e, PoolTimeoutError):
+        return False
+    msg = str(e).lower()
+    return "defunct" in msg or "connection" in msg
@@ -0,0 +1,36 @@
+"""Catalog version counter for the FalkorDB graph.
+
+A plain Redis counter next to the graph key (``<graph>:catalog_version``)
+that every process writing Layer 1/2 catalog data bumps when it is done:
+the ingest pipeline, GraphConnection write methods and the one-off
+``database/*.py`` migration scripts. Readers (CatalogSnapshot) compare it
+against the version they loaded and reload when it moved.
+
+Works with a raw ``falkordb`` Graph as well as GraphConnection handles, so
+migration scripts that open their own connection can use it directly:
+
+    from graph_version import bump_graph_version
+    bump_graph_version(graph, source="add_catalog_enrichment")
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(graph) -> str:
+    name = getattr(graph, "name", None) or getattr(graph, "_name", None) or "graph"
+    return f"{name}:catalog_version"
+
+
+def read_graph_version(graph) -> int:
+    """Return the current catalog version (0 if never bumped)."""
+    value = graph.execute_command("GET", _version_key(graph))
+    return int(value) if value is not None else 0
+
+
+def bump_graph_version(graph, source: str = "") -> int:
+    """Increment the catalog version and return the new value."""
+    version = int(graph.execute_command("INCR", _version_key(graph)))
+    logger.info(f"[GraphVersion] Catalog version bumped to {version}" + (f" ({source})" if source else ""))
+    return version
@@ -0,0 +1,99 @@
+"""Incremental extraction of array items from a streamed JSON object.
+
+The synthesis LLM returns one JSON object whose ``content_segments`` array
+carries the user-visible answer. While tokens stream in, each segment can be
+surfaced as soon as its closing brace arrives:
+
+    parser = JsonArrayItemParser("content_segments")
+    for delta in llm_stream:
+        for index, segment in parser.feed(delta):
+            ...   # {"text": "...", "type": "GENERAL"}
+
+Only object items of the named array on the top-level object are reported;
+nested arrays/objects with the same key are ignored. The scanner is a single
+pass over each new chunk (string/escape aware), so feeding the whole response
+costs O(n) overall. An item that fails to parse is skipped silently; the
+caller still parses the full text at the end.
+"""
+
+import json
+
+
+class JsonArrayItemParser:
+    """Report completed items of ``key``'s array on the top-level JSON object."""
+
+    def __init__(self, key: str):
+        self.key = key
+        self._buf = []          # chunks of the current item only
+        self._depth = 0         # container nesting depth
+        self._in_string = False
+        self._escape = False
+        self._string_chars = []
+        self._last_key = None   # last string seen at depth 1
+        self._pending_key = None
+        self._array_depth = None  # depth of the target array while it is open
+        self._array_done = False
+        self._item_active = False
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Items reported so far."""
+        return self._count
+
+    def feed(self, chunk: str) -> list[tuple[int, dict]]:
+        """Consume ``chunk``; return ``(index, item)`` for items completed by it."""
+        completed = []
+        item_start = 0 if self._item_active else None
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = "".join(self._string_chars)
+                    continue
+                if self._depth == 1:
+                    self._string_chars.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_chars = []
+            elif ch == ":" and self._depth == 1:
+                self._pending_key = self._last_key
+            elif ch == "," and self._depth == 1:
+                self._pending_key = None
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._pending_key == self.key and not self._array_done:
+                    self._array_depth = self._depth
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._item_active = True
+                    item_start = i
+                    self._buf = []
+            elif ch in "}]":
+                if self._item_active and ch == "}" and self._depth == self._array_depth + 1:
+                    self._buf.append(chunk[item_start:i + 1])
+                    self._item_active = False
+                    item_start = None
+                    try:
+                        item = json.loads("".join(self._buf))
+                    except ValueError:
+                        item = None
+                    if isinstance(item, dict):
+                        completed.append((self._count, item))
+                        self._count += 1
+                    self._buf = []
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth:
+                    # Target array closed: later arrays with the same key are ignored
+                    self._array_depth = None
+                    self._array_done = True
+                self._depth -= 1
+
+        if self._item_active and item_start is not None:
+            self._buf.append(chunk[item_start:])
+        return completed
@@ -8,7 +8,7 @@ from google.genai import types
 from dotenv import load_dotenv
 
 from database import db
-from embeddings import generate_embedding
+from embeddings import embed_map
 from prompts import EXTRACTION_PROMPT, EVENT_GRAPH_EXTRACTION_PROMPT
 from models import ExtractionResult, ExtractedHardData, ExtractedSoftKnowledge
 
@@ -124,9 +124,10 @@ def ingest_case(text: str, project_name: str, customer: str = None) -> dict:
         project_props["customer"] = customer
     db.create_node("Project", project_props)
 
-    # Step 5: Create Concept nodes with embeddings
+    # Step 5: Create Concept nodes with embeddings (one batched embedding pass)
+    concept_embeddings = embed_map(extraction.soft_knowledge.concepts)
     for concept_name in extraction.soft_knowledge.concepts:
-        embedding = generate_embedding(concept_name)
+        embedding = concept_embeddings[concept_name]
         db.create_node("Concept", {
             "name": concept_name,
             "embedding": embedding
@@ -189,6 +190,7 @@ def ingest_case(text: str, project_name: str, customer: str = None) -> dict:
             )
             counts["relationships"] += 1
 
+    db.bump_graph_version(source="ingest_case")
     return counts
 
 
@@ -339,6 +341,11 @@ def ingest_email_thread_image(image_data: bytes, mime_type: str = "image/png") -
     concept_cache = set()  # track created concepts (avoid duplicate embeddings)
     all_concepts = []  # collect all concepts for response
 
+    # Embed every local concept of the thread up front, in batched requests
+    concept_embeddings = embed_map(
+        concept for entry in timeline for concept in entry.get("local_concepts", [])
+    )
+
     # Step 3: Create Event chain and associated nodes
     previous_event_name = None
 
@@ -489,7 +496,7 @@ def ingest_email_thread_image(image_data: bytes, mime_type: str = "image/png") -
                 for concept_name in local_concepts:
                     # Create Concept node if not already created
                     if concept_name not in concept_cache:
-                        embedding = generate_embedding(concept_name)
+                        embedding = concept_embeddings[concept_name]
                         db.create_node("Concept", {
                             "name": concept_name,
                             "embedding": embedding
@@ -575,6 +582,8 @@ def ingest_email_thread_image(image_data: bytes, mime_type: str = "image/png") -
                 knowledge_candidates.append(candidate)
                 counts["knowledge_candidates"] = counts.get("knowledge_candidates", 0) + 1
 
+    db.bump_graph_version(source="ingest_email_thread_image")
+
     # Return results including extracted data for preview
     return {
         "message": "Email thread ingested successfully",
@@ -634,6 +643,11 @@ def ingest_email_thread_text(thread_text: str) -> dict:
     concept_cache = set()  # track created concepts (avoid duplicate embeddings)
     all_concepts = []  # collect all concepts for response
 
+    # Embed every local concept of the thread up front, in batched requests
+    concept_embeddings = embed_map(
+        concept for entry in timeline for concept in entry.get("local_concepts", [])
+    )
+
     # Step 3: Create Event chain and associated nodes
     previous_event_name = None
 
@@ -784,7 +798,7 @@ def ingest_email_thread_text(thread_text: str) -> dict:
                 for concept_name in local_concepts:
                     # Create Concept node if not already created
                     if concept_name not in concept_cache:
-                        embedding = generate_embedding(concept_name)
+                        embedding = concept_embeddings[concept_name]
                         db.create_node("Concept", {
                             "name": concept_name,
                             "embedding": embedding
@@ -870,6 +884,8 @@ def ingest_email_thread_text(thread_text: str) -> dict:
                 knowledge_candidates.append(candidate)
                 counts["knowledge_candidates"] = counts.get("knowledge_candidates", 0) + 1
 
+    db.bump_graph_version(source="ingest_email_thread_text")
+
     # Return results including extracted data for preview
     return {
         "message": "Email thread ingested successfully",
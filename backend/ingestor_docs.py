@@ -13,7 +13,7 @@ from google.genai import types
 from dotenv import load_dotenv
 
 from database import db
-from embeddings import generate_embedding
+from embeddings import generate_embeddings_batch
 
 load_dotenv(dotenv_path="../.env")
 
@@ -750,6 +750,9 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
     created_variants = set()
     created_categories = set()
     concept_cache = set()
+    # Concept nodes are queued as (text to embed, props) and created after
+    # Step 10 with one batched embedding pass
+    pending_concepts = []
 
     # Step 2: Create ProductVariant nodes with numeric properties
     for product in extracted_data.get("products", []):
@@ -853,12 +856,10 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
 
                 # Also create as Concept for vector search bridging
                 if cat_value not in concept_cache:
-                    embedding = generate_embedding(f"{cat_label}: {cat_value}")
-                    db.create_node("Concept", {
+                    pending_concepts.append((f"{cat_label}: {cat_value}", {
                         "name": cat_value,
-                        "category_type": cat_label,
-                        "embedding": embedding
-                    })
+                        "category_type": cat_label
+                    }))
                     counts["concepts"] += 1
                     concept_cache.add(cat_value)
 
@@ -948,12 +949,10 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
         # Create Concept for vector search bridging
         cartridge_concept = f"Filter Cartridge {cartridge.get('model_name', cartridge_id)}"
         if cartridge_concept not in concept_cache:
-            embedding = generate_embedding(cartridge_concept)
-            db.create_node("Concept", {
+            pending_concepts.append((cartridge_concept, {
                 "name": cartridge_concept,
-                "component_type": "FilterCartridge",
-                "embedding": embedding
-            })
+                "component_type": "FilterCartridge"
+            }))
             counts["concepts"] += 1
             concept_cache.add(cartridge_concept)
 
@@ -1014,12 +1013,10 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
         # Create Concept for vector search bridging
         duct_concept = f"Duct Transition {duct.get('housing_size', '')} to Ø{duct.get('valid_duct_diameters_mm', [])}"
         if duct_concept not in concept_cache:
-            embedding = generate_embedding(duct_concept)
-            db.create_node("Concept", {
+            pending_concepts.append((duct_concept, {
                 "name": duct_concept,
-                "component_type": "DuctConnection",
-                "embedding": embedding
-            })
+                "component_type": "DuctConnection"
+            }))
             counts["concepts"] += 1
             concept_cache.add(duct_concept)
 
@@ -1054,13 +1051,11 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
         # Create Concept for vector search bridging
         material_concept = f"Material {material.get('full_name', material_code)} ({material_code})"
         if material_concept not in concept_cache:
-            embedding = generate_embedding(material_concept)
-            db.create_node("Concept", {
+            pending_concepts.append((material_concept, {
                 "name": material_concept,
                 "component_type": "MaterialSpecification",
-                "corrosion_class": material.get("corrosion_class"),
-                "embedding": embedding
-            })
+                "corrosion_class": material.get("corrosion_class")
+            }))
             counts["concepts"] += 1
             concept_cache.add(material_concept)
 
@@ -1112,13 +1107,11 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
         # Create Concept for vector search bridging
         filter_concept = f"Filter {filter_item.get('model_name', '')} ({filter_item.get('part_number', filter_id)})"
         if filter_concept not in concept_cache:
-            embedding = generate_embedding(filter_concept)
-            db.create_node("Concept", {
+            pending_concepts.append((filter_concept, {
                 "name": filter_concept,
                 "component_type": "FilterConsumable",
-                "filter_type": filter_item.get("filter_type"),
-                "embedding": embedding
-            })
+                "filter_type": filter_item.get("filter_type")
+            }))
             counts["concepts"] += 1
             concept_cache.add(filter_concept)
 
@@ -1130,11 +1123,9 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
 
     for concept_name in all_concepts:
         if concept_name and concept_name not in concept_cache:
-            embedding = generate_embedding(concept_name)
-            db.create_node("Concept", {
-                "name": concept_name,
-                "embedding": embedding
-            })
+            pending_concepts.append((concept_name, {
+                "name": concept_name
+            }))
             counts["concepts"] += 1
             concept_cache.add(concept_name)
 
@@ -1147,18 +1138,22 @@ def write_configuration_graph(extracted_data: dict, schema: dict, source_documen
         if module_size and airflow:
             ref_concept = f"Reference Airflow {module_size} ({designation}): {airflow} m³/h"
             if ref_concept not in concept_cache:
-                embedding = generate_embedding(ref_concept)
-                db.create_node("Concept", {
+                pending_concepts.append((ref_concept, {
                     "name": ref_concept,
                     "component_type": "ReferenceAirflow",
                     "module_size": module_size,
                     "module_designation": designation,
-                    "airflow_m3h": airflow,
-                    "embedding": embedding
-                })
+                    "airflow_m3h": airflow
+                }))
                 counts["concepts"] += 1
                 concept_cache.add(ref_concept)
 
+    # Create the queued Concept nodes (embeddings requested in batches)
+    if pending_concepts:
+        embeddings = generate_embeddings_batch([text for text, _ in pending_concepts])
+        for (_, concept_props), embedding in zip(pending_concepts, embeddings):
+            db.create_node("Concept", {**concept_props, "embedding": embedding})
+
     # Step 11: Store compatibility rules as CompatibilityRule nodes
     for rule in extracted_data.get("compatibility_rules", []):
         if isinstance(rule, dict):
@@ -1216,6 +1211,7 @@ def ingest_document(file_bytes: bytes, mime_type: str, schema: dict, source_name
 
     # Write Configuration Graph
     counts = write_configuration_graph(extracted, schema, source_name)
+    db.bump_graph_version(source=f"ingest_document:{source_name}")
 
     return {
         "message": "Document ingested successfully",
@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Optional, AsyncGenerator
 
 from api_keys import api_keys_manager
+from llm_clients import provider_clients
+from llm_routing import routing
 from judge_prompts import (
     JUDGE_SYSTEM_PROMPT,
     JUDGE_USER_PROMPT_TEMPLATE,
@@ -81,11 +83,10 @@ def _get_gemini_file():
     if not _PDF_PATH.exists():
         print(f"  [JUDGE] WARNING: PDF not found at {_PDF_PATH}")
         return None
-    from google import genai
     api_key = api_keys_manager.get_key("gemini")
     if not api_key:
         return None
-    client = genai.Client(api_key=api_key)
+    client = provider_clients.get("gemini")
     _GEMINI_FILE_REF = client.files.upload(file=str(_PDF_PATH))
     print(f"  [JUDGE] Uploaded PDF to Gemini Files API: {_GEMINI_FILE_REF.name}")
     return _GEMINI_FILE_REF
@@ -96,12 +97,11 @@ def _get_gemini_cache() -> Optional[str]:
     global _GEMINI_CACHE_NAME
     if _GEMINI_CACHE_NAME is not None:
         return _GEMINI_CACHE_NAME
-    from google import genai
     from google.genai import types
     api_key = api_keys_manager.get_key("gemini")
     if not api_key:
         return None
-    client = genai.Client(api_key=api_key)
+    client = provider_clients.get("gemini")
     file_ref = _get_gemini_file()
     if not file_ref:
         return None
@@ -134,8 +134,7 @@ def _get_openai_file_id() -> Optional[str]:
     api_key = api_keys_manager.get_key("openai")
     if not api_key:
         return None
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
+    client = provider_clients.get("openai")
     with open(_PDF_PATH, "rb") as f:
         file_obj = client.files.create(file=f, purpose="user_data")
     _OPENAI_FILE_ID = file_obj.id
@@ -278,14 +277,13 @@ def _judge_with_gemini(question: str, response_data: dict) -> JudgeResult:
     2. File ref (PDF uploaded once via Files API) → send file ref + system prompt + user prompt
     3. No PDF fallback → text-only
     """
-    from google import genai
     from google.genai import types
 
     api_key = api_keys_manager.get_key("gemini")
     if not api_key:
         return JudgeResult(explanation="Gemini API key not configured", recommendation="ERROR")
 
-    client = genai.Client(api_key=api_key)
+    client = provider_clients.get("gemini")
     user_prompt = _build_judge_prompt(question, response_data)
 
     # Try explicit cache first (PDF + system prompt pre-cached)
@@ -366,13 +364,12 @@ def _judge_with_openai(question: str, response_data: dict, _retries: int = 3) ->
     OpenAI auto-caches matching prompt prefixes (50% discount on cached tokens).
     Retries on 429 rate-limit errors with exponential backoff.
     """
-    from openai import OpenAI
 
     api_key = api_keys_manager.get_key("openai")
     if not api_key:
         return JudgeResult(explanation="OpenAI API key not configured", recommendation="ERROR")
 
-    client = OpenAI(api_key=api_key)
+    client = provider_clients.get("openai")
     user_prompt = _build_judge_prompt(question, response_data)
 
     # Build user content: PDF by file_id (uploaded once) + text prompt
@@ -451,13 +448,12 @@ def _judge_with_claude(question: str, response_data: dict, _retries: int = 3) ->
     Uses Anthropic Messages API with native PDF document attachment.
     Retries on connection errors and rate limits with exponential backoff.
     """
-    import anthropic
 
     api_key = api_keys_manager.get_key("anthropic")
     if not api_key:
         return JudgeResult(explanation="Anthropic API key not configured", recommendation="ERROR")
 
-    client = anthropic.Anthropic(api_key=api_key)
+    client = provider_clients.get("anthropic")
     user_prompt = _build_judge_prompt(question, response_data)
 
     # Build user content: PDF document + text prompt
@@ -541,13 +537,19 @@ _judge_response = _judge_with_gemini
 # Parallel multi-LLM judge
 # ---------------------------------------------------------------------------
 
+def _guarded_judge(model: str, judge_fn, question: str, response_data: dict) -> JudgeResult:
+    """Run one judge behind its model's circuit breaker (a dead provider is skipped, not waited on)."""
+    return routing.guarded("judge", model, judge_fn, question, response_data,
+                           failed=lambda r: r.recommendation == "ERROR")
+
+
 async def judge_parallel(question: str, response_data: dict) -> dict:
     """Run Gemini + OpenAI + Claude judges in parallel, return all results."""
     loop = asyncio.get_event_loop()
 
-    gemini_future = loop.run_in_executor(None, _judge_with_gemini, question, response_data)
-    openai_future = loop.run_in_executor(None, _judge_with_openai, question, response_data)
-    claude_future = loop.run_in_executor(None, _judge_with_claude, question, response_data)
+    gemini_future = loop.run_in_executor(None, _guarded_judge, JUDGE_MODEL, _judge_with_gemini, question, response_data)
+    openai_future = loop.run_in_executor(None, _guarded_judge, OPENAI_JUDGE_MODEL, _judge_with_openai, question, response_data)
+    claude_future = loop.run_in_executor(None, _guarded_judge, CLAUDE_JUDGE_MODEL, _judge_with_claude, question, response_data)
 
     gemini_result, openai_result, claude_result = await asyncio.gather(
         gemini_future, openai_future, claude_future, return_exceptions=True
@@ -876,7 +878,6 @@ class JudgeOrchestrator:
         self, pdf_bytes: bytes, config: dict
     ) -> AsyncGenerator[dict, None]:
         """Generate evaluation questions from PDF using Gemini 3 Pro."""
-        from google import genai
         from google.genai import types
 
         api_key = api_keys_manager.get_key("gemini")
@@ -892,7 +893,7 @@ class JudgeOrchestrator:
             "model": JUDGE_MODEL,
         }
 
-        client = genai.Client(api_key=api_key)
+        client = provider_clients.get("gemini")
 
         prompt = QUESTION_GENERATION_PROMPT.format(target_count=target_count)
 
@@ -0,0 +1,147 @@
+"""Single-pass multi-keyword matching (Aho-Corasick).
+
+Several hot paths used to test every configured keyword with
+``kw in query_lower``, so their cost grew with the keyword lists. A
+``KeywordMatcher`` is compiled once from all keywords (each tagged with an
+arbitrary payload) and then reports every occurrence in one pass over the
+query, independent of how many keywords it holds:
+
+    matcher = KeywordMatcher()
+    matcher.add("hospital", ("environment", 0))
+    matcher.add("rf", ("material", 2), word_boundary=True)
+    matcher.build()
+    matcher.payloads("rf housing for a hospital")   # {("material", 2), ("environment", 0)}
+
+Matching is case-insensitive (keywords and text are lowercased), plain
+substring by default — the same semantics as ``kw.lower() in text.lower()``
+— or whole-word when added with ``word_boundary=True``. An empty keyword
+matches every text, as ``"" in text`` does. The automaton is read-only after
+``build()`` and safe to share across threads; the last scanned text is
+memoized so several lookups against the same query share one pass.
+"""
+
+from collections import deque
+from typing import Any, Hashable, Iterable
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lowercase keywords with per-keyword payloads."""
+
+    def __init__(self, keywords: Iterable[tuple[str, Hashable]] = (), word_boundary: bool = False):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # state -> [(keyword length, payload, word_boundary)]
+        self._out: list[list[tuple[int, Any, bool]]] = [[]]
+        self._always: list[Any] = []
+        self._keywords = 0
+        self._built = False
+        self._last: tuple = (None, None)
+        for keyword, payload in keywords:
+            self.add(keyword, payload, word_boundary=word_boundary)
+        if self._keywords:
+            self.build()
+
+    def __len__(self) -> int:
+        return self._keywords
+
+    def add(self, keyword: str, payload: Hashable, word_boundary: bool = False) -> "KeywordMatcher":
+        """Register ``keyword``; its occurrences report ``payload``."""
+        if self._built:
+            raise RuntimeError("KeywordMatcher is already built")
+        keyword = (keyword or "").lower()
+        self._keywords += 1
+        if not keyword:
+            self._always.append(payload)
+            return self
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(keyword), payload, word_boundary))
+        return self
+
+    def build(self) -> "KeywordMatcher":
+        """Compute failure links (breadth-first); no keywords can be added afterwards."""
+        queue = deque(self._goto[0].values())   # depth-1 states fail to the root
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def scan(self, text: str) -> list[tuple[int, int, Any]]:
+        """All occurrences in ``text`` as ``(start, end, payload)``, ordered by end position."""
+        if not self._built:
+            self.build()
+        text = (text or "").lower()
+        last_text, last_hits = self._last
+        if last_text == text:
+            return last_hits
+        hits = [(0, 0, payload) for payload in self._always]
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload, word_boundary in out[state]:
+                start = i + 1 - length
+                if word_boundary and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (i + 1 < len(text) and _is_word_char(text[i + 1]))
+                ):
+                    continue
+                hits.append((start, i + 1, payload))
+        self._last = (text, hits)
+        return hits
+
+    def payloads(self, text: str) -> set:
+        """Distinct payloads of every keyword found in ``text``."""
+        return {payload for _, _, payload in self.scan(text)}
+
+
+_application_matcher: tuple = (None, None, None)
+
+
+def application_matcher(applications: list[dict]) -> KeywordMatcher:
+    """Matcher over Application node names and keywords.
+
+    Payloads are ``(app_index, keyword_index, keyword)`` with keyword index 0
+    for the name. The matcher is keyed on the names and keywords it was built
+    from, so it is rebuilt only when those change, not for every fresh copy
+    of the same ``get_all_applications()`` result.
+    """
+    global _application_matcher
+    source, signature, matcher = _application_matcher
+    if source is applications:
+        return matcher
+    names = [
+        tuple([app.get("name") or ""] + list(app.get("keywords") or []))
+        for app in applications
+    ]
+    if tuple(names) == signature:
+        _application_matcher = (applications, signature, matcher)
+        return matcher
+    matcher = KeywordMatcher()
+    for i, keywords in enumerate(names):
+        for j, keyword in enumerate(keywords):
+            matcher.add(keyword, (i, j, (keyword or "").lower()))
+    matcher.build()
+    _application_matcher = (applications, tuple(names), matcher)
+    return matcher
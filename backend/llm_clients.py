@@ -0,0 +1,266 @@
+"""Long-lived LLM provider SDK clients with pooled keep-alive connections.
+
+Creating a ``genai.Client`` / ``OpenAI`` / ``Anthropic`` per call opened a
+fresh HTTP connection pool each time, so every Scribe, synthesis and judge
+call paid DNS + TCP + TLS setup. ``provider_clients`` keeps one client per
+provider, built lazily on first use and shared by all threads (the SDK
+clients and their httpx pools are thread-safe):
+
+    client = provider_clients.get("openai")      # None when no key is configured
+    client.responses.create(...)
+
+A client is rebuilt when ``api_keys_manager`` returns a different key for
+its provider, so key rotation takes effect on the next call. In-flight calls
+keep using the client they started with; a replaced client's connection pool
+is closed once it is garbage collected, i.e. after its last call or stream
+has let go of it.
+
+Every HTTP request made through these clients is measured: new connections
+and their connect time (TCP + TLS) and time to first byte (request sent ->
+response headers). ``render_prometheus()`` is served by ``GET /metrics``.
+
+Pool limits: LLM_HTTP_MAX_CONNECTIONS (default 32),
+LLM_HTTP_MAX_KEEPALIVE (default 16), LLM_HTTP_KEEPALIVE_S (default 90).
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional
+
+from api_keys import api_keys_manager
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the time-to-first-byte histogram buckets; +Inf is implicit.
+TTFB_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+_TIMING_EXTENSION = "llm_client_timing"
+
+
+def _http_limits():
+    import httpx
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", 32)),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", 16)),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_S", 90)),
+    )
+
+
+class _ProviderStats:
+    __slots__ = ("builds", "requests", "errors", "connections", "connect_seconds", "ttfb_seconds", "buckets")
+
+    def __init__(self):
+        self.builds = 0
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.connect_seconds = 0.0
+        self.ttfb_seconds = 0.0
+        self.buckets = [0] * len(TTFB_BUCKETS)
+
+
+class ClientMetrics:
+    """Thread-safe per-provider connection and time-to-first-byte counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._providers: dict[str, _ProviderStats] = {}
+
+    def _stats(self, provider: str) -> _ProviderStats:
+        stats = self._providers.get(provider)
+        if stats is None:
+            stats = self._providers[provider] = _ProviderStats()
+        return stats
+
+    def record_build(self, provider: str):
+        with self._lock:
+            self._stats(provider).builds += 1
+
+    def record_request(self, provider: str, ttfb: float, connect: Optional[float] = None,
+                       error: bool = False):
+        """One HTTP exchange; ``connect`` is set when it had to open a new connection."""
+        with self._lock:
+            stats = self._stats(provider)
+            stats.requests += 1
+            stats.ttfb_seconds += ttfb
+            if error:
+                stats.errors += 1
+            if connect is not None:
+                stats.connections += 1
+                stats.connect_seconds += connect
+            for i, bound in enumerate(TTFB_BUCKETS):
+                if ttfb <= bound:
+                    stats.buckets[i] += 1
+                    break
+
+    def reset(self):
+        with self._lock:
+            self._providers.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "client_builds": s.builds,
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "new_connections": s.connections,
+                    "connection_reuse_rate": round(1 - s.connections / s.requests, 3) if s.requests else None,
+                    "avg_connect_ms": round(s.connect_seconds * 1000 / s.connections, 1) if s.connections else None,
+                    "avg_ttfb_ms": round(s.ttfb_seconds * 1000 / s.requests, 1) if s.requests else None,
+                }
+                for name, s in sorted(self._providers.items())
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            snapshot = [
+                (name, s.builds, s.requests, s.errors, s.connections, s.connect_seconds,
+                 s.ttfb_seconds, list(s.buckets))
+                for name, s in sorted(self._providers.items())
+            ]
+
+        lines = []
+
+        def _counter(metric, help_text, index, fmt="{}"):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in snapshot:
+                lines.append(f'{metric}{{provider="{row[0]}"}} {fmt.format(row[index])}')
+
+        _counter("llm_client_builds_total", "LLM provider clients built (first use and key rotations).", 1)
+        _counter("llm_client_requests_total", "HTTP requests sent to LLM providers.", 2)
+        _counter("llm_client_errors_total", "HTTP responses from LLM providers with status >= 400.", 3)
+        _counter("llm_client_connections_total", "New HTTP connections opened to LLM providers.", 4)
+        _counter("llm_client_connect_seconds_total", "Time spent opening connections (TCP + TLS).", 5, "{:.6f}")
+
+        metric = "llm_client_ttfb_seconds"
+        lines.append(f"# HELP {metric} Time from sending a request to receiving the response headers.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, _, requests, _, _, _, ttfb_seconds, buckets in snapshot:
+            cumulative = 0
+            for bound, count in zip(TTFB_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{provider="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{provider="{name}",le="+Inf"}} {requests}')
+            lines.append(f'{metric}_sum{{provider="{name}"}} {ttfb_seconds:.6f}')
+            lines.append(f'{metric}_count{{provider="{name}"}} {requests}')
+
+        return "\n".join(lines) + "\n"
+
+
+client_metrics = ClientMetrics()
+
+
+def timing_hooks(provider: str, metrics: ClientMetrics = client_metrics) -> dict[str, list[Callable]]:
+    """httpx ``event_hooks`` measuring connect time and time to first byte per request.
+
+    The request hook installs an httpcore ``trace`` callback, which reports
+    the TCP connect and TLS handshake only when a new connection is opened;
+    the response hook fires once the response headers have arrived.
+    """
+    def on_request(request):
+        timing = {"start": time.perf_counter(), "connect": None, "mark": None}
+
+        def trace(event: str, info: dict):
+            if not event.startswith(("connection.connect_tcp.", "connection.start_tls.")):
+                return
+            if event.endswith(".started"):
+                timing["mark"] = time.perf_counter()
+            elif event.endswith(".complete") and timing["mark"] is not None:
+                timing["connect"] = (timing["connect"] or 0.0) + time.perf_counter() - timing["mark"]
+                timing["mark"] = None
+
+        request.extensions["trace"] = trace
+        request.extensions[_TIMING_EXTENSION] = timing
+
+    def on_response(response):
+        timing = response.request.extensions.get(_TIMING_EXTENSION)
+        if timing is None:
+            return
+        metrics.record_request(
+            provider, time.perf_counter() - timing["start"],
+            connect=timing["connect"], error=response.status_code >= 400,
+        )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+# Builders return (SDK client, object whose close() releases its connection pool).
+
+def _build_gemini(api_key: str):
+    from google import genai
+    from google.genai import types
+    client = genai.Client(api_key=api_key, http_options=types.HttpOptions(
+        client_args={"limits": _http_limits(), "event_hooks": timing_hooks("gemini")},
+    ))
+    return client, client._api_client
+
+
+def _build_openai(api_key: str):
+    from openai import OpenAI, DefaultHttpxClient
+    http_client = DefaultHttpxClient(limits=_http_limits(), event_hooks=timing_hooks("openai"))
+    return OpenAI(api_key=api_key, http_client=http_client), http_client
+
+
+def _build_anthropic(api_key: str):
+    import anthropic
+    http_client = anthropic.DefaultHttpxClient(limits=_http_limits(), event_hooks=timing_hooks("anthropic"))
+    return anthropic.Anthropic(api_key=api_key, http_client=http_client), http_client
+
+
+class ProviderClients:
+    """One shared SDK client per provider, rebuilt when its API key changes."""
+
+    def __init__(self, builders: dict[str, Callable[[str], tuple[Any, Any]]],
+                 metrics: ClientMetrics = client_metrics):
+        self._builders = builders
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._clients: dict[str, tuple[str, Any]] = {}
+
+    def get(self, provider: str):
+        """Client for ``provider``; None when no API key is configured."""
+        api_key = api_keys_manager.get_key(provider)
+        if not api_key:
+            return None
+        cached = self._clients.get(provider)
+        if cached is not None and cached[0] == api_key:
+            return cached[1]
+        with self._lock:
+            cached = self._clients.get(provider)
+            if cached is not None and cached[0] == api_key:
+                return cached[1]
+            if cached is not None:
+                logger.info(f"[LLMClients] {provider} API key changed, rebuilding client")
+            client, pool = self._builders[provider](api_key)
+            # Closing on collection rather than on replacement lets calls and
+            # streams still holding the old client finish on its connections.
+            weakref.finalize(client, _close, provider, pool)
+            self._clients[provider] = (api_key, client)
+            self._metrics.record_build(provider)
+        return client
+
+    def reset(self):
+        """Drop all clients (they are rebuilt on next use, and closed once unused)."""
+        with self._lock:
+            self._clients.clear()
+
+
+def _close(provider: str, pool):
+    """Release a collected client's HTTP connection pool."""
+    try:
+        pool.close()
+    except Exception as e:
+        logger.warning(f"[LLMClients] Closing a released {provider} client failed: {e}")
+
+
+provider_clients = ProviderClients({
+    "gemini": _build_gemini,
+    "openai": _build_openai,
+    "anthropic": _build_anthropic,
+})
@@ -15,6 +15,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 from api_keys import api_keys_manager
+from llm_clients import provider_clients
 
 
 @dataclass
@@ -60,14 +61,12 @@ class GeminiProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.4,
     ) -> LLMResponse:
-        from google import genai
         from google.genai import types
 
-        api_key = api_keys_manager.get_key("gemini")
-        if not api_key:
+        client = provider_clients.get("gemini")
+        if client is None:
             return LLMResponse(provider=self.name, content="", error="Gemini API key not configured")
 
-        client = genai.Client(api_key=api_key)
         model = "gemini-2.0-flash"
         t0 = time.time()
 
@@ -133,13 +132,10 @@ class OpenAIProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.4,
     ) -> LLMResponse:
-        from openai import OpenAI
-
-        api_key = api_keys_manager.get_key("openai")
-        if not api_key:
+        client = provider_clients.get("openai")
+        if client is None:
             return LLMResponse(provider=self.name, content="", error="OpenAI API key not configured")
 
-        client = OpenAI(api_key=api_key)
         t0 = time.time()
 
         try:
@@ -193,13 +189,10 @@ class AnthropicProvider(LLMProvider):
         max_tokens: int = 4096,
         temperature: float = 0.4,
     ) -> LLMResponse:
-        import anthropic
-
-        api_key = api_keys_manager.get_key("anthropic")
-        if not api_key:
+        client = provider_clients.get("anthropic")
+        if client is None:
             return LLMResponse(provider=self.name, content="", error="Anthropic API key not configured")
 
-        client = anthropic.Anthropic(api_key=api_key)
         t0 = time.time()
 
         try:
@@ -253,14 +246,12 @@ class GeminiProProvider(GeminiProvider):
         max_tokens: int = 4096,
         temperature: float = 0.4,
     ) -> LLMResponse:
-        from google import genai
         from google.genai import types
 
-        api_key = api_keys_manager.get_key("gemini")
-        if not api_key:
+        client = provider_clients.get("gemini")
+        if client is None:
             return LLMResponse(provider=self.name, content="", error="Gemini API key not configured")
 
-        client = genai.Client(api_key=api_key)
         model = "gemini-3-pro-preview"
         t0 = time.time()
 
@@ -314,13 +305,10 @@ class AnthropicOpusProvider(AnthropicProvider):
         max_tokens: int = 4096,
         temperature: float = 0.4,
     ) -> LLMResponse:
-        import anthropic
-
-        api_key = api_keys_manager.get_key("anthropic")
-        if not api_key:
+        client = provider_clients.get("anthropic")
+        if client is None:
             return LLMResponse(provider=self.name, content="", error="Anthropic API key not configured")
 
-        client = anthropic.Anthropic(api_key=api_key)
         t0 = time.time()
 
         try:
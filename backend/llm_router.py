@@ -5,14 +5,23 @@ Routes LLM calls to Google Gemini or OpenAI GPT based on model prefix (gpt-* / g
   - gpt-*   → OpenAI Responses API
 
 All callers use a single `llm_call()` function with a unified response format.
+`llm_call_stream()` is the token-streaming variant: it yields text deltas as
+they arrive and exposes the same LLMResult once exhausted. Provider calls
+run with the SDK's default timeout: they back required pipeline stages,
+which a request Deadline (deadline.py) never cuts short.
+Provider SDK clients are shared and pooled (llm_clients.py). Every call's
+latency and outcome is recorded per model; passing ``site=`` ("scribe",
+"synthesis", ...) applies that call site's routing policy — circuit
+breaking, and hedging/failover to a backup model (llm_routing.py).
 """
 
 import logging
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
-from api_keys import api_keys_manager
+from llm_clients import provider_clients
+from llm_routing import provider_failed, routing
 
 logger = logging.getLogger(__name__)
 
@@ -35,24 +44,16 @@ class LLMResult:
     error: Optional[str] = None
 
 
-def _call_gemini(
-    model: str,
+def _gemini_request(
     system_prompt: Optional[str],
     user_prompt: str,
     json_mode: bool,
     temperature: float,
     max_output_tokens: Optional[int],
-) -> LLMResult:
-    from google import genai
+) -> dict:
+    """``contents`` / ``config`` arguments for generate_content(_stream)."""
     from google.genai import types
 
-    api_key = api_keys_manager.get_key("gemini")
-    if not api_key:
-        return LLMResult(text="", error="GEMINI_API_KEY not set")
-
-    client = genai.Client(api_key=api_key)
-    t0 = time.time()
-
     config_kwargs: dict = {}
     if system_prompt:
         config_kwargs["system_instruction"] = system_prompt
@@ -62,16 +63,58 @@ def _call_gemini(
     if max_output_tokens:
         config_kwargs["max_output_tokens"] = max_output_tokens
 
+    return {
+        "contents": [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=user_prompt)],
+            )
+        ],
+        "config": types.GenerateContentConfig(**config_kwargs),
+    }
+
+
+def _openai_request(
+    model: str,
+    system_prompt: Optional[str],
+    user_prompt: str,
+    json_mode: bool,
+    temperature: float,
+    max_output_tokens: Optional[int],
+) -> dict:
+    """Keyword arguments for responses.create."""
+    kwargs: dict = {
+        "model": model,
+        "input": [{"role": "user", "content": [{"type": "input_text", "text": user_prompt}]}],
+        "temperature": temperature,
+    }
+    if system_prompt:
+        kwargs["instructions"] = system_prompt
+    if json_mode:
+        kwargs["text"] = {"format": {"type": "json_object"}}
+    if max_output_tokens:
+        kwargs["max_output_tokens"] = max_output_tokens
+    return kwargs
+
+
+def _call_gemini(
+    model: str,
+    system_prompt: Optional[str],
+    user_prompt: str,
+    json_mode: bool,
+    temperature: float,
+    max_output_tokens: Optional[int],
+) -> LLMResult:
+    client = provider_clients.get("gemini")
+    if client is None:
+        return LLMResult(text="", error="GEMINI_API_KEY not set")
+
+    t0 = time.time()
+
     try:
         response = client.models.generate_content(
             model=model,
-            contents=[
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=user_prompt)],
-                )
-            ],
-            config=types.GenerateContentConfig(**config_kwargs),
+            **_gemini_request(system_prompt, user_prompt, json_mode, temperature, max_output_tokens),
         )
 
         text = response.text or ""
@@ -102,29 +145,16 @@ def _call_openai(
     temperature: float,
     max_output_tokens: Optional[int],
 ) -> LLMResult:
-    from openai import OpenAI
-
-    api_key = api_keys_manager.get_key("openai")
-    if not api_key:
+    client = provider_clients.get("openai")
+    if client is None:
         return LLMResult(text="", error="OPENAI_API_KEY not set")
 
-    client = OpenAI(api_key=api_key)
     t0 = time.time()
 
-    kwargs: dict = {
-        "model": model,
-        "input": [{"role": "user", "content": [{"type": "input_text", "text": user_prompt}]}],
-        "temperature": temperature,
-    }
-    if system_prompt:
-        kwargs["instructions"] = system_prompt
-    if json_mode:
-        kwargs["text"] = {"format": {"type": "json_object"}}
-    if max_output_tokens:
-        kwargs["max_output_tokens"] = max_output_tokens
-
     try:
-        response = client.responses.create(**kwargs)
+        response = client.responses.create(
+            **_openai_request(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+        )
 
         text = response.output_text or ""
         usage = getattr(response, "usage", None)
@@ -153,9 +183,155 @@ def llm_call(
     json_mode: bool = True,
     temperature: float = 0.0,
     max_output_tokens: Optional[int] = None,
+    site: Optional[str] = None,
 ) -> LLMResult:
-    """Route an LLM call to the appropriate provider based on model name."""
+    """Route an LLM call to the appropriate provider based on model name.
+
+    With a ``site`` the call may be served by the site's backup model, or
+    fail fast with ``error`` while every candidate's circuit is open.
+    """
+    def call(target: str) -> LLMResult:
+        if target.startswith("gpt-"):
+            return _call_openai(target, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+        return _call_gemini(target, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+
+    if site is None:
+        result = call(model)
+        routing.record(model, result.duration_s, not provider_failed(result))
+        return result
+    return routing.call(site, model, call, json_mode=json_mode,
+                        on_circuit_open=lambda message: LLMResult(text="", error=message))
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+class LLMStream:
+    """Text deltas of a streaming LLM call.
+
+    Iterate to receive the response text as it is generated. Provider errors
+    do not raise: the stream simply ends and ``result.error`` is set, matching
+    llm_call. ``result`` is None until the stream has been exhausted.
+    """
+
+    def __init__(self, provider: str, model: str, produce: Callable[["LLMStream"], Iterator[str]]):
+        self.provider = provider
+        self.model = model
+        self._produce = produce
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.result: Optional[LLMResult] = None
+        self.on_result: Optional[Callable[[LLMResult], None]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        t0 = time.time()
+        parts: list[str] = []
+        error = None
+        try:
+            for delta in self._produce(self):
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"{self.provider} streaming API error ({self.model}): {e}")
+            error = str(e)
+        self.result = LLMResult(
+            text="".join(parts),
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            duration_s=round(time.time() - t0, 2),
+            error=error,
+        )
+        if self.on_result is not None:
+            self.on_result(self.result)
+
+
+def _stream_gemini(
+    model: str,
+    system_prompt: Optional[str],
+    user_prompt: str,
+    json_mode: bool,
+    temperature: float,
+    max_output_tokens: Optional[int],
+) -> LLMStream:
+    def produce(stream: LLMStream) -> Iterator[str]:
+        client = provider_clients.get("gemini")
+        if client is None:
+            raise RuntimeError("GEMINI_API_KEY not set")
+
+        for chunk in client.models.generate_content_stream(
+            model=model,
+            **_gemini_request(system_prompt, user_prompt, json_mode, temperature, max_output_tokens),
+        ):
+            usage = getattr(chunk, "usage_metadata", None)
+            if usage:
+                stream.input_tokens = getattr(usage, "prompt_token_count", 0) or 0
+                stream.output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+            yield chunk.text or ""
+
+    return LLMStream("Gemini", model, produce)
+
+
+def _stream_openai(
+    model: str,
+    system_prompt: Optional[str],
+    user_prompt: str,
+    json_mode: bool,
+    temperature: float,
+    max_output_tokens: Optional[int],
+) -> LLMStream:
+    def produce(stream: LLMStream) -> Iterator[str]:
+        client = provider_clients.get("openai")
+        if client is None:
+            raise RuntimeError("OPENAI_API_KEY not set")
+
+        events = client.responses.create(
+            **_openai_request(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens),
+            stream=True,
+        )
+        for event in events:
+            event_type = getattr(event, "type", "")
+            if event_type == "response.output_text.delta":
+                yield event.delta
+            elif event_type == "response.completed":
+                usage = getattr(event.response, "usage", None)
+                if usage:
+                    stream.input_tokens = getattr(usage, "input_tokens", 0) or 0
+                    stream.output_tokens = getattr(usage, "output_tokens", 0) or 0
+            elif event_type == "response.failed":
+                error = getattr(event.response, "error", None)
+                raise RuntimeError(getattr(error, "message", None) or "response failed")
+            elif event_type == "error":
+                raise RuntimeError(getattr(event, "message", None) or "stream error")
+
+    return LLMStream("OpenAI", model, produce)
+
+
+def llm_call_stream(
+    model: str,
+    user_prompt: str,
+    system_prompt: Optional[str] = None,
+    json_mode: bool = True,
+    temperature: float = 0.0,
+    max_output_tokens: Optional[int] = None,
+    site: Optional[str] = None,
+) -> LLMStream:
+    """Streaming counterpart of llm_call: iterate for text deltas, then read ``.result``.
+
+    Tokens are forwarded as they arrive, so a ``site`` policy cannot hedge a
+    stream; it only moves to the backup model while the primary's circuit is open.
+    """
+    if site is not None:
+        target = routing.select(site, model)
+        if target is None:
+            def circuit_open(stream: LLMStream) -> Iterator[str]:
+                raise RuntimeError(f"Circuit open for {model}")
+            return LLMStream("Router", model, circuit_open)
+        model = target
     if model.startswith("gpt-"):
-        return _call_openai(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+        stream = _stream_openai(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
     else:
-        return _call_gemini(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+        stream = _stream_gemini(model, system_prompt, user_prompt, json_mode, temperature, max_output_tokens)
+    stream.on_result = lambda result: routing.record(model, result.duration_s, not provider_failed(result))
+    return stream
@@ -0,0 +1,379 @@
+"""Latency-aware routing for LLM calls: rolling stats, hedged requests, circuit breaking.
+
+Every ``llm_call`` records its latency and outcome per model. Call sites
+that pass ``site=`` are routed by that site's ``RoutePolicy``:
+
+    llm_call(model, prompt, site="scribe")
+
+- **Circuit breaking** (opt-in per site): after LLM_BREAKER_FAILURES
+  consecutive failures a model is skipped for LLM_BREAKER_COOLDOWN_S; then a
+  single probe call decides whether it closes again. With no usable model
+  the call fails fast with an ``error`` instead of waiting out another
+  provider timeout. Only transport and provider errors count as failures —
+  a response that is merely invalid JSON (e.g. a truncated synthesis the
+  caller repairs) does not, since the circuit is per model and shared by
+  every site and site-less call.
+- **Hedging** (needs a ``backup`` model): if the primary has not answered
+  after its rolling p95 latency, the backup is fired too and the first
+  valid response (no error, parseable JSON in json mode) wins. The loser is
+  left to finish in the background; its outcome still feeds the stats.
+- **Failover**: a primary that fails or returns invalid JSON before the
+  hedge delay triggers the backup immediately.
+
+Policies are configured per call site from the environment, e.g.
+LLM_ROUTE_SCRIBE_BACKUP=gemini-2.0-flash, LLM_ROUTE_SYNTHESIS_HEDGE=0,
+LLM_ROUTE_JUDGE_BREAKER=1. Without a backup only circuit breaking applies.
+The judge and debate sites run fixed per-provider panels, so they use
+``guarded()`` (circuit breaking only) rather than hedging to another model.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+ROUTE_SITES = ("scribe", "synthesis", "judge", "debate")
+
+# Rolling window (calls per model) for latency percentiles and error rates
+LLM_STATS_WINDOW = int(os.getenv("LLM_STATS_WINDOW", 50))
+# Hedge delay: p95 of the primary's recent latencies once it has enough samples
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 10))
+LLM_HEDGE_DEFAULT_DELAY_S = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_S", 8))
+LLM_HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", 1))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", 30))
+LLM_HEDGE_WORKERS = int(os.getenv("LLM_HEDGE_WORKERS", 16))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised by ``guarded()`` when the target's circuit is open."""
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    backup: Optional[str] = None    # model fired on hedge / failover
+    hedge: bool = True              # fire the backup after the primary's p95 (needs backup)
+    circuit_breaker: bool = False   # skip models whose circuit is open
+
+    @classmethod
+    def from_env(cls, site: str) -> "RoutePolicy":
+        prefix = f"LLM_ROUTE_{site.upper()}_"
+        return cls(
+            backup=os.getenv(prefix + "BACKUP") or None,
+            hedge=os.getenv(prefix + "HEDGE", "1") != "0",
+            circuit_breaker=os.getenv(prefix + "BREAKER", "0") == "1",
+        )
+
+
+class _ModelState:
+    """Rolling outcomes and circuit state of one model (guarded by LLMRouter._lock)."""
+
+    __slots__ = ("window", "calls", "failures", "consecutive_failures", "opened_at", "probe_at")
+
+    def __init__(self, window: int):
+        self.window: deque = deque(maxlen=window)   # (latency_s, ok)
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None      # circuit open since
+        self.probe_at: Optional[float] = None       # half-open probe in flight since
+
+
+def provider_failed(result: Any) -> bool:
+    """Whether the provider call itself failed (transport or provider ``error``).
+
+    Only these outcomes count toward a model's circuit breaker.
+    """
+    return result is None or bool(getattr(result, "error", None))
+
+
+def valid_result(result: Any, json_mode: bool = False) -> bool:
+    """An LLMResult usable by the caller: no error, non-empty, and JSON when asked for.
+
+    Used to pick the hedging winner and to fail over; not a breaker failure.
+    """
+    if result is None or getattr(result, "error", None) or not getattr(result, "text", ""):
+        return False
+    if json_mode:
+        try:
+            json.loads(result.text)
+        except ValueError:
+            return False
+    return True
+
+
+class LLMRouter:
+    """Per-model latency/error statistics and per-site routing policies."""
+
+    def __init__(self, policies: Optional[dict[str, RoutePolicy]] = None,
+                 window: int = LLM_STATS_WINDOW,
+                 failure_threshold: int = LLM_BREAKER_FAILURES,
+                 cooldown_s: float = LLM_BREAKER_COOLDOWN_S,
+                 clock: Callable[[], float] = time.monotonic,
+                 max_workers: int = LLM_HEDGE_WORKERS):
+        self.policies = dict(policies or {})
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._models: dict[str, _ModelState] = {}
+        self._hedges: dict[str, list[int]] = {}    # site -> [fired, won by backup]
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def policy(self, site: str) -> RoutePolicy:
+        return self.policies.get(site) or RoutePolicy()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = _ModelState(self.window)
+        return state
+
+    # ------------------------------------------------------------------
+    # Statistics and circuit state
+    # ------------------------------------------------------------------
+
+    def record(self, model: str, latency_s: float, ok: bool):
+        with self._lock:
+            state = self._state(model)
+            state.window.append((latency_s, ok))
+            state.calls += 1
+            state.probe_at = None
+            if ok:
+                state.consecutive_failures = 0
+                if state.opened_at is not None:
+                    logger.info(f"[LLMRouting] circuit closed for {model}")
+                state.opened_at = None
+                return
+            state.failures += 1
+            state.consecutive_failures += 1
+            if state.opened_at is not None or state.consecutive_failures >= self.failure_threshold:
+                if state.opened_at is None:
+                    logger.warning(f"[LLMRouting] circuit opened for {model} "
+                                   f"after {state.consecutive_failures} consecutive failures")
+                state.opened_at = self.clock()
+
+    def admit(self, model: str) -> bool:
+        """Whether ``model`` may be called now; past the cooldown one probe call is let through."""
+        with self._lock:
+            state = self._state(model)
+            if state.opened_at is None:
+                return True
+            now = self.clock()
+            if now - state.opened_at < self.cooldown_s:
+                return False
+            # Half-open: a single probe at a time (a lost probe expires after another cooldown)
+            if state.probe_at is not None and now - state.probe_at < self.cooldown_s:
+                return False
+            state.probe_at = now
+            return True
+
+    def circuit(self, model: str) -> str:
+        with self._lock:
+            state = self._models.get(model)
+            if state is None or state.opened_at is None:
+                return "closed"
+            return "open" if self.clock() - state.opened_at < self.cooldown_s else "half_open"
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """Latency quantile of the model's recent successful calls (None without samples)."""
+        with self._lock:
+            state = self._models.get(model)
+            latencies = sorted(lat for lat, ok in state.window if ok) if state else []
+        if not latencies:
+            return None
+        return latencies[max(0, math.ceil(q * len(latencies)) - 1)]
+
+    def hedge_delay(self, model: str) -> float:
+        with self._lock:
+            state = self._models.get(model)
+            samples = sum(1 for _, ok in state.window if ok) if state else 0
+        if samples < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_DEFAULT_DELAY_S
+        return max(LLM_HEDGE_MIN_DELAY_S, self.percentile(model, 0.95))
+
+    # ------------------------------------------------------------------
+    # Routed calls
+    # ------------------------------------------------------------------
+
+    def _attempt(self, model: str, attempt: Callable[[str], Any]):
+        t0 = time.monotonic()
+        result = attempt(model)
+        self.record(model, time.monotonic() - t0, not provider_failed(result))
+        return result
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                    thread_name_prefix="llm-hedge")
+        return self._pool
+
+    def _count_hedge(self, site: str, won: bool):
+        with self._lock:
+            self._hedges.setdefault(site, [0, 0])[1 if won else 0] += 1
+
+    def call(self, site: str, model: str, attempt: Callable[[str], Any],
+             json_mode: bool = True, on_circuit_open: Callable[[str], Any] = None):
+        """Run ``attempt(model)`` under the site's policy and return the chosen result.
+
+        ``attempt`` must not raise (llm_call's providers report errors in the
+        result). When every candidate's circuit is open, returns
+        ``on_circuit_open(message)``.
+        """
+        policy = self.policy(site)
+        chain = [model] + ([policy.backup] if policy.backup and policy.backup != model else [])
+        candidates = iter(chain)
+
+        def next_admitted() -> Optional[str]:
+            for candidate in candidates:
+                if not policy.circuit_breaker or self.admit(candidate):
+                    return candidate
+                logger.info(f"[LLMRouting] {site}: skipping {candidate} (circuit open)")
+            return None
+
+        def circuit_open():
+            return on_circuit_open(f"Circuit open for {', '.join(chain)}")
+
+        if len(chain) == 1 or not policy.hedge:
+            result = None
+            while (candidate := next_admitted()) is not None:
+                result = self._attempt(candidate, attempt)
+                if valid_result(result, json_mode):
+                    return result
+            return result if result is not None else circuit_open()
+
+        first = next_admitted()
+        if first is None:
+            return circuit_open()
+        pool = self._executor()
+        pending = {pool.submit(self._attempt, first, attempt): first}
+        delay = self.hedge_delay(first)
+        hedged = False
+        hedge_model = None
+        result = None
+        while pending:
+            done, _ = wait(pending, timeout=None if hedged else delay, return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary slower than its p95: race the backup against it
+                hedged = True
+                backup = next_admitted()
+                if backup is not None:
+                    logger.info(f"[LLMRouting] {site}: hedging {first} with {backup} after {delay:.1f}s")
+                    self._count_hedge(site, won=False)
+                    hedge_model = backup
+                    pending[pool.submit(self._attempt, backup, attempt)] = backup
+                continue
+            for future in done:
+                winner = pending.pop(future)
+                result = future.result()
+                if valid_result(result, json_mode):
+                    if winner == hedge_model:
+                        self._count_hedge(site, won=True)
+                    return result
+            if not hedged:
+                # Primary failed fast: fail over without waiting for the hedge delay
+                hedged = True
+                backup = next_admitted()
+                if backup is not None:
+                    pending[pool.submit(self._attempt, backup, attempt)] = backup
+        return result
+
+    def select(self, site: str, model: str) -> Optional[str]:
+        """First model of the site's chain whose circuit admits a call (for streaming, which cannot hedge)."""
+        policy = self.policy(site)
+        for candidate in [model] + ([policy.backup] if policy.backup and policy.backup != model else []):
+            if not policy.circuit_breaker or self.admit(candidate):
+                return candidate
+        return None
+
+    def guarded(self, site: str, target: str, fn: Callable[..., Any], *args,
+                failed: Callable[[Any], bool] = lambda r: bool(getattr(r, "error", None))):
+        """Call ``fn(*args)`` behind ``target``'s circuit breaker, recording its outcome.
+
+        Raises CircuitOpenError without calling ``fn`` while the circuit is open.
+        """
+        if self.policy(site).circuit_breaker and not self.admit(target):
+            raise CircuitOpenError(f"Circuit open for {target}")
+        t0 = time.monotonic()
+        try:
+            result = fn(*args)
+        except Exception:
+            self.record(target, time.monotonic() - t0, False)
+            raise
+        self.record(target, time.monotonic() - t0, not failed(result))
+        return result
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def reset(self):
+        with self._lock:
+            self._models.clear()
+            self._hedges.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            names = sorted(self._models)
+            windows = {name: list(self._models[name].window) for name in names}
+            totals = {name: (self._models[name].calls, self._models[name].failures) for name in names}
+            hedges = {site: {"fired": c[0], "backup_won": c[1]} for site, c in sorted(self._hedges.items())}
+        models = {}
+        for name in names:
+            window = windows[name]
+            p50, p95 = self.percentile(name, 0.5), self.percentile(name, 0.95)
+            models[name] = {
+                "calls": totals[name][0],
+                "failures": totals[name][1],
+                "window_error_rate": round(sum(1 for _, ok in window if not ok) / len(window), 3) if window else None,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "circuit": self.circuit(name),
+            }
+        return {
+            "models": models,
+            "hedges": hedges,
+            "policies": {site: vars(self.policy(site)) for site in sorted(set(ROUTE_SITES) | set(self.policies))},
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        stats = self.stats()
+        lines = [
+            "# HELP llm_route_calls_total LLM calls recorded per model.",
+            "# TYPE llm_route_calls_total counter",
+        ]
+        for name, s in stats["models"].items():
+            lines.append(f'llm_route_calls_total{{model="{name}"}} {s["calls"]}')
+        lines += ["# HELP llm_route_failures_total Failed LLM calls (transport or provider errors) per model.",
+                  "# TYPE llm_route_failures_total counter"]
+        for name, s in stats["models"].items():
+            lines.append(f'llm_route_failures_total{{model="{name}"}} {s["failures"]}')
+        lines += ["# HELP llm_route_circuit_open Whether the model's circuit breaker is open (1) or not (0).",
+                  "# TYPE llm_route_circuit_open gauge"]
+        for name, s in stats["models"].items():
+            lines.append(f'llm_route_circuit_open{{model="{name}"}} {int(s["circuit"] == "open")}')
+        lines += ["# HELP llm_route_hedges_total Backup requests fired per call site.",
+                  "# TYPE llm_route_hedges_total counter"]
+        for site, h in stats["hedges"].items():
+            lines.append(f'llm_route_hedges_total{{site="{site}"}} {h["fired"]}')
+        lines += ["# HELP llm_route_hedge_wins_total Hedged calls answered first by the backup.",
+                  "# TYPE llm_route_hedge_wins_total counter"]
+        for site, h in stats["hedges"].items():
+            lines.append(f'llm_route_hedge_wins_total{{site="{site}"}} {h["backup_won"]}')
+        return "\n".join(lines) + "\n"
+
+
+routing = LLMRouter({site: RoutePolicy.from_env(site) for site in ROUTE_SITES})
@@ -0,0 +1,174 @@
+"""Per-verdict context bundle for TraitBasedEngine.
+
+One ``process_query`` used to issue the same graph lookups several times
+(logic gates twice, applications up to three times, the product family's
+constraints, traits, features, ...) one network call at a time.
+EngineContext is a request-scoped view of the graph connection:
+
+    ctx = EngineContext(db)
+    ctx.prefetch(stressor_ids, "FAM_GDB", "ENV_KITCHEN")   # one round trip
+    ctx.get_hard_constraints("FAM_GDB")                    # served from memory
+
+``prefetch`` loads everything the engine reads for a (stressor set, product
+family) pair with ``GraphConnection.get_engine_context``; every other
+read-only lookup in MEMOIZED is cached on first use. The memo lives only as
+long as the verdict, so it never serves data across requests or graph
+versions. Lookups return the memoized objects themselves, as the query
+cache underneath does, so callers must copy before they mutate.
+"""
+
+import logging
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# GraphConnection lookups that are stable for the length of one verdict
+MEMOIZED = frozenset({
+    "get_stressors_by_keywords",
+    "get_goals_by_keywords",
+    "get_all_applications",
+    "get_stressors_for_application",
+    "get_causal_rules_for_stressors",
+    "get_all_product_families_with_traits",
+    "get_product_traits",
+    "get_hard_constraints",
+    "get_installation_constraints",
+    "resolve_environment_hierarchy",
+    "get_optimization_strategy",
+    "get_capacity_rules",
+    "get_available_dimension_modules",
+    "get_variable_features",
+    "get_required_parameters",
+    "get_all_accessory_codes",
+    "get_accessory_compatibility",
+    "get_dependency_rules_for_stressors",
+})
+
+# Lookups that normalize their product family argument to a FAM_ ID
+_FAMILY_KEYED = frozenset({
+    "get_product_traits",
+    "get_hard_constraints",
+    "get_installation_constraints",
+    "get_optimization_strategy",
+    "get_capacity_rules",
+})
+
+# get_engine_context bundle key -> (method, product family form of its argument)
+_BUNDLE_FAMILY_METHODS = {
+    "product_traits": ("get_product_traits", "id"),
+    "hard_constraints": ("get_hard_constraints", "id"),
+    "installation_constraints": ("get_installation_constraints", "id"),
+    "optimization_strategy": ("get_optimization_strategy", "id"),
+    "capacity_rules": ("get_capacity_rules", "id"),
+    "variable_features": ("get_variable_features", "code"),
+    "required_parameters": ("get_required_parameters", "code"),
+}
+
+
+def _pf_id(item_id: str) -> str:
+    return item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+class EngineContext:
+    """Request-scoped view of the graph connection that memoizes engine lookups."""
+
+    def __init__(self, db):
+        self.db = db
+        self._memo: dict = {}
+        self._gates: list[tuple[frozenset, list]] = []
+        self._bundles: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, name: str, args: tuple):
+        if name in _FAMILY_KEYED and args and isinstance(args[0], str):
+            args = (_pf_id(args[0]),) + args[1:]
+        return (name,) + _hashable(args)
+
+    def _lookup(self, name: str, fn, args: tuple):
+        key = self._key(name, args)
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        self.misses += 1
+        value = fn(*args)
+        self._memo[key] = value
+        return value
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if name not in MEMOIZED or not callable(attr):
+            return attr
+
+        def memoized(*args, **kwargs):
+            if kwargs:
+                return attr(*args, **kwargs)
+            return self._lookup(name, attr, args)
+
+        return memoized
+
+    def get_logic_gates_for_stressors(self, stressor_ids: list[str]) -> list[dict]:
+        """Gates of the stressors, answered from any fetched superset (rows are per gate/stressor)."""
+        wanted = frozenset(stressor_ids)
+        for fetched, rows in self._gates:
+            if wanted <= fetched:
+                self.hits += 1
+                return [r for r in rows if r.get("stressor_id") in wanted]
+        self.misses += 1
+        rows = self.db.get_logic_gates_for_stressors(stressor_ids)
+        if isinstance(rows, list):
+            self._gates.append((wanted, rows))
+        return rows
+
+    def prefetch(self, stressor_ids: Iterable[str], product_family: Optional[str] = None,
+                 environment_id: Optional[str] = None):
+        """Load the bundle of a (stressor set, product family) pair in one round trip.
+
+        Each pair is fetched at most once; lookups already memoized are kept.
+        A failed or unavailable bundle only means the lookups run one by one.
+        """
+        stressor_ids = list(dict.fromkeys(stressor_ids))
+        pf_id = _pf_id(product_family) if product_family else None
+        bundle_key = (frozenset(stressor_ids), pf_id, environment_id)
+        loader = getattr(self.db, "get_engine_context", None)
+        if bundle_key in self._bundles or not callable(loader):
+            return
+        self._bundles.add(bundle_key)
+        wanted = frozenset(stressor_ids)
+        gate_ids = [] if any(wanted <= fetched for fetched, _ in self._gates) else stressor_ids
+        try:
+            bundle = loader(gate_ids, pf_id, environment_id)
+        except Exception as e:
+            logger.debug(f"[EngineContext] Context bundle failed, falling back to single lookups: {e}")
+            return
+        if not isinstance(bundle, dict):
+            return
+
+        if gate_ids and "logic_gates" in bundle:
+            self._gates.append((wanted, bundle["logic_gates"]))
+        if "applications" in bundle:
+            self._seed("get_all_applications", (), bundle["applications"])
+        if "accessory_codes" in bundle:
+            self._seed("get_all_accessory_codes", (), bundle["accessory_codes"])
+        if "environment_chain" in bundle and environment_id:
+            self._seed("resolve_environment_hierarchy", (environment_id,), bundle["environment_chain"])
+        if pf_id:
+            for field, (method, form) in _BUNDLE_FAMILY_METHODS.items():
+                if field in bundle:
+                    self._seed(method, (pf_id if form == "id" else pf_id[4:],), bundle[field])
+
+    def _seed(self, name: str, args: tuple, value):
+        key = self._key(name, args)
+        if key not in self._memo:
+            self._memo[key] = value
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "bundles": len(self._bundles)}
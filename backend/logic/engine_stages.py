@@ -0,0 +1,131 @@
+"""Incremental engine re-evaluation across conversation turns.
+
+A configuration dialogue runs TraitBasedEngine once per turn, but most
+follow-up turns only answer a clarification (airflow, a gate parameter,
+a dimension). The trait stage of the pipeline — causal rules, candidate
+matching, vetoes, assembly and pivot — depends only on the detected
+stressor set and the product hint, so it is cached per session:
+
+    stage = engine.stage_cache.get(session_id, key)      # key = TraitStageKey
+    if stage is None:
+        stage = ...                                       # Steps 2-5d
+        engine.stage_cache.put(session_id, key, stage)
+
+Context-dependent stages (gates, constraints, sizing, capacity, missing
+parameters) are recomputed every turn. Entries expire after
+ENGINE_INCREMENTAL_TTL_S and are keyed by the graph version, so catalog
+edits are picked up on the next turn. ENGINE_INCREMENTAL=0 disables reuse.
+"""
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+ENGINE_INCREMENTAL = os.getenv("ENGINE_INCREMENTAL", "1") != "0"
+ENGINE_INCREMENTAL_TTL_S = float(os.getenv("ENGINE_INCREMENTAL_TTL_S", 1800))
+ENGINE_INCREMENTAL_SESSIONS = int(os.getenv("ENGINE_INCREMENTAL_SESSIONS", 1024))
+
+
+class TraitStageKey(NamedTuple):
+    """Inputs of the trait stage."""
+    stressor_ids: frozenset
+    product_hint: Optional[str]
+    graph_version: Optional[int]
+
+
+@dataclass
+class TraitStage:
+    """Outputs of Steps 2-5d of TraitBasedEngine.process_query."""
+    rules: list             # list[CausalRule]
+    matches: list           # list[TraitMatch], after vetoes and pivot
+    non_vetoed: list        # non-vetoed matches before the pivot
+    assembly: Optional[list]
+
+
+class EngineStageCache:
+    """Per-session cache of the last trait stage (thread-safe, LRU over sessions)."""
+
+    def __init__(self, enabled: bool = ENGINE_INCREMENTAL, ttl_s: float = ENGINE_INCREMENTAL_TTL_S,
+                 max_sessions: int = ENGINE_INCREMENTAL_SESSIONS, clock: Callable[[], float] = time.monotonic):
+        self.enabled = enabled
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, tuple[TraitStageKey, TraitStage, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _copy(stage: TraitStage) -> TraitStage:
+        # Matches and assembly stages are mutated downstream (sorting, target
+        # pivot); copy them together so non_vetoed keeps pointing into matches.
+        # Rules are read-only and carry the compiled rule index, so they are shared.
+        matches, non_vetoed, assembly = copy.deepcopy((stage.matches, stage.non_vetoed, stage.assembly))
+        return TraitStage(stage.rules, matches, non_vetoed, assembly)
+
+    def get(self, session_id: Optional[str], key: TraitStageKey) -> Optional[TraitStage]:
+        """The session's trait stage if it was computed for the same inputs, as a private copy."""
+        if not self.enabled or not session_id:
+            return None
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry[0] != key or self._clock() - entry[2] > self.ttl_s:
+                self._misses += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self._hits += 1
+            stage = entry[1]
+        logger.info(f"[TraitEngine] Incremental turn: reusing trait stage for session {session_id}")
+        return self._copy(stage)
+
+    def put(self, session_id: Optional[str], key: TraitStageKey, stage: TraitStage):
+        if not self.enabled or not session_id:
+            return
+        stored = self._copy(stage)
+        with self._lock:
+            self._sessions[session_id] = (key, stored, self._clock())
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "sessions": len(self._sessions),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def render_prometheus(self, prefix: str = "engine_incremental") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        stats = self.stats()
+        return "\n".join([
+            f"# HELP {prefix}_hits_total Turns that reused the session's trait stage.",
+            f"# TYPE {prefix}_hits_total counter",
+            f"{prefix}_hits_total {stats['hits']}",
+            f"# HELP {prefix}_misses_total Session turns that recomputed the trait stage.",
+            f"# TYPE {prefix}_misses_total counter",
+            f"{prefix}_misses_total {stats['misses']}",
+            f"# HELP {prefix}_sessions Sessions with a cached trait stage.",
+            f"# TYPE {prefix}_sessions gauge",
+            f"{prefix}_sessions {stats['sessions']}",
+        ]) + "\n"
+
+
+# Shared by the retriever's engine singleton and the /health endpoints
+trait_stages = EngineStageCache()
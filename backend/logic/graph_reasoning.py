@@ -20,6 +20,63 @@ from dataclasses import dataclass, field
 from typing import Optional
 import re
 
+from keyword_matcher import application_matcher
+
+
+# Regex fallbacks of GraphReasoningEngine, compiled once at import.
+# Material: the first code (in this order) with any matching pattern wins.
+_MATERIAL_FALLBACK_PATTERNS = [
+    (code, re.compile(pattern, re.IGNORECASE))
+    for code, patterns in {
+        'FZ': [r'\bFZ\b', r'galvanized', r'zinc', r'cynk', r'ocynk'],
+        'ZM': [r'\bZM\b', r'zinc.?magnesium', r'magneli'],
+        'RF': [r'\bRF\b', r'stainless', r'stal nierdzewna', r'inox', r'304'],
+        'SF': [r'\bSF\b', r'316', r'marine.?grade'],
+    }.items()
+    for pattern in patterns
+]
+
+_FAMILY_FALLBACK = ('GDB', 'GDC', 'GDP', 'GDMI', 'GDF', 'GDR', 'PFF', 'BFF')
+
+# Known accessory substrings of the uppercased query (order matters - longer patterns first)
+_ACCESSORY_FALLBACK_SUBSTRINGS = [
+    # Full names/descriptions (check first)
+    ('ECCENTRIC LOCK', 'EXL'),
+    ('QUICK RELEASE', 'EXL'),
+    ('QUICK-RELEASE', 'EXL'),
+    ('LEFT HINGE', 'L'),
+    ('LEFT-HINGE', 'L'),
+    ('POLYSFILTER', 'Polis'),
+    ('AFTER-FILTER RAIL', 'Polis'),
+    ('AFTER FILTER RAIL', 'Polis'),
+    ('AFTER-FILTER', 'Polis'),
+    ('POLISHING RAIL', 'Polis'),
+    ('BAYONET', 'Bayonet'),
+    # Codes (check after)
+    ('-EXL', 'EXL'),
+    (' EXL', 'EXL'),
+    ('/EXL', 'EXL'),
+    ('+EXL', 'EXL'),
+    ('_EXL', 'EXL'),
+    ('-L-', 'L'),
+    ('-L ', 'L'),
+    (' L ', 'L'),  # Only match standalone L
+    ('-POLIS', 'Polis'),
+    (' POLIS', 'Polis'),
+    ('(POLIS)', 'Polis'),
+    ("'POLIS'", 'Polis'),
+]
+
+_ACCESSORY_FALLBACK_PATTERNS = [
+    (re.compile(r'\bWITH\s+EXL\b'), 'EXL'),
+    (re.compile(r'\bWITH\s+L\b'), 'L'),
+    (re.compile(r'\bWITH\s+POLIS\b'), 'Polis'),
+    (re.compile(r'\bADD\s+EXL\b'), 'EXL'),
+    (re.compile(r'\bINCLUDE\s+EXL\b'), 'EXL'),
+    (re.compile(r'\bEXL\s+LOCK'), 'EXL'),
+    (re.compile(r'\bEXL\s+HANDLE'), 'EXL'),
+]
+
 
 @dataclass
 class ApplicationMatch:
@@ -846,26 +903,21 @@ class GraphReasoningEngine:
         # =========================================================================
         applications = self.db.get_all_applications()
 
-        for app in applications:
-            app_id = app.get('id', '')
-            name = app.get('name', '')
-            keywords = app.get('keywords', [])
-
-            # Check if name or any keyword is in the query
-            all_keywords = [name.lower()] + [k.lower() for k in keywords]
-
-            for keyword in all_keywords:
-                if keyword in query_lower:
-                    return ApplicationMatch(
-                        id=app_id,
-                        name=name,
-                        keywords=keywords,
-                        matched_keyword=keyword,
-                        risks=app.get('risks', []),
-                        requirements=app.get('requirements', []),
-                        match_method="Keyword Match",
-                        confidence=1.0
-                    )
+        # Name or any keyword in the query; the first application (then keyword) in list order wins
+        hits = [payload for _, _, payload in application_matcher(applications).scan(query_lower)]
+        if hits:
+            app_index, _, keyword = min(hits)
+            app = applications[app_index]
+            return ApplicationMatch(
+                id=app.get('id', ''),
+                name=app.get('name', ''),
+                keywords=app.get('keywords', []),
+                matched_keyword=keyword,
+                risks=app.get('risks', []),
+                requirements=app.get('requirements', []),
+                match_method="Keyword Match",
+                confidence=1.0
+            )
 
         # =========================================================================
         # STEP B: VECTOR SEARCH (Semantic Fallback)
@@ -1475,20 +1527,9 @@ class GraphReasoningEngine:
 
     def _extract_material_regex_fallback(self, query: str) -> Optional[str]:
         """FALLBACK: Regex-based material extraction. Only called when Scribe/state has no material."""
-        query_upper = query.upper()
-
-        # Material patterns with their codes
-        material_patterns = {
-            'FZ': [r'\bFZ\b', r'galvanized', r'zinc', r'cynk', r'ocynk'],
-            'ZM': [r'\bZM\b', r'zinc.?magnesium', r'magneli'],
-            'RF': [r'\bRF\b', r'stainless', r'stal nierdzewna', r'inox', r'304'],
-            'SF': [r'\bSF\b', r'316', r'marine.?grade'],
-        }
-
-        for code, patterns in material_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, query, re.IGNORECASE):
-                    return code
+        for code, pattern in _MATERIAL_FALLBACK_PATTERNS:
+            if pattern.search(query):
+                return code
 
         return None
 
@@ -1496,9 +1537,7 @@ class GraphReasoningEngine:
         """FALLBACK: Regex-based product family extraction. Only called when not pre-detected."""
         query_upper = query.upper()
 
-        families = ['GDB', 'GDC', 'GDP', 'GDMI', 'GDF', 'GDR', 'PFF', 'BFF']
-
-        for family in families:
+        for family in _FAMILY_FALLBACK:
             if family in query_upper:
                 return family
 
@@ -1509,53 +1548,14 @@ class GraphReasoningEngine:
         query_upper = query.upper()
         found_accessories = []
 
-        # Known accessory patterns (order matters - longer patterns first)
-        accessory_patterns = [
-            # Full names/descriptions (check first)
-            ('ECCENTRIC LOCK', 'EXL'),
-            ('QUICK RELEASE', 'EXL'),
-            ('QUICK-RELEASE', 'EXL'),
-            ('LEFT HINGE', 'L'),
-            ('LEFT-HINGE', 'L'),
-            ('POLYSFILTER', 'Polis'),
-            ('AFTER-FILTER RAIL', 'Polis'),
-            ('AFTER FILTER RAIL', 'Polis'),
-            ('AFTER-FILTER', 'Polis'),
-            ('POLISHING RAIL', 'Polis'),
-            ('BAYONET', 'Bayonet'),
-            # Codes (check after)
-            ('-EXL', 'EXL'),
-            (' EXL', 'EXL'),
-            ('/EXL', 'EXL'),
-            ('+EXL', 'EXL'),
-            ('_EXL', 'EXL'),
-            ('-L-', 'L'),
-            ('-L ', 'L'),
-            (' L ', 'L'),  # Only match standalone L
-            ('-POLIS', 'Polis'),
-            (' POLIS', 'Polis'),
-            ('(POLIS)', 'Polis'),
-            ("'POLIS'", 'Polis'),
-        ]
-
-        for pattern, accessory in accessory_patterns:
+        for pattern, accessory in _ACCESSORY_FALLBACK_SUBSTRINGS:
             if pattern in query_upper:
                 if accessory not in found_accessories:
                     found_accessories.append(accessory)
 
         # Also check for "with EXL" or "with L" patterns
-        with_patterns = [
-            (r'\bWITH\s+EXL\b', 'EXL'),
-            (r'\bWITH\s+L\b', 'L'),
-            (r'\bWITH\s+POLIS\b', 'Polis'),
-            (r'\bADD\s+EXL\b', 'EXL'),
-            (r'\bINCLUDE\s+EXL\b', 'EXL'),
-            (r'\bEXL\s+LOCK', 'EXL'),
-            (r'\bEXL\s+HANDLE', 'EXL'),
-        ]
-
-        for pattern, accessory in with_patterns:
-            if re.search(pattern, query_upper):
+        for pattern, accessory in _ACCESSORY_FALLBACK_PATTERNS:
+            if pattern.search(query_upper):
                 if accessory not in found_accessories:
                     found_accessories.append(accessory)
 
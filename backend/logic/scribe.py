@@ -364,6 +364,7 @@ def extract_semantic_intent(
             json_mode=True,
             temperature=0.0,
             max_output_tokens=768,
+            site="scribe",
         )
 
         if result.error:
@@ -18,6 +18,8 @@ import logging
 import time
 from typing import Optional
 
+from db_metrics import query_metrics
+
 logger = logging.getLogger("session_graph")
 
 
@@ -55,25 +57,46 @@ class SessionGraphManager:
         """Initialize with an existing GraphConnection instance."""
         self.db = db_connection
 
-    def _run_query(self, cypher: str, params: dict = None) -> list:
-        """Execute a Cypher query using the db connection's graph."""
+    def _run_query(self, cypher: str, params: dict = None, method: str = "query") -> list:
+        """Execute a Cypher query using the db connection's graph.
+
+        ``method`` names the calling method in the latency metrics.
+        """
         from db_result_helpers import result_to_dicts
+        t0 = time.perf_counter()
         try:
             graph = self.db.connect()
             result = graph.query(cypher, params=params or {})
-            return result_to_dicts(result)
+            rows = result_to_dicts(result)
         except Exception as e:
+            self._record(method, t0, cypher, error=True)
             logger.error(f"Session graph query failed: {e}")
             raise
+        self._record(method, t0, cypher, rows)
+        return rows
 
-    def _run_write(self, cypher: str, params: dict = None) -> None:
-        """Execute a write transaction."""
+    def _run_write(self, cypher: str, params: dict = None, method: str = "write") -> None:
+        """Execute a write transaction (``method`` as in ``_run_query``)."""
+        t0 = time.perf_counter()
         try:
             graph = self.db.connect()
             graph.query(cypher, params=params or {})
         except Exception as e:
+            self._record(method, t0, cypher, error=True)
             logger.error(f"Session graph write failed: {e}")
             raise
+        self._record(method, t0, cypher)
+
+    @staticmethod
+    def _record(caller: str, t0: float, cypher: str, rows: list = None, error: bool = False):
+        """Record latency metrics under ``session.<calling method>``."""
+        method = f"session.{caller}"
+        query_metrics.record(
+            method, time.perf_counter() - t0,
+            rows=len(rows) if rows else 0,
+            payload_bytes=query_metrics.payload_bytes(method, rows) if rows else 0,
+            error=error, cypher=cypher,
+        )
 
     # =========================================================================
     # SESSION LIFECYCLE
@@ -86,7 +109,7 @@ class SessionGraphManager:
             SET s.user_id = $user_id,
                 s.last_active = timestamp(),
                 s.created_at = COALESCE(s.created_at, timestamp())
-        """, {"session_id": session_id, "user_id": user_id})
+        """, {"session_id": session_id, "user_id": user_id}, method="ensure_session")
 
     def clear_session(self, session_id: str) -> None:
         """Delete all Layer 4 nodes for a session (Session, ActiveProject, TagUnit, ConversationTurn)."""
@@ -96,7 +119,7 @@ class SessionGraphManager:
             OPTIONAL MATCH (p)-[:HAS_UNIT]->(t:TagUnit)
             OPTIONAL MATCH (p)-[:HAS_TURN]->(ct:ConversationTurn)
             DETACH DELETE ct, t, p, s
-        """, {"session_id": session_id})
+        """, {"session_id": session_id}, method="clear_session")
         logger.info(f"Cleared session graph for {session_id}")
 
     def cleanup_stale_sessions(self, max_age_ms: int = 7200000) -> int:
@@ -111,7 +134,7 @@ class SessionGraphManager:
             WITH s, p, t, ct, s.id AS sid
             DETACH DELETE ct, t, p, s
             RETURN count(DISTINCT sid) AS cleaned
-        """, {"cutoff": cutoff})
+        """, {"cutoff": cutoff}, method="cleanup_stale_sessions")
         cleaned = result[0]["cleaned"] if result else 0
         if cleaned > 0:
             logger.info(f"Cleaned {cleaned} stale session(s) from graph")
@@ -139,7 +162,7 @@ class SessionGraphManager:
             "project_id": project_id,
             "project_name": project_name,
             "customer": customer,
-        })
+        }, method="set_project")
 
     def lock_material(self, session_id: str, material_code: str) -> None:
         """Lock material on the ActiveProject and link to Layer 1 Material node."""
@@ -162,7 +185,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "material_code": material_code.upper(),
-        })
+        }, method="lock_material")
 
     def set_detected_family(self, session_id: str, family: str) -> None:
         """Set detected product family on the ActiveProject and link to Layer 1."""
@@ -187,7 +210,7 @@ class SessionGraphManager:
             "project_id": project_id,
             "family": family.upper(),
             "family_id": family_id,
-        })
+        }, method="set_detected_family")
 
     def set_pending_clarification(self, session_id: str, param_name: str = None) -> None:
         """Track what parameter the system is currently asking about.
@@ -205,7 +228,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "param_name": param_name,
-        })
+        }, method="set_pending_clarification")
 
     def set_accessories(self, session_id: str, accessories: list) -> None:
         """Persist accessories list on the ActiveProject node."""
@@ -220,7 +243,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "accessories": accessories,
-        })
+        }, method="set_accessories")
 
     def set_assembly_group(self, session_id: str, assembly_group: dict) -> None:
         """Persist assembly group metadata (multi-stage system) on the ActiveProject node."""
@@ -236,7 +259,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "assembly_json": json.dumps(assembly_group),
-        })
+        }, method="set_assembly_group")
 
     def set_resolved_params(self, session_id: str, resolved_params: dict) -> None:
         """Persist generic resolved parameters (gate answers, etc.) on the ActiveProject node."""
@@ -252,7 +275,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "params_json": json.dumps(resolved_params),
-        })
+        }, method="set_resolved_params")
 
     def set_vetoed_families(self, session_id: str, vetoed_families: list[str]) -> None:
         """Persist vetoed product families on the ActiveProject node.
@@ -273,7 +296,7 @@ class SessionGraphManager:
             "session_id": session_id,
             "project_id": project_id,
             "vetoed_json": json.dumps(vetoed_families),
-        })
+        }, method="set_vetoed_families")
 
     # =========================================================================
     # CONVERSATION HISTORY (v3.0 — Semantic Scribe context)
@@ -308,7 +331,7 @@ class SessionGraphManager:
             "role": role,
             "message": message[:2000],
             "turn_number": turn_number,
-        })
+        }, method="store_turn")
 
     def get_recent_turns(self, session_id: str, n: int = 3) -> list[dict]:
         """Retrieve the last N conversation turns for a session.
@@ -322,7 +345,7 @@ class SessionGraphManager:
             RETURN ct.role AS role, ct.message AS message, ct.turn_number AS turn_number
             ORDER BY ct.turn_number DESC
             LIMIT $n
-        """, {"project_id": project_id, "n": n})
+        """, {"project_id": project_id, "n": n}, method="get_recent_turns")
         # Reverse to chronological order (oldest first)
         return list(reversed(result))
 
@@ -438,7 +461,7 @@ class SessionGraphManager:
             RETURN properties(t) AS tag
         """
 
-        result = self._run_query(cypher, params)
+        result = self._run_query(cypher, params, method="upsert_tag")
 
         # Link to DimensionModule in Layer 1
         if housing_width and housing_height:
@@ -452,7 +475,7 @@ class SessionGraphManager:
                 FOREACH (_ IN CASE WHEN d IS NOT NULL THEN [1] ELSE [] END |
                     MERGE (t)-[:SIZED_AS]->(d)
                 )
-            """, {"tag_node_id": tag_node_id, "dim_id": dim_id})
+            """, {"tag_node_id": tag_node_id, "dim_id": dim_id}, method="upsert_tag")
 
         return result[0]["tag"] if result else {}
 
@@ -480,7 +503,7 @@ class SessionGraphManager:
                    p {.name, .customer, .locked_material, .detected_family, .pending_clarification, .accessories, .assembly_group, .resolved_params, .vetoed_families} AS project,
                    tags,
                    size(tags) AS tag_count
-        """, {"session_id": session_id})
+        """, {"session_id": session_id}, method="get_project_state")
 
         if not result:
             return {
@@ -503,7 +526,7 @@ class SessionGraphManager:
         result = self._run_query("""
             MATCH (s:Session {id: $session_id})-[:WORKING_ON]->(p:ActiveProject)-[:HAS_UNIT]->(t:TagUnit)
             RETURN count(t) AS cnt
-        """, {"session_id": session_id})
+        """, {"session_id": session_id}, method="get_tag_count")
         return result[0]["cnt"] if result else 0
 
     def get_project_state_for_prompt(self, session_id: str) -> str:
@@ -679,7 +702,7 @@ class SessionGraphManager:
                     properties: d {.width_mm, .height_mm, .reference_airflow_m3h, .label}
                  }] ELSE [] END AS dim_nodes
             RETURN session_nodes, project_nodes, tag_nodes, mat_nodes, family_nodes, dim_nodes
-        """, {"session_id": session_id})
+        """, {"session_id": session_id}, method="get_session_graph_data")
 
         # Fallback: simpler approach using multiple queries
         nodes = []
@@ -707,7 +730,7 @@ class SessionGraphManager:
                 id(r3) AS r3_id, type(r3) AS r3_type,
                 id(r4) AS r4_id, type(r4) AS r4_type,
                 id(r5) AS r5_id, type(r5) AS r5_type
-        """, {"session_id": session_id})
+        """, {"session_id": session_id}, method="get_session_graph_data")
 
         for row in graph_result:
             # Session node
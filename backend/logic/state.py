@@ -1209,20 +1209,6 @@ class TechnicalState:
         return "\n".join(lines)
 
 
-def _normalize_numeric_in_text(text: str) -> str:
-    """Normalize thousand-separated numbers in text for regex extraction.
-
-    Handles comma (25,000), space (25 000), and dot-as-thousand (25.000) separators.
-    Does NOT touch dimension patterns like 600x600.
-    """
-    import re
-    # Comma thousand separator: 6,000 or 25,000
-    text = re.sub(r'(\d{1,3}),(\d{3})\b', r'\1\2', text)
-    # Space thousand separator: 6 000 or 25 000
-    text = re.sub(r'(\d{1,3})\s(\d{3})\b', r'\1\2', text)
-    return text
-
-
 def extract_tags_from_query(query: str) -> list[dict]:
     """FALLBACK: Regex-based tag/dimension extraction. Only called when Scribe LLM
     fails or returns no entities.
@@ -1232,52 +1218,8 @@ def extract_tags_from_query(query: str) -> list[dict]:
     - "Item A: 300x600 filter 150mm deep"
     - "25,000 m³/h" (comma-separated thousands)
     """
-    import re
-
-    # Normalize thousands separators BEFORE any regex matching
-    query = _normalize_numeric_in_text(query)
-
-    tags = []
-
-    # Pattern 1: "Tag XXXX: WxHxD" or "Tag XXXX - WxHxD" (supports x, ×, X separators)
-    tag_pattern = r'(?:tag|item|pos(?:ition)?)\s*[:#\-]?\s*(\w+)[:\-\s]+(\d{2,4})[x\u00d7X](\d{2,4})(?:[x\u00d7X](\d{2,4}))?'
-    matches = re.findall(tag_pattern, query, re.IGNORECASE)
-
-    for match in matches:
-        tag_id, w, h, d = match
-        tags.append({
-            "tag_id": tag_id,
-            "filter_width": int(w),
-            "filter_height": int(h),
-            "filter_depth": int(d) if d else None
-        })
-
-    # Pattern 2: Standalone dimensions with implied single tag (supports x, ×, X separators)
-    if not tags:
-        dim_pattern = r'(\d{2,4})[x\u00d7X](\d{2,4})(?:[x\u00d7X](\d{2,4}))?(?:\s*mm)?'
-        dim_matches = re.findall(dim_pattern, query)
-
-        for i, match in enumerate(dim_matches):
-            w, h, d = match
-            tags.append({
-                "tag_id": f"item_{i+1}",
-                "filter_width": int(w),
-                "filter_height": int(h),
-                "filter_depth": int(d) if d else None
-            })
-
-    # Pattern 3: Airflow specification (relaxed: also match m³, m3h without slash)
-    # Supports up to 6 digits (up to 999,999 m³/h) after normalization
-    airflow_pattern = r'(\d{3,6})\s*(?:m³/h|m3/h|m³|cbm|cubic|m3h)'
-    airflow_matches = re.findall(airflow_pattern, query, re.IGNORECASE)
-
-    # If we have airflow values and tags, try to match them
-    if airflow_matches and tags:
-        for i, airflow in enumerate(airflow_matches):
-            if i < len(tags):
-                tags[i]["airflow_m3h"] = int(airflow)
-
-    return tags
+    from query_features import query_features
+    return [dict(tag) for tag in query_features(query).tags]
 
 
 def extract_material_from_query(query: str) -> Optional[str]:
@@ -1287,56 +1229,15 @@ def extract_material_from_query(query: str) -> Optional[str]:
     Uses word-boundary regex to avoid substring false positives
     (e.g. 'rf' matching inside 'airflow').
     """
-    import re
-    query_lower = query.lower()
-
-    patterns = _get_material_extraction_patterns()
-
-    for mat_code, keywords in patterns.items():
-        for kw in keywords:
-            if re.search(r'\b' + re.escape(kw) + r'\b', query_lower):
-                return mat_code
-
-    return None
-
-
-def _get_material_extraction_patterns() -> dict[str, list[str]]:
-    """Get material extraction patterns from config, falling back to hardcoded."""
-    try:
-        from config_loader import get_config
-        cfg = get_config()
-        if cfg.material_codes_extended:
-            return {
-                mat.code: mat.extraction_keywords
-                for mat in cfg.material_codes_extended
-            }
-    except Exception:
-        pass
-    # Hardcoded fallback
-    return {
-        'RF': ['stainless steel', 'stainless', 'nierdzewna', 'rostfri', 'edelstahl', 'inox', 'rf'],
-        'FZ': ['galvanized', 'verzinkt', 'zinc', 'cynk', 'fz'],
-        'ZM': ['zinkmagnesium', 'magnelis', 'zm'],
-        'SF': ['sendzimir', 'sf'],
-    }
+    from query_features import query_features
+    return query_features(query).material
 
 
 def extract_project_from_query(query: str) -> Optional[str]:
     """FALLBACK: Regex-based project name extraction. Only called when Scribe LLM
     fails or returns no project_name."""
-    import re
-
-    patterns = [
-        r'(?:project|projekt|for|dla)\s+([A-Z][a-zA-Z0-9]+)',
-        r'([A-Z][a-zA-Z0-9]+)\s+project',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, query, re.IGNORECASE)
-        if match:
-            return match.group(1)
-
-    return None
+    from query_features import query_features
+    return query_features(query).project_name
 
 
 def extract_accessories_from_query(query: str) -> list[str]:
@@ -1347,35 +1248,5 @@ def extract_accessories_from_query(query: str) -> list[str]:
     - Round duct connections: "Ø500mm", "500mm round duct", "circular duct 500"
     - Transition pieces: "transition piece", "reducer", "adapter"
     """
-    import re
-    accessories = []
-
-    # Round duct connections: Ø500, Ø500mm, 500mm round duct, round ducts (500mm diameter)
-    duct_patterns = [
-        r'[ØO\u2300]\s*(\d{2,4})\s*(?:mm)?',                                          # Ø500mm
-        r'(\d{2,4})\s*mm\s+round\s+(?:ducts?|connections?|pipes?)',                    # 500mm round duct(s)
-        r'round\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})\s*(?:mm)?\s*(?:diameter)?\)?', # round ducts (500mm diameter)
-        r'circular\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})',                    # circular duct(s) (500
-        r'(\d{2,4})\s*mm\s+(?:circular|round)\s+(?:ducts?|connections?|pipes?)',        # 500mm circular duct(s)
-        r'(\d{2,4})\s*mm\s+diameter\s+(?:round|circular)?\s*(?:ducts?|pipes?)',        # 500mm diameter round ducts
-        r'(?:round|circular)\s+(?:ducts?|pipes?)\s+(?:of\s+|with\s+)?(\d{2,4})\s*mm', # round ducts of 500mm
-    ]
-    for pattern in duct_patterns:
-        matches = re.findall(pattern, query, re.IGNORECASE)
-        for m in matches:
-            acc = f"Round duct \u00d8{m}mm"
-            if acc not in accessories:
-                accessories.append(acc)
-
-    # Transition/reducer mentions (only if not already captured via duct diameter)
-    transition_patterns = [
-        r'transition\s+piece',
-        r'reducer',
-        r'adapter',
-    ]
-    for pattern in transition_patterns:
-        if re.search(pattern, query, re.IGNORECASE):
-            if not any('Round duct' in a for a in accessories):
-                accessories.append("Transition piece (type TBD)")
-
-    return accessories
+    from query_features import query_features
+    return list(query_features(query).accessories)
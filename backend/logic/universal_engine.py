@@ -18,12 +18,22 @@ NO HARDCODED DOMAIN LOGIC — all knowledge is in the graph.
 """
 
 import re
+import copy
+import functools
 import math
 import logging
+import os
+import time
 import operator as op
 from dataclasses import dataclass, field
 from typing import Optional, Any
 
+from keyword_matcher import application_matcher
+from rule_index import RuleIndex, RuleSet
+from sizing_table import SizingTable, arrangement_grid
+from logic.engine_context import EngineContext
+from logic.engine_stages import EngineStageCache, TraitStage, TraitStageKey
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +65,20 @@ class CausalRule:
     explanation: str
 
 
+class CausalRuleList(list):
+    """CausalRules of one stressor set, carrying their compiled RuleSet from the rule index."""
+
+    def __init__(self, rules: list[CausalRule], stressor_ids: frozenset, compiled: RuleSet, index: RuleIndex):
+        super().__init__(rules)
+        self.stressor_ids = stressor_ids
+        self.compiled = compiled
+        self.index = index
+
+    def __reduce__(self):
+        # Pickled (process pool verdicts) as the plain rules, without the index
+        return list, (list(self),)
+
+
 @dataclass
 class TraitMatch:
     """A product's trait coverage evaluation result."""
@@ -728,25 +752,29 @@ class TraitBasedEngine:
     4. Computing coverage scores and applying vetoes
     """
 
-    def __init__(self, db):
+    def __init__(self, db, stage_cache: Optional[EngineStageCache] = None):
         """
         Args:
             db: Neo4jConnection instance with trait-query methods
+            stage_cache: Per-session trait stage cache (a private one by default)
         """
         self.db = db
+        self.stage_cache = stage_cache if stage_cache is not None else EngineStageCache()
 
     # =========================================================================
     # STEP 1: DETECT STRESSORS
     # =========================================================================
 
-    def detect_stressors(self, query: str, context: Optional[dict] = None) -> list[DetectedStressor]:
+    def detect_stressors(self, query: str, context: Optional[dict] = None,
+                         deadline=None) -> list[DetectedStressor]:
         """Detect environmental stressors from user query and Scribe-extracted context.
 
         Methods:
         1. Keyword matching against EnvironmentalStressor.keywords (Cypher)
         2. Application detection → EXPOSES_TO → Stressor
         3. Environment stressor lookup using Scribe-detected installation_environment
-        4. Vector search semantic fallback (when 1-3 find nothing)
+        4. Vector search semantic fallback (when 1-3 find nothing) — optional,
+           shed once the request ``deadline`` has no optional budget left
         """
         context = context or {}
         query_lower = query.lower()
@@ -770,14 +798,9 @@ class TraitBasedEngine:
         # Method 2: Application detection → EXPOSES_TO → Stressor
         applications = self.db.get_all_applications()
         detected_app = None
-        for app in applications:
-            app_keywords = [app.get("name", "").lower()] + [k.lower() for k in app.get("keywords", [])]
-            for kw in app_keywords:
-                if kw and kw in query_lower:
-                    detected_app = app
-                    break
-            if detected_app:
-                break
+        app_hits = [(i, j) for _, _, (i, j, kw) in application_matcher(applications).scan(query_lower) if kw]
+        if app_hits:
+            detected_app = applications[min(app_hits)[0]]
 
         if detected_app:
             app_stressors = self.db.get_stressors_for_application(detected_app["id"])
@@ -816,7 +839,7 @@ class TraitBasedEngine:
                     )
 
         # Method 4: Vector search semantic fallback (when keyword/context detection found nothing)
-        if not stressors_by_id:
+        if not stressors_by_id and (deadline is None or deadline.allows("engine_vector_search")):
             try:
                 from embeddings import generate_embedding
                 query_embedding = generate_embedding(query)
@@ -861,7 +884,11 @@ class TraitBasedEngine:
             return []
 
         stressor_ids = [s.id for s in stressors]
-        raw_rules = self.db.get_causal_rules_for_stressors(stressor_ids)
+        index = self._rule_index()
+        if index is not None:
+            raw_rules = index.rules_for(stressor_ids)
+        else:
+            raw_rules = self.db.get_causal_rules_for_stressors(stressor_ids)
 
         rules = []
         for row in raw_rules:
@@ -876,8 +903,31 @@ class TraitBasedEngine:
             ))
 
         logger.info(f"[TraitEngine] Loaded {len(rules)} causal rules for {len(stressor_ids)} stressors")
+        if index is not None:
+            key = frozenset(stressor_ids)
+            return CausalRuleList(rules, key, index.ruleset(key), index)
         return rules
 
+    def _rule_index(self) -> Optional[RuleIndex]:
+        """Compiled rule index of the current graph version, when the db serves one."""
+        getter = getattr(self.db, "rule_index", None)
+        index = getter() if callable(getter) else None
+        return index if isinstance(index, RuleIndex) else None
+
+    @staticmethod
+    def _compiled_rules(rules: list[CausalRule], stressor_ids: set) -> tuple[RuleSet, Optional[RuleIndex]]:
+        """RuleSet for matching ``rules`` against ``stressor_ids``: from the index, else compiled ad hoc."""
+        if isinstance(rules, CausalRuleList) and rules.stressor_ids == stressor_ids:
+            return rules.compiled, rules.index
+        return RuleSet.compile(rules, stressor_ids), None
+
+    def _prefetch_context(self, stressors: list[DetectedStressor], product_family: Optional[str], context: dict):
+        """Fetch the (stressor set, product family) context bundle when running request-scoped."""
+        if isinstance(self.db, EngineContext):
+            self.db.prefetch(
+                [s.id for s in stressors], product_family, context.get("installation_environment"),
+            )
+
     # =========================================================================
     # STEP 3: GET CANDIDATE PRODUCTS
     # =========================================================================
@@ -935,58 +985,19 @@ class TraitBasedEngine:
         - Check DEMANDS_TRAIT rules: does the product have the demanded trait?
         - Check NEUTRALIZED_BY rules: are any of the product's traits neutralized?
         - Compute coverage_score = (demanded met and not neutralized) / (total demanded)
+
+        Traits are integer-coded bitsets (rule_index), so each candidate is a
+        few mask operations against the stressors' compiled rules.
         """
-        # Collect demanded traits (from DEMANDS_TRAIT rules)
-        demanded_traits: dict[str, CausalRule] = {}
-        for rule in rules:
-            if rule.rule_type == "DEMANDS_TRAIT":
-                # Keep the most severe rule per trait
-                if rule.trait_id not in demanded_traits or \
-                   _severity_rank(rule.severity) > _severity_rank(demanded_traits[rule.trait_id].severity):
-                    demanded_traits[rule.trait_id] = rule
-
-        # Collect neutralized traits (from NEUTRALIZED_BY rules)
-        stressor_ids = {s.id for s in stressors}
-        neutralization_map: dict[str, CausalRule] = {}  # trait_id -> rule
-        for rule in rules:
-            if rule.rule_type == "NEUTRALIZED_BY" and rule.stressor_id in stressor_ids:
-                if rule.trait_id not in neutralization_map or \
-                   _severity_rank(rule.severity) > _severity_rank(neutralization_map[rule.trait_id].severity):
-                    neutralization_map[rule.trait_id] = rule
+        compiled, index = self._compiled_rules(rules, {s.id for s in stressors})
 
         matches = []
         for candidate in candidates:
-            product_trait_ids = set(candidate.get("all_trait_ids") or [])
-            # Remove None values
-            product_trait_ids.discard(None)
-
-            traits_present = []
-            traits_missing = []
-            traits_neutralized = []
-
-            # Check demanded traits
-            for trait_id, rule in demanded_traits.items():
-                if trait_id in product_trait_ids:
-                    # Product has the trait — but is it neutralized?
-                    if trait_id in neutralization_map:
-                        traits_neutralized.append(rule.trait_name)
-                    else:
-                        traits_present.append(rule.trait_name)
-                else:
-                    traits_missing.append(rule.trait_name)
-
-            # Also check if any of the product's PRIMARY traits are neutralized
-            for trait_id, neut_rule in neutralization_map.items():
-                if trait_id in product_trait_ids and neut_rule.trait_name not in traits_neutralized:
-                    traits_neutralized.append(neut_rule.trait_name)
-
-            # Compute coverage score
-            total_demanded = len(demanded_traits)
-            if total_demanded > 0:
-                met_and_active = len(traits_present)
-                coverage = met_and_active / total_demanded
+            if index is not None:
+                mask = index.family_mask(candidate, compiled)
             else:
-                coverage = 1.0  # No demands = no constraints = everything fits
+                mask = compiled.encode(candidate.get("all_trait_ids") or ())
+            traits_present, traits_missing, traits_neutralized, coverage = compiled.match(mask)
 
             matches.append(TraitMatch(
                 product_family_id=candidate.get("product_id", ""),
@@ -1019,31 +1030,13 @@ class TraitBasedEngine:
         - A CRITICAL DEMANDS_TRAIT is missing
         - A CRITICAL NEUTRALIZED_BY applies to its primary trait
         """
-        critical_demands = {
-            rule.trait_id: rule for rule in rules
-            if rule.rule_type == "DEMANDS_TRAIT" and rule.severity == "CRITICAL"
-        }
-        critical_neutralizations = {
-            rule.trait_id: rule for rule in rules
-            if rule.rule_type == "NEUTRALIZED_BY" and rule.severity == "CRITICAL"
-        }
+        compiled = rules.compiled if isinstance(rules, CausalRuleList) else RuleSet.compile(rules)
 
         for match in matches:
-            product_trait_ids = set()
-            # Reconstruct trait IDs from names (reverse lookup via demanded traits)
-            for trait_id, rule in critical_demands.items():
-                if rule.trait_name in match.traits_missing:
-                    match.vetoed = True
-                    match.veto_reasons.append(
-                        rule.explanation or f"{rule.stressor_name} requires {rule.trait_name}"
-                    )
-
-            for trait_id, rule in critical_neutralizations.items():
-                if rule.trait_name in match.traits_neutralized:
-                    match.vetoed = True
-                    match.veto_reasons.append(
-                        rule.explanation or f"{rule.trait_name} ineffective under {rule.stressor_name}"
-                    )
+            reasons = compiled.veto_reasons(match.traits_missing, match.traits_neutralized)
+            if reasons:
+                match.vetoed = True
+                match.veto_reasons.extend(reasons)
 
         return matches
 
@@ -1819,8 +1812,9 @@ class TraitBasedEngine:
         if not item_id:
             return None
 
+        table = self._served_sizing_table(item_id)
         try:
-            rules = self.db.get_capacity_rules(item_id)
+            rules = table.capacity_rules if table is not None else self.db.get_capacity_rules(item_id)
         except Exception as e:
             logger.warning(f"[TraitEngine] Failed to query capacity rules: {e}")
             return None
@@ -1959,6 +1953,40 @@ class TraitBasedEngine:
     # STEP 5d1b: COMPUTE SIZING ARRANGEMENT (Graph-Driven)
     # =========================================================================
 
+    def _served_sizing_table(self, item_id: str) -> Optional[SizingTable]:
+        """Precomputed sizing table of the current graph version, when the db serves one."""
+        getter = getattr(self.db, "sizing_table", None)
+        table = getter(item_id) if callable(getter) else None
+        return table if isinstance(table, SizingTable) else None
+
+    def _sizing_table(self, item_id: str) -> Optional[SizingTable]:
+        """Sizing table of the family: precomputed, else built ad hoc from its Strategy and variants."""
+        table = self._served_sizing_table(item_id)
+        if table is not None:
+            return table
+
+        strategy = None
+        try:
+            strategy = self.db.get_optimization_strategy(item_id)
+        except Exception as e:
+            logger.warning(f"[TraitEngine] Failed to query strategy: {e}")
+
+        try:
+            modules = self.db.get_available_dimension_modules(item_id)
+        except Exception as e:
+            logger.warning(f"[TraitEngine] Failed to query dimension modules: {e}")
+            return None
+        return SizingTable(item_id, modules or (), strategy)
+
+    @staticmethod
+    def _axis_constraint(value) -> Optional[int]:
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return None
+
     def compute_sizing_arrangement(
         self,
         item_id: str,
@@ -1991,87 +2019,36 @@ class TraitBasedEngine:
         except (ValueError, TypeError):
             return None
 
-        # --- Graph-driven spatial strategy ---
-        strategy = None
-        try:
-            strategy = self.db.get_optimization_strategy(item_id)
-        except Exception as e:
-            logger.warning(f"[TraitEngine] Failed to query strategy: {e}")
+        # --- Graph-driven spatial strategy (precomputed per graph version) ---
+        table = self._sizing_table(item_id)
+        if table is None:
+            return None
 
-        # Read axis names from graph Strategy node (domain-agnostic)
-        primary_axis = (strategy or {}).get("primary_axis") or "width_mm"
-        secondary_axis = (strategy or {}).get("secondary_axis") or "height_mm"
-        expansion_unit = (strategy or {}).get("expansion_unit")
+        # Axis names come from the graph Strategy node (domain-agnostic)
+        primary_axis = table.primary_axis
+        secondary_axis = table.secondary_axis
 
         # User constraints on BOTH axes: context key = "max_{axis_name}"
-        primary_constraint_key = f"max_{primary_axis}"
-        secondary_constraint_key = f"max_{secondary_axis}"
-        user_primary_constraint = context.get(primary_constraint_key)
-        user_secondary_constraint = context.get(secondary_constraint_key)
+        max_primary = self._axis_constraint(context.get(f"max_{primary_axis}"))
+        max_secondary = self._axis_constraint(context.get(f"max_{secondary_axis}"))
 
-        try:
-            modules = self.db.get_available_dimension_modules(item_id)
-        except Exception as e:
-            logger.warning(f"[TraitEngine] Failed to query dimension modules: {e}")
-            return None
-
-        if not modules:
+        if not table.modules:
             return None
 
         # v3.9: Keep unfiltered list for single-module alternative search
-        all_modules = list(modules)
-
-        # Filter modules by primary axis constraint
-        max_primary = None
-        if user_primary_constraint is not None:
-            try:
-                max_primary = int(user_primary_constraint)
-            except (ValueError, TypeError):
-                max_primary = None
-
-            if max_primary:
-                fitting = [
-                    m for m in modules
-                    if m.get(primary_axis, 0) <= max_primary
-                ]
-                if fitting:
-                    total_before = len(modules)
-                    modules = fitting
-                    logger.info(
-                        f"[TraitEngine] {primary_axis} constraint {max_primary}mm: "
-                        f"{len(fitting)}/{total_before} modules fit"
-                    )
-                else:
-                    logger.warning(
-                        f"[TraitEngine] No modules fit within "
-                        f"{primary_axis}≤{max_primary}mm constraint"
-                    )
-
-        # Filter modules by secondary axis constraint
-        max_secondary = None
-        if user_secondary_constraint is not None:
-            try:
-                max_secondary = int(user_secondary_constraint)
-            except (ValueError, TypeError):
-                max_secondary = None
-
-            if max_secondary:
-                fitting = [
-                    m for m in modules
-                    if m.get(secondary_axis, 0) <= max_secondary
-                ]
-                if fitting:
-                    total_before = len(modules)
-                    modules = fitting
-                    logger.info(
-                        f"[TraitEngine] {secondary_axis} constraint {max_secondary}mm: "
-                        f"{len(fitting)}/{total_before} modules fit"
-                    )
-                else:
-                    logger.warning(
-                        f"[TraitEngine] No modules fit within "
-                        f"{secondary_axis}≤{max_secondary}mm constraint"
-                    )
+        all_modules = table.modules
+
+        # Filter modules by the axis constraints (a constraint no module fits is ignored)
+        tier = table.tier(max_primary, max_secondary)
+        modules = tier.modules
+        for axis, limit, fit in ((primary_axis, max_primary, tier.primary_fit),
+                                 (secondary_axis, max_secondary, tier.secondary_fit)):
+            if fit is None:
+                continue
+            if fit[0]:
+                logger.info(f"[TraitEngine] {axis} constraint {limit}mm: {fit[0]}/{fit[1]} modules fit")
+            else:
+                logger.warning(f"[TraitEngine] No modules fit within {axis}≤{limit}mm constraint")
 
         # v3.5b: Explicit dimension lock
         # When user specifies dimensions (e.g., "600x600"), honor them for module
@@ -2100,24 +2077,13 @@ class TraitBasedEngine:
             # No exact match or no explicit dims — pick optimal module:
             # 1. Prefer smallest single-unit module that covers required airflow
             # 2. If none can do it alone, pick highest airflow to minimize unit count
-            single_unit = [
-                m for m in modules
-                if float(m.get("reference_airflow_m3h", 0)) >= airflow_float
-            ]
-            if single_unit:
-                best = min(
-                    single_unit,
-                    key=lambda m: float(m.get("reference_airflow_m3h", 0))
-                )
+            best = tier.select(airflow_float)
+            if float(best.get("reference_airflow_m3h") or 0) >= airflow_float:
                 logger.info(
                     f"[TraitEngine] Optimal single-unit: {best.get('id')} "
                     f"({best.get('reference_airflow_m3h')} m³/h >= {airflow_float})"
                 )
             else:
-                best = max(
-                    modules,
-                    key=lambda m: float(m.get("reference_airflow_m3h", 0))
-                )
                 logger.info(
                     f"[TraitEngine] No single-unit option — highest airflow: "
                     f"{best.get('id')} ({best.get('reference_airflow_m3h')} m³/h)"
@@ -2195,66 +2161,20 @@ class TraitBasedEngine:
         module_secondary = int(best.get(secondary_axis, 0))
 
         # --- Spatial arrangement (pure math on graph-supplied axes) ---
-        # Use actual module width for arrangement geometry.
-        # expansion_unit (Strategy property) is an abstract grid step (e.g. 600 for GDB),
-        # but the selected module may be wider (e.g. 1800mm). Physical arrangement
-        # dimensions must reflect the real module width, not the grid step.
-        exp_unit = module_primary
-        if max_primary and exp_unit > 0 and modules_needed > 1:
-            max_on_primary = max(1, max_primary // exp_unit)
-            needed_on_secondary = math.ceil(modules_needed / max_on_primary)
-        else:
-            max_on_primary = modules_needed
-            needed_on_secondary = 1
-
-        effective_primary = exp_unit * max_on_primary
-        effective_secondary = module_secondary * needed_on_secondary
-
-        # Validate secondary axis doesn't exceed constraint
-        if max_secondary and effective_secondary > max_secondary:
+        # The grid step is the actual module width, not the Strategy expansion_unit
+        # (an abstract step, e.g. 600 for GDB, that a 1800mm module exceeds).
+        # v3.5: After the geometry is final, verify the modules physically fit
+        # within BOTH axis constraints simultaneously.
+        grid = arrangement_grid(modules_needed, module_primary, module_secondary, max_primary, max_secondary)
+        max_on_primary, needed_on_secondary = grid.columns, grid.rows
+        effective_primary, effective_secondary = grid.effective_primary, grid.effective_secondary
+        spatial_feasible, max_modules_fitting = grid.feasible, grid.max_modules_fitting
+        if grid.rebalanced:
             logger.warning(
-                f"[TraitEngine] {secondary_axis} overflow: effective "
-                f"{effective_secondary}mm > max {max_secondary}mm. "
-                f"Increasing parallel units on primary axis."
-            )
-            # Re-calculate: fit within secondary constraint by using more primary-axis units
-            max_stacked = max(1, max_secondary // module_secondary)
-            max_per_row = math.ceil(modules_needed / max_stacked) if max_stacked else modules_needed
-            max_on_primary = max_per_row
-            needed_on_secondary = max_stacked
-            effective_primary = exp_unit * max_on_primary
-            effective_secondary = module_secondary * needed_on_secondary
-
-        # --- v3.5: Spatial feasibility check ---
-        # After arrangement geometry is finalized, verify the required modules
-        # physically fit within BOTH axis constraints simultaneously.
-        # Two conditions for spatial impossibility:
-        # 1. Not enough slots (modules_needed > max_fitting)
-        # 2. Effective dimensions exceed constraints (after overflow recalc)
-        max_modules_fitting = max_on_primary * needed_on_secondary
-        spatial_feasible = modules_needed <= max_modules_fitting
-
-        # Also check if effective dimensions exceed constraints
-        if spatial_feasible and max_primary and effective_primary > max_primary:
-            spatial_feasible = False
-            # Recalculate true fitting capacity within both constraints
-            true_max_on_primary = max(1, max_primary // exp_unit) if exp_unit > 0 else 1
-            true_max_on_secondary = (
-                max(1, max_secondary // module_secondary)
-                if max_secondary and module_secondary > 0
-                else modules_needed
+                f"[TraitEngine] {secondary_axis} overflow: stacked modules exceed "
+                f"max {max_secondary}mm. Increased parallel units on primary axis "
+                f"to {max_on_primary}."
             )
-            max_modules_fitting = true_max_on_primary * true_max_on_secondary
-
-        if spatial_feasible and max_secondary and effective_secondary > max_secondary:
-            spatial_feasible = False
-            true_max_on_primary = max(1, max_primary // exp_unit) if max_primary and exp_unit > 0 else modules_needed
-            true_max_on_secondary = (
-                max(1, max_secondary // module_secondary)
-                if module_secondary > 0
-                else 1
-            )
-            max_modules_fitting = true_max_on_primary * true_max_on_secondary
 
         if not spatial_feasible and (max_primary or max_secondary):
             logger.warning(
@@ -2566,10 +2486,10 @@ class TraitBasedEngine:
             logger.info("[TraitEngine] No DependencyRule nodes for detected stressors")
             return None
 
-        all_families = self.db.get_all_product_families_with_traits()
         # Graph-driven priority: families with lower selection_priority are preferred
         # for protector role. Cypher already sorts, but defense-in-depth.
-        all_families.sort(key=lambda f: f.get("selection_priority") or 50)
+        all_families = sorted(self.db.get_all_product_families_with_traits(),
+                              key=lambda f: f.get("selection_priority") or 50)
         stages = []
 
         # Track (family_id, trait_id) to deduplicate protector stages
@@ -3080,6 +3000,76 @@ class TraitBasedEngine:
             has_installation_block=has_installation_block,
         )
 
+    def _trait_stage(self, query: str, product_hint: Optional[str],
+                     stressors: list[DetectedStressor], session_id: Optional[str] = None) -> TraitStage:
+        """Steps 2-5d of process_query, served from the session's previous turn when its inputs match.
+
+        Depends only on the stressor set, the product hint and the graph
+        version, never on the turn's context, so follow-up turns that only
+        answer clarifications skip it.
+        """
+        index = self._rule_index()
+        key = TraitStageKey(
+            frozenset(s.id for s in stressors),
+            product_hint,
+            index.version if index is not None else None,
+        )
+        cached = self.stage_cache.get(session_id, key)
+        if cached is not None:
+            return cached
+
+        # Step 2: Get causal rules
+        rules = self.get_causal_rules(stressors)
+
+        # Step 3: Get candidate products
+        candidates = self.get_candidate_products(query, product_hint)
+
+        # Step 4: Match traits to products
+        matches = self.match_traits(rules, candidates, stressors)
+
+        # Step 5: Check vetoes
+        matches = self.check_vetoes(matches, rules)
+
+        # Step 5c: Try ASSEMBLY first — when products are vetoed due to
+        # neutralization, build a multi-stage sequence instead of pivoting.
+        # When no product_hint is given, infer TARGET from best-scoring match. (v2.8)
+        assembly = None
+        non_vetoed = [m for m in matches if not m.vetoed]
+        if not non_vetoed and rules:
+            target_hint = product_hint
+            if not target_hint and matches:
+                # Infer target: prefer a product vetoed by NEUTRALIZATION (assemblable)
+                # over one vetoed by missing traits (can't help with assembly).
+                neutralization_vetoed = [
+                    m for m in matches
+                    if m.vetoed and m.traits_neutralized
+                ]
+                if neutralization_vetoed:
+                    # Sort by selection_priority to get the preferred product
+                    neutralization_vetoed.sort(key=lambda m: m.selection_priority)
+                    target_hint = neutralization_vetoed[0].product_family_id.replace("FAM_", "")
+                else:
+                    target_hint = matches[0].product_family_id.replace("FAM_", "")
+                logger.info(f"[TraitEngine] No product_hint — inferred TARGET: {target_hint}")
+            if target_hint:
+                assembly = self.build_assembly(query, target_hint, stressors, rules, matches)
+
+        # Step 5d: If assembly failed, fall back to simple pivot
+        if not assembly and not non_vetoed and rules and product_hint:
+            logger.info("[TraitEngine] Assembly not possible, expanding to all families for pivot")
+            all_candidates = self.get_candidate_products(query, product_hint=None)
+            pf_id = product_hint if product_hint.startswith("FAM_") else f"FAM_{product_hint.upper()}"
+            extra_candidates = [c for c in all_candidates if c.get("product_id") != pf_id]
+            if extra_candidates:
+                extra_matches = self.match_traits(rules, extra_candidates, stressors)
+                extra_matches = self.check_vetoes(extra_matches, rules)
+                matches.extend(extra_matches)
+                matches.sort(key=lambda m: (-int(not m.vetoed), -m.coverage_score))
+
+        stage = TraitStage(rules, matches, non_vetoed, assembly)
+        self.stage_cache.put(session_id, key, stage)
+        return stage
+
     # =========================================================================
     # MAIN ENTRY POINT
     # =========================================================================
@@ -3089,6 +3079,8 @@ class TraitBasedEngine:
         query: str,
         product_hint: Optional[str] = None,
         context: Optional[dict] = None,
+        deadline=None,
+        session_id: Optional[str] = None,
     ) -> EngineVerdict:
         """Main entry point for the trait-based reasoning engine.
 
@@ -3096,14 +3088,27 @@ class TraitBasedEngine:
             query: User's natural language query
             product_hint: Optional pre-detected product family (e.g., "GDB")
             context: Dict of already-known parameter values
+            deadline: Optional request Deadline; optional lookups are shed once it is spent
+            session_id: Optional conversation ID; lets follow-up turns reuse the trait stage
 
         Returns:
             EngineVerdict with complete reasoning results
         """
+        if not isinstance(self.db, EngineContext):
+            # The engine is shared across requests: memoize this verdict's graph
+            # lookups on a request-scoped copy.
+            scoped = copy.copy(self)
+            scoped.db = EngineContext(self.db)
+            return scoped.process_query(query, product_hint=product_hint, context=context,
+                                        deadline=deadline, session_id=session_id)
+
         context = context or {}
 
         # Step 1: Detect stressors (pass context for Scribe-detected environment)
-        stressors = self.detect_stressors(query, context=context)
+        stressors = self.detect_stressors(query, context=context, deadline=deadline)
+
+        # Step 1a: Load the verdict's context bundle in one round trip
+        self._prefetch_context(stressors, product_hint, context)
 
         # Step 1b: Auto-resolve boolean gate params for context-inferred stressors.
         # When a stressor was detected from application/keyword/environment context,
@@ -3133,8 +3138,13 @@ class TraitBasedEngine:
                 except Exception as e:
                     logger.debug(f"[TraitEngine] Gate pre-resolution failed: {e}")
 
-        # Step 2: Get causal rules
-        rules = self.get_causal_rules(stressors)
+        # Steps 2-5d: Causal rules, candidates, trait matching, vetoes,
+        # assembly and pivot — reused across a session's turns while the
+        # stressors and product hint are unchanged (v4.1)
+        stage = self._trait_stage(query, product_hint, stressors, session_id)
+        rules, matches, non_vetoed, assembly = (
+            stage.rules, stage.matches, stage.non_vetoed, stage.assembly,
+        )
 
         # v3.5: Collect stressor-demanded trait IDs (APPLICATION-CRITICAL only)
         # Used to trait-qualify alternatives — ensures alternatives can actually
@@ -3149,57 +3159,12 @@ class TraitBasedEngine:
                 f"{stressor_demanded_trait_ids}"
             )
 
-        # Step 3: Get candidate products
-        candidates = self.get_candidate_products(query, product_hint)
-
-        # Step 4: Match traits to products
-        matches = self.match_traits(rules, candidates, stressors)
-
-        # Step 5: Check vetoes
-        matches = self.check_vetoes(matches, rules)
-
         # Step 5a: Detect functional goals from query
         goals = self.detect_goals(query)
 
         # Step 5b: Evaluate logic gates (v2.0)
         gate_evaluations = self.evaluate_logic_gates(stressors, context)
 
-        # Step 5c: Try ASSEMBLY first — when products are vetoed due to
-        # neutralization, build a multi-stage sequence instead of pivoting.
-        # When no product_hint is given, infer TARGET from best-scoring match. (v2.8)
-        assembly = None
-        non_vetoed = [m for m in matches if not m.vetoed]
-        if not non_vetoed and rules:
-            target_hint = product_hint
-            if not target_hint and matches:
-                # Infer target: prefer a product vetoed by NEUTRALIZATION (assemblable)
-                # over one vetoed by missing traits (can't help with assembly).
-                neutralization_vetoed = [
-                    m for m in matches
-                    if m.vetoed and m.traits_neutralized
-                ]
-                if neutralization_vetoed:
-                    # Sort by selection_priority to get the preferred product
-                    neutralization_vetoed.sort(key=lambda m: m.selection_priority)
-                    target_hint = neutralization_vetoed[0].product_family_id.replace("FAM_", "")
-                else:
-                    target_hint = matches[0].product_family_id.replace("FAM_", "")
-                logger.info(f"[TraitEngine] No product_hint — inferred TARGET: {target_hint}")
-            if target_hint:
-                assembly = self.build_assembly(query, target_hint, stressors, rules, matches)
-
-        # Step 5d: If assembly failed, fall back to simple pivot
-        if not assembly and not non_vetoed and rules and product_hint:
-            logger.info("[TraitEngine] Assembly not possible, expanding to all families for pivot")
-            all_candidates = self.get_candidate_products(query, product_hint=None)
-            pf_id = product_hint if product_hint.startswith("FAM_") else f"FAM_{product_hint.upper()}"
-            extra_candidates = [c for c in all_candidates if c.get("product_id") != pf_id]
-            if extra_candidates:
-                extra_matches = self.match_traits(rules, extra_candidates, stressors)
-                extra_matches = self.check_vetoes(extra_matches, rules)
-                matches.extend(extra_matches)
-                matches.sort(key=lambda m: (-int(not m.vetoed), -m.coverage_score))
-
         # Step 5e: Check hard constraints (v2.0 → v3.0b per-stage)
         constraint_overrides = []
         pf_id_for_constraints = None
@@ -3207,16 +3172,19 @@ class TraitBasedEngine:
             pf_id_for_constraints = product_hint if product_hint.startswith("FAM_") else f"FAM_{product_hint.upper()}"
             constraint_overrides = self.check_hard_constraints(pf_id_for_constraints, context)
         elif assembly:
+            # Use TARGET stage for sizing/capacity; its context bundle loads
+            # before the constraint checks so they are served from it
+            target_stage = next((s for s in assembly if s.role == "TARGET"), None)
+            if target_stage:
+                pf_id_for_constraints = target_stage.product_family_id
+                self._prefetch_context(stressors, pf_id_for_constraints, context)
             # Check constraints for ALL assembly stages (v3.0b)
             for stage in assembly:
                 stage_overrides = self.check_hard_constraints(stage.product_family_id, context)
                 constraint_overrides.extend(stage_overrides)
-            # Use TARGET stage for sizing/capacity
-            target_stage = next((s for s in assembly if s.role == "TARGET"), None)
-            if target_stage:
-                pf_id_for_constraints = target_stage.product_family_id
         elif non_vetoed:
             pf_id_for_constraints = non_vetoed[0].product_family_id
+            self._prefetch_context(stressors, pf_id_for_constraints, context)
             constraint_overrides = self.check_hard_constraints(pf_id_for_constraints, context)
 
         # Step 5e2: Check installation constraints (v3.0)
@@ -3576,10 +3544,94 @@ class TraitBasedEngine:
         )
 
 
+    # =========================================================================
+    # BATCH ENTRY POINT
+    # =========================================================================
+
+    def process_queries(
+        self,
+        items: list[tuple[str, Optional[str], Optional[dict]]],
+        deadline=None,
+        processes: Optional[int] = None,
+    ) -> list[EngineVerdict]:
+        """Evaluate a batch of (query, product_hint, context) items, one verdict per item in order.
+
+        The batch shares one EngineContext, so a graph lookup is made once
+        for all items that need it, and items with the same stressor set
+        share the compiled rule set of the rule index.
+
+        Args:
+            items: (query, product_hint, context) tuples
+            deadline: Optional Deadline applied to every item (workers get
+                the budget left when the batch is submitted)
+            processes: Worker processes for large batches (bulk offers, judge
+                runs). Each worker connects to the graph itself through the
+                global ``database.db`` and evaluates contiguous chunks of the
+                batch, so this engine's db must be that connection (or an
+                EngineContext over it). None/1 evaluates in-process.
+
+        Raises:
+            ValueError: ``processes > 1`` with any other db
+        """
+        items = [tuple(item) for item in items]
+        if not items:
+            return []
+        if processes and processes > 1 and len(items) > 1:
+            import database
+            base_db = self.db.db if isinstance(self.db, EngineContext) else self.db
+            if base_db is not database.db:
+                raise ValueError("process_queries(processes > 1) only runs on the global database.db connection")
+            return _process_in_pool(items, processes, deadline)
+
+        scoped = copy.copy(self)
+        scoped.db = self.db if isinstance(self.db, EngineContext) else EngineContext(self.db)
+        verdicts = [
+            scoped.process_query(query, product_hint=product_hint, context=context, deadline=deadline)
+            for query, product_hint, context in items
+        ]
+        logger.info(f"[TraitEngine] Batch of {len(items)} verdicts, context lookups {scoped.db.stats()}")
+        return verdicts
+
+
 # =============================================================================
-# HELPERS
+# PROCESS POOL (process_queries)
 # =============================================================================
 
-def _severity_rank(severity: str) -> int:
-    """Convert severity to numeric rank for comparison."""
-    return {"CRITICAL": 3, "WARNING": 2, "INFO": 1}.get(severity, 0)
+ENGINE_BATCH_CHUNKS_PER_WORKER = int(os.getenv("ENGINE_BATCH_CHUNKS_PER_WORKER", 4))
+
+_worker_engine: Optional[TraitBasedEngine] = None
+
+
+def _process_chunk(chunk: list[tuple], deadline_at: Optional[float] = None,
+                   reserve: float = 0.0) -> list[EngineVerdict]:
+    """Pool worker: evaluate a chunk on this process's own engine and graph connection.
+
+    ``deadline_at`` (wall-clock epoch seconds) and ``reserve`` rebuild the
+    caller's Deadline in the worker; None means no budget.
+    """
+    global _worker_engine
+    if _worker_engine is None:
+        from database import db
+        _worker_engine = TraitBasedEngine(db)
+    deadline = None
+    if deadline_at is not None:
+        from deadline import Deadline
+        deadline = Deadline(max(0.0, deadline_at - time.time()), reserve)
+    return _worker_engine.process_queries(chunk, deadline=deadline)
+
+
+def _process_in_pool(items: list[tuple], processes: int, deadline=None) -> list[EngineVerdict]:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(processes, len(items))
+    size = max(1, math.ceil(len(items) / (workers * ENGINE_BATCH_CHUNKS_PER_WORKER)))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    deadline_at = reserve = None
+    if deadline is not None and deadline.seconds is not None:
+        deadline_at, reserve = time.time() + deadline.remaining(), deadline.reserve
+    run = functools.partial(_process_chunk, deadline_at=deadline_at, reserve=reserve or 0.0)
+    # Spawned, not forked: a forked worker would inherit the parent's pooled
+    # graph sockets (and any lock held mid-checkout) instead of opening its own
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return [verdict for verdicts in pool.map(run, chunks) for verdict in verdicts]
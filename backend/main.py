@@ -1,15 +1,24 @@
 import json
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from database import db
+from db_metrics import query_metrics
+from embeddings import embedding_cache
+from response_cache import response_cache
+from llm_clients import client_metrics
+from llm_routing import routing as llm_routing
+from single_flight import consult_flights
+from logic.engine_stages import trait_stages
+from async_database import AsyncGraphConnection, aiter_sync
 from ingestor import ingest_case, ingest_email_thread_image, ingest_email_thread_text
 from ingestor_docs import analyze_document_schema, ingest_document
 from retriever import consult_brain, query_explainable, query_deep_explainable, query_deep_explainable_streaming
@@ -36,6 +45,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Async facade over the db singleton for read-only endpoints (see async_database.py)
+adb = AsyncGraphConnection(db)
+# Dedicated workers for driving the sync deep-explainable stream generator
+_stream_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("STREAM_WORKERS", 64)), thread_name_prefix="sse-stream",
+)
+
 # Static files for UI prototypes
 STATIC_DIR = Path(__file__).parent / "static"
 if STATIC_DIR.exists():
@@ -55,6 +71,14 @@ async def startup_event():
     print("✅ Server ready!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled FalkorDB connections."""
+    await adb.close()
+    _stream_executor.shutdown(wait=False)
+    db.close()
+
+
 class GraphStats(BaseModel):
     nodes: int
     relationships: int
@@ -79,6 +103,78 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """FalkorDB connection pool utilization and checkout wait-time stats."""
+    return {**db.pool_stats(), "async": adb.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics: per-method graph query calls, latency, rows, bytes, retries; embedding and response cache hits; LLM client connections and routing; coalesced consult requests; reused engine stages."""
+    return PlainTextResponse(
+        query_metrics.render_prometheus() + embedding_cache.render_prometheus()
+        + response_cache.render_prometheus() + client_metrics.render_prometheus()
+        + llm_routing.render_prometheus() + consult_flights.render_prometheus()
+        + trait_stages.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/health/db-queries")
+async def db_queries_health():
+    """Per-method graph query stats as JSON, slowest total time first."""
+    return db.query_stats()
+
+
+@app.get("/health/embedding-cache")
+async def embedding_cache_health():
+    """Embedding cache entries and memory/disk hit rates."""
+    return embedding_cache.stats()
+
+
+@app.get("/health/response-cache")
+async def response_cache_health():
+    """Semantic first-turn response cache hit rate and occupancy."""
+    return response_cache.stats()
+
+
+@app.get("/health/llm-clients")
+async def llm_clients_health():
+    """Per-provider LLM client builds, connection reuse, connect time and time to first byte."""
+    return client_metrics.stats()
+
+
+@app.get("/health/llm-routing")
+async def llm_routing_health():
+    """Per-model rolling latency/error stats, circuit states, hedges and call-site policies."""
+    return llm_routing.stats()
+
+
+@app.get("/health/consult-coalescing")
+async def consult_coalescing_health():
+    """Identical in-flight consult requests served by a single pipeline run."""
+    return consult_flights.stats()
+
+
+@app.get("/health/query-cache")
+async def query_cache_health():
+    """Graph query cache hit/miss/eviction counters."""
+    return db.cache_stats()
+
+
+@app.get("/health/catalog")
+async def catalog_health():
+    """In-memory catalog snapshot version and index sizes."""
+    return db.catalog_stats()
+
+
+@app.get("/health/engine-incremental")
+async def engine_incremental_health():
+    """Session turns that reused the trait stage of their previous verdict."""
+    return trait_stages.stats()
+
+
 @app.get("/test-lab/results")
 async def get_test_lab_results(_user: str = Depends(get_current_user)):
     """Serve the latest test results JSON for the Test Lab viewer."""
@@ -257,9 +353,9 @@ async def auth_verify(user_info: dict = Depends(get_current_user_info)):
 async def get_graph_stats(_user: str = Depends(get_current_user)):
     """Get statistics about the graph database"""
     try:
-        connected = db.verify_connection()
-        nodes = db.get_node_count()
-        relationships = db.get_relationship_count()
+        connected = await adb.verify_connection()
+        nodes = await adb.get_node_count()
+        relationships = await adb.get_relationship_count()
         return GraphStats(nodes=nodes, relationships=relationships, connected=connected)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -273,12 +369,96 @@ async def clear_graph(_user: str = Depends(get_current_user)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+GRAPH_EXPORT_PAGE_SIZE = int(os.getenv("GRAPH_EXPORT_PAGE_SIZE", 1000))
+
+
+def _parse_graph_cursor(cursor: Optional[str]) -> tuple[str, int]:
+    """Opaque export cursor ``"<nodes|relationships>:<last id>"`` -> (kind, after)."""
+    if not cursor:
+        return "nodes", -1
+    kind, _, after = cursor.partition(":")
+    if kind not in ("nodes", "relationships"):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+    try:
+        return kind, int(after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
+
 @app.get("/graph/data")
-async def get_graph_data(_user: str = Depends(get_current_user)):
-    """Get all nodes and relationships for visualization"""
+async def get_graph_data(
+    format: str = "json",
+    lod: str = "full",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    properties: Optional[str] = None,
+    _user: str = Depends(get_current_user),
+):
+    """Get nodes and relationships for visualization.
+
+    - ``lod=clusters``: one node per label with counts, edges aggregated by
+      label pair and type (zoomed-out view).
+    - ``format=ndjson``: stream one JSON object per line
+      (``{"kind": "node", ...}`` / ``{"kind": "relationship", ...}``, then
+      ``{"kind": "end", ...}``), paging through the graph server-side.
+    - ``cursor`` / ``limit``: one page of the export; pass the returned
+      ``next_cursor`` to continue (nodes first, then relationships). A
+      relationship page holds the outgoing edges of ``limit`` source nodes.
+    - ``properties``: comma-separated property whitelist. Embeddings are
+      never returned.
+
+    Without any of these the full graph is returned as before.
+    """
+    if lod not in ("full", "clusters"):
+        raise HTTPException(status_code=400, detail=f"Invalid lod: {lod}")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}")
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    prop_list = [p.strip() for p in properties.split(",") if p.strip()] if properties else None
+
+    if lod == "clusters":
+        try:
+            return await adb.get_graph_clusters()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if format == "ndjson":
+        page_size = limit or GRAPH_EXPORT_PAGE_SIZE
+
+        def records():
+            counts = {"nodes": 0, "relationships": 0}
+            try:
+                for kind, item in db.iter_graph_data(page_size=page_size, properties=prop_list):
+                    counts[kind] += 1
+                    yield json.dumps({"kind": "node" if kind == "nodes" else "relationship", **item}, default=str) + "\n"
+                yield json.dumps({"kind": "end", **counts}) + "\n"
+            except Exception as e:
+                yield json.dumps({"kind": "error", "detail": str(e), **counts}) + "\n"
+
+        return StreamingResponse(aiter_sync(records(), _stream_executor), media_type="application/x-ndjson")
+
     try:
-        data = db.get_graph_data()
-        return data
+        if cursor is None and limit is None:
+            return await adb.get_graph_data(prop_list)
+
+        kind, after = _parse_graph_cursor(cursor)
+        page = await adb.get_graph_data_page(
+            kind, after=after, limit=limit or GRAPH_EXPORT_PAGE_SIZE, properties=prop_list,
+        )
+        if page["next_after"] is not None:
+            next_cursor = f"{kind}:{page['next_after']}"
+        elif kind == "nodes":
+            next_cursor = "relationships:-1"
+        else:
+            next_cursor = None
+        return {
+            "nodes": page["items"] if kind == "nodes" else [],
+            "relationships": page["items"] if kind == "relationships" else [],
+            "next_cursor": next_cursor,
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -300,7 +480,7 @@ async def get_graph_neighborhood(node_id: str, depth: int = 1, max_nodes: int =
     max_nodes = min(max(max_nodes, 1), 100)
 
     try:
-        result = db.fetch_graph_neighborhood(node_id, depth=depth, max_nodes=max_nodes)
+        result = await adb.fetch_graph_neighborhood(node_id, depth=depth, max_nodes=max_nodes)
         if result is None:
             raise HTTPException(status_code=404, detail=f"Node '{node_id}' not found")
         return result
@@ -611,9 +791,12 @@ async def consult_deep_explainable_stream(request: ConsultRequest, _user: str =
     print(f"🎯 [ENDPOINT HIT] /consult/deep-explainable/stream  (Graph Reasoning mode)")
     print(f"   Session ID: {request.session_id or '(none)'}")
     print(f"{'='*60}\n")
-    def generate():
+    async def generate():
+        # The retriever is synchronous: pull each event on the stream
+        # executor so the event loop stays free between events.
         try:
-            for event in query_deep_explainable_streaming(request.query, session_id=request.session_id):
+            events = query_deep_explainable_streaming(request.query, session_id=request.session_id)
+            async for event in aiter_sync(events, _stream_executor):
                 yield f"data: {json.dumps(event)}\n\n"
         except Exception as e:
             import traceback
@@ -768,7 +951,7 @@ async def get_project_timeline(project_name: str, _user: str = Depends(get_curre
     email thread and the evidence for each classification.
     """
     try:
-        timeline_data = db.get_project_timeline(project_name)
+        timeline_data = await adb.get_project_timeline(project_name)
         if not timeline_data:
             raise HTTPException(status_code=404, detail=f"Project '{project_name}' not found")
         return timeline_data
@@ -783,7 +966,7 @@ async def get_project_timeline(project_name: str, _user: str = Depends(get_curre
 async def get_explorer_projects(_user: str = Depends(get_current_user)):
     """Get all projects with details for the data explorer."""
     try:
-        projects = db.get_all_projects_with_details()
+        projects = await adb.get_all_projects_with_details()
         return {"projects": projects}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -793,7 +976,7 @@ async def get_explorer_projects(_user: str = Depends(get_current_user)):
 async def get_explorer_project_details(project_name: str, _user: str = Depends(get_current_user)):
     """Get full details for a specific project."""
     try:
-        project = db.get_project_details(project_name)
+        project = await adb.get_project_details(project_name)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         return project
@@ -807,7 +990,7 @@ async def get_explorer_project_details(project_name: str, _user: str = Depends(g
 async def get_explorer_concepts(_user: str = Depends(get_current_user)):
     """Get all concepts with details for the data explorer."""
     try:
-        concepts = db.get_all_concepts_with_details()
+        concepts = await adb.get_all_concepts_with_details()
         return {"concepts": concepts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -817,7 +1000,7 @@ async def get_explorer_concepts(_user: str = Depends(get_current_user)):
 async def get_explorer_concept_details(concept_name: str, _user: str = Depends(get_current_user)):
     """Get full details for a specific concept."""
     try:
-        concept = db.get_concept_details(concept_name)
+        concept = await adb.get_concept_details(concept_name)
         if not concept:
             raise HTTPException(status_code=404, detail="Concept not found")
         return concept
@@ -831,7 +1014,7 @@ async def get_explorer_concept_details(concept_name: str, _user: str = Depends(g
 async def get_explorer_observations(_user: str = Depends(get_current_user)):
     """Get all observations with details for the data explorer."""
     try:
-        observations = db.get_all_observations_with_details()
+        observations = await adb.get_all_observations_with_details()
         return {"observations": observations}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -841,7 +1024,7 @@ async def get_explorer_observations(_user: str = Depends(get_current_user)):
 async def get_explorer_actions(_user: str = Depends(get_current_user)):
     """Get all actions with details for the data explorer."""
     try:
-        actions = db.get_all_actions_with_details()
+        actions = await adb.get_all_actions_with_details()
         return {"actions": actions}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -851,7 +1034,7 @@ async def get_explorer_actions(_user: str = Depends(get_current_user)):
 async def get_explorer_competitors(_user: str = Depends(get_current_user)):
     """Get all competitor products with details for the data explorer."""
     try:
-        competitors = db.get_all_competitors_with_details()
+        competitors = await adb.get_all_competitors_with_details()
         return {"competitors": competitors}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -862,7 +1045,7 @@ async def get_explorer_competitors(_user: str = Depends(get_current_user)):
 async def list_threads(_user: str = Depends(get_current_user)):
     """Get all email threads (projects) with summary info."""
     try:
-        threads = db.get_all_threads_summary()
+        threads = await adb.get_all_threads_summary()
         return {"threads": threads}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -872,7 +1055,7 @@ async def list_threads(_user: str = Depends(get_current_user)):
 async def get_thread_details(project_name: str, _user: str = Depends(get_current_user)):
     """Get full thread details including timeline with logic nodes."""
     try:
-        timeline_data = db.get_project_timeline(project_name)
+        timeline_data = await adb.get_project_timeline(project_name)
         if not timeline_data:
             raise HTTPException(status_code=404, detail=f"Thread '{project_name}' not found")
         return timeline_data
@@ -916,10 +1099,10 @@ async def get_knowledge_candidates(status: str | None = None, _user: str = Depen
     - status: Filter by status (pending, verified, rejected). Default: all.
     """
     try:
-        candidates = db.get_all_knowledge_candidates(status=status)
+        candidates = await adb.get_all_knowledge_candidates(status=status)
         # Merge graph-derived rule candidates (always available for pending view)
         if status is None or status == "pending":
-            graph_rules = db.get_graph_rules_as_candidates()
+            graph_rules = await adb.get_graph_rules_as_candidates()
         else:
             graph_rules = []
         return {"candidates": candidates + graph_rules}
@@ -979,7 +1162,7 @@ async def get_knowledge_library(_user: str = Depends(get_current_user)):
     Returns verified sources with their usage frequency and aliases.
     """
     try:
-        sources = db.get_verified_sources_library()
+        sources = await adb.get_verified_sources_library()
         return {"sources": sources}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -989,7 +1172,7 @@ async def get_knowledge_library(_user: str = Depends(get_current_user)):
 async def get_knowledge_source_details(source_id: str, _user: str = Depends(get_current_user)):
     """Get detailed information about a verified knowledge source."""
     try:
-        source = db.get_verified_source_details(source_id)
+        source = await adb.get_verified_source_details(source_id)
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
         return source
@@ -1021,7 +1204,7 @@ async def get_expert_knowledge_map(_user: str = Depends(get_current_user)):
     data sources, and processes based on email thread analysis.
     """
     try:
-        experts = db.get_expert_knowledge_map()
+        experts = await adb.get_expert_knowledge_map()
         return {"experts": experts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1034,9 +1217,9 @@ async def get_knowledge_stats(_user: str = Depends(get_current_user)):
     Returns counts of pending candidates, verified sources, coverage metrics.
     """
     try:
-        stats = db.get_knowledge_stats()
+        stats = await adb.get_knowledge_stats()
         # Include graph-derived rules in the pending count
-        graph_rules = db.get_graph_rules_as_candidates()  # cached
+        graph_rules = await adb.get_graph_rules_as_candidates()  # cached
         stats["pending"] = stats.get("pending", 0) + len(graph_rules)
         stats["total_candidates"] = stats.get("total_candidates", 0) + len(graph_rules)
         return stats
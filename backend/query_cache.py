@@ -0,0 +1,152 @@
+"""Bounded, namespaced LRU + TTL cache for graph read queries.
+
+Replaces the unbounded module-level dict that used to live in database.py.
+Entries are grouped by namespace (one per cached GraphConnection method) so
+write paths can drop exactly the data they may have changed:
+
+    cache = QueryCache(max_entries=2048, max_bytes=64 * 1024 * 1024, ttl=300)
+    cache.set("product_traits", "FAM_GDB", traits)
+    cache.get("product_traits", "FAM_GDB")     # -> traits or None
+    cache.invalidate("product_traits")          # one namespace
+    cache.invalidate()                          # everything
+
+Eviction happens on every write: expired entries first, then least-recently
+used entries until both the entry and the (approximate) byte cap hold.
+All operations are guarded by a single lock and are safe across threads.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def approx_size(obj, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of a query result (dict/list/str tree)."""
+    size = sys.getsizeof(obj)
+    if _depth > 6:
+        return size
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approx_size(item, _depth + 1)
+    return size
+
+
+class QueryCache:
+    """Thread-safe LRU + TTL cache with a memory cap and namespaces."""
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (namespace, key) -> (value, expires_at, size)
+        self._entries: "OrderedDict[tuple[str, str], tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._ns_hits: dict[str, int] = {}
+        self._ns_misses: dict[str, int] = {}
+
+    def get(self, namespace: str, key: str = "") -> Optional[Any]:
+        """Return the cached value, or None on miss/expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at > now:
+                    self._entries.move_to_end((namespace, key))
+                    self._hits += 1
+                    self._ns_hits[namespace] = self._ns_hits.get(namespace, 0) + 1
+                    return value
+                del self._entries[(namespace, key)]
+                self._bytes -= size
+                self._expirations += 1
+            self._misses += 1
+            self._ns_misses[namespace] = self._ns_misses.get(namespace, 0) + 1
+            return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value; evicts expired then LRU entries to honour the caps."""
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._entries.pop((namespace, key), None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[(namespace, key)] = (value, expires_at, size)
+            self._bytes += size
+            self._evict_locked()
+
+    def _evict_locked(self):
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        now = time.monotonic()
+        for k in [k for k, (_, exp, _) in self._entries.items() if exp <= now]:
+            _, _, size = self._entries.pop(k)
+            self._bytes -= size
+            self._expirations += 1
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def invalidate(self, *namespaces: str) -> int:
+        """Drop all entries of the given namespaces (all entries if none given).
+
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            if not namespaces:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                wanted = set(namespaces)
+                keys = [k for k in self._entries if k[0] in wanted]
+                for k in keys:
+                    self._bytes -= self._entries.pop(k)[2]
+                removed = len(keys)
+            self._invalidations += 1
+            return removed
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            namespaces = {}
+            for ns, _ in self._entries:
+                namespaces[ns] = namespaces.get(ns, 0) + 1
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "namespaces": {
+                    ns: {
+                        "entries": namespaces.get(ns, 0),
+                        "hits": self._ns_hits.get(ns, 0),
+                        "misses": self._ns_misses.get(ns, 0),
+                    }
+                    for ns in sorted(set(namespaces) | set(self._ns_hits) | set(self._ns_misses))
+                },
+            }
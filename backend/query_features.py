@@ -0,0 +1,333 @@
+"""Shared, precompiled regex extraction of query features.
+
+The regex fallbacks (``detect_intent_fast``, ``extract_entity_codes``,
+``extract_project_keywords`` in retriever.py and ``extract_*_from_query`` in
+logic/state.py) used to rebuild patterns from the config and re-scan the
+query independently, several times per turn. Here every pattern is compiled
+once per loaded DomainConfig (``QueryPatterns``), and each query's features
+are computed at most once and memoized (``QueryFeatures``):
+
+    features = query_features("GDB 600x600 RF for Huddinge project, 3400 m3/h")
+    features.entity_references     # ["GDB", "GDB-600X600"] (unordered)
+    features.tags                  # [{"tag_id": "item_1", "filter_width": 600, ...}]
+    features.material              # "RF"
+
+The lowercase / uppercase / thousand-normalized forms of the text are derived
+once and shared by every extractor, and keyword lists (application keywords,
+action words, material names) are matched in one pass with KeywordMatcher.
+Each feature keeps the exact semantics of the function it replaced. Values
+are shared between callers of the same query — callers copy before mutating.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Optional
+
+from keyword_matcher import KeywordMatcher
+
+DEFAULT_PRODUCT_FAMILIES = ["GDB", "GDMI", "GDC", "GDP", "GDF", "GDR", "PFF", "BFF", "EXL"]
+
+DEFAULT_APPLICATION_KEYWORDS = {
+    'hospital': ['hospital', 'szpital', 'medical', 'clinic', 'klinik'],
+    'kitchen': ['kitchen', 'kuchnia', 'restaurant', 'restauracja', 'food'],
+    'office': ['office', 'biuro', 'commercial', 'komercyjny'],
+    'industrial': ['industrial', 'przemysłowy', 'factory', 'fabryka'],
+    'cleanroom': ['cleanroom', 'czyste pomieszczenie', 'pharma', 'farmaceut'],
+}
+
+DEFAULT_MATERIAL_KEYWORDS = {
+    'RF': ['stainless steel', 'stainless', 'nierdzewna', 'rostfri', 'edelstahl', 'inox', 'rf'],
+    'FZ': ['galvanized', 'verzinkt', 'zinc', 'cynk', 'fz'],
+    'ZM': ['zinkmagnesium', 'magnelis', 'zm'],
+    'SF': ['sendzimir', 'sf'],
+}
+
+# Action words in priority order: the first category with a hit wins
+_ACTION_WORDS = [
+    ("compare", ['compare', 'porównaj', 'vs', 'versus', 'difference']),
+    ("configure", ['configure', 'konfigur', 'setup', 'option']),
+    ("troubleshoot", ['problem', 'issue', 'nie działa', 'error', 'troubleshoot']),
+    ("select", ['recommend', 'suggest', 'need', 'potrzeb', 'want', 'chcę']),
+]
+
+_LANGUAGE_PATTERNS = [
+    ("pl", re.compile(r'\b(czy|jak|jaki|mamy|jest|dla|przy)\b', re.IGNORECASE)),
+    ("de", re.compile(r'\b(ist|sind|für|mit|bei|wie)\b', re.IGNORECASE)),
+    ("sv", re.compile(r'\b(är|för|med|och|hur)\b', re.IGNORECASE)),
+]
+_FULL_CODE_RE = re.compile(r'\b([A-Z]{2,4}-\d{2,4}[xX]\d{2,4}(?:-\d{2,4})?)\b', re.IGNORECASE)
+_NUMERIC_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*([a-zA-Z³²/°]+(?:/[a-zA-Z]+)?)')
+_CONTEXT_CLEAN_RE = re.compile(r'[^\w\d\-x/]')
+
+# Tag / dimension / airflow extraction (state.extract_tags_from_query)
+_THOUSANDS_COMMA_RE = re.compile(r'(\d{1,3}),(\d{3})\b')
+_THOUSANDS_SPACE_RE = re.compile(r'(\d{1,3})\s(\d{3})\b')
+_TAG_RE = re.compile(
+    r'(?:tag|item|pos(?:ition)?)\s*[:#\-]?\s*(\w+)[:\-\s]+(\d{2,4})[x×X](\d{2,4})(?:[x×X](\d{2,4}))?',
+    re.IGNORECASE,
+)
+_DIMENSION_RE = re.compile(r'(\d{2,4})[x×X](\d{2,4})(?:[x×X](\d{2,4}))?(?:\s*mm)?')
+_AIRFLOW_RE = re.compile(r'(\d{3,6})\s*(?:m³/h|m3/h|m³|cbm|cubic|m3h)', re.IGNORECASE)
+
+_PROJECT_NAME_RES = [
+    re.compile(r'(?:project|projekt|for|dla)\s+([A-Z][a-zA-Z0-9]+)', re.IGNORECASE),
+    re.compile(r'([A-Z][a-zA-Z0-9]+)\s+project', re.IGNORECASE),
+]
+
+_DUCT_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'[ØO⌀]\s*(\d{2,4})\s*(?:mm)?',                                          # Ø500mm
+    r'(\d{2,4})\s*mm\s+round\s+(?:ducts?|connections?|pipes?)',                    # 500mm round duct(s)
+    r'round\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})\s*(?:mm)?\s*(?:diameter)?\)?',  # round ducts (500mm diameter)
+    r'circular\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})',                    # circular duct(s) (500
+    r'(\d{2,4})\s*mm\s+(?:circular|round)\s+(?:ducts?|connections?|pipes?)',        # 500mm circular duct(s)
+    r'(\d{2,4})\s*mm\s+diameter\s+(?:round|circular)?\s*(?:ducts?|pipes?)',        # 500mm diameter round ducts
+    r'(?:round|circular)\s+(?:ducts?|pipes?)\s+(?:of\s+|with\s+)?(\d{2,4})\s*mm',  # round ducts of 500mm
+)]
+_TRANSITION_RES = [re.compile(p, re.IGNORECASE) for p in (r'transition\s+piece', r'reducer', r'adapter')]
+
+
+class QueryPatterns:
+    """Every extraction pattern of one DomainConfig, compiled once."""
+
+    def __init__(self, config=None):
+        self.config = config
+        families = (config.product_families if config else None) or DEFAULT_PRODUCT_FAMILIES
+        self.product_families = list(config.product_families) if config else []
+        self.family_re = re.compile(
+            r'\b(' + "|".join(re.escape(f) for f in families) + r')[-\s]?(\d{2,4})?[xX]?(\d{2,4})?\b',
+            re.IGNORECASE,
+        )
+
+        self.applications = list(((config.fallback_application_keywords if config else None)
+                                  or DEFAULT_APPLICATION_KEYWORDS).items())
+        self.application_matcher = KeywordMatcher(
+            (kw, ("app", i)) for i, (_, keywords) in enumerate(self.applications) for kw in keywords
+        )
+        self.action_matcher = KeywordMatcher(
+            (word, ("action", i)) for i, (_, words) in enumerate(_ACTION_WORDS) for word in words
+        )
+
+        self.entity_patterns = [p.compile() for p in config.product_code_patterns] if config else []
+        self.normalization = config.normalization if config else None
+
+        project_search = config.project_search if config else None
+        self.project_patterns = [re.compile(p) for p in project_search.patterns] if project_search else []
+        self.project_stopwords = set(project_search.stopwords) if project_search else set()
+        self.project_identifiers = list(project_search.known_identifiers) if project_search else []
+
+        if config and config.material_codes_extended:
+            materials = {mat.code: mat.extraction_keywords for mat in config.material_codes_extended}
+        else:
+            materials = DEFAULT_MATERIAL_KEYWORDS
+        self.material_codes = list(materials)
+        # Keywords are matched against the lowercased query, so only lowercase
+        # keywords can ever match (as with the former per-keyword regex)
+        self.material_matcher = KeywordMatcher()
+        for i, keywords in enumerate(materials.values()):
+            for kw in keywords:
+                if kw == kw.lower():
+                    self.material_matcher.add(kw, i, word_boundary=True)
+        self.material_matcher.build()
+
+
+class QueryFeatures:
+    """Lazily extracted, memoized regex features of one query."""
+
+    def __init__(self, text: str, patterns: QueryPatterns):
+        self.text = text
+        self.patterns = patterns
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def upper(self) -> str:
+        return self.text.upper()
+
+    @cached_property
+    def numbers_normalized(self) -> str:
+        """Text with thousand separators removed (25,000 / 25 000 -> 25000)."""
+        return _THOUSANDS_SPACE_RE.sub(r'\1\2', _THOUSANDS_COMMA_RE.sub(r'\1\2', self.text))
+
+    # --- Intent (retriever.detect_intent_fast) ---------------------------
+
+    @cached_property
+    def language(self) -> str:
+        for language, pattern in _LANGUAGE_PATTERNS:
+            if pattern.search(self.text):
+                return language
+        return "en"
+
+    @cached_property
+    def entity_references(self) -> list[str]:
+        refs = [m[0].upper() for m in self.patterns.family_re.findall(self.text)]
+        refs.extend(c.upper() for c in _FULL_CODE_RE.findall(self.text))
+        return list(set(refs))
+
+    @cached_property
+    def numeric_constraints(self) -> list[dict]:
+        constraints = []
+        for value_str, unit in _NUMERIC_RE.findall(self.text):
+            try:
+                constraints.append({"value": float(value_str.replace(',', '.')), "unit": unit, "context": "extracted"})
+            except ValueError:
+                pass
+        return constraints
+
+    @cached_property
+    def context_keywords(self) -> list[str]:
+        hit = {i for _, i in self.patterns.application_matcher.payloads(self.lower)}
+        return [app for i, (app, _) in enumerate(self.patterns.applications) if i in hit]
+
+    @cached_property
+    def action_intent(self) -> str:
+        hit = sorted(i for _, i in self.patterns.action_matcher.payloads(self.lower))
+        first = hit[0] if hit else None
+        if first is not None and first < 3:
+            return _ACTION_WORDS[first][0]
+        if self.entity_references or first == 3:
+            return "select"
+        return "general_info"
+
+    @cached_property
+    def has_specific_constraint(self) -> bool:
+        return bool(self.numeric_constraints) or "context update:" in self.lower
+
+    # --- Entities and projects (retriever) -------------------------------
+
+    @cached_property
+    def entity_codes(self) -> list[str]:
+        normalization = self.patterns.normalization
+        codes = []
+        for compiled in self.patterns.entity_patterns:
+            for match in compiled.findall(self.text):
+                normalized = match
+                if normalization and normalization.replace_space_with:
+                    normalized = normalized.replace(' ', normalization.replace_space_with)
+                if normalization and normalization.uppercase:
+                    normalized = normalized.upper()
+                codes.append(normalized)
+
+        for family in self.patterns.product_families:
+            idx = self.upper.find(family.upper())
+            if idx < 0:
+                continue
+            if not any(family.upper() in c.upper() for c in codes):
+                codes.append(family)
+            # Try to extract more context around the family name
+            clean_context = _CONTEXT_CLEAN_RE.sub(' ', self.text[idx:idx + 30]).strip().split()[0]
+            if normalization and normalization.replace_space_with:
+                clean_context = clean_context.replace(' ', normalization.replace_space_with)
+            if len(clean_context) > len(family) and clean_context not in codes:
+                codes.append(clean_context)
+        return list(set(codes))
+
+    @cached_property
+    def project_keywords(self) -> list[str]:
+        keywords = []
+        for pattern in self.patterns.project_patterns:
+            for match in pattern.findall(self.lower):
+                if match not in self.patterns.project_stopwords and len(match) > 2:
+                    keywords.append(match)
+        for identifier in self.patterns.project_identifiers:
+            if identifier.lower() in self.lower:
+                keywords.append(identifier)
+        return list(set(keywords))
+
+    # --- Technical state fallbacks (logic/state.py) ----------------------
+
+    @cached_property
+    def tags(self) -> list[dict]:
+        text = self.numbers_normalized
+        tags = [
+            {"tag_id": tag_id, "filter_width": int(w), "filter_height": int(h),
+             "filter_depth": int(d) if d else None}
+            for tag_id, w, h, d in _TAG_RE.findall(text)
+        ]
+        if not tags:
+            tags = [
+                {"tag_id": f"item_{i + 1}", "filter_width": int(w), "filter_height": int(h),
+                 "filter_depth": int(d) if d else None}
+                for i, (w, h, d) in enumerate(_DIMENSION_RE.findall(text))
+            ]
+        if tags:
+            for i, airflow in enumerate(_AIRFLOW_RE.findall(text)[:len(tags)]):
+                tags[i]["airflow_m3h"] = int(airflow)
+        return tags
+
+    @cached_property
+    def material(self) -> Optional[str]:
+        hits = self.patterns.material_matcher.payloads(self.lower)
+        return self.patterns.material_codes[min(hits)] if hits else None
+
+    @cached_property
+    def project_name(self) -> Optional[str]:
+        for pattern in _PROJECT_NAME_RES:
+            match = pattern.search(self.text)
+            if match:
+                return match.group(1)
+        return None
+
+    @cached_property
+    def accessories(self) -> list[str]:
+        accessories = []
+        for pattern in _DUCT_RES:
+            for m in pattern.findall(self.text):
+                acc = f"Round duct Ø{m}mm"
+                if acc not in accessories:
+                    accessories.append(acc)
+        for pattern in _TRANSITION_RES:
+            if pattern.search(self.text) and not any('Round duct' in a for a in accessories):
+                accessories.append("Transition piece (type TBD)")
+        return accessories
+
+
+_patterns_lock = threading.Lock()
+_current_patterns: Optional[tuple] = None   # (config, QueryPatterns) of the active config
+_features_lock = threading.Lock()
+_features: "OrderedDict[tuple[int, str], QueryFeatures]" = OrderedDict()
+FEATURES_CACHE_SIZE = 256
+
+
+def patterns_for(config=None) -> QueryPatterns:
+    """Compiled patterns for ``config``; rebuilt when a different config object is loaded.
+
+    Only the current config's patterns are kept, and the features memo is
+    dropped with them, so config reloads do not accumulate compiled sets.
+    """
+    global _current_patterns
+    entry = _current_patterns
+    if entry is not None and entry[0] is config:
+        return entry[1]
+    patterns = QueryPatterns(config)
+    with _patterns_lock:
+        _current_patterns = (config, patterns)
+    with _features_lock:
+        _features.clear()
+    return patterns
+
+
+def query_features(query: str, config=None) -> QueryFeatures:
+    """Memoized features of ``query`` (``config`` defaults to the active domain config)."""
+    if config is None:
+        try:
+            from config_loader import get_config
+            config = get_config()
+        except Exception:
+            config = None
+    patterns = patterns_for(config)
+    key = (id(patterns), query or "")
+    with _features_lock:
+        features = _features.get(key)
+        if features is not None and features.patterns is patterns:
+            _features.move_to_end(key)
+            return features
+    features = QueryFeatures(query or "", patterns)
+    with _features_lock:
+        _features[key] = features
+        while len(_features) > FEATURES_CACHE_SIZE:
+            _features.popitem(last=False)
+    return features
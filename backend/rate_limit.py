@@ -0,0 +1,66 @@
+"""Client-side rate limiting and retry backoff for remote model APIs.
+
+    bucket = TokenBucket(rate=25.0, capacity=25)   # ~1500 requests / minute
+    bucket.acquire()                               # blocks until a token is free
+
+    for attempt, delay in enumerate(backoff_delays(retries=4)):
+        ...
+
+Both are thread-safe / stateless so one bucket can be shared by a worker
+pool that fans requests out concurrently.
+"""
+
+import random
+import threading
+import time
+from typing import Iterator, Optional
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are available; False if ``timeout`` elapses first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+def backoff_delays(retries: int, base: float = 0.5, cap: float = 20.0) -> Iterator[float]:
+    """Exponential backoff with full jitter: ``retries`` delays, each in [0, min(cap, base * 2**n)]."""
+    for attempt in range(retries):
+        yield random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -0,0 +1,238 @@
+"""Semantic cache for first-turn deep-explainable responses.
+
+The same few dozen opening questions ("GDB 600x600 for a kitchen exhaust",
+"hospital chlorine") each cost a full Scribe + engine + synthesis run. A
+finished run is stored under an exact bucket key — domain, graph version,
+model, the normalized starting ``TechnicalState`` and the parameters
+extracted from the query (codes, dimensions, numbers, material) — together
+with the query embedding. A later first-turn query in the same bucket whose
+embedding is at least ``similarity`` (cosine) close is served from cache:
+
+    key = response_cache.bucket_key(domain, graph_version, model, state.to_dict(), params)
+    hit = response_cache.lookup(key, query_embedding)
+    if hit:
+        ...                                   # replay hit.events, then hit.complete
+    recorder = response_cache.recorder()
+    for event in pipeline:                    # sets recorder.key/.embedding on a miss
+        recorder.observe(event)
+    recorder.commit()
+
+Entries expire after ``ttl`` seconds; the least recently used entry goes
+when ``max_entries`` is exceeded. Graph writes call ``invalidate()`` (see
+``database.on_graph_write``) and the graph version in the key covers writes
+made by other processes. All operations are thread-safe.
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import count
+from operator import mul
+from typing import Optional
+
+
+def _normalize(vector: list[float]) -> Optional[tuple[float, ...]]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if not norm:
+        return None
+    return tuple(v / norm for v in vector)
+
+
+@dataclass
+class CachedResponse:
+    """A recorded pipeline run: replayable inference events plus the complete event."""
+    events: list[dict]
+    complete: dict
+    assistant_summary: str = ""
+    similarity: float = 1.0
+    stored_at: float = field(default_factory=time.time)
+
+
+class ResponseRecorder:
+    """Collects the events of one pipeline run and stores them on ``commit``."""
+
+    def __init__(self, cache: "ResponseCache", key: Optional[str] = None,
+                 embedding: Optional[list[float]] = None):
+        self.cache = cache
+        self.key = key
+        self.embedding = embedding
+        self.events: list[dict] = []
+        self.complete: Optional[dict] = None
+        self.assistant_summary = ""
+        self.cacheable = True
+
+    def observe(self, event: dict):
+        """Record inference steps and the complete event; ignore the rest."""
+        kind = event.get("type")
+        if kind == "inference":
+            self.events.append(event)
+        elif kind == "complete":
+            self.complete = event
+        elif kind == "error":
+            self.cacheable = False
+
+    def commit(self) -> bool:
+        """Store the run if it has a key and finished cleanly. Returns True when stored."""
+        if not self.key or not self.cacheable or self.complete is None:
+            return False
+        return self.cache.store(self.key, self.embedding, CachedResponse(
+            events=self.events, complete=self.complete, assistant_summary=self.assistant_summary,
+        ))
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache of responses, matched by embedding similarity."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600.0, similarity: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._ids = count()
+        # entry id -> (bucket key, unit embedding, CachedResponse, expires_at)
+        self._entries: "OrderedDict[int, tuple[str, tuple, CachedResponse, float]]" = OrderedDict()
+        self._buckets: dict[str, set[int]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._similarity_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def bucket_key(domain: str, graph_version: int, model: str, state: dict,
+                   params: Optional[dict] = None) -> str:
+        """Exact-match part of the key: everything except the query wording.
+
+        ``params`` are the values extracted from the query; queries that differ
+        in any of them never share a bucket, however similar their embeddings.
+        """
+        payload = json.dumps([domain, graph_version, model, state, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def recorder(self, key: Optional[str] = None,
+                 embedding: Optional[list[float]] = None) -> ResponseRecorder:
+        """Recorder for one run; set ``key``/``embedding`` once the run turns out cacheable."""
+        return ResponseRecorder(self, key, embedding)
+
+    def lookup(self, key: str, embedding: list[float]) -> Optional[CachedResponse]:
+        """Best live entry in ``key``'s bucket at or above the similarity threshold."""
+        query = _normalize(embedding) if embedding else None
+        now = time.monotonic()
+        with self._lock:
+            best_id, best_score = None, self.similarity
+            for entry_id in list(self._buckets.get(key, ())):
+                _, vector, _, expires_at = self._entries[entry_id]
+                if expires_at <= now:
+                    self._drop_locked(entry_id)
+                    self._expirations += 1
+                    continue
+                if query is None or len(vector) != len(query):
+                    continue
+                score = sum(map(mul, query, vector))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self._hits += 1
+            self._similarity_total += best_score
+            cached = self._entries[best_id][2]
+        return CachedResponse(
+            events=cached.events, complete=cached.complete,
+            assistant_summary=cached.assistant_summary,
+            similarity=best_score, stored_at=cached.stored_at,
+        )
+
+    def store(self, key: str, embedding: list[float], response: CachedResponse) -> bool:
+        """Add an entry; evicts the least recently used entries beyond ``max_entries``."""
+        vector = _normalize(embedding) if embedding else None
+        if not self.enabled or vector is None:
+            return False
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = (key, vector, response, time.monotonic() + self.ttl)
+            self._buckets.setdefault(key, set()).add(entry_id)
+            self._stores += 1
+            while len(self._entries) > self.max_entries:
+                self._drop_locked(next(iter(self._entries)))
+                self._evictions += 1
+        return True
+
+    def _drop_locked(self, entry_id: int):
+        key = self._entries.pop(entry_id)[0]
+        bucket = self._buckets[key]
+        bucket.discard(entry_id)
+        if not bucket:
+            del self._buckets[key]
+
+    def invalidate(self) -> int:
+        """Drop every entry (called after graph writes). Returns the number removed."""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._buckets.clear()
+            self._invalidations += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Hit/miss counters, mean hit similarity and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "buckets": len(self._buckets),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "similarity_threshold": self.similarity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "mean_hit_similarity": round(self._similarity_total / self._hits, 4) if self._hits else None,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def render_prometheus(self) -> str:
+        """Hit/miss counters in the Prometheus text format (appended to /metrics)."""
+        with self._lock:
+            counts = (("hit", self._hits), ("miss", self._misses))
+            entries = len(self._entries)
+        lines = [
+            "# HELP response_cache_lookups_total Semantic response cache lookups by outcome.",
+            "# TYPE response_cache_lookups_total counter",
+        ]
+        for outcome, value in counts:
+            lines.append(f'response_cache_lookups_total{{outcome="{outcome}"}} {value}')
+        lines += [
+            "# HELP response_cache_entries Cached responses currently held.",
+            "# TYPE response_cache_entries gauge",
+            f"response_cache_entries {entries}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# How long a first turn waits for its query embedding before looking up the
+# cache; a slower embedding skips the lookup so the Scribe is not delayed.
+LOOKUP_EMBEDDING_WAIT_S = float(os.getenv("RESPONSE_CACHE_EMBEDDING_WAIT", 0.15))
+
+# RESPONSE_CACHE_MAX_ENTRIES=0 disables the cache.
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 512)),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", 3600)),
+    similarity=float(os.getenv("RESPONSE_CACHE_SIMILARITY", 0.95)),
+)
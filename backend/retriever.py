@@ -12,14 +12,15 @@ import re
 import json
 import time
 import logging
+from itertools import chain
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 from dotenv import load_dotenv
 
-from database import db
-from embeddings import generate_embedding
+from database import db, on_graph_write
+from embeddings import embed_map, generate_embedding
 from config_loader import get_config, reload_config, DomainConfig, ReasoningPolicy
 from models import (
     ConsultResponse, StructuredResponse, GraphEvidence, PolicyCheckResult,
@@ -43,7 +44,17 @@ from logic.state import (
 
 load_dotenv(dotenv_path="../.env")
 
-from llm_router import llm_call, DEFAULT_MODEL
+from llm_router import llm_call, llm_call_stream, DEFAULT_MODEL
+from incremental_json import JsonArrayItemParser
+from stage_graph import StageGraph
+from deadline import Deadline
+from context_packer import ContextPacker, SYNTHESIS_CONTEXT_TOKENS
+from query_features import query_features
+from response_cache import LOOKUP_EMBEDDING_WAIT_S, response_cache
+from single_flight import consult_flights
+
+# Cached answers may quote any catalog data, so every graph write drops them.
+on_graph_write(response_cache.invalidate)
 LLM_MODEL = DEFAULT_MODEL
 
 
@@ -104,63 +115,18 @@ class QueryIntent:
 def detect_intent_fast(query: str) -> QueryIntent:
     """FALLBACK: Regex-based intent detection. Only called when Scribe LLM
     fails or for fields Scribe didn't extract. Scribe is the primary extractor (v4.0).
-    """
-    query_lower = query.lower()
-
-    # 1. Detect language
-    language = _detect_language_fallback(query)
-
-    # 2. Extract product codes (from config product families)
-    _cfg = get_config()
-    _families_re = "|".join(re.escape(f) for f in _cfg.product_families) if _cfg.product_families else "GDB|GDMI|GDC|GDP|GDF|GDR|PFF|BFF|EXL"
-    product_pattern = r'\b(' + _families_re + r')[-\s]?(\d{2,4})?[xX]?(\d{2,4})?\b'
-    product_matches = re.findall(product_pattern, query, re.IGNORECASE)
-    entity_references = [m[0].upper() for m in product_matches] if product_matches else []
-
-    # Also catch full product codes like "GDB-600x600-750"
-    full_code_pattern = r'\b([A-Z]{2,4}-\d{2,4}[xX]\d{2,4}(?:-\d{2,4})?)\b'
-    full_codes = re.findall(full_code_pattern, query, re.IGNORECASE)
-    entity_references.extend([c.upper() for c in full_codes])
-    entity_references = list(set(entity_references))  # dedupe
-
-    # 3. Extract numeric constraints
-    numeric_constraints = _extract_numeric_constraints_fallback(query)
-
-    # 4. Detect application/environment keywords (from config)
-    _app_kw = _cfg.fallback_application_keywords or {
-        'hospital': ['hospital', 'szpital', 'medical', 'clinic', 'klinik'],
-        'kitchen': ['kitchen', 'kuchnia', 'restaurant', 'restauracja', 'food'],
-        'office': ['office', 'biuro', 'commercial', 'komercyjny'],
-        'industrial': ['industrial', 'przemysłowy', 'factory', 'fabryka'],
-        'cleanroom': ['cleanroom', 'czyste pomieszczenie', 'pharma', 'farmaceut'],
-    }
-    context_keywords = []
-    for app, keywords in _app_kw.items():
-        if any(kw in query_lower for kw in keywords):
-            context_keywords.append(app)
-
-    # 5. Detect action intent
-    if any(w in query_lower for w in ['compare', 'porównaj', 'vs', 'versus', 'difference']):
-        action_intent = "compare"
-    elif any(w in query_lower for w in ['configure', 'konfigur', 'setup', 'option']):
-        action_intent = "configure"
-    elif any(w in query_lower for w in ['problem', 'issue', 'nie działa', 'error', 'troubleshoot']):
-        action_intent = "troubleshoot"
-    elif entity_references or any(w in query_lower for w in ['recommend', 'suggest', 'need', 'potrzeb', 'want', 'chcę']):
-        action_intent = "select"
-    else:
-        action_intent = "general_info"
-
-    # 6. Check for specific constraints
-    has_specific = bool(numeric_constraints) or "context update:" in query_lower
 
+    Patterns are precompiled per config and features memoized per query
+    (see query_features.py).
+    """
+    features = query_features(query, get_config())
     return QueryIntent({
-        "language": language,
-        "numeric_constraints": numeric_constraints,
-        "entity_references": entity_references,
-        "action_intent": action_intent,
-        "context_keywords": context_keywords,
-        "has_specific_constraint": has_specific
+        "language": features.language,
+        "numeric_constraints": [dict(c) for c in features.numeric_constraints],
+        "entity_references": list(features.entity_references),
+        "action_intent": features.action_intent,
+        "context_keywords": list(features.context_keywords),
+        "has_specific_constraint": features.has_specific_constraint
     })
 
 
@@ -193,41 +159,12 @@ def detect_intent(query: str) -> QueryIntent:
 
 def _detect_language_fallback(query: str) -> str:
     """Simple regex-based language detection as fallback."""
-    polish_patterns = [r'\b(czy|jak|jaki|mamy|jest|dla|przy)\b']
-    german_patterns = [r'\b(ist|sind|für|mit|bei|wie)\b']
-    swedish_patterns = [r'\b(är|för|med|och|hur)\b']
-
-    for pattern in polish_patterns:
-        if re.search(pattern, query, re.IGNORECASE):
-            return 'pl'
-    for pattern in german_patterns:
-        if re.search(pattern, query, re.IGNORECASE):
-            return 'de'
-    for pattern in swedish_patterns:
-        if re.search(pattern, query, re.IGNORECASE):
-            return 'sv'
-    return 'en'
+    return query_features(query, get_config()).language
 
 
 def _extract_numeric_constraints_fallback(query: str) -> list[dict]:
     """Extract numeric values with units from query as fallback."""
-    constraints = []
-    # Generic pattern for number + unit
-    pattern = r'(\d+(?:[.,]\d+)?)\s*([a-zA-Z³²/°]+(?:/[a-zA-Z]+)?)'
-    matches = re.findall(pattern, query)
-
-    for value_str, unit in matches:
-        try:
-            value = float(value_str.replace(',', '.'))
-            constraints.append({
-                "value": value,
-                "unit": unit,
-                "context": "extracted"
-            })
-        except ValueError:
-            pass
-
-    return constraints
+    return [dict(c) for c in query_features(query, get_config()).numeric_constraints]
 
 
 # =============================================================================
@@ -681,65 +618,12 @@ def extract_entity_codes(query: str) -> list[str]:
     Returns:
         List of extracted entity codes, normalized for database matching
     """
-    config = get_config()
-    codes = []
-    query_upper = query.upper()
-
-    # Apply configured regex patterns
-    for pattern_config in config.product_code_patterns:
-        compiled = pattern_config.compile()
-        matches = compiled.findall(query)
-
-        # Normalize matches
-        for match in matches:
-            normalized = match
-            if config.normalization.replace_space_with:
-                normalized = normalized.replace(' ', config.normalization.replace_space_with)
-            if config.normalization.uppercase:
-                normalized = normalized.upper()
-            codes.append(normalized)
-
-    # Check for configured entity families/categories
-    for family in config.product_families:
-        if family.upper() in query_upper:
-            # Check if we already have a full code for this family
-            has_full_code = any(family.upper() in c.upper() for c in codes)
-            if not has_full_code:
-                codes.append(family)
-
-            # Try to extract more context around the family name
-            idx = query_upper.find(family.upper())
-            if idx >= 0:
-                context = query[idx:idx+30]
-                clean_context = re.sub(r'[^\w\d\-x/]', ' ', context).strip().split()[0]
-                if config.normalization.replace_space_with:
-                    clean_context = clean_context.replace(' ', config.normalization.replace_space_with)
-                if len(clean_context) > len(family) and clean_context not in codes:
-                    codes.append(clean_context)
-
-    return list(set(codes))
+    return list(query_features(query, get_config()).entity_codes)
 
 
 def extract_project_keywords(query: str) -> list[str]:
     """Extract project identifiers from query using configured patterns."""
-    config = get_config()
-    keywords = []
-    query_lower = query.lower()
-    stopwords = set(config.project_search.stopwords)
-
-    # Apply configured patterns
-    for pattern in config.project_search.patterns:
-        matches = re.findall(pattern, query_lower)
-        for match in matches:
-            if match not in stopwords and len(match) > 2:
-                keywords.append(match)
-
-    # Check for known identifiers
-    for identifier in config.project_search.known_identifiers:
-        if identifier.lower() in query_lower:
-            keywords.append(identifier)
-
-    return list(set(keywords))
+    return list(query_features(query, get_config()).project_keywords)
 
 
 # =============================================================================
@@ -933,7 +817,8 @@ Return ONLY a JSON array of strings. No explanation.
         return concepts[:5]
 
 
-def get_semantic_rules_expanded(concepts: list[str], user_query: str = "") -> str:
+def get_semantic_rules_expanded(concepts: list[str], user_query: str = "",
+                                deadline: Optional[Deadline] = None) -> str:
     """Retrieve learned rules using expanded concept search.
 
     Searches for each concept separately and aggregates results,
@@ -942,19 +827,29 @@ def get_semantic_rules_expanded(concepts: list[str], user_query: str = "") -> st
     Args:
         concepts: List of extracted concepts from extract_search_concepts()
         user_query: Original query for keyword fallback
+        deadline: Optional request Deadline; the expansion is optional work, so
+            remaining concepts are skipped once its optional budget is spent
 
     Returns:
         Formatted string block to inject into LLM prompt
     """
-    if not concepts:
+    if not concepts or (deadline is not None and not deadline.allows("semantic_rules")):
         return ""
 
     rules_by_text = {}  # rule_text -> {rule_data, max_score}
 
-    # Step 1: Generate embeddings and search for each concept
+    # Step 1: Generate embeddings (one batched request) and search for each concept
+    try:
+        concept_embeddings = embed_map(concepts, retries=0)
+    except Exception as e:
+        print(f"Warning: Batched concept embedding failed, embedding one by one: {e}")
+        concept_embeddings = {}
+
     for concept in concepts:
+        if deadline is not None and not deadline.allows("semantic_rules"):
+            break
         try:
-            concept_embedding = generate_embedding(concept)
+            concept_embedding = concept_embeddings.get(concept) or generate_embedding(concept)
             concept_rules = db.get_semantic_rules(concept_embedding, top_k=3, min_score=0.75)
 
             for rule in concept_rules:
@@ -973,7 +868,7 @@ def get_semantic_rules_expanded(concepts: list[str], user_query: str = "") -> st
             continue
 
     # Step 2: Keyword fallback for exact matches
-    if user_query:
+    if user_query and (deadline is None or deadline.allows("semantic_rules")):
         query_lower = user_query.lower()
         for concept in concepts:
             try:
@@ -1331,7 +1226,8 @@ def _get_trait_engine():
     global _trait_engine
     if _trait_engine is None:
         from logic.universal_engine import TraitBasedEngine
-        _trait_engine = TraitBasedEngine(db)
+        from logic.engine_stages import trait_stages
+        _trait_engine = TraitBasedEngine(db, stage_cache=trait_stages)
     return _trait_engine
 
 
@@ -1363,18 +1259,22 @@ def build_graph_reasoning_prompt(query: str, product_family: str = None, context
 
 
 def get_graph_reasoning_report(query: str, product_family: str = None, context: dict = None,
-                               material: str = None, accessories: list = None):
+                               material: str = None, accessories: list = None,
+                               deadline: Optional[Deadline] = None, session_id: Optional[str] = None):
     """Get the full GraphReasoningReport for advanced use cases.
 
     Returns the structured report object for cases where you need
     programmatic access to the reasoning results.
 
     Uses TraitBasedEngine with full installation constraint pipeline.
+    ``deadline`` lets the engine shed its optional lookups; ``session_id``
+    lets a follow-up turn reuse the trait stage of the session's last verdict.
     """
     from logic.universal_engine import TraitBasedEngine
     from logic.verdict_adapter import VerdictToReportAdapter
     engine = _get_trait_engine()
-    verdict = engine.process_query(query, product_hint=product_family, context=context)
+    verdict = engine.process_query(query, product_hint=product_family, context=context,
+                                   deadline=deadline, session_id=session_id)
     return VerdictToReportAdapter().adapt(verdict)
 
 
@@ -1603,14 +1503,12 @@ def query_knowledge_graph(user_query: str) -> dict:
                     config_results["variants"].append(fr)
 
     # Search by configured keywords
-    all_keywords = config.get_all_search_keywords()
-    for kw in all_keywords:
-        if kw.lower() in user_query.lower():
-            general_config = db.configuration_graph_search(kw)
-            for key in config_results.keys():
-                for item in general_config.get(key, []):
-                    if item not in config_results[key]:
-                        config_results[key].append(item)
+    for kw in config.match_search_keywords(user_query):
+        general_config = db.configuration_graph_search(kw)
+        for key in config_results.keys():
+            for item in general_config.get(key, []):
+                if item not in config_results[key]:
+                    config_results[key].append(item)
 
     # Step 5: Self-learning - find knowledge sources
     knowledge_sources = find_knowledge_source_mentions(user_query)
@@ -1652,6 +1550,7 @@ def query_knowledge_graph(user_query: str) -> dict:
         system_prompt=system_prompt,
         json_mode=True,
         temperature=0.0,
+        site="synthesis",
     )
 
     # Parse structured response
@@ -1891,14 +1790,12 @@ def query_explainable(user_query: str) -> ExplainableResponse:
                     config_results["variants"].append(fr)
 
     # Search by configured keywords
-    all_keywords = config.get_all_search_keywords()
-    for kw in all_keywords:
-        if kw.lower() in user_query.lower():
-            general_config = db.configuration_graph_search(kw)
-            for key in config_results.keys():
-                for item in general_config.get(key, []):
-                    if item not in config_results[key]:
-                        config_results[key].append(item)
+    for kw in config.match_search_keywords(user_query):
+        general_config = db.configuration_graph_search(kw)
+        for key in config_results.keys():
+            for item in general_config.get(key, []):
+                if item not in config_results[key]:
+                    config_results[key].append(item)
 
     # Step 6: GENERIC - Filter entities by numeric constraints from intent
     rejected_products = []
@@ -1965,6 +1862,7 @@ def query_explainable(user_query: str) -> ExplainableResponse:
         system_prompt=system_prompt,
         json_mode=True,
         temperature=0.0,
+        site="synthesis",
     )
 
     # Step 12: Parse and validate response
@@ -2421,8 +2319,7 @@ def query_deep_explainable(user_query: str, model: str = None) -> "DeepExplainab
         }
 
         # Collect all search terms to run in parallel
-        all_keywords = get_config().get_all_search_keywords()
-        matching_keywords = [kw for kw in all_keywords if kw.lower() in user_query.lower()]
+        matching_keywords = get_config().match_search_keywords(user_query)
 
         def search_code(code):
             """Search for a single entity code."""
@@ -2687,6 +2584,7 @@ def query_deep_explainable(user_query: str, model: str = None) -> "DeepExplainab
         json_mode=True,
         temperature=0.0,
         max_output_tokens=4096,
+        site="synthesis",
     )
     if _llm_result.error:
         raise Exception(_llm_result.error)
@@ -3126,7 +3024,210 @@ def query_deep_explainable(user_query: str, model: str = None) -> "DeepExplainab
     )
 
 
-def query_deep_explainable_streaming(user_query: str, session_id: str = None, model: str = None):
+def _strip_state_markers(user_query: str) -> str:
+    """Remove the frontend [LOCKED: ...] and [STATE: {...}] markers from a query."""
+    user_query = re.sub(r'\s*\[LOCKED:[^\]]+\]', '', user_query).strip()
+    return re.sub(r'\s*\[STATE:\s*\{.+\}\s*\]', '', user_query, flags=re.IGNORECASE | re.DOTALL).strip()
+
+
+def _load_session_context(session_id: Optional[str], user_query: str):
+    """Layer 4 session context for a streaming turn.
+
+    Opens the session, loads the persisted technical state, stores the user
+    turn and reads the recent turns the Scribe uses as history. Every step
+    is non-fatal.
+
+    Returns:
+        (session_graph_mgr or None, TechnicalState, recent_turns)
+    """
+    session_graph_mgr = None
+    technical_state = TechnicalState()
+    recent_turns = []
+    if not session_id:
+        return session_graph_mgr, technical_state, recent_turns
+
+    try:
+        session_graph_mgr = db.get_session_graph_manager()
+        session_graph_mgr.ensure_session(session_id)
+    except Exception as e:
+        logger.warning(f"Session graph init failed (non-fatal): {e}")
+    if not session_graph_mgr:
+        return session_graph_mgr, technical_state, recent_turns
+
+    try:
+        graph_state = session_graph_mgr.get_project_state(session_id)
+        if graph_state.get("tags") or graph_state.get("project"):
+            technical_state = TechnicalState.load_from_graph(session_graph_mgr, session_id)
+            print(f"🔒 [GRAPH STATE] Loaded {len(technical_state.tags)} tags from Layer 4")
+    except Exception as e:
+        logger.warning(f"Graph state load failed (non-fatal): {e}")
+
+    # v3.0: Store user turn in Layer 4 for Scribe conversation history
+    try:
+        session_graph_mgr.store_turn(
+            session_id, "user", user_query, technical_state.turn_count + 1
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store user turn (non-fatal): {e}")
+
+    try:
+        recent_turns = session_graph_mgr.get_recent_turns(session_id, n=3)
+    except Exception:
+        pass  # Non-fatal: Scribe works without history
+
+    return session_graph_mgr, technical_state, recent_turns
+
+
+def _keyword_config_search(query: str, config: DomainConfig) -> list[dict]:
+    """Configuration-graph search for every configured keyword present in the query."""
+    return [db.configuration_graph_search(kw) for kw in config.match_search_keywords(query)]
+
+
+# Packed prompt sections rendered into the synthesis prompt's {policies}, in order
+_POLICY_SECTIONS = (
+    "resolution", "locked_state", "multi_entity", "additional_data", "geometric_conflicts",
+    "graph_policies", "material_restriction", "material_override", "corrosion_requirement",
+    "material_alternatives",
+)
+
+
+def _response_cache_key(config: DomainConfig, model: str, query: str, technical_state: TechnicalState,
+                        recent_turns: list, has_client_state: bool) -> Optional[str]:
+    """Semantic response cache bucket for this turn, or None when it is not cacheable.
+
+    Only first turns are cached: later turns depend on conversation history
+    that the key does not capture.
+    """
+    if not response_cache.enabled:
+        return None
+    return _first_turn_bucket(config, model, query, technical_state, recent_turns, has_client_state)
+
+
+def _first_turn_bucket(config: DomainConfig, model: str, query: str, technical_state: TechnicalState,
+                       recent_turns: list, has_client_state: bool) -> Optional[str]:
+    """Domain, graph version, model, starting-state and query-parameter key of a first turn.
+
+    The starting state of a first turn is empty, so the parameters extracted
+    from the query itself (codes, dimensions, numbers, material) are part of
+    the key: "600x600, 3400 m3/h" and "600x600, 5000 m3/h" embed almost
+    identically but must never share an answer. None for later turns.
+    """
+    if has_client_state or technical_state.turn_count or len(recent_turns) > 1:
+        return None
+    try:
+        graph_version = db.get_graph_version()
+    except Exception as e:
+        logger.warning(f"Graph version read failed, response cache skipped: {e}")
+        return None
+    return response_cache.bucket_key(config.domain_id, graph_version, model, technical_state.to_dict(),
+                                     _query_parameters(query, config))
+
+
+def _query_parameters(query: str, config: DomainConfig) -> dict:
+    """Regex-extracted parameters a first-turn answer depends on (see query_features.py)."""
+    features = query_features(query, config)
+    return {
+        "codes": sorted(features.entity_codes),
+        "tags": features.tags,
+        "numbers": sorted((c["value"], c["unit"].lower()) for c in features.numeric_constraints),
+        "material": features.material,
+    }
+
+
+def _finish_session_turn(session_graph_mgr, session_id: Optional[str],
+                         technical_state: TechnicalState, assistant_summary: str):
+    """Layer 4: persist the turn's technical state and store the assistant turn summary."""
+    if not (session_graph_mgr and session_id):
+        return
+    try:
+        technical_state.persist_to_graph(session_graph_mgr, session_id)
+        print(f"💾 [GRAPH STATE] Persisted {len(technical_state.tags)} tags to Layer 4")
+    except Exception as e:
+        logger.warning(f"Graph state persist failed (non-fatal): {e}")
+
+    # v3.0: Store assistant turn summary for Scribe conversation history
+    try:
+        session_graph_mgr.store_turn(
+            session_id, "assistant", assistant_summary, technical_state.turn_count
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store assistant turn (non-fatal): {e}")
+
+
+def _session_state_event(session_graph_mgr, session_id: Optional[str]) -> Optional[dict]:
+    """Layer 4 session graph state event for frontend visualization (None if unavailable)."""
+    if not (session_graph_mgr and session_id):
+        return None
+    try:
+        session_state = session_graph_mgr.get_project_state(session_id)
+        session_state["reasoning_paths"] = session_graph_mgr.get_reasoning_path(session_id)
+        return {"type": "session_state", "data": session_state}
+    except Exception as e:
+        logger.warning(f"Session state emit failed (non-fatal): {e}")
+        return None
+
+
+def _finish_reused_turn(complete: dict, assistant_summary: str, session_graph_mgr,
+                        session_id: Optional[str], total_start: float, **marker):
+    """Complete + session events for a turn answered by another run (cache hit or coalesced).
+
+    The answer's technical state is persisted to this request's own session.
+    """
+    complete = dict(complete)
+    technical_state = TechnicalState.from_dict(complete.get("technical_state") or {})
+    _finish_session_turn(session_graph_mgr, session_id, technical_state, assistant_summary)
+
+    timings = {"total": time.time() - total_start}
+    complete["response"] = {**complete["response"], "timings": timings}
+    complete["timings"] = timings
+    complete.update(marker)
+    yield complete
+
+    session_event = _session_state_event(session_graph_mgr, session_id)
+    if session_event:
+        yield session_event
+
+
+def _replay_cached_response(cached, emitted: int, session_graph_mgr, session_id: Optional[str],
+                            total_start: float):
+    """Events for a semantic cache hit: the recorded steps not yet emitted, then the stored answer."""
+    yield from cached.events[emitted:]
+    print(f"♻️ [RESPONSE CACHE] Hit (similarity={cached.similarity:.3f})")
+    yield from _finish_reused_turn(
+        cached.complete, cached.assistant_summary, session_graph_mgr, session_id, total_start,
+        response_cache={
+            "similarity": round(cached.similarity, 4),
+            "age_s": round(time.time() - cached.stored_at, 1),
+        },
+    )
+
+
+def _follow_flight(flight, emitted: int, session_graph_mgr, session_id: Optional[str],
+                   total_start: float):
+    """Events for a request coalesced onto an identical in-flight run.
+
+    Streams the leader's events from ``emitted`` on as they are produced;
+    the leader's own session events are replaced by this session's.
+    """
+    joined_at = time.time()
+    complete = None
+    for event in flight.follow(start=emitted):
+        kind = event.get("type")
+        if kind == "complete":
+            complete = event
+        elif kind != "session_state":
+            yield event
+    if complete is None:
+        raise RuntimeError("Coalesced run finished without a response")
+    print(f"🔗 [SINGLE FLIGHT] Served from a coalesced run ({time.time() - joined_at:.1f}s wait)")
+    yield from _finish_reused_turn(
+        complete, flight.result or "", session_graph_mgr, session_id, total_start,
+        coalesced={"waited_s": round(time.time() - joined_at, 2)},
+    )
+
+
+def query_deep_explainable_streaming(user_query: str, session_id: str = None, model: str = None,
+                                     deadline: Optional[Deadline] = None):
     """Streaming version of deep explainable query with real-time inference chain.
 
     Yields SSE events showing the actual reasoning process:
@@ -3138,9 +3239,74 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
 
     Each yield is a dict with: {"type": "inference", "step": "...", "detail": "...", "data": {...}}
 
+    While the synthesis LLM streams, each ``content_segments`` entry is also
+    yielded as {"type": "content_segment", "index": i, "segment": {...}} the
+    moment it is complete. These are provisional; the "complete" event
+    carries the final, validated response.
+
+    First turns are served from the semantic response cache (response_cache.py)
+    when a near-identical question was answered for the same starting state,
+    domain, graph version and model: the recorded inference events are
+    replayed and the "complete" event carries a "response_cache" entry.
+
+    The request runs under a latency budget (``deadline``, by default
+    Deadline.from_env()). Required stages always run; optional ones (similar
+    cases, vector retrieval, the engine's vector-search fallback) are shed
+    once the budget is spent and reported as ``shed_<stage>`` in timings.
+    Degraded runs are not stored in the response cache.
+
+    Identical first turns running at the same time (same query, domain,
+    graph version, model and starting state) are coalesced (single_flight.py):
+    the first one runs the pipeline, the others stream its events and finish
+    with their own session. Their "complete" event carries a "coalesced" entry.
+
     Args:
         user_query: The user's question
         session_id: Optional session ID for Layer 4 graph state persistence
+        deadline: Optional request Deadline
+    """
+    deadline = deadline or Deadline.from_env()
+    recorder = response_cache.recorder()
+    ticket = consult_flights.ticket()
+    events = _deep_explainable_stream(user_query, session_id, model, recorder, deadline, ticket)
+    try:
+        for event in events:
+            recorder.observe(event)
+            if ticket.leading:
+                # Identical requests may attach to this run from now on: finish
+                # it in the background so a client disconnect cannot strand them.
+                yield from ticket.drive(chain([event], _recorded(events, recorder, deadline)),
+                                        result=lambda: recorder.assistant_summary)
+                return
+            yield event
+    except Exception as e:
+        ticket.abort(e)
+        raise
+    _commit_recorded(recorder, deadline)
+
+
+def _recorded(events, recorder, deadline: Deadline):
+    """The rest of a led run, recorded for the response cache as it is produced."""
+    for event in events:
+        recorder.observe(event)
+        yield event
+    _commit_recorded(recorder, deadline)
+
+
+def _commit_recorded(recorder, deadline: Deadline):
+    if deadline.shed_stages:
+        recorder.cacheable = False
+    if recorder.commit():
+        print("♻️ [RESPONSE CACHE] Stored first-turn response")
+
+
+def _deep_explainable_stream(user_query: str, session_id: Optional[str], model: Optional[str], recorder,
+                             deadline: Deadline, ticket=None):
+    """Pipeline behind query_deep_explainable_streaming.
+
+    Sets ``recorder.key``/``recorder.embedding`` when the turn may be cached;
+    on a cache hit it replays the stored run instead. A first turn identical
+    to one already in flight follows that run through ``ticket``.
     """
     import json
     from models import (
@@ -3151,18 +3317,23 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
 
     config = get_config()
     model = model or DEFAULT_MODEL
-
-    # Layer 4: Session Graph Manager (if session_id provided)
-    session_graph_mgr = None
-    if session_id:
-        try:
-            session_graph_mgr = db.get_session_graph_manager()
-            session_graph_mgr.ensure_session(session_id)
-        except Exception as e:
-            logger.warning(f"Session graph init failed (non-fatal): {e}")
     timings = {}
     total_start = time.time()
 
+    # Speculative prefetch: these stages need only the raw query (or the
+    # session id), so they start at request arrival and overlap with the
+    # Scribe LLM call and graph reasoning. Each result is joined where the
+    # pipeline consumes it, so the SSE events keep their order.
+    prefetch_query = _strip_state_markers(user_query)
+    stages = StageGraph()
+    stages.submit("session", _load_session_context, session_id, user_query)
+    stages.submit("embedding", generate_embedding, prefetch_query)
+    stages.submit("retrieval", lambda emb: db.hybrid_retrieval(emb, top_k=3, min_score=0.7),
+                  depends_on=["embedding"])
+    stages.submit("similar_cases", lambda emb: db.get_similar_cases(emb, top_k=2),
+                  depends_on=["embedding"])
+    stages.submit("keyword_config", _keyword_config_search, prefetch_query, config)
+
     # Dimension constraint variables — extracted early so they're available for
     # resolved_context + engine sizing. Actual regex extraction follows query_lower init.
     user_max_width_mm = None
@@ -3196,26 +3367,10 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
     # This replaces simple variable locking with a full state manager
     # that tracks per-tag specifications and never forgets parameters.
 
-    # Initialize state: try graph first (Layer 4), then fall back to frontend state
-    technical_state = TechnicalState()
-
-    if session_graph_mgr and session_id:
-        try:
-            graph_state = session_graph_mgr.get_project_state(session_id)
-            if graph_state.get("tags") or graph_state.get("project"):
-                technical_state = TechnicalState.load_from_graph(session_graph_mgr, session_id)
-                print(f"🔒 [GRAPH STATE] Loaded {len(technical_state.tags)} tags from Layer 4")
-        except Exception as e:
-            logger.warning(f"Graph state load failed (non-fatal): {e}")
-
-    # v3.0: Store user turn in Layer 4 for Scribe conversation history
-    if session_graph_mgr and session_id:
-        try:
-            session_graph_mgr.store_turn(
-                session_id, "user", user_query, technical_state.turn_count + 1
-            )
-        except Exception as e:
-            logger.warning(f"Failed to store user turn (non-fatal): {e}")
+    # Initialize state: try graph first (Layer 4), then fall back to frontend state.
+    # Layer 4: the session stage opens the session, loads its state, stores
+    # this user turn and reads the Scribe history.
+    session_graph_mgr, technical_state, recent_turns = stages.result("session")
 
     # Parse locked context from frontend [LOCKED: material=RF; project=Nouryon; filter_depths=292,600]
     # Also check for full technical state JSON
@@ -3278,9 +3433,39 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
                     )
                     print(f"   📌 Parsed dimensions for {tag_id}: {dim}")
 
+    # Semantic response cache: a first turn whose starting state, domain,
+    # graph version, model and query parameters match a stored run, with a
+    # near-identical query embedding, replays that run instead of calling
+    # Scribe/LLM again. The embedding is waited for only briefly (repeated
+    # questions hit the embedding cache); when it is slower the lookup is
+    # skipped so the Scribe keeps overlapping with it, and the run is still
+    # recorded once the embedding arrives.
+    cache_key = _response_cache_key(config, model, prefetch_query, technical_state, recent_turns,
+                                    bool(state_json_match))
+    query_embedding = stages.get("embedding", timeout=LOOKUP_EMBEDDING_WAIT_S) if cache_key else None
+    if cache_key and query_embedding:
+        cached = response_cache.lookup(cache_key, query_embedding)
+        if cached:
+            stages.cancel()
+            yield from _replay_cached_response(
+                cached, len(recorder.events), session_graph_mgr, session_id, total_start,
+            )
+            return
+    if cache_key:
+        recorder.key, recorder.embedding = cache_key, query_embedding
+
+    # Single flight: an identical first turn already running answers this one too
+    if ticket is not None and consult_flights.enabled:
+        bucket = cache_key if response_cache.enabled else _first_turn_bucket(
+            config, model, prefetch_query, technical_state, recent_turns, bool(state_json_match))
+        flight = ticket.join(f"{bucket}:{' '.join(prefetch_query.split())}", recorder.events) if bucket else None
+        if flight is not None:
+            stages.cancel()
+            yield from _follow_flight(flight, len(recorder.events), session_graph_mgr, session_id, total_start)
+            return
+
     # Remove the [LOCKED: ...] and [STATE: ...] from query for processing
-    user_query = re.sub(r'\s*\[LOCKED:[^\]]+\]', '', user_query).strip()
-    user_query = re.sub(r'\s*\[STATE:\s*\{.+\}\s*\]', '', user_query, flags=re.IGNORECASE | re.DOTALL).strip()
+    user_query = prefetch_query
     query_lower = user_query.lower()
 
     # Clean query for extraction (sanitization, not intent detection)
@@ -3299,13 +3484,6 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
         yield {"type": "inference", "step": "scribe", "status": "active",
                "detail": "Analyzing intent..."}
 
-        recent_turns = []
-        if session_graph_mgr and session_id:
-            try:
-                recent_turns = session_graph_mgr.get_recent_turns(session_id, n=3)
-            except Exception:
-                pass  # Non-fatal: Scribe works without history
-
         scribe_intent = extract_semantic_intent(
             query=clean_query_for_extraction,
             recent_turns=recent_turns,
@@ -3527,19 +3705,23 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
     # ============================================================
     if len(technical_state.tags) > 1:
         weight_data = {}
+        _default_pf = get_config().default_product_family
+        _variant_names = []
         for tag_id, tag in technical_state.tags.items():
             if tag.housing_width and tag.housing_height:
                 size = f"{tag.housing_width}x{tag.housing_height}"
                 length = tag.housing_length or 550
-                _default_pf = get_config().default_product_family
                 pf = tag.product_family or detected_product_family or _default_pf
-                variant_name = f"{pf}-{size}-{length}"
-                try:
-                    weight_result = db.get_variant_weight(variant_name)
-                    if weight_result:
-                        weight_data[variant_name] = weight_result
-                except Exception:
-                    pass
+                _variant_names.append(f"{pf}-{size}-{length}")
+        # One pipelined round trip for all tags instead of one query per tag
+        _variant_names = list(dict.fromkeys(_variant_names))
+        try:
+            _weights = db.get_variant_weights([(name, None) for name in _variant_names])
+            for variant_name, weight_result in zip(_variant_names, _weights):
+                if weight_result:
+                    weight_data[variant_name] = weight_result
+        except Exception:
+            pass
 
         multi_entity_context = "\n## MULTI-ENTITY REQUEST DETECTED\n\n"
         multi_entity_context += "The user has provided multiple Tags/Items. Handle EACH SEPARATELY in your response.\n\n"
@@ -3853,6 +4035,8 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
         context=resolved_context,
         material=technical_state.locked_material.value if technical_state.locked_material else None,
         accessories=technical_state.accessories or None,
+        deadline=deadline,
+        session_id=session_id,
     )
     timings["graph_reasoning"] = time.time() - t1
 
@@ -3946,7 +4130,16 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
         technical_state._sync_assembly_params()
 
         # Apply auto-resolve defaults to each assembly stage's product family
-        # (e.g., GDP pre-filter always uses 250mm housing_length from graph)
+        # (e.g., GDP pre-filter always uses 250mm housing_length from graph).
+        # All stages' features are fetched in one round trip.
+        def _vf_family(pf_name: str) -> str:
+            parts = pf_name.replace("FAM_", "").split()
+            return parts[0] if parts else ""
+
+        stage_features = db.get_variable_features_many([
+            _vf_family(stage.get("product_family") or "")
+            for stage in technical_state.assembly_group["stages"]
+        ])
         for stage in technical_state.assembly_group["stages"]:
             tag_id = stage["tag_id"]
             pf_name = stage.get("product_family", "")
@@ -3954,7 +4147,7 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
             if not tag or not pf_name:
                 continue
             try:
-                vf_list = db.get_variable_features(pf_name.replace("FAM_", "").split()[0])
+                vf_list = stage_features.get(_vf_family(pf_name), [])
                 for vf in vf_list:
                     if vf.get("auto_resolve") and vf.get("default_value") is not None:
                         p_name = vf.get("parameter_name", "")
@@ -4101,12 +4294,17 @@ def query_deep_explainable_streaming(user_query: str, session_id: str = None, mo
     _mat_code = technical_state.locked_material.value if technical_state.locked_material else None
     _material_overrides_applied = []
     if _mat_code:
+        # All tags' families in one round trip
+        _mats_by_family = db.get_available_materials_many([
+            _tag.product_family if _tag.product_family.startswith("FAM_") else f"FAM_{_tag.product_family}"
+            for _tag in technical_state.tags.values() if _tag.product_family
+        ])
         for _tag_id, _tag in technical_state.tags.items():
             if not _tag.product_family:
                 continue
             _fam = _tag.product_family
             _fam_id = f"FAM_{_fam}" if not _fam.startswith("FAM_") else _fam
-            _available_mats = db.get_available_materials(_fam_id)
+            _available_mats = _mats_by_family.get(_fam_id, [])
             if not _available_mats:
                 continue
             _mat_ids = [m["id"] for m in _available_mats]
@@ -4373,10 +4571,7 @@ The user has chosen to remove the accessory option to fit within their space con
                 if fr not in config_results["variants"]:
                     config_results["variants"].append(fr)
 
-    all_keywords = config.get_all_search_keywords()
-    matching_keywords = [kw for kw in all_keywords if kw.lower() in user_query.lower()]
-    for kw in matching_keywords:
-        general_config = db.configuration_graph_search(kw)
+    for general_config in stages.result("keyword_config"):
         for key in config_results.keys():
             for item in general_config.get(key, []):
                 if item not in config_results[key]:
@@ -4470,24 +4665,50 @@ The user has chosen to remove the accessory option to fit within their space con
     # Format contexts
     config_context = format_configuration_context(config_results)
 
-    # Get retrieval results and similar cases (simplified for streaming)
-    query_embedding = generate_embedding(user_query)
-    retrieval_results = db.hybrid_retrieval(query_embedding, top_k=3, min_score=0.7)
-    similar_cases = db.get_similar_cases(query_embedding, top_k=2)
-    graph_context = format_retrieval_context(retrieval_results, similar_cases, config_context)
+    # Get retrieval results and similar cases (prefetched at request arrival).
+    # Both are optional context: joined only while the deadline allows it.
+    retrieval_results = stages.optional("retrieval", deadline, default=[])
+    similar_cases = stages.optional("similar_cases", deadline, default=[])
+    if recorder.key and recorder.embedding is None:
+        # Not ready at the cache lookup; finished by now unless retrieval was shed
+        recorder.embedding = stages.get("embedding", timeout=0)
+
+    # Every prompt block goes through the token-budgeted packer: optional
+    # blocks lose facts already stated by more important ones and are cut
+    # to their budgets; required (safety-critical) blocks stay verbatim.
+    packer = ContextPacker(budget=SYNTHESIS_CONTEXT_TOKENS)
+    packer.add("configuration", config_context, priority=2, budget=1500)
+    packer.add("retrieval", format_retrieval_context(retrieval_results, similar_cases), priority=4, budget=1500)
 
     # Build prompts
     graph_reasoning_context = graph_reasoning_report.to_prompt_injection()
 
-    # v3.8.1: Inject housing corrosion class into reasoning context
+    # v3.8.1: Inject housing corrosion class into reasoning context.
+    # The housing spec and (when blocked) the family's material alternatives
+    # are fetched in one pipelined round trip; materials are used further below.
+    _is_blocked = (
+        graph_reasoning_report.suitability
+        and not graph_reasoning_report.suitability.is_suitable
+    )
+    _mat_records = []
     if technical_state.detected_family:
         try:
             _pf_id = f"FAM_{technical_state.detected_family}" if not technical_state.detected_family.startswith("FAM_") else technical_state.detected_family
-            from db_result_helpers import result_single
-            _pf_rec = result_single(db.connect().query(
+            from db_result_helpers import result_single, result_to_dicts
+            _pf_queries = [(
                 "MATCH (pf:ProductFamily {id: $pf_id}) RETURN pf.corrosion_class AS cc, pf.indoor_only AS io",
-                params={"pf_id": _pf_id}
-            ))
+                {"pf_id": _pf_id},
+            )]
+            if _is_blocked:
+                _pf_queries.append(("""
+                    MATCH (pf:ProductFamily {id: $fam_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
+                    RETURN m.id AS id, m.name AS name, m.corrosion_class AS corrosion_class
+                    ORDER BY m.corrosion_class DESC
+                    """, {"fam_id": _pf_id}))
+            _pf_results = db.query_many(_pf_queries)
+            if _is_blocked:
+                _mat_records = result_to_dicts(_pf_results[1])
+            _pf_rec = result_single(_pf_results[0])
             if _pf_rec:
                 _cc = _pf_rec.get("cc")
                 _io = _pf_rec.get("io")
@@ -4502,32 +4723,30 @@ The user has chosen to remove the accessory option to fit within their space con
             logger.warning(f"Failed to fetch housing corrosion class: {e}")
 
     # Combine all constraint contexts (resolution > geometric > graph policies)
-    constraint_contexts = []
-    if resolution_context:
-        constraint_contexts.append(resolution_context)
-    if locked_context:
-        constraint_contexts.append(locked_context)
-    if multi_entity_context:
-        constraint_contexts.append(multi_entity_context)
-    if additional_data_context:
-        constraint_contexts.append(additional_data_context)
-    if geometric_conflict_context:
-        constraint_contexts.append(geometric_conflict_context)
+    packer.add("resolution", resolution_context, required=True)
+    packer.add("locked_state", locked_context, required=True)
+    packer.add("multi_entity", multi_entity_context, priority=2, budget=1000)
+    packer.add("additional_data", additional_data_context, priority=3, budget=400)
+    packer.add("geometric_conflicts", geometric_conflict_context, required=True)
     if graph_reasoning_context:
-        constraint_contexts.append(f"**Graph-Based Policy Evaluation:**\n{graph_reasoning_context}")
+        packer.add("graph_policies", f"**Graph-Based Policy Evaluation:**\n{graph_reasoning_context}", required=True)
     if material_availability_warning:
-        constraint_contexts.append(
+        packer.add(
+            "material_restriction",
             f"**⚠️ CRITICAL MATERIAL RESTRICTION:**\n{material_availability_warning}\n"
             f"You MUST inform the customer that this material is not available for this product. "
-            f"Suggest the available alternatives listed above. Do NOT proceed with the unavailable material."
+            f"Suggest the available alternatives listed above. Do NOT proceed with the unavailable material.",
+            required=True,
         )
     if _material_overrides_applied:
         _override_text = "\n".join(f"  - {o}" for o in _material_overrides_applied)
-        constraint_contexts.append(
+        packer.add(
+            "material_override",
             f"**⚠️ MATERIAL OVERRIDE (post-pivot):**\n{_override_text}\n"
             f"The user's requested material is NOT available for the recommended product. "
             f"Product codes have been corrected to use an available material. "
-            f"Inform the customer about the available material options."
+            f"Inform the customer about the available material options.",
+            required=True,
         )
 
     # v4.3: Inject corrosion class material options when Scribe extracted class, not material
@@ -4536,38 +4755,29 @@ The user has chosen to remove the accessory option to fit within their space con
     _req_corr = technical_state.resolved_params.get("required_corrosion_class")
     if _corr_mat_options and _req_corr:
         _opt_lines = [f"  - **{o['code']}** ({o['name']}) — corrosion class {o['class']}" for o in _corr_mat_options]
-        constraint_contexts.append(
+        packer.add(
+            "corrosion_requirement",
             f"**CORROSION CLASS REQUIREMENT: {_req_corr}**\n"
             f"The customer requires corrosion class {_req_corr}. "
             f"The following materials meet this requirement and are available for this product:\n"
             + "\n".join(_opt_lines) + "\n"
-            f"Present these options to the customer and recommend the most suitable one for their environment."
+            f"Present these options to the customer and recommend the most suitable one for their environment.",
+            required=True,
         )
     elif _corr_no_match and _req_corr:
-        constraint_contexts.append(
+        packer.add(
+            "corrosion_requirement",
             f"**⚠️ CORROSION CLASS REQUIREMENT: {_req_corr} — NO MATCH**\n"
             f"The customer requires corrosion class {_req_corr}, but no available materials "
-            f"for this product meet that class. Inform the customer and suggest alternatives."
+            f"for this product meet that class. Inform the customer and suggest alternatives.",
+            required=True,
         )
 
     # v3.13: Inject material alternatives when blocked (all products vetoed for material)
     # Query graph for available materials on the user's detected product family
-    _is_blocked = (
-        graph_reasoning_report.suitability
-        and not graph_reasoning_report.suitability.is_suitable
-    )
+    # (_is_blocked / _mat_records were resolved with the housing spec above)
     if _is_blocked and technical_state.detected_family:
         try:
-            _fam_id = f"FAM_{technical_state.detected_family}" if not technical_state.detected_family.startswith("FAM_") else technical_state.detected_family
-            from db_result_helpers import result_to_dicts
-            _mat_records = result_to_dicts(db.connect().query(
-                """
-                MATCH (pf:ProductFamily {id: $fam_id})-[:AVAILABLE_IN_MATERIAL]->(m:Material)
-                RETURN m.id AS id, m.name AS name, m.corrosion_class AS corrosion_class
-                ORDER BY m.corrosion_class DESC
-                """,
-                params={"fam_id": _fam_id}
-            ))
             if _mat_records:
                 _mat_lines = []
                 for rec in _mat_records:
@@ -4578,12 +4788,18 @@ The user has chosen to remove the accessory option to fit within their space con
                     + "\n\nYou MUST suggest these specific material options to the user. "
                     + "Explain which material(s) meet the environmental requirement."
                 )
-                constraint_contexts.append(_mat_text)
-                print(f"📢 [PROMPT] Injected {len(_mat_result.records)} material alternatives for {technical_state.detected_family}")
+                packer.add("material_alternatives", _mat_text, required=True)
+                print(f"📢 [PROMPT] Injected {len(_mat_records)} material alternatives for {technical_state.detected_family}")
         except Exception as e:
             logger.warning(f"Failed to fetch material alternatives: {e}")
 
-    combined_policies = "\n".join(constraint_contexts) if constraint_contexts else "No additional context."
+    packed_context = packer.pack()
+    timings.update(packed_context.timings())
+    graph_context = (packed_context.text("configuration", "retrieval", sep="\n\n\n---\n\n\n")
+                     or "No relevant past cases found.")
+    combined_policies = packed_context.text(*_POLICY_SECTIONS) or "No additional context."
+    if packed_context.original_tokens != packed_context.total_tokens:
+        print(f"📦 [CONTEXT PACKER] {packed_context.original_tokens} → {packed_context.total_tokens} tokens (est.)")
 
     # Inject material availability warning into system prompt active_policies
     _active_policies = graph_reasoning_context or ""
@@ -4601,16 +4817,26 @@ The user has chosen to remove the accessory option to fit within their space con
         policies=combined_policies
     )
 
-    # Call LLM
+    # Call LLM (token streaming). Each content segment is sent as a
+    # "content_segment" event as soon as its JSON object closes; the final
+    # "complete" event still carries the fully validated response.
     try:
-        _llm_result = llm_call(
+        _llm_stream = llm_call_stream(
             model=model,
             user_prompt=synthesis_prompt,
             system_prompt=system_prompt,
             json_mode=True,
             temperature=0.0,
             max_output_tokens=4096,
+            site="synthesis",
         )
+        _segment_parser = JsonArrayItemParser("content_segments")
+        for _delta in _llm_stream:
+            for _seg_index, _segment in _segment_parser.feed(_delta):
+                if _seg_index == 0:
+                    timings["llm_first_segment"] = time.time() - t1
+                yield {"type": "content_segment", "index": _seg_index, "segment": _segment}
+        _llm_result = _llm_stream.result
         if _llm_result.error:
             raise Exception(_llm_result.error)
         raw_text = _llm_result.text
@@ -4627,6 +4853,7 @@ The user has chosen to remove the accessory option to fit within their space con
             print(f"⚠️ JSON parse failed ({je}), attempting repair on {len(raw_text)} chars")
             llm_response = _repair_truncated_json(raw_text)
     except Exception as e:
+        recorder.cacheable = False
         llm_response = {
             "content_segments": [{"text": f"Error generating response: {str(e)}", "type": "GENERAL"}],
             "response_type": "FINAL_ANSWER"
@@ -4634,6 +4861,8 @@ The user has chosen to remove the accessory option to fit within their space con
 
     timings["llm"] = time.time() - t1
     timings["total"] = time.time() - total_start
+    timings.update(stages.timings(prefix="prefetch_"))
+    timings.update(deadline.timings())
 
     yield {"type": "inference", "step": "thinking", "status": "done",
            "detail": "👔 Done"}
@@ -5246,23 +5475,11 @@ The user has chosen to remove the accessory option to fit within their space con
     technical_state_dict = technical_state.to_dict()
 
     # Layer 4: Persist state to graph after processing
-    if session_graph_mgr and session_id:
-        try:
-            technical_state.persist_to_graph(session_graph_mgr, session_id)
-            print(f"💾 [GRAPH STATE] Persisted {len(technical_state.tags)} tags to Layer 4")
-        except Exception as e:
-            logger.warning(f"Graph state persist failed (non-fatal): {e}")
-
-        # v3.0: Store assistant turn summary for Scribe conversation history
-        try:
-            clar_flag = "clarification" if clarification_needed else "answer"
-            fam = detected_product_family or technical_state.detected_family or "TBD"
-            assistant_summary = f"Recommended: {fam}, type={clar_flag}, tags={len(technical_state.tags)}"
-            session_graph_mgr.store_turn(
-                session_id, "assistant", assistant_summary, technical_state.turn_count
-            )
-        except Exception as e:
-            logger.warning(f"Failed to store assistant turn (non-fatal): {e}")
+    clar_flag = "clarification" if clarification_needed else "answer"
+    fam = detected_product_family or technical_state.detected_family or "TBD"
+    assistant_summary = f"Recommended: {fam}, type={clar_flag}, tags={len(technical_state.tags)}"
+    recorder.assistant_summary = assistant_summary
+    _finish_session_turn(session_graph_mgr, session_id, technical_state, assistant_summary)
 
     yield {"type": "complete", "response": transformed_response, "timings": timings,
            "locked_context": session_locked,
@@ -5276,14 +5493,9 @@ The user has chosen to remove the accessory option to fit within their space con
            }}
 
     # Layer 4: Emit session graph state for frontend visualization
-    if session_graph_mgr and session_id:
-        try:
-            session_state = session_graph_mgr.get_project_state(session_id)
-            reasoning_paths = session_graph_mgr.get_reasoning_path(session_id)
-            session_state["reasoning_paths"] = reasoning_paths
-            yield {"type": "session_state", "data": session_state}
-        except Exception as e:
-            logger.warning(f"Session state emit failed (non-fatal): {e}")
+    session_event = _session_state_event(session_graph_mgr, session_id)
+    if session_event:
+        yield session_event
 
 
 # Backwards compatibility exports
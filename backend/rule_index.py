@@ -0,0 +1,236 @@
+"""Compiled trait/stressor rule index for the trait-based engine.
+
+``TraitBasedEngine`` scores every product family against the causal rules
+of the detected stressors (DEMANDS_TRAIT / NEUTRALIZED_BY). The rule graph
+and the families' trait sets only change with the catalog, so they are
+compiled once per graph version (CatalogSnapshot builds the index):
+
+- every PhysicalTrait gets an integer code; a family's trait set is an
+  int bitset;
+- the rules of any set of stressors compile to a ``RuleSet`` (demanded and
+  neutralized trait masks, most severe rule per trait, critical veto
+  rules), cached per stressor set.
+
+Matching a family is then a handful of mask operations:
+
+    rules = index.ruleset(stressor_ids)
+    present, missing, neutralized, coverage = rules.match(index.family_mask(family, rules))
+
+Without a catalog snapshot (or for rule lists assembled by hand)
+``RuleSet.compile`` builds the same structure ad hoc with a local codec.
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+SEVERITY_RANK = {"CRITICAL": 3, "WARNING": 2, "INFO": 1}
+
+# Compiled RuleSets kept per index (one per distinct detected-stressor set)
+RULESET_CACHE_SIZE = 256
+
+_RULE_FIELDS = ("rule_type", "stressor_id", "stressor_name", "trait_id", "trait_name", "severity", "explanation")
+
+
+def _rule_tuple(rule) -> tuple:
+    """(rule_type, stressor_id, stressor_name, trait_id, trait_name, severity, explanation) of a row or CausalRule."""
+    if isinstance(rule, Mapping):
+        values = [rule.get(f) for f in _RULE_FIELDS]
+    else:
+        values = [getattr(rule, f, None) for f in _RULE_FIELDS]
+    values[5] = values[5] or "INFO"
+    values[6] = values[6] or ""
+    return tuple(values)
+
+
+def _bits(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class RuleSet:
+    """Causal rules of one stressor set, compiled to trait bitmasks."""
+
+    __slots__ = (
+        "codes", "demanded", "neutralized", "demand_mask", "neutralized_mask",
+        "critical_demands", "critical_demand_names",
+        "critical_neutralizations", "critical_neutralized_names",
+    )
+
+    def __init__(self, rules: Iterable, stressor_ids: Optional[Iterable[str]] = None,
+                 codes: Optional[Mapping[str, int]] = None):
+        rows = [_rule_tuple(r) for r in rules]
+        if codes is None:
+            local: dict[str, int] = {}
+            for row in rows:
+                local.setdefault(row[3], len(local))
+            codes = local
+        self.codes = codes
+        stressor_ids = set(stressor_ids) if stressor_ids is not None else None
+
+        # Most severe rule per trait, in first-seen order
+        demanded: dict[str, tuple] = {}
+        neutralized: dict[str, tuple] = {}
+        critical_demands: dict[str, tuple] = {}
+        critical_neutralizations: dict[str, tuple] = {}
+        for row in rows:
+            rule_type, stressor_id, stressor_name, trait_id, trait_name, severity, explanation = row
+            if rule_type == "DEMANDS_TRAIT":
+                if trait_id not in demanded or SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(demanded[trait_id][5], 0):
+                    demanded[trait_id] = row
+                if severity == "CRITICAL":
+                    critical_demands[trait_id] = (
+                        trait_name, explanation or f"{stressor_name} requires {trait_name}")
+            elif rule_type == "NEUTRALIZED_BY":
+                if stressor_ids is None or stressor_id in stressor_ids:
+                    if trait_id not in neutralized or \
+                            SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(neutralized[trait_id][5], 0):
+                        neutralized[trait_id] = row
+                if severity == "CRITICAL":
+                    critical_neutralizations[trait_id] = (
+                        trait_name, explanation or f"{trait_name} ineffective under {stressor_name}")
+
+        self.demanded = tuple((1 << codes[t], row[4]) for t, row in demanded.items())
+        self.neutralized = tuple((1 << codes[t], row[4]) for t, row in neutralized.items())
+        self.demand_mask = sum(bit for bit, _ in self.demanded)
+        self.neutralized_mask = sum(bit for bit, _ in self.neutralized)
+        self.critical_demands = tuple(critical_demands.values())
+        self.critical_demand_names = frozenset(name for name, _ in self.critical_demands)
+        self.critical_neutralizations = tuple(critical_neutralizations.values())
+        self.critical_neutralized_names = frozenset(name for name, _ in self.critical_neutralizations)
+
+    @classmethod
+    def compile(cls, rules: Iterable, stressor_ids: Optional[Iterable[str]] = None) -> "RuleSet":
+        """Ad hoc RuleSet with a local trait codec (rules not served by a RuleIndex)."""
+        return cls(rules, stressor_ids)
+
+    def encode(self, trait_ids: Iterable[Optional[str]]) -> int:
+        """Bitset of the given traits; traits no rule mentions are irrelevant and dropped."""
+        codes = self.codes
+        mask = 0
+        for trait_id in trait_ids:
+            code = codes.get(trait_id) if trait_id is not None else None
+            if code is not None:
+                mask |= 1 << code
+        return mask
+
+    def match(self, mask: int) -> tuple[list[str], list[str], list[str], float]:
+        """(traits_present, traits_missing, traits_neutralized, coverage) of a family's trait mask.
+
+        Present: demanded, owned and not neutralized. Neutralized: owned
+        demanded traits that are neutralized, then any other owned trait a
+        stressor neutralizes.
+        """
+        demand_mask, neutralized_mask = self.demand_mask, self.neutralized_mask
+        present_mask = mask & demand_mask & ~neutralized_mask
+        missing_mask = demand_mask & ~mask
+        owned_neutralized = mask & neutralized_mask
+
+        present, missing, neutralized = [], [], []
+        if demand_mask:
+            for bit, name in self.demanded:
+                if bit & present_mask:
+                    present.append(name)
+                elif bit & missing_mask:
+                    missing.append(name)
+                elif bit & owned_neutralized:
+                    neutralized.append(name)
+        if owned_neutralized:
+            for bit, name in self.neutralized:
+                if bit & owned_neutralized and name not in neutralized:
+                    neutralized.append(name)
+
+        coverage = _bits(present_mask) / len(self.demanded) if self.demanded else 1.0
+        return present, missing, neutralized, coverage
+
+    def veto_reasons(self, traits_missing: Iterable[str], traits_neutralized: Iterable[str]) -> list[str]:
+        """Reasons a match is vetoed: missing CRITICAL demands, then CRITICAL neutralizations."""
+        reasons = []
+        missing = self.critical_demand_names.intersection(traits_missing)
+        if missing:
+            reasons.extend(reason for name, reason in self.critical_demands if name in missing)
+        neutralized = self.critical_neutralized_names.intersection(traits_neutralized)
+        if neutralized:
+            reasons.extend(reason for name, reason in self.critical_neutralizations if name in neutralized)
+        return reasons
+
+
+class RuleIndex:
+    """All causal rules and product family trait sets of one graph version, integer-coded."""
+
+    def __init__(self, families: list[dict], rules: list[dict], version: int = 0):
+        self.version = version
+        codes: dict[str, int] = {}
+        for rule in rules:
+            codes.setdefault(rule.get("trait_id"), len(codes))
+        for family in families:
+            for trait_id in family.get("all_trait_ids") or ():
+                codes.setdefault(trait_id, len(codes))
+        self.codes: Mapping[str, int] = MappingProxyType(codes)
+
+        # product_id -> (trait ids the mask was built from, mask)
+        masks = {}
+        for family in families:
+            trait_ids = tuple(family.get("all_trait_ids") or ())
+            masks[family["product_id"]] = (trait_ids, self._encode(trait_ids))
+        self._family_masks = MappingProxyType(masks)
+
+        by_stressor: dict[str, list] = {}
+        for position, rule in enumerate(rules):
+            by_stressor.setdefault(rule.get("stressor_id"), []).append((position, MappingProxyType(dict(rule))))
+        self._rules_by_stressor = MappingProxyType({k: tuple(v) for k, v in by_stressor.items()})
+        self.rule_count = len(rules)
+
+        self._lock = threading.Lock()
+        self._rulesets: "OrderedDict[frozenset, RuleSet]" = OrderedDict()
+
+    def rules_for(self, stressor_ids: Iterable[str]) -> list[dict]:
+        """Rule rows of the given stressors (shape of get_causal_rules_for_stressors), in graph order."""
+        picked = []
+        for stressor_id in set(stressor_ids):
+            picked.extend(self._rules_by_stressor.get(stressor_id, ()))
+        picked.sort(key=lambda item: item[0])
+        return [dict(row) for _, row in picked]
+
+    def ruleset(self, stressor_ids: Iterable[str]) -> RuleSet:
+        """Compiled rules of the stressor set (cached)."""
+        key = frozenset(stressor_ids)
+        with self._lock:
+            compiled = self._rulesets.get(key)
+            if compiled is not None:
+                self._rulesets.move_to_end(key)
+                return compiled
+        compiled = RuleSet(self.rules_for(key), key, codes=self.codes)
+        with self._lock:
+            self._rulesets[key] = compiled
+            while len(self._rulesets) > RULESET_CACHE_SIZE:
+                self._rulesets.popitem(last=False)
+        return compiled
+
+    def _encode(self, trait_ids: Iterable[Optional[str]]) -> int:
+        mask = 0
+        for trait_id in trait_ids:
+            if trait_id is not None:
+                mask |= 1 << self.codes[trait_id]
+        return mask
+
+    def family_mask(self, candidate: dict, rules: RuleSet) -> int:
+        """Trait bitset of a candidate: precompiled when it is an unchanged catalog family."""
+        trait_ids = candidate.get("all_trait_ids") or ()
+        if rules.codes is self.codes:
+            cached = self._family_masks.get(candidate.get("product_id"))
+            if cached is not None and cached[0] == tuple(trait_ids):
+                return cached[1]
+        return rules.encode(trait_ids)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            cached = len(self._rulesets)
+        return {
+            "version": self.version,
+            "traits": len(self.codes),
+            "families": len(self._family_masks),
+            "rules": self.rule_count,
+            "stressors": len(self._rules_by_stressor),
+            "compiled_rulesets": cached,
+        }
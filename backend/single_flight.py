@@ -0,0 +1,203 @@
+"""Single-flight coalescing of identical in-flight streaming requests.
+
+Batch runners and users refreshing the UI send the same first-turn question
+concurrently; each copy would pay for its own Scribe + engine + synthesis
+run. With single-flight, the first request for a key becomes the leader
+and later ones attach to its run and receive the same events:
+
+    ticket = consult_flights.ticket()
+    ...
+    flight = ticket.join(key, seed_events)     # inside the pipeline
+    if flight is not None:                     # follower
+        for event in flight.follow(start=len(seed_events)):
+            ...
+        return
+    ...
+    # in the wrapper, once ticket.leading:
+    yield from ticket.drive(rest_of_pipeline, result=lambda: summary)
+
+``drive`` finishes the leader's pipeline on a background thread and then
+follows the flight like any other attached request, so a leader whose
+client disconnects does not strand its followers. A failed run raises the
+leader's exception in every attached request.
+
+Controlled by CONSULT_COALESCE (default on) and CONSULT_COALESCE_WAIT_S,
+the longest a follower waits for the next event (default 120).
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CONSULT_COALESCE = os.getenv("CONSULT_COALESCE", "1") != "0"
+CONSULT_COALESCE_WAIT_S = float(os.getenv("CONSULT_COALESCE_WAIT_S", 120))
+
+
+class Flight:
+    """Events of one in-flight run, appended by the leader and read by every attached request."""
+
+    def __init__(self, events: Optional[list] = None, wait_s: float = CONSULT_COALESCE_WAIT_S):
+        self.events: list = list(events or [])
+        self.wait_s = wait_s
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.result: Any = None
+        self.followers = 0
+        self._cond = threading.Condition()
+
+    def publish(self, event):
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None, result: Any = None):
+        with self._cond:
+            self.done = True
+            self.error = error
+            self.result = result
+            self._cond.notify_all()
+
+    def follow(self, start: int = 0) -> Iterator:
+        """Events from index ``start`` on, blocking for new ones until the run finishes.
+
+        Raises the leader's error once its events are exhausted, or
+        TimeoutError when no event arrives within ``wait_s``.
+        """
+        index = start
+        while True:
+            with self._cond:
+                if index >= len(self.events) and not self.done:
+                    if not self._cond.wait_for(lambda: index < len(self.events) or self.done,
+                                               timeout=self.wait_s):
+                        raise TimeoutError(f"No event from the coalesced run within {self.wait_s:.0f}s")
+                batch = self.events[index:]
+                finished = self.done
+            index += len(batch)
+            yield from batch
+            if finished and index >= len(self.events):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class FlightTicket:
+    """One request's membership in a SingleFlight group (leader, follower or neither)."""
+
+    def __init__(self, group: "SingleFlight"):
+        self.group = group
+        self.key: Optional[str] = None
+        self.flight: Optional[Flight] = None
+        self._driving = False
+
+    @property
+    def leading(self) -> bool:
+        return self.flight is not None
+
+    def join(self, key: str, seed_events: list) -> Optional[Flight]:
+        """The in-flight run to follow, or None when this request leads (or coalescing is off).
+
+        ``seed_events`` are the events this request has produced so far; a
+        new flight starts with them so followers can skip as many.
+        """
+        flight, leader = self.group._join(key, seed_events)
+        if leader:
+            self.key, self.flight = key, flight
+            return None
+        return flight
+
+    def abort(self, error: BaseException):
+        """Release a led flight whose run failed before ``drive`` took it over."""
+        if self.flight is not None and not self._driving:
+            self.group._leave(self.key, self.flight, error, None)
+            self.flight = None
+
+    def drive(self, events: Iterator, result: Callable[[], Any] = lambda: None) -> Iterator:
+        """Finish ``events`` on a background thread, publishing each; yield the flight from here."""
+        self._driving = True
+        flight, start = self.flight, len(self.flight.events)
+
+        def run():
+            error = None
+            try:
+                for event in events:
+                    flight.publish(event)
+            except BaseException as e:     # surfaced to every attached request
+                logger.error(f"[SingleFlight] leader run failed: {e}")
+                error = e
+            finally:
+                self.group._leave(self.key, flight, error, result() if error is None else None)
+
+        threading.Thread(target=run, name="single-flight", daemon=True).start()
+        return flight.follow(start)
+
+
+class SingleFlight:
+    """Thread-safe registry of in-flight runs keyed by request identity."""
+
+    def __init__(self, enabled: bool = CONSULT_COALESCE, wait_s: float = CONSULT_COALESCE_WAIT_S):
+        self.enabled = enabled
+        self.wait_s = wait_s
+        self._lock = threading.Lock()
+        self._flights: dict[str, Flight] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._failed = 0
+
+    def ticket(self) -> FlightTicket:
+        return FlightTicket(self)
+
+    def _join(self, key: str, seed_events: list) -> tuple[Optional[Flight], bool]:
+        if not self.enabled or not key:
+            return None, False
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self._coalesced += 1
+                return flight, False
+            flight = self._flights[key] = Flight(seed_events, self.wait_s)
+            self._leaders += 1
+            return flight, True
+
+    def _leave(self, key: str, flight: Flight, error: Optional[BaseException], result: Any):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if error is not None:
+                self._failed += 1
+        flight.finish(error, result)
+        if flight.followers:
+            logger.info(f"[SingleFlight] run shared with {flight.followers} coalesced request(s)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self._leaders + self._coalesced
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._flights),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "coalesce_rate": round(self._coalesced / requests, 3) if requests else 0.0,
+                "failed_runs": self._failed,
+            }
+
+    def render_prometheus(self, prefix: str = "consult") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        stats = self.stats()
+        return "\n".join([
+            f"# HELP {prefix}_coalesced_requests_total Requests attached to an identical in-flight run.",
+            f"# TYPE {prefix}_coalesced_requests_total counter",
+            f"{prefix}_coalesced_requests_total {stats['coalesced']}",
+            f"# HELP {prefix}_flight_leaders_total Requests that ran the pipeline for their key.",
+            f"# TYPE {prefix}_flight_leaders_total counter",
+            f"{prefix}_flight_leaders_total {stats['leaders']}",
+            f"# HELP {prefix}_flights_in_flight Runs currently shared by key.",
+            f"# TYPE {prefix}_flights_in_flight gauge",
+            f"{prefix}_flights_in_flight {stats['in_flight']}",
+        ]) + "\n"
+
+
+consult_flights = SingleFlight()
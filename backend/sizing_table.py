@@ -0,0 +1,336 @@
+"""Precomputed sizing arrangement tables for the trait-based engine.
+
+``TraitBasedEngine.compute_sizing_arrangement`` picks a module (ProductVariant)
+for the required airflow, then lays out the module grid within the user's
+max width/height. The inputs — a family's variants, its Strategy axes and its
+CapacityRules — only change with the catalog, so they are compiled once per
+graph version (CatalogSnapshot builds the tables):
+
+- for every (max primary, max secondary) constraint a ``ModuleTier`` holds
+  the fitting modules sorted by reference airflow; the airflow breakpoints
+  map any airflow to its module with one bisection (smallest module that
+  covers it, else the largest one, repeated);
+- ``arrangement_grid`` is the pure floor/ceil layout of N modules within the
+  constraints;
+- capacity rules are indexed by module descriptor for capacity alternatives.
+
+Single lookups and whole batches (bulk offers, repeated airflow
+clarifications) go through the same table:
+
+    table = snapshot.sizing_table("FAM_GDB")
+    table.size(3400, max_primary=1200)
+    table.size_many(airflows, max_primary=1200)   # vectorized with NumPy
+
+NumPy is in requirements.txt; without it ``size_many`` still works, bisecting
+value by value.
+Without a catalog snapshot the engine builds a SizingTable ad hoc from the
+family's lookups.
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Iterable, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # size_many falls back to pure Python
+    np = None
+
+# Constraint tiers kept per family table (one per distinct max width/height pair)
+TIER_CACHE_SIZE = 64
+
+DEFAULT_PRIMARY_AXIS = "width_mm"
+DEFAULT_SECONDARY_AXIS = "height_mm"
+
+
+def _airflow(module) -> float:
+    return float(module.get("reference_airflow_m3h") or 0)
+
+
+def _pf_id(item_id: str) -> str:
+    return item_id if item_id.startswith("FAM_") else f"FAM_{item_id.upper()}"
+
+
+class Grid(NamedTuple):
+    """Module layout within the axis constraints."""
+    columns: int                # modules side by side on the primary axis
+    rows: int                   # modules stacked on the secondary axis
+    effective_primary: int
+    effective_secondary: int
+    feasible: bool
+    max_modules_fitting: int
+    rebalanced: bool            # rows capped by the secondary constraint
+
+
+def arrangement_grid(modules_needed: int, module_primary: int, module_secondary: int,
+                     max_primary: Optional[int] = None, max_secondary: Optional[int] = None) -> Grid:
+    """Lay out ``modules_needed`` modules within max primary/secondary dimensions (floor/ceil only).
+
+    The grid step is the module's own primary dimension; the Strategy
+    expansion unit is an abstract step that wider modules exceed.
+    """
+    exp_unit = module_primary
+    if max_primary and exp_unit > 0 and modules_needed > 1:
+        columns = max(1, max_primary // exp_unit)
+        rows = math.ceil(modules_needed / columns)
+    else:
+        columns = modules_needed
+        rows = 1
+    effective_primary = exp_unit * columns
+    effective_secondary = module_secondary * rows
+
+    # Secondary overflow: fit within the constraint by adding primary-axis units
+    rebalanced = bool(max_secondary and effective_secondary > max_secondary)
+    if rebalanced:
+        max_stacked = max(1, max_secondary // module_secondary)
+        columns = math.ceil(modules_needed / max_stacked) if max_stacked else modules_needed
+        rows = max_stacked
+        effective_primary = exp_unit * columns
+        effective_secondary = module_secondary * rows
+
+    # Spatially impossible when there are not enough slots or the effective
+    # dimensions still exceed a constraint (after the overflow recalculation)
+    max_modules_fitting = columns * rows
+    feasible = modules_needed <= max_modules_fitting
+
+    if feasible and max_primary and effective_primary > max_primary:
+        feasible = False
+        true_columns = max(1, max_primary // exp_unit) if exp_unit > 0 else 1
+        true_rows = (
+            max(1, max_secondary // module_secondary)
+            if max_secondary and module_secondary > 0
+            else modules_needed
+        )
+        max_modules_fitting = true_columns * true_rows
+
+    if feasible and max_secondary and effective_secondary > max_secondary:
+        feasible = False
+        true_columns = max(1, max_primary // exp_unit) if max_primary and exp_unit > 0 else modules_needed
+        true_rows = max(1, max_secondary // module_secondary) if module_secondary > 0 else 1
+        max_modules_fitting = true_columns * true_rows
+
+    return Grid(columns, rows, effective_primary, effective_secondary, feasible,
+                max_modules_fitting, rebalanced)
+
+
+class ModuleTier:
+    """Modules fitting one (max primary, max secondary) constraint, sorted by reference airflow."""
+
+    __slots__ = ("modules", "sorted_modules", "breakpoints", "fallback", "primary_fit", "secondary_fit")
+
+    def __init__(self, modules: tuple, primary_fit: Optional[tuple] = None,
+                 secondary_fit: Optional[tuple] = None):
+        self.modules = modules
+        # Stable sort: among equal airflows the graph's order decides, as min()/max() did
+        self.sorted_modules = tuple(sorted(modules, key=_airflow))
+        self.breakpoints = tuple(_airflow(m) for m in self.sorted_modules)
+        # Airflow above every module: the highest-airflow module, repeated
+        self.fallback = bisect_left(self.breakpoints, self.breakpoints[-1]) if modules else None
+        # (fitting, total) counts of the constraint filters, None when not applied
+        self.primary_fit = primary_fit
+        self.secondary_fit = secondary_fit
+
+    def position(self, airflow: float) -> Optional[int]:
+        """Index into sorted_modules of the module selected for ``airflow``."""
+        if not self.modules:
+            return None
+        i = bisect_left(self.breakpoints, airflow)
+        return i if i < len(self.breakpoints) else self.fallback
+
+    def select(self, airflow: float):
+        """Smallest module covering the airflow on its own, else the highest-airflow module."""
+        i = self.position(airflow)
+        return self.sorted_modules[i] if i is not None else None
+
+
+class SizingTable:
+    """Sizing data of one product family, compiled for module selection and grid layout."""
+
+    def __init__(self, family_id: str, modules: Iterable[dict], strategy: Optional[dict] = None,
+                 capacity_rules: Iterable[dict] = ()):
+        self.family_id = family_id
+        self.strategy = MappingProxyType(dict(strategy)) if strategy else None
+        self.primary_axis = (strategy or {}).get("primary_axis") or DEFAULT_PRIMARY_AXIS
+        self.secondary_axis = (strategy or {}).get("secondary_axis") or DEFAULT_SECONDARY_AXIS
+        self.modules = tuple(MappingProxyType(dict(m)) for m in modules or ())
+        self.capacity_rules = tuple(MappingProxyType(dict(r)) for r in capacity_rules or ())
+        self._lock = threading.Lock()
+        self._tiers: "OrderedDict[tuple, ModuleTier]" = OrderedDict()
+
+    def _fit(self, modules: tuple, axis: str, limit: Optional[int]):
+        if not limit:
+            return modules, None
+        fitting = tuple(m for m in modules if (m.get(axis) or 0) <= limit)
+        return (fitting or modules), (len(fitting), len(modules))
+
+    def tier(self, max_primary: Optional[int] = None, max_secondary: Optional[int] = None) -> ModuleTier:
+        """Modules fitting the constraints (cached). A constraint no module fits is ignored."""
+        key = (max_primary or None, max_secondary or None)
+        with self._lock:
+            tier = self._tiers.get(key)
+            if tier is not None:
+                self._tiers.move_to_end(key)
+                return tier
+        modules, primary_fit = self._fit(self.modules, self.primary_axis, key[0])
+        modules, secondary_fit = self._fit(modules, self.secondary_axis, key[1])
+        tier = ModuleTier(modules, primary_fit, secondary_fit)
+        with self._lock:
+            self._tiers[key] = tier
+            while len(self._tiers) > TIER_CACHE_SIZE:
+                self._tiers.popitem(last=False)
+        return tier
+
+    def _grid(self, module, modules_needed: int, max_primary, max_secondary) -> Grid:
+        return arrangement_grid(
+            modules_needed, int(module.get(self.primary_axis) or 0), int(module.get(self.secondary_axis) or 0),
+            max_primary, max_secondary,
+        )
+
+    def size(self, airflow: float, max_primary: Optional[int] = None,
+             max_secondary: Optional[int] = None) -> Optional[dict]:
+        """Module, module count and grid for one airflow, or None without a usable module."""
+        module = self.tier(max_primary, max_secondary).select(airflow)
+        ref_airflow = _airflow(module) if module is not None else 0
+        if ref_airflow <= 0:
+            return None
+        modules_needed = max(1, math.ceil(airflow / ref_airflow))
+        return {
+            "module_id": module.get("id", ""),
+            "reference_airflow_m3h": ref_airflow,
+            "modules_needed": modules_needed,
+            "grid": self._grid(module, modules_needed, max_primary, max_secondary),
+        }
+
+    def size_many(self, airflows, max_primary: Optional[int] = None,
+                  max_secondary: Optional[int] = None) -> dict:
+        """Size a batch of airflow values under one constraint pair.
+
+        Returns parallel columns: module_ids (list, None where no usable
+        module), modules_needed, columns, rows and feasible (NumPy arrays when
+        NumPy is installed, else lists; 0/False where no usable module).
+        """
+        tier = self.tier(max_primary, max_secondary)
+        if np is not None:
+            return self._size_many_numpy(tier, airflows, max_primary, max_secondary)
+
+        out = {"module_ids": [], "modules_needed": [], "columns": [], "rows": [], "feasible": []}
+        grids: dict = {}
+        for airflow in airflows:
+            airflow = float(airflow)
+            i = tier.position(airflow)
+            ref_airflow = tier.breakpoints[i] if i is not None else 0
+            if ref_airflow <= 0:
+                needed, module_id, grid = 0, None, None
+            else:
+                needed = max(1, math.ceil(airflow / ref_airflow))
+                module = tier.sorted_modules[i]
+                module_id = module.get("id", "")
+                grid = grids.get((i, needed))
+                if grid is None:
+                    grid = grids[(i, needed)] = self._grid(module, needed, max_primary, max_secondary)
+            out["module_ids"].append(module_id)
+            out["modules_needed"].append(needed)
+            out["columns"].append(grid.columns if grid else 0)
+            out["rows"].append(grid.rows if grid else 0)
+            out["feasible"].append(grid.feasible if grid else False)
+        return out
+
+    def _size_many_numpy(self, tier: ModuleTier, airflows, max_primary, max_secondary) -> dict:
+        values = np.asarray(airflows, dtype=float).ravel()
+        n = values.size
+        if not tier.modules or n == 0:
+            zeros = np.zeros(n, dtype=int)
+            return {"module_ids": [None] * n, "modules_needed": zeros, "columns": zeros.copy(),
+                    "rows": zeros.copy(), "feasible": np.zeros(n, dtype=bool)}
+
+        breakpoints = np.asarray(tier.breakpoints, dtype=float)
+        positions = np.searchsorted(breakpoints, values, side="left")
+        positions[positions == breakpoints.size] = tier.fallback
+        refs = breakpoints[positions]
+        usable = refs > 0
+        needed = np.zeros(n, dtype=int)
+        needed[usable] = np.maximum(1, np.ceil(values[usable] / refs[usable])).astype(int)
+
+        # The grid depends only on (module, count): lay out each distinct pair once
+        pairs, inverse = np.unique(np.stack([positions, needed]), axis=1, return_inverse=True)
+        inverse = inverse.ravel()
+        layouts = []
+        for i, count in pairs.T:
+            if count > 0:
+                grid = self._grid(tier.sorted_modules[i], int(count), max_primary, max_secondary)
+                layouts.append((grid.columns, grid.rows, grid.feasible))
+            else:
+                layouts.append((0, 0, False))
+        layouts = np.asarray(layouts, dtype=object)
+
+        module_ids = np.asarray([m.get("id", "") for m in tier.sorted_modules], dtype=object)[positions]
+        module_ids[~usable] = None
+        return {
+            "module_ids": module_ids.tolist(),
+            "modules_needed": needed,
+            "columns": layouts[inverse, 0].astype(int),
+            "rows": layouts[inverse, 1].astype(int),
+            "feasible": layouts[inverse, 2].astype(bool),
+        }
+
+
+class SizingTables:
+    """Sizing tables of every product family of one graph version, plus a capacity-by-module index."""
+
+    def __init__(self, families: list[dict], dimension_modules: dict, capacity_rules: dict,
+                 strategies: dict, version: int = 0):
+        self.version = version
+        pf_ids = list(dict.fromkeys(list(dimension_modules) + list(capacity_rules) + list(strategies)))
+        self._tables = MappingProxyType({
+            pf_id: SizingTable(pf_id, dimension_modules.get(pf_id, ()), strategies.get(pf_id),
+                               capacity_rules.get(pf_id, ()))
+            for pf_id in pf_ids
+        })
+
+        # module_descriptor -> ((family row, rule), ...) in selection_priority order
+        families_by_id = {f["product_id"]: f for f in families}
+        ordered = [f["product_id"] for f in families] + [p for p in capacity_rules if p not in families_by_id]
+        by_descriptor: dict[str, list] = {}
+        for pf_id in ordered:
+            family = families_by_id.get(pf_id, {"product_id": pf_id})
+            for rule in self._tables[pf_id].capacity_rules if pf_id in self._tables else ():
+                by_descriptor.setdefault(rule.get("module_descriptor"), []).append((family, rule))
+        self._by_descriptor = MappingProxyType({k: tuple(v) for k, v in by_descriptor.items()})
+
+    def table(self, item_id: str) -> Optional[SizingTable]:
+        return self._tables.get(_pf_id(item_id))
+
+    def products_with_higher_capacity(self, blocked_pf_id: str, module_descriptor: str,
+                                      min_output_rating: float,
+                                      required_trait_ids: Optional[list[str]] = None) -> list[dict]:
+        """Rows of GraphConnection.find_products_with_higher_capacity, from the index."""
+        blocked = _pf_id(blocked_pf_id)
+        trait_ids = required_trait_ids or []
+        rows = []
+        for family, rule in self._by_descriptor.get(module_descriptor, ()):
+            rating = rule.get("output_rating")
+            if family["product_id"] == blocked or rating is None or not rating > min_output_rating:
+                continue
+            if trait_ids:
+                matched = set(family.get("direct_trait_ids") or ()) & set(trait_ids)
+                if len(matched) < len(trait_ids):
+                    continue
+            rows.append({
+                "product_id": family["product_id"],
+                "product_name": family.get("product_name"),
+                "selection_priority": family.get("selection_priority"),
+                "output_rating": rating,
+                "description": rule.get("description"),
+            })
+        rows.sort(key=lambda r: (r["selection_priority"] is None, r["selection_priority"] or 0))
+        return rows
+
+    def stats(self) -> dict:
+        return {
+            "families": len(self._tables),
+            "module_descriptors": len(self._by_descriptor),
+            "numpy": np is not None,
+        }
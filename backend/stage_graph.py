@@ -0,0 +1,113 @@
+"""Dependency-aware speculative stages for the request pipelines.
+
+Work that only needs the raw request (embedding, vector retrieval, keyword
+search, session load) can start the moment a request arrives and overlap
+with the LLM calls that gate the rest of the pipeline:
+
+    stages = StageGraph(PREFETCH_EXECUTOR)
+    stages.submit("embedding", generate_embedding, query)
+    stages.submit("retrieval", lambda emb: db.hybrid_retrieval(emb), depends_on=["embedding"])
+    ...                                    # Scribe LLM call runs meanwhile
+    retrieval = stages.result("retrieval")  # joined where it used to be computed
+
+A stage's dependencies must be submitted before it, so on a FIFO executor a
+dependent stage only ever waits on stages that are already running and a
+shared, bounded pool cannot deadlock. ``result`` re-raises the stage's
+exception; ``get`` returns a default instead. ``optional`` joins a stage only
+within a request Deadline's optional budget (deadline.py) and sheds it after.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PREFETCH_WORKERS", 16)), thread_name_prefix="prefetch",
+)
+
+
+class StageGraph:
+    """Named futures with declared dependencies and per-stage run times."""
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self.executor = executor or PREFETCH_EXECUTOR
+        self._futures: dict[str, Future] = {}
+        self._seconds: dict[str, float] = {}
+
+    def submit(self, name: str, fn: Callable, *args, depends_on: Iterable[str] = (), **kwargs) -> Future:
+        """Schedule ``fn(*dep_results, *args, **kwargs)`` once ``depends_on`` have finished."""
+        if name in self._futures:
+            raise ValueError(f"Stage already submitted: {name}")
+        deps = list(depends_on)
+        missing = [d for d in deps if d not in self._futures]
+        if missing:
+            raise KeyError(f"Stage {name} depends on unknown stages: {missing}")
+
+        def _run():
+            dep_results = [self._futures[d].result() for d in deps]
+            t0 = time.perf_counter()
+            try:
+                return fn(*dep_results, *args, **kwargs)
+            finally:
+                self._seconds[name] = time.perf_counter() - t0
+
+        future = self.executor.submit(_run)
+        self._futures[name] = future
+        return future
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Wait for stage ``name``; re-raises the stage's exception."""
+        return self._futures[name].result(timeout=timeout)
+
+    def get(self, name: str, default: Any = None, timeout: Optional[float] = None) -> Any:
+        """Wait for stage ``name``; ``default`` if it failed, was never submitted
+        or is still running after ``timeout`` seconds (it keeps running)."""
+        future = self._futures.get(name)
+        if future is None:
+            return default
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout as e:
+            if not future.done():
+                return default
+            logger.warning(f"[StageGraph] Stage {name} failed: {e}")
+            return default
+        except Exception as e:
+            logger.warning(f"[StageGraph] Stage {name} failed: {e}")
+            return default
+
+    def optional(self, name: str, deadline, default: Any = None) -> Any:
+        """Wait for optional stage ``name`` only while ``deadline`` allows optional work.
+
+        A stage that has not finished when the optional budget runs out is
+        cancelled (or, if already running, abandoned), recorded as shed on the
+        deadline and ``default`` is returned. Failures also return ``default``.
+        """
+        future = self._futures.get(name)
+        if future is None:
+            return default
+        try:
+            return future.result(timeout=deadline.optional_timeout())
+        except FutureTimeout as e:
+            if future.done():   # the stage itself raised a TimeoutError
+                logger.warning(f"[StageGraph] Stage {name} failed: {e}")
+                return default
+            future.cancel()
+            deadline.shed(name)
+            return default
+        except Exception as e:
+            logger.warning(f"[StageGraph] Stage {name} failed: {e}")
+            return default
+
+    def cancel(self):
+        """Cancel stages that have not started yet."""
+        for future in self._futures.values():
+            future.cancel()
+
+    def timings(self, prefix: str = "") -> dict[str, float]:
+        """Run time (seconds) of every finished stage, excluding time spent waiting."""
+        return {f"{prefix}{name}": seconds for name, seconds in self._seconds.items()}
@@ -4,8 +4,11 @@ Loads REAL tenant config (tenants/mann_hummel/config.yaml) — pins actual confi
 Provides mock DB fixtures for migration-safe testing.
 """
 
+import os
+import shutil
 import sys
 import json
+import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -22,6 +25,65 @@ if str(BACKEND_DIR) not in sys.path:
 from backend.logic.state import TechnicalState, TagSpecification, MaterialCode
 from backend.config_loader import get_config, load_domain_config
 
+_embedding_cache_dir = None
+
+
+def pytest_configure(config):
+    """Point the embedding disk cache at a throwaway dir before embeddings is imported."""
+    global _embedding_cache_dir
+    if "EMBEDDING_CACHE_PATH" not in os.environ:
+        _embedding_cache_dir = tempfile.mkdtemp(prefix="embedding-cache-")
+        os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(_embedding_cache_dir, "embeddings.sqlite")
+
+
+def pytest_unconfigure(config):
+    if _embedding_cache_dir:
+        shutil.rmtree(_embedding_cache_dir, ignore_errors=True)
+        os.environ.pop("EMBEDDING_CACHE_PATH", None)
+
+
+# =============================================================================
+# SHARED TEST DOUBLES
+# =============================================================================
+
+class FakeQueryResult:
+    """Simulates FalkorDB's QueryResult object.
+
+    FalkorDB returns:
+      - header: list of (type_int, column_name) tuples
+      - result_set: list of lists (positional, NOT named dicts)
+    """
+    def __init__(self, header: list[tuple], result_set: list[list]):
+        self._header = header
+        self._result_set = result_set
+
+    @property
+    def header(self):
+        return self._header
+
+    @property
+    def result_set(self):
+        return self._result_set
+
+
+def fake_result(columns, rows):
+    """FakeQueryResult with the given column names and positional rows."""
+    return FakeQueryResult([(1, c) for c in columns], rows)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock: set or add to ``now``."""
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
 
 # =============================================================================
 # CONFIG FIXTURES
@@ -36,12 +36,21 @@ def client():
             mock_db.get_session_graph_manager.return_value = MagicMock()
             MockDB.return_value = mock_db
 
+            # The async facade talks to FalkorDB natively: stub it too
+            mock_adb = AsyncMock()
+            mock_adb.verify_connection.return_value = True
+            mock_adb.get_node_count.return_value = 100
+            mock_adb.get_relationship_count.return_value = 200
+            mock_adb.get_graph_data.return_value = {"nodes": [], "relationships": []}
+            mock_adb.stats = MagicMock(return_value={})
+
             from backend.main import app
             # Override the app's dependency to bypass auth
             from backend.auth import get_current_user, get_current_user_info
             app.dependency_overrides[get_current_user] = lambda: "test_user"
             app.dependency_overrides[get_current_user_info] = lambda: {"username": "test_user", "role": "admin"}
-            yield TestClient(app)
+            with patch("backend.main.adb", mock_adb):
+                yield TestClient(app)
             app.dependency_overrides.clear()
 
 
@@ -66,15 +75,43 @@ class TestHealthEndpoint:
 class TestGraphStats:
     def test_graph_stats_shape(self, client):
         resp = client.get("/graph/stats")
-        if resp.status_code == 200:
-            data = resp.json()
-            assert "node_count" in data or "nodes" in data
+        assert resp.status_code == 200
+        assert resp.json() == {"nodes": 100, "relationships": 200, "connected": True}
 
     def test_graph_data_shape(self, client):
         resp = client.get("/graph/data")
-        if resp.status_code == 200:
-            data = resp.json()
-            assert isinstance(data, dict)
+        assert resp.status_code == 200
+        assert resp.json() == {"nodes": [], "relationships": []}
+
+    def test_graph_data_ndjson_stream(self, client):
+        with patch("backend.main.db") as mock_db:
+            mock_db.iter_graph_data.return_value = iter([
+                ("nodes", {"id": "1", "label": "Project", "name": "Alpha", "properties": {}}),
+                ("relationships", {"id": "7", "type": "HAS", "source": "1", "target": "1", "properties": {}}),
+            ])
+            resp = client.get("/graph/data?format=ndjson&properties=name")
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["kind"] for line in lines] == ["node", "relationship", "end"]
+        assert lines[1]["type"] == "HAS"
+        assert lines[-1] == {"kind": "end", "nodes": 1, "relationships": 1}
+        assert mock_db.iter_graph_data.call_args.kwargs["properties"] == ["name"]
+
+    def test_graph_data_cursor_pages(self, client):
+        from backend.main import adb
+        page = AsyncMock(return_value={"items": [{"id": "5"}], "next_after": 5})
+        with patch.object(adb, "get_graph_data_page", page, create=True):
+            data = client.get("/graph/data?limit=1").json()
+        assert data == {"nodes": [{"id": "5"}], "relationships": [], "next_cursor": "nodes:5"}
+
+    def test_graph_data_clusters(self, client):
+        from backend.main import adb
+        clusters = {"lod": "clusters", "nodes": [], "relationships": []}
+        with patch.object(adb, "get_graph_clusters", AsyncMock(return_value=clusters)):
+            assert client.get("/graph/data?lod=clusters").json() == clusters
+
+    def test_graph_data_rejects_bad_cursor(self, client):
+        assert client.get("/graph/data?cursor=bogus").status_code == 400
 
 
 # =============================================================================
@@ -0,0 +1,146 @@
+"""Tests for the asyncio graph facade (async_database.py)."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from async_database import AsyncGraphConnection, aiter_sync
+from tests.conftest import fake_result
+
+
+class FakeAsyncGraph:
+    """Async graph handle answering by query fragment; records calls."""
+
+    name = "hvac"
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    async def query(self, q, params=None):
+        self.calls.append((q, params))
+        for fragment, result in self.answers.items():
+            if fragment in q:
+                return result
+        raise AssertionError(f"unexpected query: {q}")
+
+    ro_query = query
+
+
+@pytest.fixture
+def sync_db():
+    from database import GraphConnection
+    return GraphConnection()
+
+
+class TestNativePath:
+
+    def test_counts_and_explorer_reads(self, sync_db):
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        adb.graph = FakeAsyncGraph({
+            "count(n)": fake_result(["count"], [[12]]),
+            "MATCH (p:Project {name: $name})": fake_result(["name"], [["Alpha"]]),
+            "MATCH (p:Project)": fake_result(["name", "customer"], [["Alpha", "ACME"]]),
+        })
+
+        async def run():
+            return (
+                await adb.get_node_count(),
+                await adb.get_all_projects_with_details(),
+                await adb.get_project_details("Alpha"),
+            )
+
+        count, projects, details = asyncio.run(run())
+        assert count == 12
+        assert projects == [{"name": "Alpha", "customer": "ACME"}]
+        assert details == {"name": "Alpha"}
+        assert adb.graph.calls[-1][1] == {"name": "Alpha"}
+
+    def test_graph_data_shapes_like_sync(self, sync_db):
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        adb.graph = FakeAsyncGraph({
+            "labels(n)": fake_result(["id", "labels", "properties"],
+                                 [[1, ["Project"], {"name": "Alpha", "embedding": [0.1]}]]),
+            "type(r)": fake_result(["id", "type", "source", "target", "properties"],
+                               [[7, "HAS", 1, 2, {}]]),
+        })
+        data = asyncio.run(adb.get_graph_data())
+        assert data["nodes"] == [{"id": "1", "label": "Project", "name": "Alpha", "properties": {"name": "Alpha"}}]
+        assert data["relationships"][0]["source"] == "1"
+
+    def test_knowledge_stats_default(self, sync_db):
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        adb.graph = FakeAsyncGraph({"KnowledgeCandidate": fake_result(["pending"], [])})
+        assert asyncio.run(adb.get_knowledge_stats())["total_projects"] == 0
+
+
+class TestAsyncPipeline:
+
+    def test_query_many_single_round_trip(self, sync_db):
+        from falkordb.asyncio.graph import AsyncGraph
+
+        client = MagicMock()
+        pipe = client.connection.pipeline.return_value
+        pipe.execute = AsyncMock(return_value=[
+            [[[1, "a"]], [[[3, 1]]], ["Cached execution: 0"]],
+            [[[1, "b"]], [[[3, 2]]], ["Cached execution: 0"]],
+        ])
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        adb._graph = AsyncGraph(client, "hvac")
+
+        results = asyncio.run(adb.query_many(["RETURN 1 AS a", ("RETURN $x AS b", {"x": 2})]))
+        assert [r.result_set for r in results] == [[[1]], [[2]]]
+        pipe.execute.assert_awaited_once_with(raise_on_error=False)
+        assert pipe.execute_command.call_count == 2
+
+
+class TestOffloadFallback:
+
+    def test_explicit_sync_graph_is_offloaded(self, sync_db):
+        sync_db.graph = MagicMock()
+        sync_db.graph.query.return_value = fake_result(["name"], [["Alpha"]])
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        assert asyncio.run(adb.get_all_threads_summary()) == [{"name": "Alpha"}]
+
+    def test_other_methods_run_on_offload_executor(self):
+        sync = MagicMock()
+        seen = {}
+
+        def timeline(name):
+            seen["thread"] = threading.current_thread().name
+            return {"project": name}
+
+        sync.get_project_timeline.side_effect = timeline
+        adb = AsyncGraphConnection(sync, offload_workers=1)
+        assert asyncio.run(adb.get_project_timeline("Alpha")) == {"project": "Alpha"}
+        assert seen["thread"].startswith("graph-offload")
+
+    def test_non_callable_attributes_pass_through(self, sync_db):
+        adb = AsyncGraphConnection(sync_db, offload_workers=1)
+        assert adb.graph_name == sync_db.graph_name
+
+
+class TestAiterSync:
+
+    def test_preserves_order_and_exhausts(self):
+        async def collect():
+            return [item async for item in aiter_sync(iter([1, 2, 3]))]
+        assert asyncio.run(collect()) == [1, 2, 3]
+
+    def test_propagates_errors(self):
+        def broken():
+            yield 1
+            raise ValueError("boom")
+
+        async def collect():
+            return [item async for item in aiter_sync(broken())]
+        with pytest.raises(ValueError):
+            asyncio.run(collect())
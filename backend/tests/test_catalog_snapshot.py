@@ -0,0 +1,237 @@
+"""Tests for the in-memory catalog snapshot and graph version stamps."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from catalog_snapshot import CatalogSnapshot
+from graph_version import bump_graph_version, read_graph_version
+from tests.conftest import fake_result
+
+
+class FakeCatalogGraph:
+    """Answers the snapshot's bulk queries by matching on a query fragment."""
+
+    name = "hvac"
+
+    def __init__(self):
+        self.version = 0
+        self.queries = 0
+        self.families = [
+            ["FAM_GDB", "GDB", "housing", 1, "GDB-{w}x{h}", None,
+             ["T_FILTER"], ["Filtration"], ["T_CORR"], ["Corrosion"], ["T_FILTER", "T_CORR"]],
+            ["FAM_GDP", "GDP", "panel", 2, "GDP-{w}x{h}", 25,
+             [], [], [], [], []],
+        ]
+
+    def execute_command(self, *args):
+        if args[0] == "GET":
+            return str(self.version) if self.version else None
+        if args[0] == "INCR":
+            self.version += 1
+            return self.version
+        raise AssertionError(args)
+
+    def query(self, q, params=None):
+        self.queries += 1
+        if "DETACH DELETE" in q:
+            self.families = []
+            return fake_result([], [])
+        if "pf.code_format AS code_format" in q:
+            return fake_result(
+                ["product_id", "product_name", "product_type", "selection_priority",
+                 "code_format", "default_frame_depth", "direct_trait_ids", "direct_trait_names",
+                 "material_trait_ids", "material_trait_names", "all_trait_ids"],
+                [list(r) for r in self.families],
+            )
+        if "NEUTRALIZED_BY" in q:
+            return fake_result(
+                ["rule_type", "trait_id", "trait_name", "stressor_id", "stressor_name", "severity", "explanation"],
+                [["NEUTRALIZED_BY", "T_FILTER", "Filtration", "S_GREASE", "Grease", "CRITICAL", None],
+                 ["DEMANDS_TRAIT", "T_CORR", "Corrosion", "S_SALT", "Salt spray", "WARNING", "Needs RF"]],
+            )
+        if "HAS_TRAIT" in q and "UNION" in q:
+            return fake_result(
+                ["pf_id", "id", "name", "source", "is_primary"],
+                [["FAM_GDB", "T_FILTER", "Filtration", "direct", True],
+                 ["FAM_GDB", "T_CORR", "Corrosion", "RF", False],
+                 ["FAM_GDB", "T_CORR", "Corrosion", "RF", False]],
+            )
+        if "AVAILABLE_IN_MATERIAL" in q:
+            return fake_result(["pf_id", "id", "name", "code"],
+                           [["FAM_GDB", "MAT_FZ", "Galvanized", "FZ"],
+                            ["FAM_GDB", "MAT_RF", "Stainless", "RF"]])
+        if "connection_type" in q:
+            return fake_result(["pf_id", "code", "offset"],
+                           [["FAM_GDB", "PG", 0], ["FAM_GDB", "F", 50]])
+        if "HAS_VARIANT" in q:
+            return fake_result(["pf_id", "id", "width_mm", "height_mm", "reference_airflow_m3h", "label"],
+                           [["FAM_GDB", "GDB_600x600", 600, 600, 3400, "600x600 mm"]])
+        if "HAS_CAPACITY" in q:
+            return fake_result(["pf_id", "id", "module_descriptor", "input_requirement", "output_rating",
+                            "assumption", "description", "capacity_per_component", "component_count_key"],
+                           [["FAM_GDB", "CAP_GDB", "600x600", "airflow_m3h", 3400, None, None, None, None]])
+        if "OPTIMIZATION_STRATEGY" in q:
+            return fake_result(["pf_id", "id", "name", "sort_property", "sort_order", "description",
+                            "primary_axis", "secondary_axis", "expansion_unit"],
+                           [["FAM_GDB", "STRAT_1", "Min footprint", "width_mm", "ASC", None,
+                             "width", "height", 600]])
+        raise AssertionError(f"unexpected query: {q}")
+
+
+class TestGraphVersion:
+
+    def test_read_defaults_to_zero(self):
+        assert read_graph_version(FakeCatalogGraph()) == 0
+
+    def test_bump_increments(self):
+        graph = FakeCatalogGraph()
+        assert bump_graph_version(graph, source="test") == 1
+        assert bump_graph_version(graph) == 2
+        assert read_graph_version(graph) == 2
+
+
+class TestCatalogSnapshot:
+
+    @pytest.fixture
+    def snapshot(self):
+        return CatalogSnapshot.load(FakeCatalogGraph(), version=7)
+
+    def test_product_traits_grouped_and_deduped(self, snapshot):
+        traits = snapshot.product_traits("GDB")
+        assert [t["id"] for t in traits] == ["T_FILTER", "T_CORR"]
+        assert "pf_id" not in traits[0]
+        assert snapshot.product_traits("FAM_UNKNOWN") == []
+
+    def test_families_with_traits_shape(self, snapshot):
+        families = snapshot.all_product_families_with_traits()
+        assert [f["product_id"] for f in families] == ["FAM_GDB", "FAM_GDP"]
+        assert "code_format" not in families[0]
+        assert families[0]["all_trait_ids"] == ["T_FILTER", "T_CORR"]
+
+    def test_code_format(self, snapshot):
+        assert snapshot.product_family_code_format("FAM_GDP") == {
+            "fmt": "GDP-{w}x{h}", "default_frame_depth": 25,
+        }
+        assert snapshot.product_family_code_format("FAM_NOPE") is None
+
+    def test_materials_and_offsets(self, snapshot):
+        assert [m["code"] for m in snapshot.available_materials("FAM_GDB")] == ["FZ", "RF"]
+        assert snapshot.connection_length_offset("FAM_GDB", "F") == 50
+        assert snapshot.connection_length_offset("FAM_GDB", "X") == 0
+        assert snapshot.connection_length_offset("FAM_GDP", "F") == 0
+
+    def test_sizing_collections(self, snapshot):
+        assert snapshot.available_dimension_modules("GDB")[0]["width_mm"] == 600
+        assert snapshot.capacity_rules("FAM_GDB")[0]["output_rating"] == 3400
+        assert snapshot.optimization_strategy("gdb")["primary_axis"] == "width"
+        assert snapshot.optimization_strategy("GDP") is None
+
+    def test_snapshot_is_immutable(self, snapshot):
+        with pytest.raises(AttributeError):
+            snapshot.version = 8
+        traits = snapshot.product_traits("GDB")
+        traits[0]["id"] = "MUTATED"
+        traits.append({"id": "EXTRA"})
+        assert [t["id"] for t in snapshot.product_traits("GDB")] == ["T_FILTER", "T_CORR"]
+
+    def test_stats(self, snapshot):
+        stats = snapshot.stats()
+        assert stats["version"] == 7
+        assert stats["product_families"] == 2
+        assert stats["dimension_modules"] == 1
+        assert stats["causal_rules"] == 2
+        assert stats["sizing_tables"] == 1
+
+    def test_causal_rules_indexed_by_stressor(self, snapshot):
+        assert [r["trait_id"] for r in snapshot.causal_rules_for_stressors(["S_SALT", "S_GREASE"])] == \
+            ["T_FILTER", "T_CORR"]
+        assert snapshot.causal_rules_for_stressors(["S_NONE"]) == []
+        assert snapshot.rule_index.version == 7
+
+    def test_sizing_table(self, snapshot):
+        table = snapshot.sizing_table("GDB")
+        assert (table.primary_axis, table.secondary_axis) == ("width", "height")
+        assert table.modules[0]["id"] == "GDB_600x600"
+        assert table.capacity_rules[0]["id"] == "CAP_GDB"
+        assert snapshot.sizing_table("GDP") is None
+
+
+class TestGraphConnectionSnapshot:
+
+    @pytest.fixture
+    def db(self):
+        from database import GraphConnection
+        conn = GraphConnection()
+        conn.graph = FakeCatalogGraph()
+        conn.catalog_check_interval = 0
+        return conn
+
+    def test_disabled_until_loaded(self, db):
+        assert db.catalog_snapshot() is None
+        assert db.catalog_stats() == {"enabled": False}
+
+    def test_methods_served_from_snapshot(self, db):
+        db.load_catalog_snapshot()
+        before = db.graph.queries
+        assert db.get_available_materials("FAM_GDB")[0]["code"] == "FZ"
+        assert db.get_connection_length_offset("FAM_GDB", "F") == 50
+        assert db.get_product_family_code_format("FAM_GDB")["fmt"] == "GDB-{w}x{h}"
+        assert db.get_optimization_strategy("GDB")["id"] == "STRAT_1"
+        assert db.get_capacity_rules("GDB")[0]["id"] == "CAP_GDB"
+        assert db.get_available_dimension_modules("GDB")[0]["id"] == "GDB_600x600"
+        assert len(db.get_product_traits("GDB")) == 2
+        assert len(db.get_all_product_families_with_traits()) == 2
+        assert db.get_causal_rules_for_stressors(["S_SALT"])[0]["explanation"] == "Needs RF"
+        assert db.find_products_with_higher_capacity("GDP", "600x600", 1000) == [{
+            "product_id": "FAM_GDB", "product_name": "GDB", "selection_priority": 1,
+            "output_rating": 3400, "description": None,
+        }]
+        assert db.graph.queries == before
+
+    def test_reload_on_version_change(self, db):
+        first = db.load_catalog_snapshot()
+        assert db.catalog_snapshot() is first
+        db.graph.families.append(
+            ["FAM_GDC", "GDC", "housing", 3, None, None, [], [], [], [], []]
+        )
+        db.bump_graph_version(source="test")
+        second = db.catalog_snapshot()
+        assert second is not first
+        assert second.version == 1
+        assert len(db.get_all_product_families_with_traits()) == 3
+        assert db.rule_index() is second.rule_index is not first.rule_index
+        assert db.sizing_table("GDB") is second.sizing_table("GDB") is not first.sizing_table("GDB")
+
+    def test_catalog_write_bumps_version_and_reloads(self, db):
+        first = db.load_catalog_snapshot()
+        db.catalog_check_interval = 60
+        db.clear_graph()
+        assert db.get_graph_version() == 1
+        second = db.catalog_snapshot()
+        assert second is not first
+        assert db.get_all_product_families_with_traits() == []
+
+    def test_per_row_writes_leave_the_version_bump_to_the_batch(self, db):
+        import database
+        calls = []
+        database.on_graph_write(lambda: calls.append("bust"))
+        try:
+            with patch.object(db, "_execute_with_retry", return_value=True):
+                db.create_node("Observation", {"name": "obs_1"})
+                db.create_relationship("Observation", "obs_1", "LED_TO", "Action", "act_1")
+        finally:
+            database._write_listeners.pop()
+        assert calls == []
+        assert db.get_graph_version() == 0
+
+    def test_refresh_failure_keeps_previous_snapshot(self, db):
+        first = db.load_catalog_snapshot()
+        db.graph.execute_command = MagicMock(side_effect=ValueError("boom"))
+        assert db.catalog_snapshot() is first
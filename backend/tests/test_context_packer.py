@@ -0,0 +1,112 @@
+"""Tests for token-budgeted prompt context packing (context_packer.py)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from context_packer import ContextPacker, estimate_tokens
+
+POLICY = (
+    "**Graph-Based Policy Evaluation:**\n"
+    "- Stainless steel (RF) is required for chlorine exposure above 50 ppm.\n"
+    "- Housing corrosion class: **C5** (the housing itself, regardless of material)"
+)
+
+
+def _lines(prefix: str, n: int) -> str:
+    return "\n".join(f"{prefix} line {i} with enough words to be a fact" for i in range(n))
+
+
+class TestEstimateTokens:
+
+    def test_ascii_about_four_chars_per_token(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 25) == 25
+
+    def test_non_ascii_counted_individually(self):
+        assert estimate_tokens("żółć") == 4
+        assert estimate_tokens("⚠️ RF") > estimate_tokens("!! RF")
+
+
+class TestContextPacker:
+
+    def test_unchanged_within_budget(self):
+        packer = ContextPacker(budget=10_000)
+        packer.add("a", "first block").add("b", "second block", required=True)
+        packed = packer.pack()
+        assert packed.text() == "first block\nsecond block"
+        assert packed.timings()["ctx_tokens_saved"] == 0
+
+    def test_duplicate_facts_removed_from_lower_priority_only(self):
+        packer = ContextPacker()
+        packer.add("configuration", "Products:\n- Housing corrosion class: C5 (the housing itself, regardless of material)",
+                   priority=2)
+        packer.add("graph_policies", POLICY, required=True)
+        packed = packer.pack()
+        assert packed["graph_policies"] == POLICY
+        assert packed["configuration"] == "Products:"
+        assert packed.sections["configuration"].duplicate_lines == 1
+
+    def test_repeats_within_a_section_kept(self):
+        row = "| GDB 600x600 | 3400 m3/h | stainless steel RF |"
+        rows = "\n".join([row] * 3)
+        packer = ContextPacker()
+        packer.add("sizing", rows, priority=1).add("retrieval", row, priority=3)
+        packed = packer.pack()
+        assert packed["sizing"] == rows
+        assert packed.sections["sizing"].duplicate_lines == 0
+        assert packed["retrieval"] == ""
+
+    def test_short_lines_never_deduplicated(self):
+        packer = ContextPacker()
+        packer.add("a", "---\n**YOU MUST:**", priority=1).add("b", "---\n**YOU MUST:**", priority=2)
+        assert packer.pack()["b"] == "---\n**YOU MUST:**"
+
+    def test_section_budget_cuts_at_line_boundary(self):
+        packer = ContextPacker()
+        packer.add("retrieval", _lines("case", 50), budget=60)
+        section = packer.pack().sections["retrieval"]
+        assert section.tokens <= 60 and section.truncated
+        assert section.text.splitlines()[0] == "case line 0 with enough words to be a fact"
+        assert section.text.endswith("more lines omitted for length]")
+
+    def test_total_budget_sheds_least_important_first(self):
+        packer = ContextPacker(budget=200)
+        packer.add("configuration", _lines("variant", 10), priority=2)
+        packer.add("retrieval", _lines("case", 10), priority=4)
+        packer.add("locked_state", _lines("tag", 10), required=True)
+        packed = packer.pack()
+        assert packed["retrieval"] == ""
+        assert packed["configuration"].startswith("variant line 0")
+        assert packed["locked_state"] == _lines("tag", 10)
+        assert packed.total_tokens <= 200
+
+    def test_required_kept_even_over_budget(self):
+        packer = ContextPacker(budget=10)
+        packer.add("graph_policies", POLICY, required=True)
+        assert packer.pack()["graph_policies"] == POLICY
+
+    def test_render_order_is_insertion_order(self):
+        packer = ContextPacker()
+        packer.add("x", "low", priority=9).add("y", "high", required=True)
+        packed = packer.pack()
+        assert packed.text() == "low\nhigh"
+        assert packed.text("y", "x", sep=" | ") == "low | high"
+
+    def test_timings_flat_ints(self):
+        packer = ContextPacker(budget=50)
+        packer.add("retrieval", _lines("case", 20)).add("empty", "")
+        timings = packer.pack().timings()
+        assert "ctx_tokens_empty" not in timings
+        assert all(isinstance(v, int) for v in timings.values())
+        assert timings["ctx_tokens_total"] + timings["ctx_tokens_saved"] == estimate_tokens(_lines("case", 20))
+
+    def test_duplicate_section_name_rejected(self):
+        packer = ContextPacker().add("a", "x")
+        with pytest.raises(ValueError):
+            packer.add("a", "y")
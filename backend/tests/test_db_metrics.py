@@ -0,0 +1,123 @@
+"""Tests for per-method graph query metrics (db_metrics.py + wiring)."""
+
+import logging
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from db_metrics import QueryMetrics, count_rows, method_name_of, query_metrics
+from redis.exceptions import ConnectionError as RedisConnectionError
+from tests.conftest import fake_result
+
+
+class TestQueryMetrics:
+
+    def test_method_name_from_closure(self):
+        class GraphConnection:
+            def get_node_count(self):
+                def _query():
+                    pass
+                return _query
+        assert method_name_of(GraphConnection().get_node_count()) == "get_node_count"
+
+    def test_count_rows(self):
+        assert count_rows(None) == 0
+        assert count_rows([1, 2, 3]) == 3
+        assert count_rows({"a": 1}) == 1
+        assert count_rows(fake_result(["a"], [[1], [2]])) == 2
+
+    def test_record_and_stats(self):
+        metrics = QueryMetrics()
+        metrics.record("m", 0.004, rows=2, payload_bytes=100)
+        metrics.record("m", 0.020, rows=1, payload_bytes=50, retries=1, error=True)
+        stats = metrics.stats()["m"]
+        assert stats["calls"] == 2
+        assert stats["errors"] == 1
+        assert stats["rows"] == 3
+        assert stats["payload_bytes"] == 150
+        assert stats["retries"] == 1
+        assert stats["max_ms"] == 20.0
+
+    def test_prometheus_histogram_is_cumulative(self):
+        metrics = QueryMetrics()
+        metrics.record("get_x", 0.004)
+        metrics.record("get_x", 0.3)
+        text = metrics.render_prometheus()
+        assert '# TYPE graph_query_duration_seconds histogram' in text
+        assert 'graph_query_calls_total{method="get_x"} 2' in text
+        assert 'graph_query_duration_seconds_bucket{method="get_x",le="0.005"} 1' in text
+        assert 'graph_query_duration_seconds_bucket{method="get_x",le="0.5"} 2' in text
+        assert 'graph_query_duration_seconds_bucket{method="get_x",le="+Inf"} 2' in text
+        assert 'graph_query_duration_seconds_count{method="get_x"} 2' in text
+
+    def test_payload_bytes_sampled_per_method(self):
+        metrics = QueryMetrics(payload_sample_every=3)
+        rows = [{"id": "T1", "name": "Grease"}]
+        sizes = [metrics.payload_bytes("m", rows) for _ in range(6)]
+        assert sizes[0] == sizes[3] > 0
+        assert sizes[1] == sizes[2] == sizes[4] == sizes[5] == 0
+        assert metrics.payload_bytes("other", rows) == sizes[0]
+
+    def test_slow_query_log(self, caplog):
+        metrics = QueryMetrics(slow_query_ms=10)
+        with caplog.at_level(logging.WARNING, logger="db_metrics"):
+            metrics.record("fast", 0.001)
+            metrics.record("slow", 0.05, cypher="MATCH (n)\n   RETURN n")
+        assert len(caplog.records) == 1
+        assert "slow took 50ms" in caplog.records[0].getMessage()
+        assert "MATCH (n) RETURN n" in caplog.records[0].getMessage()
+
+
+class TestGraphConnectionInstrumentation:
+
+    @pytest.fixture
+    def db(self):
+        from database import GraphConnection
+        query_metrics.reset()
+        conn = GraphConnection()
+        conn.graph = MagicMock()
+        yield conn
+        query_metrics.reset()
+
+    def test_execute_with_retry_records_per_method(self, db):
+        db.graph.query.return_value = fake_result(["count"], [[5]])
+        assert db.get_node_count() == 5
+        stats = db.query_stats()["get_node_count"]
+        assert stats["calls"] == 1
+        assert stats["rows"] == 1
+        assert stats["payload_bytes"] > 0
+
+    def test_retries_and_errors_counted(self, db):
+        db.reconnect = MagicMock()
+        db.graph.query.side_effect = RedisConnectionError("reset")
+        with pytest.raises(RedisConnectionError):
+            db.get_relationship_count()
+        stats = db.query_stats()["get_relationship_count"]
+        assert stats["errors"] == 1
+        assert stats["retries"] == 2
+
+    def test_engine_reads_are_instrumented(self, db):
+        db.catalog_snapshot = MagicMock(return_value=None)
+        db.graph.query.return_value = fake_result(["id"], [["CAP_1"]])
+        assert db.get_capacity_rules("GDB") == [{"id": "CAP_1"}]
+        assert db.get_stressors_by_keywords(["grease"]) == [{"id": "CAP_1"}]
+        stats = db.query_stats()
+        assert stats["get_capacity_rules"]["rows"] == 1
+        assert stats["get_stressors_by_keywords"]["calls"] == 1
+
+    def test_session_graph_helpers_record_caller(self, db):
+        from logic.session_graph import SessionGraphManager
+        db.graph.query.return_value = fake_result(["id"], [["S1"], ["S2"]])
+        mgr = SessionGraphManager(db)
+
+        assert len(mgr._run_query("MATCH (s:Session) RETURN s.id AS id", method="get_sessions")) == 2
+        mgr.ensure_session("S1")
+        stats = db.query_stats()
+        assert stats["session.get_sessions"]["rows"] == 2
+        assert stats["session.ensure_session"]["calls"] == 1
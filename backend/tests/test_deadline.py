@@ -0,0 +1,127 @@
+"""Tests for request deadlines and optional-stage shedding (deadline.py)."""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from deadline import Deadline
+from stage_graph import StageGraph
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class TestDeadline:
+
+    def test_optional_budget_excludes_reserve(self, clock):
+        deadline = Deadline(10, reserve=4, clock=clock)
+        clock.now += 5
+        assert deadline.remaining() == 5
+        assert deadline.optional_timeout() == 1
+        assert deadline.allows("similar_cases")
+        clock.now += 1
+        assert not deadline.allows("similar_cases")
+        assert not deadline.expired()
+        assert deadline.shed_stages == ["similar_cases"]
+
+    def test_unbounded_allows_everything(self):
+        deadline = Deadline(None)
+        assert deadline.allows("anything")
+        assert deadline.optional_timeout() is None
+        assert deadline.timings() == {}
+
+    def test_timings_are_flat_numbers(self, clock):
+        deadline = Deadline(10, reserve=10, clock=clock)
+        clock.now += 2
+        deadline.allows("retrieval")
+        deadline.shed("retrieval")      # recorded once
+        timings = deadline.timings()
+        assert timings == {"shed_retrieval": 2.0, "deadline_budget": 10, "deadline_remaining": 8.0}
+
+    def test_from_env_zero_disables(self):
+        with patch("deadline.REQUEST_DEADLINE_S", 0):
+            assert Deadline.from_env().seconds is None
+
+
+class TestOptionalStages:
+
+    def test_finished_stage_used_even_when_budget_spent(self, executor):
+        stages = StageGraph(executor)
+        stages.submit("similar_cases", lambda: ["case"])
+        stages.result("similar_cases")
+        deadline = Deadline(0)
+        assert stages.optional("similar_cases", deadline, default=[]) == ["case"]
+        assert deadline.shed_stages == []
+
+    def test_slow_stage_shed(self, executor):
+        release = threading.Event()
+        stages = StageGraph(executor)
+        stages.submit("retrieval", lambda: release.wait(2) and ["hit"])
+        deadline = Deadline(0.05)
+        assert stages.optional("retrieval", deadline, default=[]) == []
+        assert deadline.shed_stages == ["retrieval"]
+        release.set()
+
+    def test_failed_stage_not_reported_as_shed(self, executor):
+        def boom():
+            raise TimeoutError("graph query timed out")
+
+        stages = StageGraph(executor)
+        stages.submit("retrieval", boom)
+        deadline = Deadline(None)
+        assert stages.optional("retrieval", deadline, default=[]) == []
+        assert deadline.shed_stages == []
+
+
+class TestEngineShedding:
+
+    def _engine(self):
+        from logic.universal_engine import TraitBasedEngine
+        db = MagicMock()
+        db.get_stressors_by_keywords.return_value = []
+        db.get_all_applications.return_value = []
+        return TraitBasedEngine(db), db
+
+    def test_vector_fallback_shed_when_budget_spent(self):
+        engine, db = self._engine()
+        deadline = Deadline(0)
+        assert engine.detect_stressors("something unusual", deadline=deadline) == []
+        db.vector_search_applications.assert_not_called()
+        assert deadline.shed_stages == ["engine_vector_search"]
+
+    def test_vector_fallback_runs_within_budget(self):
+        engine, db = self._engine()
+        db.vector_search_applications.return_value = []
+        with patch("embeddings.generate_embedding", return_value=[0.1]):
+            engine.detect_stressors("something unusual", deadline=Deadline(None))
+        db.vector_search_applications.assert_called_once()
+
+
+class TestRequiredCalls:
+
+    def test_provider_calls_keep_sdk_default_timeout(self):
+        import llm_clients
+        import llm_router
+        llm_clients.provider_clients.reset()
+        client = MagicMock()
+        client.responses.create.return_value = MagicMock(output_text="{}", usage=None)
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k"), \
+                patch("openai.OpenAI", return_value=client):
+            llm_router.llm_call("gpt-5.2", "hi", max_output_tokens=4096)
+        llm_clients.provider_clients.reset()
+        assert "timeout" not in client.responses.create.call_args.kwargs
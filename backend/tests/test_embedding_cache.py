@@ -0,0 +1,97 @@
+"""Tests for the two-tier embedding cache (embedding_cache.py)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from embedding_cache import EmbeddingCache, embedding_key, pack_float16, unpack_float16
+
+MODEL = "gemini-embedding-001"
+
+
+class TestKeys:
+
+    def test_whitespace_normalized(self):
+        assert embedding_key("pool  housing\n", MODEL) == embedding_key("pool housing", MODEL)
+
+    def test_model_is_part_of_key(self):
+        assert embedding_key("pool", MODEL) != embedding_key("pool", "text-embedding-3-large")
+
+    def test_float16_round_trip(self):
+        vector = [0.125, -0.5, 0.0123]
+        restored = unpack_float16(pack_float16(vector))
+        assert len(pack_float16(vector)) == 6
+        assert restored == pytest.approx(vector, abs=1e-3)
+
+
+class TestMemoryTier:
+
+    def test_hit_returns_copy(self):
+        cache = EmbeddingCache(max_entries=4)
+        cache.set("a", MODEL, [1.0, 2.0])
+        first = cache.get("a", MODEL)
+        first.append(3.0)
+        assert cache.get("a", MODEL) == [1.0, 2.0]
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.set("a", MODEL, [1.0])
+        cache.set("b", MODEL, [2.0])
+        cache.get("a", MODEL)
+        cache.set("c", MODEL, [3.0])
+        assert cache.get("b", MODEL) is None
+        assert cache.get("a", MODEL) == [1.0]
+
+    def test_hit_rate(self):
+        cache = EmbeddingCache()
+        assert cache.get("a", MODEL) is None
+        cache.set("a", MODEL, [1.0])
+        cache.get("a", MODEL)
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert 'embedding_cache_lookups_total{outcome="memory"} 1' in cache.render_prometheus()
+
+
+class TestDiskTier:
+
+    def test_survives_restart_as_float16(self, tmp_path):
+        path = str(tmp_path / "emb" / "cache.sqlite")
+        EmbeddingCache(path=path).set("pool housing", MODEL, [0.5, -0.25, 0.1])
+
+        cache = EmbeddingCache(path=path)
+        assert cache.get("pool housing", MODEL) == pytest.approx([0.5, -0.25, 0.1], abs=1e-3)
+        cache.get("pool housing", MODEL)
+        stats = cache.stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["disk_entries"]) == (1, 1, 1)
+
+    def test_set_many_writes_one_batch(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        EmbeddingCache(path=path).set_many([("a", [1.0]), ("b", [2.0]), ("c", [3.0])], MODEL)
+        cache = EmbeddingCache(path=path)
+        assert [cache.get(t, MODEL) for t in "abc"] == [[1.0], [2.0], [3.0]]
+        assert cache.stats()["disk_hits"] == 3
+
+    def test_memory_hits_do_not_wait_for_disk_writes(self, tmp_path):
+        cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite"))
+        cache.set("a", MODEL, [1.0])
+        with cache._disk_lock:     # a batch write in progress
+            assert cache.get("a", MODEL) == [1.0]
+
+    def test_clear_disk(self, tmp_path):
+        cache = EmbeddingCache(path=str(tmp_path / "cache.sqlite"))
+        cache.set("a", MODEL, [1.0])
+        cache.clear(disk=True)
+        assert cache.get("a", MODEL) is None
+
+    def test_unusable_path_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        cache = EmbeddingCache(path=str(blocker / "cache.sqlite"))
+        cache.set("a", MODEL, [1.0])
+        assert cache.get("a", MODEL) == [1.0]
+        assert cache.stats()["disk_path"] is None
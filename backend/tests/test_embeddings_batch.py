@@ -0,0 +1,130 @@
+"""Tests for batched embedding generation and the rate limiting helpers."""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from google.genai import errors as genai_errors
+
+from deadline import Deadline
+from embedding_cache import EmbeddingCache
+from rate_limit import TokenBucket, backoff_delays
+
+
+def _response(contents):
+    return SimpleNamespace(embeddings=[SimpleNamespace(values=[float(len(c))]) for c in contents])
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    import embeddings
+    client = MagicMock()
+    client.models.embed_content.side_effect = lambda model, contents: _response(contents)
+    monkeypatch.setattr(embeddings, "client", client)
+    monkeypatch.setattr(embeddings, "embedding_cache", EmbeddingCache())
+    monkeypatch.setattr(embeddings, "_rate_limiter", None)
+    monkeypatch.setattr(embeddings.time, "sleep", lambda s: None)
+    return embeddings
+
+
+class TestTokenBucket:
+
+    def test_burst_then_empty(self):
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        bucket.acquire()
+        t0 = time.monotonic()
+        assert bucket.acquire(timeout=1.0)
+        assert time.monotonic() - t0 >= 0.015
+
+    def test_acquire_timeout(self):
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+        assert bucket.acquire(timeout=0.01) is False
+
+    def test_backoff_is_capped(self):
+        delays = list(backoff_delays(6, base=1.0, cap=4.0))
+        assert len(delays) == 6
+        assert all(0 <= d <= 4.0 for d in delays)
+
+
+class TestGenerateEmbeddingsBatch:
+
+    def test_chunks_dedupes_and_keeps_order(self, embeddings):
+        texts = ["a", "bb", "a", "ccc", "dddd", "eeeee"]
+        vectors = embeddings.generate_embeddings_batch(texts, batch_size=2, max_workers=3)
+        assert vectors == [[1.0], [2.0], [1.0], [3.0], [4.0], [5.0]]
+        sent = [c.kwargs["contents"] for c in embeddings.client.models.embed_content.call_args_list]
+        assert sorted(map(tuple, sent)) == [("a", "bb"), ("ccc", "dddd"), ("eeeee",)]
+
+    def test_cached_texts_skip_the_api(self, embeddings):
+        embeddings.generate_embedding("a")
+        embeddings.client.models.embed_content.reset_mock()
+        embeddings.generate_embeddings_batch(["a", "bb"])
+        assert embeddings.client.models.embed_content.call_args.kwargs["contents"] == ["bb"]
+
+    def test_retries_rate_limited_requests(self, embeddings):
+        calls = {"n": 0}
+
+        def flaky(model, contents):
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise genai_errors.ClientError(429, {"error": {"message": "quota"}})
+            return _response(contents)
+
+        embeddings.client.models.embed_content.side_effect = flaky
+        assert embeddings.generate_embeddings_batch(["a"]) == [[1.0]]
+        assert calls["n"] == 3
+
+    def test_interactive_embedding_fails_fast(self, embeddings):
+        embeddings.client.models.embed_content.side_effect = genai_errors.ClientError(
+            429, {"error": {"message": "quota"}},
+        )
+        with pytest.raises(genai_errors.ClientError):
+            embeddings.generate_embedding("a")
+        with pytest.raises(genai_errors.ClientError):
+            embeddings.embed_map(["a"], retries=0)
+        assert embeddings.client.models.embed_content.call_count == 2
+
+    def test_retries_stop_at_deadline(self, embeddings):
+        embeddings.client.models.embed_content.side_effect = genai_errors.ClientError(
+            503, {"error": {"message": "unavailable"}},
+        )
+        with pytest.raises(genai_errors.ClientError):
+            embeddings.generate_embeddings_batch(["a"], retries=4, deadline=Deadline(seconds=0))
+        assert embeddings.client.models.embed_content.call_count == 1
+
+    def test_non_retryable_error_raises(self, embeddings):
+        embeddings.client.models.embed_content.side_effect = genai_errors.ClientError(
+            400, {"error": {"message": "bad"}},
+        )
+        with pytest.raises(genai_errors.ClientError):
+            embeddings.generate_embeddings_batch(["a"])
+        assert embeddings.client.models.embed_content.call_count == 1
+
+    def test_requests_share_the_rate_limiter(self, embeddings, monkeypatch):
+        acquired = []
+        limiter = MagicMock()
+        limiter.acquire.side_effect = lambda: acquired.append(threading.current_thread().name)
+        monkeypatch.setattr(embeddings, "_rate_limiter", limiter)
+        embeddings.generate_embeddings_batch(["a", "bb", "ccc"], batch_size=1, max_workers=2)
+        assert len(acquired) == 3
+
+    def test_embed_map(self, embeddings):
+        assert embeddings.embed_map(["a", "bb", "a"]) == {"a": [1.0], "bb": [2.0]}
@@ -0,0 +1,119 @@
+"""Tests for the batch verdict API (TraitBasedEngine.process_queries)."""
+
+import concurrent.futures
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import database
+import backend.logic.universal_engine as universal_engine
+from backend.logic.universal_engine import CausalRule, CausalRuleList, EngineVerdict, TraitBasedEngine
+from deadline import Deadline
+from rule_index import RuleIndex
+
+ITEMS = [
+    ("kitchen ventilation grease", "GDB", {}),
+    ("kitchen ventilation grease", None, {"airflow_m3h": 3400}),
+    ("office supply air", "GDB", None),
+]
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Run the pool in threads; records the multiprocessing start method it was given."""
+    contexts = []
+
+    def executor(max_workers, mp_context=None):
+        contexts.append(mp_context.get_start_method() if mp_context else None)
+        return concurrent.futures.ThreadPoolExecutor(max_workers)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", executor)
+    return contexts
+
+
+class TestProcessQueries:
+
+    def test_one_verdict_per_item_in_order(self, mock_db):
+        engine = TraitBasedEngine(mock_db)
+        batch = engine.process_queries(ITEMS)
+        single = [TraitBasedEngine(mock_db).process_query(q, product_hint=h, context=c) for q, h, c in ITEMS]
+        assert len(batch) == len(ITEMS)
+        assert all(isinstance(v, EngineVerdict) for v in batch)
+        assert batch == single
+        assert engine.db is mock_db
+
+    def test_graph_lookups_shared_across_batch(self, mock_db):
+        TraitBasedEngine(mock_db).process_queries(ITEMS)
+        assert mock_db.get_all_applications.call_count == 1
+        assert mock_db.get_causal_rules_for_stressors.call_count <= 2
+        assert mock_db.get_stressors_by_keywords.call_count == 2     # two distinct queries
+        assert mock_db.get_goals_by_keywords.call_count == 2
+
+    def test_empty_batch(self, mock_db):
+        assert TraitBasedEngine(mock_db).process_queries([]) == []
+        mock_db.get_all_applications.assert_not_called()
+
+    def test_pool_chunks_keep_order(self, mock_db, monkeypatch, thread_pool):
+        monkeypatch.setattr(database, "db", mock_db)
+        engine = TraitBasedEngine(mock_db)
+        monkeypatch.setattr(universal_engine, "_process_chunk",
+                            lambda chunk, **kwargs: [chunk_item[0] for chunk_item in chunk])
+        queries = [(f"q{i}", None, None) for i in range(11)]
+        assert engine.process_queries(queries, processes=3) == [q for q, _, _ in queries]
+        assert thread_pool == ["spawn"]     # workers open their own graph connections
+
+    def test_pool_requires_global_db(self, mock_db):
+        with pytest.raises(ValueError):
+            TraitBasedEngine(mock_db).process_queries(ITEMS, processes=2)
+
+    def test_pool_passes_deadline_budget(self, mock_db, monkeypatch, thread_pool):
+        monkeypatch.setattr(database, "db", mock_db)
+        calls = []
+        monkeypatch.setattr(universal_engine, "_process_chunk",
+                            lambda chunk, **kwargs: calls.append(kwargs) or [None] * len(chunk))
+        TraitBasedEngine(mock_db).process_queries(ITEMS, deadline=Deadline(30, reserve=5), processes=2)
+        assert calls and all(c["reserve"] == 5 for c in calls)
+        assert all(0 < c["deadline_at"] - time.time() <= 30 for c in calls)
+
+
+class TestProcessChunk:
+
+    def test_same_verdicts_as_serial_path(self, mock_db, monkeypatch):
+        monkeypatch.setattr(database, "db", mock_db)
+        monkeypatch.setattr(universal_engine, "_worker_engine", None)
+        assert universal_engine._process_chunk(ITEMS) == TraitBasedEngine(mock_db).process_queries(ITEMS)
+        assert universal_engine._worker_engine.db is mock_db
+
+    def test_rebuilds_deadline_in_worker(self, monkeypatch):
+        seen = []
+
+        class Engine:
+            def process_queries(self, chunk, deadline=None):
+                seen.append(deadline)
+                return []
+
+        monkeypatch.setattr(universal_engine, "_worker_engine", Engine())
+        universal_engine._process_chunk(ITEMS, deadline_at=time.time() + 20, reserve=4)
+        universal_engine._process_chunk(ITEMS, deadline_at=time.time() - 1)
+        universal_engine._process_chunk(ITEMS)
+        assert 0 < seen[0].remaining() <= 20 and seen[0].reserve == 4
+        assert seen[1].expired()
+        assert seen[2] is None
+
+
+class TestVerdictPickling:
+
+    def test_indexed_rules_pickle_without_index(self):
+        rule = CausalRule("DEMANDS_TRAIT", "S1", "Salt", "T1", "Corrosion", "CRITICAL", "")
+        index = RuleIndex([], [])
+        rules = CausalRuleList([rule], frozenset({"S1"}), index.ruleset(["S1"]), index)
+        verdict = pickle.loads(pickle.dumps(EngineVerdict(active_causal_rules=rules)))
+        assert verdict.active_causal_rules == [rule]
+        assert type(verdict.active_causal_rules) is list
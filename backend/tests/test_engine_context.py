@@ -0,0 +1,205 @@
+"""Tests for the per-verdict engine context bundle (logic/engine_context.py, get_engine_context)."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from logic.engine_context import EngineContext
+from logic.engine_stages import TraitStage
+from backend.logic.universal_engine import AssemblyStage, TraitBasedEngine
+from tests.conftest import fake_result
+
+
+GATES = [
+    {"gate_id": "G1", "stressor_id": "STR_A", "params": []},
+    {"gate_id": "G2", "stressor_id": "STR_B", "params": []},
+]
+
+
+class TestEngineContext:
+
+    def test_repeated_lookup_hits_db_once_without_copying(self):
+        db = MagicMock()
+        db.get_hard_constraints.return_value = [{"id": "HC1"}]
+        ctx = EngineContext(db)
+        first = ctx.get_hard_constraints("GDB")
+        assert ctx.get_hard_constraints("FAM_GDB") is first
+        db.get_hard_constraints.assert_called_once_with("GDB")
+        assert ctx.stats()["hits"] == 1
+
+    def test_unlisted_methods_pass_through(self):
+        db = MagicMock()
+        ctx = EngineContext(db)
+        ctx.get_material_property("FAM_GDB", "RF", "chlorine")
+        ctx.get_material_property("FAM_GDB", "RF", "chlorine")
+        assert db.get_material_property.call_count == 2
+
+    def test_gates_answered_from_fetched_superset(self):
+        db = MagicMock()
+        db.get_logic_gates_for_stressors.return_value = GATES
+        ctx = EngineContext(db)
+        assert ctx.get_logic_gates_for_stressors(["STR_A", "STR_B"]) == GATES
+        assert ctx.get_logic_gates_for_stressors(["STR_B"]) == [GATES[1]]
+        db.get_logic_gates_for_stressors.assert_called_once()
+
+    def test_prefetch_seeds_bundle(self):
+        db = MagicMock()
+        db.get_engine_context.return_value = {
+            "logic_gates": GATES, "applications": [{"id": "APP_KITCHEN"}], "accessory_codes": [],
+            "environment_chain": ["ENV_KITCHEN", "ENV_INDOOR"],
+            "hard_constraints": [{"id": "HC1"}], "variable_features": [{"feature_id": "F1"}],
+        }
+        ctx = EngineContext(db)
+        ctx.prefetch(["STR_A", "STR_B"], "GDB", "ENV_KITCHEN")
+        ctx.prefetch(["STR_B", "STR_A"], "FAM_GDB", "ENV_KITCHEN")
+        db.get_engine_context.assert_called_once_with(["STR_A", "STR_B"], "FAM_GDB", "ENV_KITCHEN")
+
+        assert ctx.get_logic_gates_for_stressors(["STR_A"]) == [GATES[0]]
+        assert ctx.get_all_applications() == [{"id": "APP_KITCHEN"}]
+        assert ctx.resolve_environment_hierarchy("ENV_KITCHEN") == ["ENV_KITCHEN", "ENV_INDOOR"]
+        assert ctx.get_hard_constraints("FAM_GDB") == [{"id": "HC1"}]
+        assert ctx.get_variable_features("GDB") == [{"feature_id": "F1"}]
+        db.get_logic_gates_for_stressors.assert_not_called()
+        db.get_all_applications.assert_not_called()
+        db.get_hard_constraints.assert_not_called()
+
+    def test_second_family_skips_fetched_gates(self):
+        db = MagicMock()
+        db.get_engine_context.return_value = {"logic_gates": GATES}
+        ctx = EngineContext(db)
+        ctx.prefetch(["STR_A"], None)
+        ctx.prefetch(["STR_A"], "FAM_GDC")
+        assert db.get_engine_context.call_args.args == ([], "FAM_GDC", None)
+
+    def test_failed_bundle_falls_back_to_single_lookups(self):
+        db = MagicMock()
+        db.get_engine_context.side_effect = ConnectionError("graph down")
+        db.get_hard_constraints.return_value = []
+        ctx = EngineContext(db)
+        ctx.prefetch(["STR_A"], "GDB")
+        assert ctx.get_hard_constraints("GDB") == []
+        db.get_hard_constraints.assert_called_once()
+
+
+class TestEngineScoping:
+
+    def test_process_query_memoizes_per_verdict(self, mock_db):
+        engine = TraitBasedEngine(mock_db)
+        engine.process_query("kitchen ventilation grease", product_hint="GDB",
+                             context={"installation_environment": "ENV_KITCHEN"})
+        assert engine.db is mock_db
+        assert mock_db.get_all_applications.call_count == 1
+        assert mock_db.get_logic_gates_for_stressors.call_count == 1
+
+        engine.process_query("kitchen ventilation grease", product_hint="GDB")
+        assert mock_db.get_all_applications.call_count == 2     # nothing kept across verdicts
+
+    def test_application_matcher_built_once_across_verdicts(self, mock_db, monkeypatch):
+        import keyword_matcher
+        builds = []
+        monkeypatch.setattr(keyword_matcher, "_application_matcher", (None, None, None))
+        original_build = keyword_matcher.KeywordMatcher.build
+        monkeypatch.setattr(keyword_matcher.KeywordMatcher, "build",
+                            lambda self: builds.append(self) or original_build(self))
+        mock_db.get_all_applications.side_effect = lambda: [{"id": "APP_KITCHEN", "name": "Kitchen",
+                                                             "keywords": ["restaurant"]}]
+        engine = TraitBasedEngine(mock_db)
+        for _ in range(3):
+            engine.process_query("restaurant kitchen ventilation grease")
+        assert mock_db.get_all_applications.call_count == 3
+        assert len(builds) == 1
+
+    def test_top_family_constraints_served_from_its_bundle(self, mock_db):
+        mock_db.get_engine_context.return_value = {"hard_constraints": [], "logic_gates": []}
+        TraitBasedEngine(mock_db).process_query("kitchen ventilation grease")
+        assert mock_db.get_engine_context.call_args.args[1] == "FAM_GDB"
+        mock_db.get_hard_constraints.assert_not_called()
+
+    def test_assembly_target_bundle_loads_before_stage_checks(self, mock_db):
+        mock_db.get_engine_context.return_value = {"hard_constraints": [], "logic_gates": []}
+        assembly = [
+            AssemblyStage("PROTECTOR", "FAM_GDP", "GDP", "TRAIT_GREASE_PRE", "Grease Pre-Filtration", ""),
+            AssemblyStage("TARGET", "FAM_GDC", "GDC", "TRAIT_CARBON", "Carbon Adsorption", ""),
+        ]
+        engine = TraitBasedEngine(mock_db)
+        engine._trait_stage = lambda *args: TraitStage(rules=[], matches=[], non_vetoed=[], assembly=assembly)
+        engine.process_query("kitchen ventilation grease")
+        assert [c.args[1] for c in mock_db.get_engine_context.call_args_list] == [None, "FAM_GDC"]
+        mock_db.get_hard_constraints.assert_called_once_with("FAM_GDP")   # only the protector
+
+
+class FakeEngineGraph:
+    """Answers get_engine_context's queries by matching on a query fragment."""
+
+    name = "hvac"
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, q, params=None):
+        self.queries.append(q)
+        if "MONITORS" in q:
+            return fake_result(["gate_id", "stressor_id"], [["G1", "STR_A"]])
+        if "(app:Application)" in q:
+            return fake_result(["id", "name", "keywords", "risks", "requirements"],
+                           [["APP_KITCHEN", "Kitchen", [], [], []]])
+        if "(a:Accessory)" in q:
+            return fake_result(["id", "code", "name"], [["ACC_EXL", "EXL", "Eccentric lock"]])
+        if "IS_A" in q:
+            return fake_result(["env_chain"], [[["ENV_KITCHEN", "ENV_INDOOR", "ENV_KITCHEN"]]])
+        if "HAS_HARD_CONSTRAINT" in q:
+            return fake_result(["id"], [["HC1"]])
+        if "HAS_INSTALLATION_CONSTRAINT" in q:
+            return fake_result(["id"], [["IC1"]])
+        if "REQUIRES_PARAMETER" in q:
+            return fake_result(["param_id"], [["P1"]])
+        if "HAS_TRAIT" in q:
+            return fake_result(["id"], [["T_FILTER"]])
+        if "OPTIMIZATION_STRATEGY" in q:
+            return fake_result(["id"], [])
+        if "HAS_CAPACITY" in q:
+            return fake_result(["id"], [["CAP1"]])
+        if "HAS_VARIABLE_FEATURE" in q:
+            return fake_result(["feature_id"], [["F1"]])
+        raise AssertionError(f"unexpected query: {q}")
+
+
+class TestGetEngineContext:
+
+    @pytest.fixture
+    def db(self):
+        import database
+        database._query_cache.invalidate()
+        conn = database.GraphConnection()
+        conn.graph = FakeEngineGraph()
+        yield conn
+        database._query_cache.invalidate()
+
+    def test_bundle_shapes(self, db):
+        bundle = db.get_engine_context(["STR_A"], "GDB", "ENV_KITCHEN")
+        assert bundle["logic_gates"] == [{"gate_id": "G1", "stressor_id": "STR_A"}]
+        assert bundle["applications"][0]["id"] == "APP_KITCHEN"
+        assert bundle["accessory_codes"][0]["code"] == "EXL"
+        assert bundle["environment_chain"] == ["ENV_KITCHEN", "ENV_INDOOR"]
+        assert bundle["hard_constraints"] == [{"id": "HC1"}]
+        assert bundle["installation_constraints"] == [{"id": "IC1"}]
+        assert bundle["required_parameters"] == [{"param_id": "P1"}]
+        assert bundle["product_traits"] == [{"id": "T_FILTER"}]
+        assert bundle["optimization_strategy"] is None
+        assert bundle["capacity_rules"] == [{"id": "CAP1"}]
+        assert bundle["variable_features"] == [{"feature_id": "F1"}]
+        assert len(db.graph.queries) == 11
+
+    def test_cached_collections_not_refetched(self, db):
+        db.get_engine_context(["STR_A"], "GDB")
+        db.graph.queries.clear()
+        bundle = db.get_engine_context([], "GDB")
+        assert bundle["logic_gates"] == [] and bundle["applications"][0]["id"] == "APP_KITCHEN"
+        assert not any("(app:Application)" in q or "HAS_VARIABLE_FEATURE" in q or "HAS_TRAIT" in q
+                       for q in db.graph.queries)
@@ -0,0 +1,97 @@
+"""Tests for incremental engine re-evaluation across turns (logic/engine_stages.py)."""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from logic.engine_stages import EngineStageCache, TraitStage, TraitStageKey
+from backend.logic.universal_engine import TraitBasedEngine, TraitMatch
+
+QUERY = "kitchen ventilation grease"
+KEY = TraitStageKey(frozenset({"STR_GREASE"}), "GDB", 3)
+
+
+def _stage():
+    matches = [TraitMatch(product_family_id="FAM_GDB", product_family_name="GDB")]
+    return TraitStage(rules=[], matches=matches, non_vetoed=list(matches), assembly=None)
+
+
+class TestEngineStageCache:
+
+    def test_hit_requires_same_session_and_key(self):
+        cache = EngineStageCache(enabled=True)
+        cache.put("s1", KEY, _stage())
+        assert cache.get("s1", KEY) is not None
+        assert cache.get("s2", KEY) is None
+        assert cache.get("s1", KEY._replace(product_hint="GDC")) is None
+        assert cache.get("s1", KEY._replace(graph_version=4)) is None
+        assert cache.get(None, KEY) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_served_copies_are_private(self):
+        cache = EngineStageCache(enabled=True)
+        cache.put("s1", KEY, _stage())
+        first = cache.get("s1", KEY)
+        assert first.non_vetoed[0] is first.matches[0]
+        first.matches[0].vetoed = True
+        first.matches.append(TraitMatch(product_family_id="FAM_X", product_family_name="X"))
+        second = cache.get("s1", KEY)
+        assert len(second.matches) == 1 and not second.matches[0].vetoed
+
+    def test_ttl_and_session_eviction(self, clock):
+        cache = EngineStageCache(enabled=True, ttl_s=60, max_sessions=2, clock=clock)
+        cache.put("s1", KEY, _stage())
+        clock.now = 61
+        assert cache.get("s1", KEY) is None
+        cache.put("s1", KEY, _stage())
+        cache.put("s2", KEY, _stage())
+        cache.put("s3", KEY, _stage())
+        assert cache.get("s1", KEY) is None
+        assert cache.stats()["sessions"] == 2
+
+    def test_disabled(self):
+        cache = EngineStageCache(enabled=False)
+        cache.put("s1", KEY, _stage())
+        assert cache.get("s1", KEY) is None
+        assert "engine_incremental_hits_total 0" in cache.render_prometheus()
+
+
+class TestIncrementalProcessQuery:
+
+    def _engine(self, mock_db):
+        return TraitBasedEngine(mock_db, stage_cache=EngineStageCache(enabled=True))
+
+    def test_follow_up_turn_reuses_trait_stage(self, mock_db):
+        engine = self._engine(mock_db)
+        first = engine.process_query(QUERY, context={}, session_id="s1")
+        rules_calls = mock_db.get_causal_rules_for_stressors.call_count
+        family_calls = mock_db.get_all_product_families_with_traits.call_count
+
+        second = engine.process_query(QUERY, context={"airflow_m3h": 3400}, session_id="s1")
+        assert mock_db.get_causal_rules_for_stressors.call_count == rules_calls
+        assert mock_db.get_all_product_families_with_traits.call_count == family_calls
+        assert engine.stage_cache.stats()["hits"] == 1
+        assert [m.product_family_id for m in second.ranked_products] == \
+            [m.product_family_id for m in first.ranked_products]
+
+    def test_changed_inputs_recompute(self, mock_db):
+        engine = self._engine(mock_db)
+        engine.process_query(QUERY, session_id="s1")
+        calls = mock_db.get_causal_rules_for_stressors.call_count
+        engine.process_query(QUERY, product_hint="GDB", session_id="s1")
+        engine.process_query(QUERY, product_hint="GDB", session_id="s2")
+        engine.process_query(QUERY, product_hint="GDB")
+        assert mock_db.get_causal_rules_for_stressors.call_count == calls + 3
+        assert engine.stage_cache.stats()["hits"] == 0
+
+    def test_reused_verdict_equals_full_run(self, mock_db):
+        context = {"airflow_m3h": 3400}
+        incremental = self._engine(mock_db)
+        incremental.process_query(QUERY, product_hint="GDB", session_id="s1")
+        reused = incremental.process_query(QUERY, product_hint="GDB", context=dict(context), session_id="s1")
+        full = TraitBasedEngine(mock_db).process_query(QUERY, product_hint="GDB", context=dict(context))
+        assert incremental.stage_cache.stats()["hits"] == 1
+        assert reused == full
@@ -18,33 +18,17 @@ BACKEND_DIR = Path(__file__).resolve().parent.parent
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from db_result_helpers import result_to_dicts, result_single, result_value, _unwrap_value
+from db_result_helpers import (
+    result_to_dicts, result_single, result_value, _unwrap_value,
+    iter_dicts, iter_rows, result_to_tuples, result_column, has_rows,
+)
+from tests.conftest import FakeQueryResult
 
 
 # =============================================================================
 # Simulate FalkorDB QueryResult for testing helper methods
 # =============================================================================
 
-class FakeQueryResult:
-    """Simulates FalkorDB's QueryResult object.
-
-    FalkorDB returns:
-      - header: list of (type_int, column_name) tuples
-      - result_set: list of lists (positional, NOT named dicts)
-    """
-    def __init__(self, header: list[tuple], result_set: list[list]):
-        self._header = header
-        self._result_set = result_set
-
-    @property
-    def header(self):
-        return self._header
-
-    @property
-    def result_set(self):
-        return self._result_set
-
-
 class FakeNode:
     """Simulates FalkorDB's Node object returned for full node queries."""
     def __init__(self, node_id, labels, properties):
@@ -503,3 +487,71 @@ class TestUnwrapValue:
         assert result["_type"] == "HAS_TAG"
         assert result["weight"] == 1.0
         assert result["_id"] == 99
+
+
+# =============================================================================
+# TESTS: Lazy / columnar conversion
+# =============================================================================
+
+class TestLazyAndColumnarConversion:
+    """iter_dicts / iter_rows / result_column and the single-row fast paths."""
+
+    @pytest.fixture
+    def result(self):
+        return FakeQueryResult(
+            [(1, "id"), (1, "name"), (1, "n")],
+            [
+                ["A", "Alpha", FakeNode(1, ["Project"], {"name": "Alpha"})],
+                ["B", "Beta", None],
+            ],
+        )
+
+    def test_iter_dicts_is_lazy_and_matches_eager(self, result):
+        rows = iter_dicts(result)
+        assert not isinstance(rows, list)
+        assert list(rows) == result_to_dicts(result)
+
+    def test_iter_dicts_empty(self):
+        assert list(iter_dicts(FakeQueryResult([(1, "x")], []))) == []
+        assert list(iter_dicts(None)) == []
+
+    def test_has_rows(self, result):
+        assert has_rows(result)
+        assert not has_rows(FakeQueryResult([(1, "x")], []))
+        assert not has_rows(None)
+
+    def test_iter_rows_tuples(self, result):
+        rows = list(iter_rows(result))
+        assert rows[1] == ("B", "Beta", None)
+        assert rows[0][2]["_labels"] == ["Project"]
+
+    def test_named_rows(self, result):
+        first = result_to_tuples(result, named=True)[0]
+        assert first.id == "A"
+        assert first.name == "Alpha"
+        assert first._fields == ("id", "name", "n")
+
+    def test_named_rows_rename_invalid_columns(self):
+        res = FakeQueryResult([(1, "count(n)"), (1, "ok")], [[3, True]])
+        row = result_to_tuples(res, named=True)[0]
+        assert row.ok is True
+        assert row[0] == 3
+
+    def test_result_column(self, result):
+        assert result_column(result, "id") == ["A", "B"]
+        assert result_column(result, 1) == ["Alpha", "Beta"]
+        assert result_column(result, "missing") == []
+        assert result_column(FakeQueryResult([(1, "id")], []), "id") == []
+
+    def test_single_row_only_converts_first_row(self):
+        class Exploding:
+            properties = {}
+            labels = []
+
+            @property
+            def id(self):
+                raise AssertionError("second row converted")
+
+        res = FakeQueryResult([(1, "n")], [[FakeNode(1, ["A"], {"k": 1})], [Exploding()]])
+        assert result_single(res)["n"]["k"] == 1
+        assert result_value(res, "n")["k"] == 1
@@ -0,0 +1,125 @@
+"""Tests for the paged / projected / level-of-detail graph export."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from redis.exceptions import ResponseError
+
+from tests.conftest import fake_result
+
+NODE_COLUMNS = ["id", "labels", "properties"]
+REL_COLUMNS = ["id", "type", "source", "target", "properties"]
+
+
+@pytest.fixture
+def db():
+    from database import GraphConnection
+    conn = GraphConnection()
+    conn.graph = MagicMock()
+    return conn
+
+
+class TestProjection:
+
+    def test_embeddings_excluded_server_side(self, db):
+        db.graph.query.side_effect = lambda q, params=None: (
+            fake_result(NODE_COLUMNS, [[1, ["Project"], [["name", "Alpha"]]]]) if "labels(n)" in q
+            else fake_result(REL_COLUMNS, [])
+        )
+        data = db.get_graph_data()
+        assert data["nodes"] == [{"id": "1", "label": "Project", "name": "Alpha", "properties": {"name": "Alpha"}}]
+        query, params = db.graph.query.call_args_list[0].args
+        assert "n[k]" in query
+        assert params == {"exclude": ["embedding"], "include": None}
+
+    def test_property_whitelist(self, db):
+        db.graph.query.return_value = fake_result(NODE_COLUMNS, [])
+        db.get_graph_data(properties=["name"])
+        assert db.graph.query.call_args.args[1]["include"] == ["name"]
+
+    def test_falls_back_to_property_maps(self, db):
+        def query(q, params=None):
+            if "n[k]" in q or "r[k]" in q:
+                raise ResponseError("Invalid input '['")
+            if "labels(n)" in q:
+                return fake_result(NODE_COLUMNS, [[1, ["Project"], {"name": "Alpha", "code": "A", "embedding": [0.1]}]])
+            return fake_result(REL_COLUMNS, [[7, "HAS", 1, 2, {"embedding": [0.2], "w": 1}]])
+
+        db.graph.query.side_effect = query
+        data = db.get_graph_data(properties=["name", "w"])
+        assert data["nodes"][0]["properties"] == {"name": "Alpha"}
+        assert data["relationships"][0]["properties"] == {"w": 1}
+
+
+class TestPaging:
+
+    def test_page_seeks_by_id(self, db):
+        db.graph.query.return_value = fake_result(
+            NODE_COLUMNS, [[4, ["Project"], [["name", "A"]]], [9, ["Project"], [["name", "B"]]]],
+        )
+        page = db.get_graph_data_page("nodes", after=3, limit=2)
+        assert [n["id"] for n in page["items"]] == ["4", "9"]
+        assert page["next_after"] == 9
+        params = db.graph.query.call_args.args[1]
+        assert params["after"] == 3 and params["limit"] == 2
+
+    def test_short_page_ends_kind(self, db):
+        db.graph.query.return_value = fake_result(REL_COLUMNS, [[7, "HAS", 1, 2, []]])
+        page = db.get_graph_data_page("relationships", limit=5)
+        assert page["next_after"] is None
+
+    def test_relationship_pages_seek_by_source_node(self, db):
+        db.graph.query.return_value = fake_result(REL_COLUMNS, [
+            [10, "R", 4, 5, []], [11, "R", 4, 6, []], [None, None, 7, None, None],
+        ])
+        page = db.get_graph_data_page("relationships", after=3, limit=2)
+        assert [r["id"] for r in page["items"]] == ["10", "11"]
+        assert page["next_after"] == 7
+        query, params = db.graph.query.call_args.args
+        assert "id(a) > $after" in query and "id(r) > $after" not in query
+        assert params["after"] == 3 and params["limit"] == 2
+
+    def test_unknown_kind(self, db):
+        with pytest.raises(ValueError):
+            db.get_graph_data_page("edges")
+
+    def test_iter_graph_data_walks_nodes_then_relationships(self, db):
+        pages = {
+            ("nodes", -1): [[1, ["A"], []], [2, ["A"], []]],
+            ("nodes", 2): [[3, ["B"], []]],
+            ("relationships", -1): [[10, "R", 1, 3, []]],
+        }
+
+        def query(q, params=None):
+            kind = "nodes" if "labels(n)" in q else "relationships"
+            columns = NODE_COLUMNS if kind == "nodes" else REL_COLUMNS
+            return fake_result(columns, pages.get((kind, params["after"]), []))
+
+        db.graph.query.side_effect = query
+        items = list(db.iter_graph_data(page_size=2))
+        assert [(kind, item["id"]) for kind, item in items] == [
+            ("nodes", "1"), ("nodes", "2"), ("nodes", "3"), ("relationships", "10"),
+        ]
+
+
+class TestClusters:
+
+    def test_label_clusters_and_aggregated_edges(self, db):
+        db.graph.query.side_effect = lambda q, params=None: (
+            fake_result(["source", "type", "target", "count"], [["Project", "USES", "Product", 12]])
+            if "type(r)" in q
+            else fake_result(["label", "count"], [["Project", 40], ["Product", 7]])
+        )
+        data = db.get_graph_clusters()
+        assert data["lod"] == "clusters"
+        assert [(n["id"], n["count"]) for n in data["nodes"]] == [("cluster:Project", 40), ("cluster:Product", 7)]
+        edge = data["relationships"][0]
+        assert (edge["source"], edge["target"], edge["count"]) == ("cluster:Project", "cluster:Product", 12)
+
@@ -0,0 +1,241 @@
+"""Tests for the bounded FalkorDB connection pool (graph_pool.py).
+
+No real DB: the pool factory returns MagicMock clients/graphs, so these tests
+exercise checkout bounds, re-entrancy, per-connection reconnect and stats.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from graph_pool import GraphConnectionPool, PooledGraph, PoolTimeoutError
+
+
+def _factory(created: list):
+    def make():
+        client = MagicMock()
+        client.connection.ping.return_value = True
+        graph = MagicMock(name=f"graph{len(created)}")
+        created.append((client, graph))
+        return client, graph
+    return make
+
+
+class TestGraphConnectionPool:
+
+    def test_fill_opens_min_size(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=3, max_size=5)
+        pool.fill()
+        assert len(created) == 3
+        stats = pool.stats()
+        assert stats["size"] == 3
+        assert stats["idle"] == 3
+        assert stats["in_use"] == 0
+
+    def test_connections_are_reused(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=2)
+        with pool.connection() as g1:
+            pass
+        with pool.connection() as g2:
+            pass
+        assert g1 is g2
+        assert len(created) == 1
+        assert pool.stats()["checkouts"] == 2
+
+    def test_concurrent_threads_get_distinct_connections(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=4)
+        barrier = threading.Barrier(3)
+        seen = []
+
+        def worker():
+            with pool.connection() as g:
+                seen.append(g)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(g) for g in seen}) == 3
+        assert pool.stats()["peak_in_use"] == 3
+
+    def test_reentrant_checkout_reuses_lease(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1)
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                assert inner is outer
+            assert pool.current() is outer
+        assert pool.current() is None
+        assert pool.stats()["in_use"] == 0
+
+    def test_checkout_times_out_when_exhausted(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1, timeout=0.05)
+        holding = threading.Event()
+        release = threading.Event()
+
+        def holder():
+            with pool.connection():
+                holding.set()
+                release.wait(timeout=5)
+
+        t = threading.Thread(target=holder)
+        t.start()
+        holding.wait(timeout=5)
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+        release.set()
+        t.join()
+        assert pool.stats()["timeouts"] == 1
+
+    def test_waiter_records_wait_time(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1, timeout=5)
+        holding = threading.Event()
+
+        def holder():
+            with pool.connection():
+                holding.set()
+                time.sleep(0.05)
+
+        t = threading.Thread(target=holder)
+        t.start()
+        holding.wait(timeout=5)
+        with pool.connection():
+            pass
+        t.join()
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["max_wait_ms"] > 0
+
+    def test_reconnect_only_replaces_callers_connection(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=2, max_size=2)
+        pool.fill()
+        other_graph = {}
+        ready = threading.Event()
+        done = threading.Event()
+
+        def other():
+            with pool.connection() as g:
+                other_graph["g"] = g
+                ready.set()
+                done.wait(timeout=5)
+                other_graph["after"] = pool.current()
+
+        t = threading.Thread(target=other)
+        t.start()
+        ready.wait(timeout=5)
+        with pool.connection() as mine:
+            fresh = pool.reconnect()
+            assert fresh is not mine
+            assert pool.current() is fresh
+        done.set()
+        t.join()
+        assert other_graph["after"] is other_graph["g"]
+        assert pool.stats()["reconnects"] == 1
+
+    def test_reconnect_without_lease_is_noop(self):
+        pool = GraphConnectionPool(_factory([]), min_size=0, max_size=1)
+        assert pool.reconnect() is None
+
+    def test_failed_health_check_replaces_idle_connection(self):
+        created = []
+        pool = GraphConnectionPool(
+            _factory(created), min_size=1, max_size=1, health_check_interval=0,
+        )
+        pool.fill()
+        created[0][0].connection.ping.side_effect = Exception("Connection reset")
+        with pool.connection() as g:
+            assert g is created[1][1]
+        assert pool.stats()["health_check_failures"] == 1
+
+    def test_connection_error_discards_connection(self):
+        from redis.exceptions import ConnectionError as RedisConnectionError
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1)
+        with pytest.raises(RedisConnectionError):
+            with pool.connection():
+                raise RedisConnectionError("socket closed")
+        assert pool.stats()["size"] == 0
+        with pool.connection() as g:
+            assert g is created[1][1]
+
+    def test_pooled_graph_borrows_per_query(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1)
+        proxy = PooledGraph(pool)
+        proxy.query("RETURN 1", {"a": 1})
+        created[0][1].query.assert_called_once_with("RETURN 1", {"a": 1})
+        assert pool.stats()["in_use"] == 0
+
+    def test_pooled_graph_forwards_data_attributes_as_is(self):
+        created = []
+        pool = GraphConnectionPool(_factory(created), min_size=0, max_size=1)
+        proxy = PooledGraph(pool)
+        proxy.list_indices()
+        created[0][1].name = "hvac"
+        assert proxy.name == "hvac"
+        created[0][1].list_indices.assert_called_once_with()
+        assert pool.stats()["in_use"] == 0
+
+
+class TestGraphConnectionPooling:
+    """GraphConnection wiring: explicit graph handles still bypass the pool."""
+
+    def _make_db(self):
+        from database import GraphConnection
+        db = GraphConnection()
+        created = []
+        db._open_client = _factory(created)
+        return db, created
+
+    def test_explicit_graph_bypasses_pool(self):
+        from database import GraphConnection
+        db = GraphConnection()
+        db.graph = MagicMock()
+        assert db.connect() is db.graph
+        assert db._execute_with_retry(lambda: db.connect()) is db.graph
+        assert db._pool is None
+
+    def test_execute_with_retry_uses_one_leased_connection(self):
+        db, created = self._make_db()
+        seen = db._execute_with_retry(lambda: (db.connect(), db.connect()))
+        assert seen[0] is seen[1] is created[0][1]
+        assert db.pool_stats()["in_use"] == 0
+
+    def test_retry_reconnects_only_the_leased_connection(self):
+        from redis.exceptions import ConnectionError as RedisConnectionError
+        db, created = self._make_db()
+        attempts = [0]
+
+        def flaky():
+            attempts[0] += 1
+            graph = db.connect()
+            if attempts[0] == 1:
+                raise RedisConnectionError("Connection reset by peer")
+            return graph
+
+        graph = db._execute_with_retry(flaky)
+        assert graph is created[1][1]
+        stats = db.pool_stats()
+        assert stats["reconnects"] == 1
+        assert stats["size"] == 1
+
+    def test_connect_outside_retry_returns_pooled_facade(self):
+        db, _ = self._make_db()
+        assert isinstance(db.connect(), PooledGraph)
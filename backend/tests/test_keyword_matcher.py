@@ -0,0 +1,148 @@
+"""Tests for the Aho-Corasick keyword matcher and the lookups compiled from DomainConfig."""
+
+import copy
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from keyword_matcher import KeywordMatcher, application_matcher
+
+QUERIES = [
+    "hospital with FZ material",
+    "hospital with RF material",
+    "GDB 600x600 for a kitchen exhaust",
+    "GDC-FLEX outdoor on a roof, no insulation, swimming pool nearby",
+    "chlorine in a pool hall, stainless steel RF housing with bayonet",
+    "Potrzebuję GDP bez izolacji na dachu, marine offshore",
+    "pharmaceutical cleanroom, zinc magnesium ZM, 3400 m3/h",
+    "",
+]
+
+
+# Reference implementations: the linear scans the matcher replaced.
+
+def _old_search_keywords(config, query):
+    return {kw for kw in config.get_all_search_keywords() if kw.lower() in query.lower()}
+
+
+def _old_material_environment(config, query):
+    query_lower = query.lower()
+    material = next((m for m in config.material_hierarchy
+                     if m.code.lower() in query_lower or m.full_name.lower() in query_lower), None)
+    environment = next((e for e in config.demanding_environments
+                        if any(n.lower() in query_lower for n in [e.name] + e.aliases)), None)
+    if not material or not environment or material.code in environment.required_materials:
+        return None
+    return material.code, environment.name
+
+
+def _old_product_application(config, query):
+    query_lower = query.lower()
+    for prod in config.product_capabilities:
+        if prod.family.lower() not in query_lower:
+            continue
+        for warning in prod.warning_applications:
+            for trigger in warning.trigger:
+                if trigger.lower() in query_lower:
+                    return prod.family, trigger
+    for warn in config.installation_warnings:
+        trigger_found = any(t.lower() in query_lower for t in warn.trigger)
+        condition_met = (warn.condition.lower() in query_lower or "no insulation" in query_lower
+                         or "bez izolacji" in query_lower)
+        if trigger_found and condition_met:
+            for prod in warn.products_affected:
+                if prod.lower() in query_lower:
+                    return prod, ", ".join(warn.trigger)
+    return None
+
+
+def _old_accessory(config, query):
+    query_lower = query.lower()
+    for acc in config.accessory_compatibility:
+        if acc.accessory.lower() not in query_lower:
+            continue
+        for incompat in acc.NOT_compatible_with:
+            if incompat.lower() in query_lower:
+                return acc.accessory, incompat
+    return None
+
+
+class TestKeywordMatcher:
+
+    def test_matches_substring_semantics(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            keywords = {"".join(rng.choice("ab ") for _ in range(rng.randint(1, 4))) for _ in range(8)}
+            matcher = KeywordMatcher([(k, k) for k in keywords])
+            for _ in range(10):
+                text = "".join(rng.choice("abAB ") for _ in range(rng.randint(0, 12)))
+                assert matcher.payloads(text) == {k for k in keywords if k in text.lower()}
+
+    def test_positions_and_overlaps(self):
+        matcher = KeywordMatcher([("he", "he"), ("she", "she"), ("hers", "hers")])
+        assert matcher.scan("ushers") == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+    def test_word_boundary(self):
+        matcher = KeywordMatcher().add("rf", "rf", word_boundary=True).add("pool", "pool").build()
+        assert matcher.payloads("surface near a swimming-pool") == {"pool"}
+        assert matcher.payloads("RF housing") == {"rf"}
+        assert matcher.payloads("GDB-600x600-RF") == {"rf"}
+
+    def test_empty_keyword_always_matches(self):
+        matcher = KeywordMatcher([("", "any"), ("x", "x")])
+        assert matcher.payloads("abc") == {"any"}
+
+    def test_add_after_build_rejected(self):
+        matcher = KeywordMatcher([("a", 1)])
+        with pytest.raises(RuntimeError):
+            matcher.add("b", 2)
+
+
+class TestApplicationMatcher:
+
+    def test_first_application_in_list_order_wins(self):
+        apps = [{"name": "Hospital", "keywords": ["clinic"]}, {"name": "Kitchen", "keywords": ["hospital kitchen"]}]
+        hits = [payload for _, _, payload in application_matcher(apps).scan("a hospital kitchen hood")]
+        assert min(hits) == (0, 0, "hospital")
+
+    def test_rebuilt_only_when_names_or_keywords_change(self):
+        apps = [{"name": "Pool", "keywords": None}]
+        matcher = application_matcher(apps)
+        assert application_matcher(apps) is matcher
+        assert application_matcher(copy.deepcopy(apps)) is matcher
+        changed = application_matcher([{"name": "Pool", "keywords": ["spa"]}])
+        assert changed is not matcher
+        assert changed.payloads("spa") == {(0, 1, "spa")}
+
+
+class TestDomainConfigLookups:
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_same_results_as_linear_scans(self, config, query):
+        assert set(config.match_search_keywords(query)) == _old_search_keywords(config, query)
+
+        result = config.check_material_environment_mismatch(query)
+        expected = _old_material_environment(config, query)
+        assert (result["material"], result["environment"]) == expected if result else expected is None
+
+        result = config.check_product_application_mismatch(query)
+        expected = _old_product_application(config, query)
+        assert (result["product"], result["trigger"]) == expected if result else expected is None
+
+        result = config.check_accessory_compatibility(query)
+        expected = _old_accessory(config, query)
+        assert (result["accessory"], result["product"]) == expected if result else expected is None
+
+    def test_policy_keywords(self, config):
+        for policy in config.policies:
+            for keyword in policy.triggers.keywords:
+                assert policy in config.get_active_policies_for_query(f"project with {keyword} inside")
+
+    def test_matcher_compiled_once_per_config(self, config):
+        assert config.keyword_matcher is config.keyword_matcher
@@ -0,0 +1,170 @@
+"""Tests for the shared LLM provider client registry and its HTTP timing metrics (llm_clients.py)."""
+
+import gc
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import llm_clients
+from llm_clients import ClientMetrics, ProviderClients, timing_hooks
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def do_GET(self):
+        body = b"{}" if self.path == "/ok" else b"nope"
+        self.send_response(200 if self.path == "/ok" else 503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class _FakeClient:
+    pass
+
+
+class TestProviderClients:
+
+    def _registry(self, metrics):
+        built = []
+
+        def build(api_key):
+            built.append(api_key)
+            return _FakeClient(), MagicMock(name=f"pool-{api_key}")
+
+        return ProviderClients({"openai": build}, metrics=metrics), built
+
+    def test_client_reused_until_key_rotates(self):
+        metrics = ClientMetrics()
+        registry, built = self._registry(metrics)
+        keys = iter(["k1", "k1", "k2"])
+        with patch.object(llm_clients.api_keys_manager, "get_key", side_effect=lambda p: next(keys)):
+            first = registry.get("openai")
+            assert registry.get("openai") is first
+            assert registry.get("openai") is not first
+        assert built == ["k1", "k2"]
+        assert metrics.stats()["openai"]["client_builds"] == 2
+
+    def _pooled_registry(self):
+        pools = {}
+
+        def build(api_key):
+            pools[api_key] = MagicMock(name=f"pool-{api_key}")
+            return _FakeClient(), pools[api_key]
+
+        return ProviderClients({"openai": build}, metrics=ClientMetrics()), pools
+
+    def test_rotation_keeps_in_flight_client_open(self):
+        registry, pools = self._pooled_registry()
+        started, finish = threading.Event(), threading.Event()
+        closed_during_call = []
+
+        def call():
+            client = registry.get("openai")
+            started.set()
+            finish.wait(5)
+            closed_during_call.append(pools["k1"].close.called)
+            del client
+
+        keys = iter(["k1", "k2"])
+        with patch.object(llm_clients.api_keys_manager, "get_key", side_effect=lambda p: next(keys)):
+            worker = threading.Thread(target=call)
+            worker.start()
+            started.wait(5)
+            registry.get("openai")          # key rotated while the call is running
+            gc.collect()
+            finish.set()
+            worker.join()
+        gc.collect()
+        assert closed_during_call == [False]
+        pools["k1"].close.assert_called_once_with()
+        pools["k2"].close.assert_not_called()
+
+    def test_reset_closes_clients_once_released(self):
+        registry, pools = self._pooled_registry()
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k1"):
+            client = registry.get("openai")
+        registry.reset()
+        gc.collect()
+        pools["k1"].close.assert_not_called()
+        del client
+        gc.collect()
+        pools["k1"].close.assert_called_once_with()
+
+    def test_no_key_no_client(self):
+        registry, built = self._registry(ClientMetrics())
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value=None):
+            assert registry.get("openai") is None
+        assert built == []
+
+    def test_concurrent_first_use_builds_once(self):
+        registry, built = self._registry(ClientMetrics())
+        start = threading.Barrier(8)
+        clients = []
+
+        def worker():
+            start.wait()
+            clients.append(registry.get("openai"))
+
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k"):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert len(built) == 1
+        assert len({id(c) for c in clients}) == 1
+
+    def test_sdk_builders_configure_pooled_clients(self):
+        client, pool = llm_clients._build_openai("test-key")
+        assert client.api_key == "test-key"
+        assert client._client is pool and pool._event_hooks["response"]
+
+
+class TestTimingHooks:
+
+    def test_connection_reused_and_ttfb_recorded(self, server):
+        metrics = ClientMetrics()
+        with httpx.Client(event_hooks=timing_hooks("openai", metrics)) as client:
+            client.get(f"{server}/ok")
+            client.get(f"{server}/ok")
+            client.get(f"{server}/fail")
+        stats = metrics.stats()["openai"]
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["errors"] == 1
+        assert stats["avg_ttfb_ms"] is not None and stats["avg_connect_ms"] is not None
+
+    def test_prometheus_rendering(self):
+        metrics = ClientMetrics()
+        metrics.record_build("gemini")
+        metrics.record_request("gemini", ttfb=0.3, connect=0.05)
+        metrics.record_request("gemini", ttfb=1.5)
+        text = metrics.render_prometheus()
+        assert 'llm_client_requests_total{provider="gemini"} 2' in text
+        assert 'llm_client_connections_total{provider="gemini"} 1' in text
+        assert 'llm_client_ttfb_seconds_bucket{provider="gemini",le="0.5"} 1' in text
+        assert 'llm_client_ttfb_seconds_bucket{provider="gemini",le="+Inf"} 2' in text
@@ -0,0 +1,210 @@
+"""Tests for latency-aware LLM routing: stats, circuit breaking, hedging (llm_routing.py)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import llm_routing
+from llm_router import LLMResult
+from llm_routing import CircuitOpenError, LLMRouter, RoutePolicy, valid_result
+
+
+class StubProviders:
+    """Local stand-ins for provider calls: per-model delay and response text."""
+
+    def __init__(self, **models):
+        self.models = models      # model -> (delay_s, text or None for an error)
+        self.calls: list[str] = []
+        self.release = threading.Event()
+
+    def __call__(self, model: str) -> LLMResult:
+        self.calls.append(model)
+        delay, text = self.models[model]
+        if delay is None:
+            self.release.wait(5)
+        elif delay:
+            time.sleep(delay)
+        if text is None:
+            return LLMResult(text="", error=f"{model} unavailable")
+        return LLMResult(text=text)
+
+
+def _circuit_error(message):
+    return LLMResult(text="", error=message)
+
+
+class TestValidResult:
+
+    def test_json_mode_requires_parseable_json(self):
+        assert valid_result(LLMResult(text='{"a": 1}'), json_mode=True)
+        assert not valid_result(LLMResult(text="{truncated"), json_mode=True)
+        assert valid_result(LLMResult(text="plain"), json_mode=False)
+        assert not valid_result(LLMResult(text="", error="boom"))
+
+
+class TestStats:
+
+    def test_percentiles_over_successful_calls(self):
+        router = LLMRouter()
+        for i in range(1, 21):
+            router.record("m", i / 10, ok=True)
+        router.record("m", 99.0, ok=False)
+        assert router.percentile("m", 0.95) == pytest.approx(1.9)
+        assert router.percentile("m", 0.5) == pytest.approx(1.0)
+        stats = router.stats()["models"]["m"]
+        assert stats["calls"] == 21 and stats["failures"] == 1
+        assert stats["p95_ms"] == 1900.0
+
+    def test_hedge_delay_default_until_enough_samples(self):
+        router = LLMRouter()
+        router.record("m", 0.5, ok=True)
+        assert router.hedge_delay("m") == llm_routing.LLM_HEDGE_DEFAULT_DELAY_S
+        for _ in range(llm_routing.LLM_HEDGE_MIN_SAMPLES):
+            router.record("m", 3.0, ok=True)
+        assert router.hedge_delay("m") == 3.0
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures_then_probes(self, clock):
+        router = LLMRouter(failure_threshold=3, cooldown_s=30, clock=clock)
+        for _ in range(3):
+            assert router.admit("m")
+            router.record("m", 0.1, ok=False)
+        assert router.circuit("m") == "open"
+        assert not router.admit("m")
+        clock.now += 31
+        assert router.admit("m")            # the single half-open probe
+        assert not router.admit("m")
+        router.record("m", 0.1, ok=True)
+        assert router.circuit("m") == "closed" and router.admit("m")
+
+    def test_failed_probe_reopens(self, clock):
+        router = LLMRouter(failure_threshold=1, cooldown_s=30, clock=clock)
+        router.record("m", 0.1, ok=False)
+        clock.now += 31
+        assert router.admit("m")
+        router.record("m", 0.1, ok=False)
+        assert not router.admit("m")
+
+    def test_open_primary_routes_to_backup(self, clock):
+        stubs = StubProviders(primary=(0, '{"a": 1}'), backup=(0, '{"b": 2}'))
+        router = LLMRouter({"scribe": RoutePolicy(backup="backup", hedge=False, circuit_breaker=True)},
+                           failure_threshold=1, clock=clock)
+        router.record("primary", 0.1, ok=False)
+        result = router.call("scribe", "primary", stubs, on_circuit_open=_circuit_error)
+        assert result.text == '{"b": 2}'
+        assert stubs.calls == ["backup"]
+
+    def test_all_open_fails_fast(self, clock):
+        stubs = StubProviders(primary=(0, "{}"))
+        router = LLMRouter({"synthesis": RoutePolicy(circuit_breaker=True)}, failure_threshold=1, clock=clock)
+        router.record("primary", 0.1, ok=False)
+        result = router.call("synthesis", "primary", stubs, on_circuit_open=_circuit_error)
+        assert result.error == "Circuit open for primary"
+        assert stubs.calls == []
+
+    def test_breaker_is_opt_in_per_site(self, clock):
+        stubs = StubProviders(primary=(0, "{}"))
+        router = LLMRouter({"judge": RoutePolicy()}, failure_threshold=1, clock=clock)
+        router.record("primary", 0.1, ok=False)
+        assert router.call("judge", "primary", stubs, on_circuit_open=_circuit_error).text == "{}"
+        with patch.dict("os.environ", {"LLM_ROUTE_SCRIBE_BREAKER": "1"}):
+            assert RoutePolicy.from_env("scribe").circuit_breaker
+        assert not RoutePolicy.from_env("synthesis").circuit_breaker
+
+    def test_invalid_json_does_not_open_circuit(self, clock):
+        stubs = StubProviders(primary=(0, '{"content_segments": [{"text": "trunc'))
+        router = LLMRouter({"synthesis": RoutePolicy(circuit_breaker=True)}, failure_threshold=2, clock=clock)
+        for _ in range(5):
+            result = router.call("synthesis", "primary", stubs, on_circuit_open=_circuit_error)
+            assert result.text.startswith('{"content_segments"')
+        assert router.circuit("primary") == "closed"
+        assert router.stats()["models"]["primary"]["failures"] == 0
+
+    def test_guarded_raises_while_open(self, clock):
+        router = LLMRouter({"debate": RoutePolicy(circuit_breaker=True)}, failure_threshold=2, clock=clock)
+        failing = lambda: LLMResult(text="", error="down")
+        for _ in range(2):
+            router.guarded("debate", "anthropic", failing)
+        with pytest.raises(CircuitOpenError):
+            router.guarded("debate", "anthropic", failing)
+
+
+class TestHedging:
+
+    def test_fast_primary_never_hedges(self):
+        stubs = StubProviders(primary=(0, '{"p": 1}'), backup=(0, '{"b": 1}'))
+        router = LLMRouter({"scribe": RoutePolicy(backup="backup")})
+        assert router.call("scribe", "primary", stubs).text == '{"p": 1}'
+        assert stubs.calls == ["primary"]
+        assert router.stats()["hedges"] == {}
+
+    def test_slow_primary_hedged_after_delay(self):
+        stubs = StubProviders(primary=(None, '{"p": 1}'), backup=(0, '{"b": 1}'))
+        router = LLMRouter({"scribe": RoutePolicy(backup="backup")})
+        with patch.object(router, "hedge_delay", return_value=0.05):
+            t0 = time.monotonic()
+            result = router.call("scribe", "primary", stubs)
+        assert result.text == '{"b": 1}'
+        assert time.monotonic() - t0 < 2
+        assert router.stats()["hedges"] == {"scribe": {"fired": 1, "backup_won": 1}}
+        stubs.release.set()
+
+    def test_invalid_json_fails_over_immediately(self):
+        stubs = StubProviders(primary=(0, "{not json"), backup=(0, '{"b": 1}'))
+        router = LLMRouter({"synthesis": RoutePolicy(backup="backup")})
+        with patch.object(router, "hedge_delay", return_value=30):
+            t0 = time.monotonic()
+            assert router.call("synthesis", "primary", stubs).text == '{"b": 1}'
+        assert time.monotonic() - t0 < 2
+        assert router.stats()["models"]["primary"]["failures"] == 0
+        assert router.stats()["hedges"] == {}
+
+    def test_both_fail_returns_last_result(self):
+        stubs = StubProviders(primary=(0, None), backup=(0, None))
+        router = LLMRouter({"scribe": RoutePolicy(backup="backup")})
+        result = router.call("scribe", "primary", stubs)
+        assert result.error == "backup unavailable"
+
+
+class TestRouterIntegration:
+
+    def test_llm_call_with_site_uses_policy(self):
+        import llm_router
+        router = LLMRouter({"scribe": RoutePolicy(backup="gemini-2.0-flash", hedge=False, circuit_breaker=True)},
+                           failure_threshold=1)
+        router.record("gpt-5.2", 0.1, ok=False)
+        with patch.object(llm_router, "routing", router), \
+                patch.object(llm_router, "_call_gemini", return_value=LLMResult(text="{}")) as gemini, \
+                patch.object(llm_router, "_call_openai") as openai:
+            result = llm_router.llm_call("gpt-5.2", "hi", site="scribe")
+        assert result.text == "{}"
+        openai.assert_not_called()
+        assert gemini.call_args.args[0] == "gemini-2.0-flash"
+
+    def test_stream_records_outcome(self):
+        import llm_router
+        router = LLMRouter()
+        with patch.object(llm_router, "routing", router), \
+                patch.object(llm_router, "provider_clients") as clients:
+            clients.get.return_value = None
+            stream = llm_router.llm_call_stream("gpt-5.2", "hi", site="synthesis")
+            assert list(stream) == []
+        assert stream.result.error == "OPENAI_API_KEY not set"
+        assert router.stats()["models"]["gpt-5.2"]["failures"] == 1
+
+    def test_prometheus_rendering(self):
+        router = LLMRouter(failure_threshold=1)
+        router.record("gpt-5.2", 1.0, ok=False)
+        text = router.render_prometheus()
+        assert 'llm_route_failures_total{model="gpt-5.2"} 1' in text
+        assert 'llm_route_circuit_open{model="gpt-5.2"} 1' in text
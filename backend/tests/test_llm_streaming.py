@@ -0,0 +1,123 @@
+"""Tests for streaming LLM calls (llm_router.llm_call_stream) and incremental segment parsing."""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from incremental_json import JsonArrayItemParser
+import llm_clients
+import llm_router
+
+RESPONSE = {
+    "response_type": "FINAL_ANSWER",
+    "content_segments": [
+        {"text": "Use GDB-600x600 {RF} \"quoted\" [1]", "type": "GENERAL"},
+        {"text": "Second", "type": "WARNING", "meta": {"refs": [1, {"x": 2}]}},
+    ],
+    "product_cards": [{"content_segments": [{"text": "nested"}]}],
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_provider_clients():
+    """Provider clients are shared; rebuild them so each test sees its patched SDK."""
+    llm_clients.provider_clients.reset()
+    yield
+    llm_clients.provider_clients.reset()
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestJsonArrayItemParser:
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 17, 10_000])
+    def test_items_independent_of_chunking(self, size):
+        parser = JsonArrayItemParser("content_segments")
+        items = []
+        for chunk in _chunks(json.dumps(RESPONSE, indent=2), size):
+            items.extend(parser.feed(chunk))
+        assert items == list(enumerate(RESPONSE["content_segments"]))
+        assert parser.count == 2
+
+    def test_item_reported_as_soon_as_it_closes(self):
+        parser = JsonArrayItemParser("content_segments")
+        assert parser.feed('{"content_segments": [{"text": "a"') == []
+        assert parser.feed('}, {"text"') == [(0, {"text": "a"})]
+
+    def test_truncated_output_keeps_complete_items(self):
+        parser = JsonArrayItemParser("content_segments")
+        text = json.dumps(RESPONSE)
+        items = parser.feed(text[:text.index("Second") + 3])
+        assert items == [(0, RESPONSE["content_segments"][0])]
+
+    def test_other_keys_ignored(self):
+        parser = JsonArrayItemParser("content_segments")
+        assert parser.feed('{"product_cards": [{"a": 1}], "notes": "content_segments"}') == []
+
+
+class TestLlmCallStream:
+
+    def test_gemini_deltas_and_usage(self):
+        chunks = [
+            SimpleNamespace(text='{"content_', usage_metadata=None),
+            SimpleNamespace(text='segments": []}', usage_metadata=SimpleNamespace(
+                prompt_token_count=11, candidates_token_count=7)),
+        ]
+        client = MagicMock()
+        client.models.generate_content_stream.return_value = iter(chunks)
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k"), \
+                patch("google.genai.Client", return_value=client):
+            stream = llm_router.llm_call_stream("gemini-2.0-flash", "hi", max_output_tokens=100)
+            deltas = list(stream)
+        assert deltas == ['{"content_', 'segments": []}']
+        assert stream.result.text == '{"content_segments": []}'
+        assert (stream.result.input_tokens, stream.result.output_tokens) == (11, 7)
+        assert stream.result.error is None
+
+    def test_openai_events(self):
+        events = [
+            SimpleNamespace(type="response.created"),
+            SimpleNamespace(type="response.output_text.delta", delta='{"a"'),
+            SimpleNamespace(type="response.output_text.delta", delta=": 1}"),
+            SimpleNamespace(type="response.completed", response=SimpleNamespace(
+                usage=SimpleNamespace(input_tokens=3, output_tokens=4))),
+        ]
+        client = MagicMock()
+        client.responses.create.return_value = iter(events)
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k"), \
+                patch("openai.OpenAI", return_value=client):
+            stream = llm_router.llm_call_stream("gpt-5.2", "hi", system_prompt="sys")
+            assert "".join(stream) == '{"a": 1}'
+        assert client.responses.create.call_args.kwargs["stream"] is True
+        assert client.responses.create.call_args.kwargs["instructions"] == "sys"
+        assert stream.result.output_tokens == 4
+
+    def test_errors_end_stream_with_result_error(self):
+        events = [
+            SimpleNamespace(type="response.output_text.delta", delta="{"),
+            SimpleNamespace(type="error", message="overloaded"),
+        ]
+        client = MagicMock()
+        client.responses.create.return_value = iter(events)
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value="k"), \
+                patch("openai.OpenAI", return_value=client):
+            stream = llm_router.llm_call_stream("gpt-5.2", "hi")
+            assert list(stream) == ["{"]
+        assert stream.result.error == "overloaded"
+        assert stream.result.text == "{"
+
+    def test_missing_key(self):
+        with patch.object(llm_clients.api_keys_manager, "get_key", return_value=None):
+            stream = llm_router.llm_call_stream("gemini-2.0-flash", "hi")
+            assert list(stream) == []
+        assert stream.result.error == "GEMINI_API_KEY not set"
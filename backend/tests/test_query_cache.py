@@ -0,0 +1,141 @@
+"""Tests for the bounded, write-aware query cache (query_cache.py + database.py wiring)."""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from query_cache import QueryCache, approx_size
+from tests.conftest import fake_result
+
+
+class TestQueryCache:
+
+    def test_miss_then_hit(self):
+        cache = QueryCache()
+        assert cache.get("ns", "k") is None
+        cache.set("ns", "k", [1, 2])
+        assert cache.get("ns", "k") == [1, 2]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["namespaces"]["ns"] == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_namespaces_are_isolated(self):
+        cache = QueryCache()
+        cache.set("a", "k", "A")
+        cache.set("b", "k", "B")
+        assert cache.get("a", "k") == "A"
+        assert cache.get("b", "k") == "B"
+
+    def test_ttl_expiry(self):
+        cache = QueryCache(ttl=0.01)
+        cache.set("ns", "k", "v")
+        time.sleep(0.02)
+        assert cache.get("ns", "k") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction_by_entry_count(self):
+        cache = QueryCache(max_entries=2)
+        cache.set("ns", "a", 1)
+        cache.set("ns", "b", 2)
+        cache.get("ns", "a")  # a is now most recently used
+        cache.set("ns", "c", 3)
+        assert cache.get("ns", "b") is None
+        assert cache.get("ns", "a") == 1
+        assert cache.get("ns", "c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_memory_cap_evicts_oldest(self):
+        size = approx_size("x" * 1000)
+        cache = QueryCache(max_bytes=size * 2 + 10)
+        cache.set("ns", "a", "x" * 1000)
+        cache.set("ns", "b", "y" * 1000)
+        cache.set("ns", "c", "z" * 1000)
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["bytes"] <= cache.max_bytes
+        assert cache.get("ns", "a") is None
+
+    def test_oversized_value_not_stored(self):
+        cache = QueryCache(max_bytes=100)
+        cache.set("ns", "big", "y" * 10_000)
+        assert cache.get("ns", "big") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_namespace(self):
+        cache = QueryCache()
+        cache.set("a", "1", 1)
+        cache.set("a", "2", 2)
+        cache.set("b", "1", 3)
+        assert cache.invalidate("a") == 2
+        assert cache.get("a", "1") is None
+        assert cache.get("b", "1") == 3
+
+    def test_invalidate_all(self):
+        cache = QueryCache()
+        cache.set("a", "1", 1)
+        cache.set("b", "1", 2)
+        assert cache.invalidate() == 2
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["bytes"] == 0
+
+
+class TestGraphConnectionCacheWiring:
+    """Hot reads are served from cache; writes invalidate it."""
+
+    @pytest.fixture
+    def db(self):
+        import database
+        database._query_cache.invalidate()
+        conn = database.GraphConnection()
+        conn.graph = MagicMock()
+        yield conn
+        database._query_cache.invalidate()
+
+    def test_product_traits_cached_per_family(self, db):
+        db.graph.query.return_value = fake_result(
+            ["id", "name", "source", "is_primary"],
+            [["TRAIT_A", "A", "direct", True]],
+        )
+        first = db.get_product_traits("GDB")
+        second = db.get_product_traits("FAM_GDB")
+        assert first == second
+        assert db.graph.query.call_count == 1
+
+    def test_environment_keywords_cached(self, db):
+        db.graph.query.return_value = fake_result(
+            ["env_id", "keywords"], [["ENV_OUTDOOR", ["roof", "outside"]]],
+        )
+        assert db.get_environment_keywords() == {"ENV_OUTDOOR": ["roof", "outside"]}
+        db.get_environment_keywords()
+        assert db.graph.query.call_count == 1
+
+    def test_write_method_invalidates_cache(self, db):
+        db.graph.query.return_value = fake_result(
+            ["id", "name", "source", "is_primary"], [["TRAIT_A", "A", "direct", True]],
+        )
+        db.get_product_traits("GDB")
+        db.graph.query.return_value = fake_result(
+            ["keyword_id", "requirement_id", "keyword", "requirement", "confidence"],
+            [[1, 2, "pool", "needs C5", 1.0]],
+        )
+        db.save_learned_rule("pool", "needs C5", embedding=[0.0])
+        db.graph.query.return_value = fake_result(
+            ["id", "name", "source", "is_primary"], [["TRAIT_B", "B", "direct", True]],
+        )
+        assert db.get_product_traits("GDB")[0]["id"] == "TRAIT_B"
+
+    def test_write_invalidates_even_when_it_fails(self, db):
+        import database
+        database._set_cached("applications", "", [{"id": "APP_X"}])
+        db.graph.query.side_effect = ValueError("bad cypher")
+        with pytest.raises(ValueError):
+            db.delete_project("P1")
+        assert database._get_cached("applications") is None
@@ -0,0 +1,154 @@
+"""Tests for precompiled, memoized query feature extraction (query_features.py)."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from query_features import QueryFeatures, QueryPatterns, patterns_for, query_features
+
+# Outputs of the per-function extractors that query_features.py replaced
+# (scripts/bench_query_features.py keeps them), pinned per query:
+# (query, language, action_intent, context_keywords, entity_references,
+#  has_specific_constraint, numeric (value, unit) pairs, entity_codes,
+#  project_keywords, tags (id, width, height, depth, airflow), material,
+#  project, accessories)
+REFERENCE_CASES = [
+    ('GDB 600x600 for a kitchen exhaust in a hospital, 3400 m3/h',
+     'en', 'select', ['hospital', 'kitchen'], ['GDB'], True,
+     [(600.0, 'x'), (600.0, 'for'), (3400.0, 'm'), (3.0, '/h')],
+     ['GDB-600X600'], [],
+     [('item_1', 600, 600, None, 3400)],
+     None, None, []),
+    ('Tag 5684: 305x610x150, Tag 7889: 610x610x292, stainless steel, project Huddinge',
+     'en', 'general_info', [], [], True,
+     [(305.0, 'x'), (610.0, 'x'), (610.0, 'x'), (610.0, 'x')],
+     [], ['huddinge'],
+     [('5684', 305, 610, 150, None), ('7889', 610, 610, 292, None)],
+     'RF', 'Huddinge', []),
+    ('Potrzebuję GDC-FLEX 600x1200 dla szpitala, 25 000 m³/h, ocynk',
+     'pl', 'select', ['hospital'], ['GDC-FLEX'], True,
+     [(600.0, 'x'), (1200.0, 'dla'), (0.0, 'm³/h')],
+     ['FLEX-600X1200', 'GDC-FLEX', 'GDC-FLEX-600X1200'], [],
+     [('item_1', 600, 1200, None, 25000)],
+     None, 'szpitala', []),
+    ('Compare GDMI-600x600-750 vs GDP 900x600 for an office, Ø500mm round duct',
+     'en', 'compare', ['office'], ['GDMI', 'GDMI-600X600-750', 'GDP'], True,
+     [(600.0, 'x'), (750.0, 'vs'), (900.0, 'x'), (600.0, 'for'), (500.0, 'mm')],
+     ['GDMI-600X600', 'GDMI-600X600-750', 'GDMI-600x600-750', 'GDP-900X600', 'VS-GDP-900X600'], [],
+     [('item_1', 600, 600, None, None), ('item_2', 900, 600, None, None)],
+     None, 'an', ['Round duct Ø500mm']),
+    ('We need GDR housing with transition piece and adapter, airflow 6,000 m3/h, RF',
+     'en', 'select', [], ['GDR'], True,
+     [(6.0, 'm'), (3.0, '/h')],
+     ['GDR'], [],
+     [],
+     'RF', None, ['Transition piece (type TBD)', 'Transition piece (type TBD)']),
+    ('Ist GDF 300x600 mit edelstahl für eine Küche geeignet?',
+     'de', 'select', [], ['GDF'], True,
+     [(300.0, 'x'), (600.0, 'mit')],
+     ['GDF-300X600', 'IST-GDF-300X600'], [],
+     [('item_1', 300, 600, None, None)],
+     'RF', None, []),
+    ('pharma cleanroom ECO-C 400 filters, zinkmagnesium, 2 positions',
+     'en', 'general_info', ['cleanroom'], [], True,
+     [(400.0, 'filters'), (2.0, 'positions')],
+     ['ECO-C-400'], [],
+     [],
+     'ZM', None, []),
+    ('hello',
+     'en', 'general_info', [], [], False,
+     [],
+     [], [],
+     [],
+     None, None, []),
+    ('Item A: 300x600 filter 150mm deep, reducer and adapter',
+     'en', 'general_info', [], [], True,
+     [(300.0, 'x'), (600.0, 'filter'), (150.0, 'mm')],
+     [], [],
+     [('A', 300, 600, None, None)],
+     None, None, ['Transition piece (type TBD)', 'Transition piece (type TBD)']),
+    ('round ducts (500mm diameter) and circular duct 315, GDMI 25,000 m3h',
+     'en', 'select', [], ['GDMI'], True,
+     [(500.0, 'mm'), (25.0, 'm'), (3.0, 'h')],
+     ['GDMI'], [],
+     [],
+     None, None, ['Round duct Ø500mm', 'Round duct Ø315mm']),
+    ('RF? rfid airflow surface Context Update: Material is RF.',
+     'en', 'general_info', [], [], True,
+     [],
+     [], [],
+     [],
+     'RF', None, []),
+    ('Porównaj GDB i GDC dla projektu Knittel, problem z ocynk',
+     'pl', 'compare', [], ['GDB', 'GDC'], False,
+     [],
+     ['GDB', 'GDC'], ['knittel'],
+     [],
+     None, 'projektu', []),
+]
+
+
+def _turn(query: str):
+    """The extractor calls of one streaming turn, through the public functions."""
+    from retriever import detect_intent_fast, extract_entity_codes, extract_project_keywords
+    from logic.state import (
+        extract_tags_from_query, extract_material_from_query,
+        extract_project_from_query, extract_accessories_from_query,
+    )
+    intent = detect_intent_fast(query)
+    tags = extract_tags_from_query(query)
+    return (
+        intent.language, intent.action_intent, sorted(intent.context_keywords),
+        sorted(intent.entity_references), intent.has_specific_constraint,
+        [(c["value"], c["unit"]) for c in intent.numeric_constraints],
+        sorted(extract_entity_codes(query)), sorted(extract_project_keywords(query)),
+        [(t["tag_id"], t["filter_width"], t["filter_height"], t["filter_depth"], t.get("airflow_m3h")) for t in tags],
+        extract_material_from_query(query), extract_project_from_query(query),
+        extract_accessories_from_query(query),
+    )
+
+
+class TestQueryFeatures:
+
+    @pytest.mark.parametrize("case", REFERENCE_CASES, ids=lambda case: case[0][:40])
+    def test_same_results_as_legacy_extractors(self, config, case):
+        assert _turn(case[0]) == case[1:]
+
+    def test_features_memoized_per_query(self, config):
+        assert query_features("GDB 600x600", config) is query_features("GDB 600x600", config)
+        assert query_features("GDB 600x600", config) is not query_features("GDC 600x600", config)
+
+    def test_patterns_compiled_once_per_config_object(self, config):
+        assert patterns_for(config) is patterns_for(config)
+        assert isinstance(patterns_for(None), QueryPatterns)
+        assert patterns_for(None) is not patterns_for(config)
+
+    def test_only_current_config_patterns_kept(self, config):
+        import query_features as qf
+        first = patterns_for(config)
+        query_features("GDB 600x600", config)
+        patterns_for(None)
+        assert qf._current_patterns[0] is None
+        assert not qf._features
+        assert patterns_for(config) is not first
+
+    def test_callers_get_copies(self, config):
+        from logic.state import extract_tags_from_query
+        tags = extract_tags_from_query("item A: 600x600 3400 m3/h")
+        tags[0]["filter_width"] = 1
+        assert extract_tags_from_query("item A: 600x600 3400 m3/h")[0]["filter_width"] == 600
+
+    def test_defaults_without_config(self):
+        features = QueryFeatures("stainless 600x600 GDB for a hospital", QueryPatterns(None))
+        assert features.material == "RF"
+        assert features.entity_references == ["GDB"]
+        assert features.context_keywords == ["hospital"]
+        assert features.entity_codes == []
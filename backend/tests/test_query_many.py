@@ -0,0 +1,121 @@
+"""Tests for GraphConnection.query_many and the batch read variants."""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from falkordb import Graph
+from redis.exceptions import ResponseError
+
+from tests.conftest import fake_result
+
+
+def _compact(column, value):
+    """Compact GRAPH.QUERY reply with one integer column and one row."""
+    return [[[1, column]], [[[3, value]]], ["Cached execution: 0"]]
+
+
+@pytest.fixture
+def db():
+    import database
+    database._query_cache.invalidate()
+    conn = database.GraphConnection()
+    conn.graph = MagicMock()
+    yield conn
+    database._query_cache.invalidate()
+
+
+class TestQueryManyPipeline:
+    """A real falkordb Graph goes through a single Redis pipeline."""
+
+    @pytest.fixture
+    def pipe(self, db):
+        client = MagicMock()
+        pipe = client.connection.pipeline.return_value
+        db.graph = Graph(client, "hvac")
+        return pipe
+
+    def test_one_round_trip_in_order(self, db, pipe):
+        pipe.execute.return_value = [_compact("a", 1), _compact("b", 2)]
+        results = db.query_many([
+            "RETURN 1 AS a",
+            ("RETURN $x AS b", {"x": 2}),
+        ])
+        assert [r.result_set for r in results] == [[[1]], [[2]]]
+        assert [r.header[0][1] for r in results] == ["a", "b"]
+        pipe.execute.assert_called_once_with(raise_on_error=False)
+
+        commands = [c.args for c in pipe.execute_command.call_args_list]
+        assert [c[0] for c in commands] == ["GRAPH.RO_QUERY", "GRAPH.RO_QUERY"]
+        assert all(c[1] == "hvac" and c[3] == "--compact" for c in commands)
+        assert commands[1][2].startswith("CYPHER ") and commands[1][2].endswith("RETURN $x AS b")
+
+    def test_write_mode_uses_graph_query(self, db, pipe):
+        pipe.execute.return_value = [_compact("a", 1)]
+        db.query_many(["CREATE (n) RETURN 1 AS a"], read_only=False)
+        assert pipe.execute_command.call_args.args[0] == "GRAPH.QUERY"
+
+    def test_error_reply_raises(self, db, pipe):
+        pipe.execute.return_value = [_compact("a", 1), ResponseError("bad cypher")]
+        with pytest.raises(ResponseError):
+            db.query_many(["RETURN 1 AS a", "RETURN nope"])
+
+    def test_empty_batch_skips_network(self, db, pipe):
+        assert db.query_many([]) == []
+        pipe.execute.assert_not_called()
+
+
+class TestQueryManyFallback:
+
+    def test_sequential_queries_on_plain_handle(self, db):
+        db.graph.query.side_effect = lambda q, params=None: fake_result(["q"], [[q]])
+        results = db.query_many(["A", ("B", {"x": 1})])
+        assert [r.result_set[0][0] for r in results] == ["A", "B"]
+        assert db.graph.query.call_args_list[1].args == ("B", {"x": 1})
+
+
+class TestBatchVariants:
+
+    def test_variant_weights_match_single_lookup(self, db):
+        rows = {
+            "GDB-600x600-550": [[None, 40.0, 55.0, None, 550, 750]],
+            "GDP-600x600-25": [[12.0, None, None, None, None, None]],
+        }
+        columns = ["weight_kg", "weight_kg_short", "weight_kg_long", "housing_length_mm",
+                   "housing_length_short_mm", "housing_length_long_mm"]
+        db.graph.query.side_effect = lambda q, params=None: fake_result(columns, rows.get(params["name"], []))
+
+        weights = db.get_variant_weights([
+            ("GDB-600x600-550", 750), ("GDP-600x600-25", None), ("MISSING", None),
+        ])
+        assert weights == [55.0, 12.0, None]
+        assert db.get_variant_weight("GDB-600x600-550", 750) == weights[0]
+
+    def test_variant_weights_failure_returns_nones(self, db):
+        db.graph.query.side_effect = ValueError("down")
+        assert db.get_variant_weights([("A", None), ("B", None)]) == [None, None]
+
+    def test_variable_features_many_uses_cache(self, db):
+        db.graph.query.return_value = fake_result(["feature_id"], [["F_CONN"]])
+        db.get_variable_features("GDB")
+        db.graph.query.reset_mock()
+
+        features = db.get_variable_features_many(["GDB", "GDC", "GDB"])
+        assert set(features) == {"GDB", "GDC"}
+        assert db.graph.query.call_count == 1
+        assert db.graph.query.call_args.args[1] == {"family": "GDC"}
+
+    def test_available_materials_many(self, db):
+        db.graph.query.side_effect = lambda q, params=None: fake_result(
+            ["id", "name", "code"], [[f"MAT_{params['fid']}", "M", "X"]],
+        )
+        materials = db.get_available_materials_many(["FAM_GDB", "FAM_GDC"])
+        assert materials["FAM_GDC"][0]["id"] == "MAT_FAM_GDC"
+        db.get_available_materials_many(["FAM_GDB"])
+        assert db.graph.query.call_count == 2
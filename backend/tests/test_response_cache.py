@@ -0,0 +1,191 @@
+"""Tests for the semantic first-turn response cache (response_cache.py)."""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from response_cache import CachedResponse, ResponseCache
+
+KEY = ResponseCache.bucket_key("hvac", 3, "gemini-2.0-flash", {"tags": {}, "turn_count": 0})
+
+
+def _run(text="GDB-600x600"):
+    return CachedResponse(
+        events=[{"type": "inference", "step": "context", "status": "active"},
+                {"type": "inference", "step": "scribe", "status": "done"}],
+        complete={"type": "complete", "response": {"content_segments": [{"text": text}], "timings": {"total": 9.0}},
+                  "timings": {"total": 9.0}, "technical_state": {"tags": {}, "turn_count": 1}},
+        assistant_summary="Recommended: GDB, type=answer, tags=0",
+    )
+
+
+class TestResponseCache:
+
+    def test_similar_query_hits(self):
+        cache = ResponseCache(similarity=0.95)
+        cache.store(KEY, [1.0, 0.0, 0.1], _run())
+        hit = cache.lookup(KEY, [2.0, 0.0, 0.25])
+        assert hit is not None and hit.similarity > 0.99
+        assert hit.complete["response"]["content_segments"][0]["text"] == "GDB-600x600"
+
+    def test_dissimilar_query_misses(self):
+        cache = ResponseCache(similarity=0.95)
+        cache.store(KEY, [1.0, 0.0], _run())
+        assert cache.lookup(KEY, [0.6, 0.8]) is None
+
+    def test_best_match_wins(self):
+        cache = ResponseCache(similarity=0.5)
+        cache.store(KEY, [1.0, 0.0], _run("far"))
+        cache.store(KEY, [0.7, 0.7], _run("near"))
+        hit = cache.lookup(KEY, [0.6, 0.8])
+        assert hit.complete["response"]["content_segments"][0]["text"] == "near"
+
+    def test_bucket_key_separates_state_and_graph_version(self):
+        cache = ResponseCache()
+        cache.store(KEY, [1.0], _run())
+        other_version = ResponseCache.bucket_key("hvac", 4, "gemini-2.0-flash", {"tags": {}, "turn_count": 0})
+        locked = ResponseCache.bucket_key("hvac", 3, "gemini-2.0-flash",
+                                          {"tags": {}, "turn_count": 0, "locked_material": "RF"})
+        assert cache.lookup(other_version, [1.0]) is None
+        assert cache.lookup(locked, [1.0]) is None
+        assert ResponseCache.bucket_key("hvac", 3, "m", {"a": 1, "b": 2}) == \
+            ResponseCache.bucket_key("hvac", 3, "m", {"b": 2, "a": 1})
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(ttl=60)
+        with patch("response_cache.time.monotonic", return_value=1000.0):
+            cache.store(KEY, [1.0], _run())
+        with patch("response_cache.time.monotonic", return_value=1061.0):
+            assert cache.lookup(KEY, [1.0]) is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2, similarity=0.99)
+        cache.store(KEY, [1.0, 0.0], _run("a"))
+        cache.store(KEY, [0.0, 1.0], _run("b"))
+        assert cache.lookup(KEY, [1.0, 0.0])           # "a" becomes most recent
+        cache.store(KEY, [-1.0, 0.0], _run("c"))
+        assert cache.lookup(KEY, [0.0, 1.0]) is None
+        assert cache.lookup(KEY, [1.0, 0.0]) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidate_and_stats(self):
+        cache = ResponseCache()
+        cache.store(KEY, [1.0], _run())
+        cache.lookup(KEY, [1.0])
+        cache.lookup(KEY, [-1.0])
+        assert cache.invalidate() == 1
+        assert cache.lookup(KEY, [1.0]) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+        assert stats["hit_rate"] == 0.333
+        assert 'response_cache_lookups_total{outcome="hit"} 1' in cache.render_prometheus()
+
+    def test_disabled(self):
+        cache = ResponseCache(max_entries=0)
+        assert not cache.store(KEY, [1.0], _run())
+        assert cache.lookup(KEY, [1.0]) is None
+
+
+class TestResponseRecorder:
+
+    def test_records_inference_and_complete(self):
+        cache = ResponseCache()
+        recorder = cache.recorder()
+        for event in _run().events + [{"type": "content_segment", "index": 0}, _run().complete,
+                                      {"type": "session_state", "data": {}}]:
+            recorder.observe(event)
+        assert not recorder.commit()                    # no key: turn was not cacheable
+        recorder.key, recorder.embedding = KEY, [1.0]
+        assert recorder.commit()
+        hit = cache.lookup(KEY, [1.0])
+        assert [e["step"] for e in hit.events] == ["context", "scribe"]
+
+    def test_incomplete_or_failed_runs_not_stored(self):
+        cache = ResponseCache()
+        recorder = cache.recorder(KEY, [1.0])
+        recorder.observe(_run().events[0])
+        assert not recorder.commit()
+        recorder.observe(_run().complete)
+        recorder.cacheable = False
+        assert not recorder.commit()
+
+
+class TestGraphWriteBust:
+
+    def test_write_methods_notify_listeners(self):
+        import database
+        calls = []
+        database.on_graph_write(lambda: calls.append("bust"))
+        try:
+            conn = database.GraphConnection.__new__(database.GraphConnection)
+            conn._execute_with_retry = lambda fn: 7
+            conn._catalog_checked_at = 0.0
+            assert conn.bump_graph_version(source="test") == 7
+        finally:
+            database._write_listeners.pop()
+        assert calls == ["bust"]
+
+    def test_retriever_registers_cache_invalidation(self):
+        import database
+        from response_cache import response_cache
+        import retriever  # noqa: F401 (registers the listener on import)
+        assert response_cache.invalidate in database._write_listeners
+
+
+class TestStreamingCacheHelpers:
+
+    def test_only_first_turns_are_cacheable(self):
+        import retriever
+        from logic.state import TechnicalState
+        config = MagicMock(domain_id="hvac")
+        with patch.object(retriever.db, "get_graph_version", return_value=3):
+            assert retriever._response_cache_key(config, "m", "q", TechnicalState(), ["q"], False)
+            assert retriever._response_cache_key(config, "m", "q", TechnicalState(), ["q"], True) is None
+            assert retriever._response_cache_key(config, "m", "q", TechnicalState(), ["a", "b"], False) is None
+            later = TechnicalState()
+            later.turn_count = 2
+            assert retriever._response_cache_key(config, "m", "q", later, [], False) is None
+
+    def test_queries_differing_in_a_parameter_never_share_a_bucket(self):
+        import retriever
+        from logic.state import TechnicalState
+        config = retriever.get_config()
+
+        def key(query):
+            with patch.object(retriever.db, "get_graph_version", return_value=3):
+                return retriever._response_cache_key(config, "m", query, TechnicalState(), [query], False)
+
+        base = key("GDB 600x600 for a kitchen, 3400 m3/h")
+        assert base == key("GDB 600x600 for a kitchen, 3400 m3/h")
+        assert base != key("GDB 600x600 for a kitchen, 5000 m3/h")
+        assert base != key("GDB 300x600 for a kitchen, 3400 m3/h")
+        assert base != key("GDB 600x600 for a kitchen, 3400 m3/h, stainless steel")
+
+        cache = ResponseCache(similarity=0.95)
+        cache.store(base, [1.0, 0.0], _run())
+        assert cache.lookup(key("GDB 600x600 for a kitchen, 5000 m3/h"), [1.0, 0.0]) is None
+
+    def test_replay_skips_emitted_events_and_persists_session(self):
+        import retriever
+        mgr = MagicMock()
+        mgr.get_project_state.return_value = {"tags": []}
+        mgr.get_reasoning_path.return_value = []
+        cached = _run()
+        cached.similarity = 0.97
+        events = list(retriever._replay_cached_response(cached, 1, mgr, "S1", total_start=0.0))
+        assert [e["type"] for e in events] == ["inference", "complete", "session_state"]
+        assert events[0]["step"] == "scribe"
+        complete = events[1]
+        assert complete["response_cache"]["similarity"] == 0.97
+        assert complete["response"]["timings"] is complete["timings"]
+        assert cached.complete["timings"] == {"total": 9.0}   # stored entry untouched
+        assert mgr.store_turn.call_args.args[:3] == ("S1", "assistant", cached.assistant_summary)
@@ -0,0 +1,197 @@
+"""Tests for the compiled trait/stressor rule index (rule_index.py) and its use in TraitBasedEngine."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from rule_index import RuleIndex, RuleSet
+from backend.logic.universal_engine import CausalRule, DetectedStressor, TraitBasedEngine, TraitMatch
+
+
+def _rule(rule_type, stressor, trait, severity="INFO", explanation=None):
+    return {"rule_type": rule_type, "stressor_id": stressor, "stressor_name": stressor.title(),
+            "trait_id": trait, "trait_name": trait.title(), "severity": severity, "explanation": explanation}
+
+
+def _family(pf_id, traits, priority=50):
+    return {"product_id": pf_id, "product_name": pf_id, "product_type": None,
+            "selection_priority": priority, "all_trait_ids": list(traits)}
+
+
+RULES = [
+    _rule("NEUTRALIZED_BY", "grease", "t_carbon", "CRITICAL", "Grease blinds carbon"),
+    _rule("DEMANDS_TRAIT", "grease", "t_prefilter", "CRITICAL"),
+    _rule("DEMANDS_TRAIT", "salt", "t_corrosion", "WARNING"),
+    _rule("DEMANDS_TRAIT", "solvent", "t_carbon", "CRITICAL"),
+    _rule("DEMANDS_TRAIT", "salt", "t_corrosion", "CRITICAL", "Salt needs RF"),
+]
+FAMILIES = [
+    _family("FAM_GDC", ["t_carbon", "t_corrosion"], 20),
+    _family("FAM_GDB", ["t_prefilter"], 10),
+    _family("FAM_GDP", [], 30),
+]
+
+
+class _IndexedDB:
+    """Serves a RuleIndex the way GraphConnection does with a catalog snapshot loaded."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def rule_index(self):
+        return self.index
+
+    def get_causal_rules_for_stressors(self, stressor_ids):
+        raise AssertionError("rules must come from the index")
+
+
+class _RowDB:
+    def __init__(self, rules):
+        self.rules = rules
+
+    def rule_index(self):
+        return None
+
+    def get_causal_rules_for_stressors(self, stressor_ids):
+        return [dict(r) for r in self.rules if r["stressor_id"] in stressor_ids]
+
+
+def _stressors(*ids):
+    return [DetectedStressor(id=i, name=i.title(), description="", detection_method="keyword", confidence=1.0)
+            for i in ids]
+
+
+def _reference_match(rules, candidates, stressor_ids):
+    """Dict-based matching the engine used before the index (kept as the oracle)."""
+    rank = {"CRITICAL": 3, "WARNING": 2, "INFO": 1}
+    demanded, neutralized = {}, {}
+    for r in rules:
+        if r.rule_type == "DEMANDS_TRAIT":
+            if r.trait_id not in demanded or rank.get(r.severity, 0) > rank.get(demanded[r.trait_id].severity, 0):
+                demanded[r.trait_id] = r
+        elif r.rule_type == "NEUTRALIZED_BY" and r.stressor_id in stressor_ids:
+            if r.trait_id not in neutralized or \
+                    rank.get(r.severity, 0) > rank.get(neutralized[r.trait_id].severity, 0):
+                neutralized[r.trait_id] = r
+    out = {}
+    for c in candidates:
+        owned = set(c.get("all_trait_ids") or [])
+        owned.discard(None)
+        present, missing, neut = [], [], []
+        for trait_id, r in demanded.items():
+            if trait_id in owned:
+                (neut if trait_id in neutralized else present).append(r.trait_name)
+            else:
+                missing.append(r.trait_name)
+        for trait_id, r in neutralized.items():
+            if trait_id in owned and r.trait_name not in neut:
+                neut.append(r.trait_name)
+        coverage = len(present) / len(demanded) if demanded else 1.0
+        out[c["product_id"]] = (present, missing, neut, coverage)
+    return out
+
+
+def _reference_vetoes(match, rules):
+    reasons = []
+    demands = {r.trait_id: r for r in rules if r.rule_type == "DEMANDS_TRAIT" and r.severity == "CRITICAL"}
+    neuts = {r.trait_id: r for r in rules if r.rule_type == "NEUTRALIZED_BY" and r.severity == "CRITICAL"}
+    for r in demands.values():
+        if r.trait_name in match.traits_missing:
+            reasons.append(r.explanation or f"{r.stressor_name} requires {r.trait_name}")
+    for r in neuts.values():
+        if r.trait_name in match.traits_neutralized:
+            reasons.append(r.explanation or f"{r.trait_name} ineffective under {r.stressor_name}")
+    return reasons
+
+
+class TestRuleIndex:
+
+    @pytest.fixture
+    def index(self):
+        return RuleIndex(FAMILIES, RULES, version=3)
+
+    def test_rules_for_keeps_graph_order(self, index):
+        rows = index.rules_for(["salt", "grease"])
+        assert [(r["stressor_id"], r["trait_id"]) for r in rows] == [
+            ("grease", "t_carbon"), ("grease", "t_prefilter"), ("salt", "t_corrosion"), ("salt", "t_corrosion"),
+        ]
+        rows[0]["trait_id"] = "MUTATED"
+        assert index.rules_for(["grease"])[0]["trait_id"] == "t_carbon"
+
+    def test_most_severe_demand_per_trait(self, index):
+        compiled = index.ruleset(["salt"])
+        assert [name for _, name in compiled.demanded] == ["T_Corrosion"]
+        assert compiled.critical_demands == (("T_Corrosion", "Salt needs RF"),)
+
+    def test_ruleset_cached_per_stressor_set(self, index):
+        assert index.ruleset(["grease", "salt"]) is index.ruleset(["salt", "grease"])
+        assert index.stats()["compiled_rulesets"] == 1
+
+    def test_match_masks(self, index):
+        compiled = index.ruleset(["grease", "solvent"])
+        present, missing, neutralized, coverage = compiled.match(index.family_mask(FAMILIES[0], compiled))
+        assert (present, missing, neutralized, coverage) == ([], ["T_Prefilter"], ["T_Carbon"], 0.0)
+        present, missing, neutralized, coverage = compiled.match(index.family_mask(FAMILIES[1], compiled))
+        assert (present, missing, neutralized, coverage) == (["T_Prefilter"], ["T_Carbon"], [], 0.5)
+
+    def test_changed_candidate_traits_reencoded(self, index):
+        compiled = index.ruleset(["grease"])
+        edited = _family("FAM_GDP", ["t_prefilter", "t_unknown", None])
+        assert compiled.match(index.family_mask(edited, compiled))[0] == ["T_Prefilter"]
+
+
+class TestEngineEquivalence:
+
+    def test_matches_and_vetoes_equal_reference(self):
+        rng = random.Random(7)
+        traits = [f"t{i}" for i in range(12)]
+        stressor_pool = [f"s{i}" for i in range(6)]
+        for _ in range(60):
+            rows = [_rule(rng.choice(["DEMANDS_TRAIT", "NEUTRALIZED_BY"]), rng.choice(stressor_pool),
+                          rng.choice(traits), rng.choice(["CRITICAL", "WARNING", "INFO", None]),
+                          rng.choice([None, "", "because"]))
+                    for _ in range(rng.randint(0, 14))]
+            families = [_family(f"FAM_{i}", rng.sample(traits, rng.randint(0, 6)), rng.randint(1, 60))
+                        for i in range(8)]
+            stressor_ids = rng.sample(stressor_pool, rng.randint(1, 4))
+
+            indexed = TraitBasedEngine(_IndexedDB(RuleIndex(families, rows)))
+            plain = TraitBasedEngine(_RowDB(rows))
+            stressors = _stressors(*stressor_ids)
+            for engine in (indexed, plain):
+                rules = engine.get_causal_rules(stressors)
+                expected = _reference_match(rules, families, set(stressor_ids))
+                matches = engine.check_vetoes(engine.match_traits(rules, families, stressors), rules)
+                for m in matches:
+                    assert (m.traits_present, m.traits_missing, m.traits_neutralized,
+                            m.coverage_score) == expected[m.product_family_id]
+                    assert m.veto_reasons == _reference_vetoes(m, rules)
+                    assert m.vetoed == bool(m.veto_reasons)
+
+    def test_indexed_rules_carry_compiled_ruleset(self):
+        index = RuleIndex(FAMILIES, RULES)
+        rules = TraitBasedEngine(_IndexedDB(index)).get_causal_rules(_stressors("grease"))
+        assert [r.trait_id for r in rules] == ["t_carbon", "t_prefilter"]
+        assert rules.compiled is index.ruleset(["grease"])
+
+    def test_vetoes_on_hand_built_matches(self):
+        engine = TraitBasedEngine(_RowDB(RULES))
+        rules = [CausalRule("DEMANDS_TRAIT", "grease", "Grease", "t_prefilter", "Prefilter", "CRITICAL", "")]
+        match = TraitMatch(product_family_id="FAM_X", product_family_name="X", traits_missing=["Prefilter"])
+        engine.check_vetoes([match], rules)
+        assert match.vetoed and match.veto_reasons == ["Grease requires Prefilter"]
+
+    def test_adhoc_compile_matches_index(self):
+        index = RuleIndex(FAMILIES, RULES)
+        rows = index.rules_for(["grease", "salt"])
+        adhoc = RuleSet.compile(rows, {"grease", "salt"})
+        compiled = index.ruleset(["grease", "salt"])
+        for family in FAMILIES:
+            assert adhoc.match(adhoc.encode(family["all_trait_ids"])) == \
+                compiled.match(index.family_mask(family, compiled))
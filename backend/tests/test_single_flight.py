@@ -0,0 +1,165 @@
+"""Tests for single-flight coalescing of identical in-flight requests (single_flight.py)."""
+
+import os
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from single_flight import Flight, SingleFlight
+
+
+def _complete(text="GDB-600x600"):
+    return {"type": "complete", "response": {"content_segments": [{"text": text}], "timings": {"total": 9.0}},
+            "timings": {"total": 9.0}, "technical_state": {"tags": {}, "turn_count": 1}}
+
+
+class TestFlight:
+
+    def test_follower_gets_published_and_live_events(self):
+        flight = Flight([{"n": 0}])
+        flight.publish({"n": 1})
+        received = []
+        reader = threading.Thread(target=lambda: received.extend(flight.follow(start=1)))
+        reader.start()
+        flight.publish({"n": 2})
+        flight.finish(result="summary")
+        reader.join(2)
+        assert [e["n"] for e in received] == [1, 2]
+        assert flight.result == "summary"
+
+    def test_leader_error_raised_in_followers(self):
+        flight = Flight()
+        flight.publish({"n": 0})
+        flight.finish(error=ValueError("graph down"))
+        events = flight.follow()
+        assert next(events) == {"n": 0}
+        with pytest.raises(ValueError, match="graph down"):
+            next(events)
+
+    def test_stalled_run_times_out(self):
+        flight = Flight(wait_s=0.05)
+        with pytest.raises(TimeoutError):
+            list(flight.follow())
+
+
+class TestSingleFlight:
+
+    def test_second_request_follows_first(self):
+        group = SingleFlight(enabled=True)
+        leader, follower = group.ticket(), group.ticket()
+        assert leader.join("k", [{"n": 0}]) is None and leader.leading
+        flight = follower.join("k", [{"n": 0}])
+        assert flight is leader.flight and not follower.leading
+        assert group.stats()["coalesced"] == 1 and group.stats()["in_flight"] == 1
+
+    def test_finished_flight_released(self):
+        group = SingleFlight(enabled=True)
+        ticket = group.ticket()
+        ticket.join("k", [])
+        assert list(ticket.drive(iter([{"n": 1}]), result=lambda: "s")) == [{"n": 1}]
+        assert ticket.flight.result == "s"
+        assert group.stats()["in_flight"] == 0
+        assert group.ticket().join("k", []) is None      # a new run leads again
+
+    def test_abort_releases_flight_that_never_started(self):
+        group = SingleFlight(enabled=True)
+        ticket = group.ticket()
+        ticket.join("k", [])
+        flight = ticket.flight
+        ticket.abort(RuntimeError("boom"))
+        assert group.stats()["failed_runs"] == 1 and group.stats()["in_flight"] == 0
+        with pytest.raises(RuntimeError):
+            list(flight.follow())
+
+    def test_disabled_never_coalesces(self):
+        group = SingleFlight(enabled=False)
+        assert group.ticket().join("k", []) is None
+        assert group.ticket().join("k", []) is None
+        assert group.stats()["leaders"] == 0
+
+    def test_prometheus_rendering(self):
+        group = SingleFlight(enabled=True)
+        group.ticket().join("k", [])
+        group.ticket().join("k", [])
+        text = group.render_prometheus()
+        assert "consult_coalesced_requests_total 1" in text
+        assert "consult_flights_in_flight 1" in text
+
+
+class TestStreamingCoalescing:
+
+    def _pipeline(self, runs, release):
+        """Stand-in for _deep_explainable_stream that joins a flight like the real one."""
+        import retriever
+
+        def pipeline(user_query, session_id, model, recorder, deadline, ticket=None):
+            yield {"type": "inference", "step": "context", "status": "active"}
+            flight = ticket.join(f"bucket:{user_query}", recorder.events)
+            if flight is not None:
+                yield from retriever._follow_flight(flight, len(recorder.events), None, session_id, 0.0)
+                return
+            runs.append(session_id)
+            release.wait(2)
+            yield {"type": "inference", "step": "scribe", "status": "done"}
+            recorder.assistant_summary = "Recommended: GDB"
+            yield _complete()
+            yield {"type": "session_state", "data": {"session": session_id}}
+
+        return pipeline
+
+    def test_concurrent_identical_requests_run_once(self):
+        import retriever
+        runs, release = [], threading.Event()
+        group = SingleFlight(enabled=True)
+        results = {}
+
+        def request(session_id):
+            results[session_id] = list(retriever.query_deep_explainable_streaming("GDB 600x600", session_id))
+
+        with patch.object(retriever, "_deep_explainable_stream", self._pipeline(runs, release)), \
+                patch.object(retriever, "consult_flights", group), \
+                patch.object(retriever, "_finish_session_turn") as finish_turn:
+            leader = threading.Thread(target=request, args=("S1",))
+            leader.start()
+            while not group.stats()["in_flight"]:
+                threading.Event().wait(0.01)
+            follower = threading.Thread(target=request, args=("S2",))
+            follower.start()
+            while not group.stats()["coalesced"]:
+                threading.Event().wait(0.01)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        assert runs == ["S1"]
+        assert [e["type"] for e in results["S1"]] == ["inference", "inference", "complete", "session_state"]
+        assert [e["type"] for e in results["S2"]] == ["inference", "inference", "complete"]
+        assert results["S2"][-1]["coalesced"]["waited_s"] >= 0
+        assert results["S2"][-1]["response"]["content_segments"] == [{"text": "GDB-600x600"}]
+        finish_turn.assert_called_once()
+        assert finish_turn.call_args.args[1] == "S2"
+        assert finish_turn.call_args.args[3] == "Recommended: GDB"
+
+    def test_leader_failure_before_handoff_releases_key(self):
+        import retriever
+        group = SingleFlight(enabled=True)
+
+        def failing(user_query, session_id, model, recorder, deadline, ticket=None):
+            yield {"type": "inference", "step": "context", "status": "active"}
+            ticket.join("k", recorder.events)
+            raise RuntimeError("engine failed")
+
+        with patch.object(retriever, "_deep_explainable_stream", failing), \
+                patch.object(retriever, "consult_flights", group):
+            with pytest.raises(RuntimeError):
+                list(retriever.query_deep_explainable_streaming("q"))
+        assert group.stats()["in_flight"] == 0 and group.stats()["failed_runs"] == 1
@@ -0,0 +1,173 @@
+"""Tests for the precomputed sizing arrangement tables (sizing_table.py) and their use in TraitBasedEngine."""
+
+import math
+import random
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import sizing_table
+from sizing_table import SizingTable, SizingTables, arrangement_grid
+from backend.logic.universal_engine import TraitBasedEngine
+
+
+def _module(mid, width, height, airflow):
+    return {"id": mid, "width_mm": width, "height_mm": height,
+            "reference_airflow_m3h": airflow, "label": f"{width}x{height}"}
+
+
+MODULES = [
+    _module("M_1800x600", 1800, 600, 10200),
+    _module("M_600x600", 600, 600, 3400),
+    _module("M_300x600", 300, 600, 1700),
+    _module("M_600x300", 600, 300, 1700),
+]
+STRATEGY = {"id": "STRAT", "primary_axis": "width_mm", "secondary_axis": "height_mm", "expansion_unit": 600}
+
+
+def _reference_size(modules, airflow, max_primary, max_secondary):
+    """Module selection and grid math the engine used before the tables (kept as the oracle)."""
+    if max_primary:
+        modules = [m for m in modules if m["width_mm"] <= max_primary] or modules
+    if max_secondary:
+        modules = [m for m in modules if m["height_mm"] <= max_secondary] or modules
+    single = [m for m in modules if float(m["reference_airflow_m3h"]) >= airflow]
+    best = (min(single, key=lambda m: float(m["reference_airflow_m3h"])) if single
+            else max(modules, key=lambda m: float(m["reference_airflow_m3h"])))
+    needed = max(1, math.ceil(airflow / best["reference_airflow_m3h"]))
+    exp, sec = best["width_mm"], best["height_mm"]
+    if max_primary and exp > 0 and needed > 1:
+        cols = max(1, max_primary // exp)
+        rows = math.ceil(needed / cols)
+    else:
+        cols, rows = needed, 1
+    eff_p, eff_s = exp * cols, sec * rows
+    if max_secondary and eff_s > max_secondary:
+        stacked = max(1, max_secondary // sec)
+        cols, rows = math.ceil(needed / stacked), stacked
+        eff_p, eff_s = exp * cols, sec * rows
+    fitting = cols * rows
+    feasible = needed <= fitting
+    if feasible and max_primary and eff_p > max_primary:
+        feasible = False
+        fitting = max(1, max_primary // exp) * (max(1, max_secondary // sec) if max_secondary else needed)
+    if feasible and max_secondary and eff_s > max_secondary:
+        feasible = False
+        fitting = (max(1, max_primary // exp) if max_primary else needed) * max(1, max_secondary // sec)
+    return best["id"], needed, (cols, rows, eff_p, eff_s, feasible, fitting)
+
+
+class TestSizingTable:
+
+    @pytest.fixture
+    def table(self):
+        return SizingTable("FAM_GDB", MODULES, STRATEGY)
+
+    def test_selects_smallest_covering_module(self, table):
+        assert table.size(3000)["module_id"] == "M_600x600"
+        assert table.size(1700)["module_id"] == "M_300x600"      # first of equal airflows, graph order
+        sized = table.size(25000)
+        assert (sized["module_id"], sized["modules_needed"]) == ("M_1800x600", 3)
+
+    def test_constraint_tiers_cached(self, table):
+        assert table.tier(1200, None) is table.tier(1200, 0)
+        assert [m["id"] for m in table.tier(1200).modules] == ["M_600x600", "M_300x600", "M_600x300"]
+        assert table.tier(100).primary_fit == (0, 4)
+        assert len(table.tier(100).modules) == 4                 # nothing fits: constraint ignored
+
+    def test_grid_rebalances_on_secondary_overflow(self):
+        grid = arrangement_grid(6, 600, 600, max_primary=1200, max_secondary=1200)
+        assert grid.rebalanced and (grid.columns, grid.rows) == (3, 2)
+        assert not grid.feasible and grid.max_modules_fitting == 4
+
+    def test_equals_reference(self):
+        rng = random.Random(11)
+        for _ in range(80):
+            modules = [_module(f"M{i}", rng.choice([300, 600, 900, 1200, 1800]), rng.choice([300, 600, 1200]),
+                               rng.choice([800, 1700, 3400, 5100, 10200]))
+                       for i in range(rng.randint(1, 7))]
+            table = SizingTable("FAM_X", modules, STRATEGY)
+            for _ in range(10):
+                airflow = rng.uniform(100, 40000)
+                max_p = rng.choice([None, 600, 1200, 2400, 3000])
+                max_s = rng.choice([None, 600, 1200, 1800])
+                sized = table.size(airflow, max_p, max_s)
+                expected = _reference_size(modules, airflow, max_p, max_s)
+                assert (sized["module_id"], sized["modules_needed"], tuple(sized["grid"])[:6]) == expected
+
+    def test_size_many_matches_size(self, table, monkeypatch):
+        monkeypatch.setattr(sizing_table, "np", None)
+        airflows = [500, 1700, 3400, 3401, 12000, 40000]
+        batch = table.size_many(airflows, max_primary=1800, max_secondary=1200)
+        for i, airflow in enumerate(airflows):
+            sized = table.size(airflow, 1800, 1200)
+            assert batch["module_ids"][i] == sized["module_id"]
+            assert batch["modules_needed"][i] == sized["modules_needed"]
+            assert (batch["columns"][i], batch["rows"][i], batch["feasible"][i]) == \
+                (sized["grid"].columns, sized["grid"].rows, sized["grid"].feasible)
+
+    def test_size_many_numpy(self, table):
+        np = pytest.importorskip("numpy")
+        airflows = np.linspace(100, 40000, 2000)
+        batch = table.size_many(airflows, max_primary=1800)
+        for i in (0, 500, 1999):
+            sized = table.size(float(airflows[i]), 1800)
+            assert batch["module_ids"][i] == sized["module_id"]
+            assert int(batch["modules_needed"][i]) == sized["modules_needed"]
+            assert int(batch["columns"][i]) == sized["grid"].columns
+
+    def test_no_usable_module(self):
+        table = SizingTable("FAM_X", [_module("M0", 600, 600, 0)])
+        assert table.size(1000) is None
+        assert table.size_many([1000])["module_ids"] == [None]
+
+
+class TestSizingTables:
+
+    def test_higher_capacity_index(self):
+        families = [
+            {"product_id": "FAM_GDC", "product_name": "GDC", "selection_priority": 5, "direct_trait_ids": ["T_C"]},
+            {"product_id": "FAM_GDB", "product_name": "GDB", "selection_priority": 10, "direct_trait_ids": []},
+            {"product_id": "FAM_GDP", "product_name": "GDP", "selection_priority": 20, "direct_trait_ids": ["T_C"]},
+        ]
+        capacity = {pf: [{"id": f"CAP_{pf}", "module_descriptor": "600x600", "output_rating": rating}]
+                    for pf, rating in (("FAM_GDB", 3400), ("FAM_GDC", 2000), ("FAM_GDP", 5000))}
+        tables = SizingTables(families, {}, capacity, {})
+        rows = tables.products_with_higher_capacity("GDB", "600x600", 1800)
+        assert [r["product_id"] for r in rows] == ["FAM_GDC", "FAM_GDP"]
+        rows = tables.products_with_higher_capacity("GDB", "600x600", 3400, ["T_C"])
+        assert [r["product_id"] for r in rows] == ["FAM_GDP"]
+        assert tables.table("gdb").capacity_rules[0]["output_rating"] == 3400
+
+
+class TestEngineSizing:
+
+    def test_served_table_skips_lookups(self, mock_db):
+        table = SizingTable("FAM_GDB", MODULES, STRATEGY, [
+            {"input_requirement": "airflow_m3h", "output_rating": 3400, "module_descriptor": "600x600"},
+        ])
+        mock_db.sizing_table.return_value = table
+        engine = TraitBasedEngine(mock_db)
+        result = engine.compute_sizing_arrangement("FAM_GDB", {"airflow_m3h": 6000, "max_width_mm": 1200})
+        assert result["selected_module_id"] == "M_600x600"
+        assert (result["modules_needed"], result["horizontal_count"]) == (2, 2)
+        assert engine.calculate_capacity("FAM_GDB", {"airflow_m3h": 6000})["modules_needed"] == 2
+        mock_db.get_available_dimension_modules.assert_not_called()
+        mock_db.get_optimization_strategy.assert_not_called()
+        mock_db.get_capacity_rules.assert_not_called()
+
+    def test_ad_hoc_table_without_snapshot(self):
+        db = MagicMock()
+        db.sizing_table.return_value = None
+        db.get_optimization_strategy.return_value = STRATEGY
+        db.get_available_dimension_modules.return_value = MODULES
+        db.get_size_determined_properties.return_value = []
+        result = TraitBasedEngine(db).compute_sizing_arrangement("FAM_GDB", {"airflow_m3h": 3000})
+        assert result["selected_module_id"] == "M_600x600"
+        db.get_available_dimension_modules.assert_called_once_with("FAM_GDB")
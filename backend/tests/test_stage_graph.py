@@ -0,0 +1,114 @@
+"""Tests for speculative pipeline stages (stage_graph.py) and the streaming prefetch helpers."""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from stage_graph import StageGraph
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class TestStageGraph:
+
+    def test_dependencies_receive_results(self, executor):
+        stages = StageGraph(executor)
+        stages.submit("embedding", lambda q: [len(q)], "pool")
+        stages.submit("retrieval", lambda emb, k: emb + [k], 3, depends_on=["embedding"])
+        assert stages.result("retrieval") == [4, 3]
+
+    def test_stages_overlap_with_caller(self, executor):
+        release = threading.Event()
+        stages = StageGraph(executor)
+        stages.submit("slow", lambda: release.wait(2) and "done")
+        # The caller keeps working while the stage is blocked
+        release.set()
+        assert stages.result("slow", timeout=2) == "done"
+
+    def test_unknown_dependency_rejected(self, executor):
+        stages = StageGraph(executor)
+        with pytest.raises(KeyError):
+            stages.submit("retrieval", lambda emb: emb, depends_on=["embedding"])
+
+    def test_duplicate_name_rejected(self, executor):
+        stages = StageGraph(executor)
+        stages.submit("a", lambda: 1)
+        with pytest.raises(ValueError):
+            stages.submit("a", lambda: 2)
+
+    def test_failure_propagates_to_dependents(self, executor):
+        def boom():
+            raise RuntimeError("embedding API down")
+
+        stages = StageGraph(executor)
+        stages.submit("embedding", boom)
+        stages.submit("retrieval", lambda emb: emb, depends_on=["embedding"])
+        with pytest.raises(RuntimeError):
+            stages.result("retrieval")
+        assert stages.get("retrieval", default=[]) == []
+        assert stages.get("never-submitted", default="x") == "x"
+
+    def test_get_with_timeout_leaves_slow_stage_running(self, executor):
+        release = threading.Event()
+        stages = StageGraph(executor)
+        stages.submit("embedding", lambda: release.wait(2) and [0.1])
+        assert stages.get("embedding", default=None, timeout=0.01) is None
+        release.set()
+        assert stages.get("embedding", timeout=2) == [0.1]
+
+    def test_single_worker_chain_does_not_deadlock(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stages = StageGraph(pool)
+            stages.submit("a", lambda: 1)
+            stages.submit("b", lambda a: a + 1, depends_on=["a"])
+            stages.submit("c", lambda a, b: a + b, depends_on=["a", "b"])
+            assert stages.result("c", timeout=2) == 3
+
+    def test_timings_only_cover_run_time(self, executor):
+        stages = StageGraph(executor)
+        stages.submit("a", lambda: 1)
+        stages.result("a")
+        assert set(stages.timings(prefix="prefetch_")) == {"prefetch_a"}
+
+
+class TestStreamingPrefetchHelpers:
+
+    def test_strip_state_markers(self):
+        from retriever import _strip_state_markers
+        query = 'GDB 600x600 for a pool [LOCKED: material=RF] [STATE: {"tags": {}}]'
+        assert _strip_state_markers(query) == "GDB 600x600 for a pool"
+
+    def test_session_context_stores_turn_before_reading_history(self):
+        import retriever
+        mgr = MagicMock()
+        mgr.get_project_state.return_value = {}
+        calls = []
+        mgr.store_turn.side_effect = lambda *a: calls.append("store")
+        mgr.get_recent_turns.side_effect = lambda *a, **k: calls.append("history") or ["turn"]
+        with patch.object(retriever.db, "get_session_graph_manager", return_value=mgr):
+            session_mgr, state, turns = retriever._load_session_context("S1", "raw [LOCKED: material=RF]")
+        assert session_mgr is mgr
+        assert turns == ["turn"]
+        assert calls == ["store", "history"]
+        assert mgr.store_turn.call_args.args[:3] == ("S1", "user", "raw [LOCKED: material=RF]")
+
+    def test_no_session(self):
+        from retriever import _load_session_context
+        session_mgr, state, turns = _load_session_context(None, "q")
+        assert session_mgr is None and turns == [] and not state.tags
@@ -64,6 +64,8 @@ interface DiagnosticsData {
 interface Message {
   role: "user" | "assistant";
   content: string;
+  // Provisional content built from streamed content_segment events
+  streaming?: boolean;
   widgets?: Widget[];
   // Dev mode metadata
   graphPaths?: string[];
@@ -662,6 +664,7 @@ export const Chat = forwardRef<ChatHandle, ChatProps>(function Chat(
       const decoder = new TextDecoder();
       let data: DeepExplainableResponseData | null = null;
       const dynamicSteps: ReasoningStep[] = [];
+      const streamedSegments: string[] = [];
 
       if (reader) {
         let buffer = "";
@@ -698,6 +701,17 @@ export const Chat = forwardRef<ChatHandle, ChatProps>(function Chat(
                   setReasoningSteps([...dynamicSteps]);
                   console.log(`🔗 Inference: ${event.detail}`);
 
+                } else if (event.type === "content_segment" && event.segment) {
+                  // Provisional answer text while the LLM is still generating
+                  streamedSegments[event.index] = event.segment.text || "";
+                  const preview = streamedSegments.join("");
+                  setMessages((prev) => {
+                    const last = prev[prev.length - 1];
+                    if (last && last.streaming) {
+                      return [...prev.slice(0, -1), { ...last, content: preview }];
+                    }
+                    return [...prev, { role: "assistant", content: preview, streaming: true }];
+                  });
                 } else if (event.type === "complete") {
                   // Final response received
                   data = event.response;
@@ -758,8 +772,9 @@ export const Chat = forwardRef<ChatHandle, ChatProps>(function Chat(
         });
       }
 
+      // The final message replaces the provisional streamed one
       setMessages((prev) => [
-        ...prev,
+        ...prev.filter((m) => !m.streaming),
         {
           role: "assistant",
           content: contentText,
@@ -769,7 +784,7 @@ export const Chat = forwardRef<ChatHandle, ChatProps>(function Chat(
     } catch (error) {
       const errorMessage = error instanceof Error ? error.message : "An unknown error occurred";
       setMessages((prev) => [
-        ...prev,
+        ...prev.filter((m) => !m.streaming),
         {
           role: "assistant",
           content: `⚠️ **Error:** ${errorMessage}\n\nPlease try again.`,
@@ -0,0 +1,271 @@
+"""Microbenchmark: legacy per-function regex extraction vs shared QueryFeatures.
+
+Usage:
+    python scripts/bench_query_features.py [iterations]
+
+The legacy functions below are verbatim copies of the extractors as they
+were before query_features.py (modulo taking the config as an argument);
+backend/tests/test_query_features.py pins their outputs as reference cases.
+A streaming turn calls roughly this set of extractors on the same query.
+
+On a fresh query the shared features are only about 5-20% faster than the
+legacy extractors; the large ratio in the last line is the memo hit when
+the same query is extracted again within a turn.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+QUERIES = [
+    "GDB 600x600 for a kitchen exhaust in a hospital, 3400 m3/h",
+    "Tag 5684: 305x610x150, Tag 7889: 610x610x292, stainless steel, project Huddinge",
+    "Potrzebuję GDC-FLEX 600x1200 dla szpitala, 25 000 m³/h, ocynk",
+    "Compare GDMI-600x600-750 vs GDP 900x600 for an office, Ø500mm round duct",
+    "We need GDR housing with transition piece and adapter, airflow 6,000 m3/h, RF",
+    "Ist GDF 300x600 mit edelstahl für eine Küche geeignet?",
+    "pharma cleanroom ECO-C 400 filters, zinkmagnesium, 2 positions",
+    "hello",
+]
+
+
+# =============================================================================
+# LEGACY IMPLEMENTATIONS (reference)
+# =============================================================================
+
+def legacy_detect_intent_fast(query: str, _cfg) -> dict:
+    query_lower = query.lower()
+    language = legacy_language(query)
+    _families_re = "|".join(re.escape(f) for f in _cfg.product_families) if _cfg.product_families else "GDB|GDMI|GDC|GDP|GDF|GDR|PFF|BFF|EXL"
+    product_pattern = r'\b(' + _families_re + r')[-\s]?(\d{2,4})?[xX]?(\d{2,4})?\b'
+    product_matches = re.findall(product_pattern, query, re.IGNORECASE)
+    entity_references = [m[0].upper() for m in product_matches] if product_matches else []
+    full_code_pattern = r'\b([A-Z]{2,4}-\d{2,4}[xX]\d{2,4}(?:-\d{2,4})?)\b'
+    full_codes = re.findall(full_code_pattern, query, re.IGNORECASE)
+    entity_references.extend([c.upper() for c in full_codes])
+    entity_references = list(set(entity_references))
+    numeric_constraints = legacy_numeric_constraints(query)
+    _app_kw = _cfg.fallback_application_keywords
+    context_keywords = []
+    for app, keywords in _app_kw.items():
+        if any(kw in query_lower for kw in keywords):
+            context_keywords.append(app)
+    if any(w in query_lower for w in ['compare', 'porównaj', 'vs', 'versus', 'difference']):
+        action_intent = "compare"
+    elif any(w in query_lower for w in ['configure', 'konfigur', 'setup', 'option']):
+        action_intent = "configure"
+    elif any(w in query_lower for w in ['problem', 'issue', 'nie działa', 'error', 'troubleshoot']):
+        action_intent = "troubleshoot"
+    elif entity_references or any(w in query_lower for w in ['recommend', 'suggest', 'need', 'potrzeb', 'want', 'chcę']):
+        action_intent = "select"
+    else:
+        action_intent = "general_info"
+    has_specific = bool(numeric_constraints) or "context update:" in query_lower
+    return {
+        "language": language,
+        "numeric_constraints": numeric_constraints,
+        "entity_references": entity_references,
+        "action_intent": action_intent,
+        "context_keywords": context_keywords,
+        "has_specific_constraint": has_specific,
+    }
+
+
+def legacy_language(query: str) -> str:
+    for lang, pattern in (('pl', r'\b(czy|jak|jaki|mamy|jest|dla|przy)\b'),
+                          ('de', r'\b(ist|sind|für|mit|bei|wie)\b'),
+                          ('sv', r'\b(är|för|med|och|hur)\b')):
+        if re.search(pattern, query, re.IGNORECASE):
+            return lang
+    return 'en'
+
+
+def legacy_numeric_constraints(query: str) -> list[dict]:
+    constraints = []
+    pattern = r'(\d+(?:[.,]\d+)?)\s*([a-zA-Z³²/°]+(?:/[a-zA-Z]+)?)'
+    for value_str, unit in re.findall(pattern, query):
+        try:
+            constraints.append({"value": float(value_str.replace(',', '.')), "unit": unit, "context": "extracted"})
+        except ValueError:
+            pass
+    return constraints
+
+
+def legacy_entity_codes(query: str, config) -> list[str]:
+    codes = []
+    query_upper = query.upper()
+    for pattern_config in config.product_code_patterns:
+        compiled = pattern_config.compile()
+        matches = compiled.findall(query)
+        for match in matches:
+            normalized = match
+            if config.normalization.replace_space_with:
+                normalized = normalized.replace(' ', config.normalization.replace_space_with)
+            if config.normalization.uppercase:
+                normalized = normalized.upper()
+            codes.append(normalized)
+    for family in config.product_families:
+        if family.upper() in query_upper:
+            has_full_code = any(family.upper() in c.upper() for c in codes)
+            if not has_full_code:
+                codes.append(family)
+            idx = query_upper.find(family.upper())
+            if idx >= 0:
+                context = query[idx:idx+30]
+                clean_context = re.sub(r'[^\w\d\-x/]', ' ', context).strip().split()[0]
+                if config.normalization.replace_space_with:
+                    clean_context = clean_context.replace(' ', config.normalization.replace_space_with)
+                if len(clean_context) > len(family) and clean_context not in codes:
+                    codes.append(clean_context)
+    return list(set(codes))
+
+
+def legacy_project_keywords(query: str, config) -> list[str]:
+    keywords = []
+    query_lower = query.lower()
+    stopwords = set(config.project_search.stopwords)
+    for pattern in config.project_search.patterns:
+        for match in re.findall(pattern, query_lower):
+            if match not in stopwords and len(match) > 2:
+                keywords.append(match)
+    for identifier in config.project_search.known_identifiers:
+        if identifier.lower() in query_lower:
+            keywords.append(identifier)
+    return list(set(keywords))
+
+
+def legacy_tags(query: str) -> list[dict]:
+    query = re.sub(r'(\d{1,3}),(\d{3})\b', r'\1\2', query)
+    query = re.sub(r'(\d{1,3})\s(\d{3})\b', r'\1\2', query)
+    tags = []
+    tag_pattern = r'(?:tag|item|pos(?:ition)?)\s*[:#\-]?\s*(\w+)[:\-\s]+(\d{2,4})[x×X](\d{2,4})(?:[x×X](\d{2,4}))?'
+    for tag_id, w, h, d in re.findall(tag_pattern, query, re.IGNORECASE):
+        tags.append({"tag_id": tag_id, "filter_width": int(w), "filter_height": int(h),
+                     "filter_depth": int(d) if d else None})
+    if not tags:
+        dim_pattern = r'(\d{2,4})[x×X](\d{2,4})(?:[x×X](\d{2,4}))?(?:\s*mm)?'
+        for i, (w, h, d) in enumerate(re.findall(dim_pattern, query)):
+            tags.append({"tag_id": f"item_{i+1}", "filter_width": int(w), "filter_height": int(h),
+                         "filter_depth": int(d) if d else None})
+    airflow_pattern = r'(\d{3,6})\s*(?:m³/h|m3/h|m³|cbm|cubic|m3h)'
+    airflow_matches = re.findall(airflow_pattern, query, re.IGNORECASE)
+    if airflow_matches and tags:
+        for i, airflow in enumerate(airflow_matches):
+            if i < len(tags):
+                tags[i]["airflow_m3h"] = int(airflow)
+    return tags
+
+
+def legacy_material(query: str, config) -> Optional[str]:
+    query_lower = query.lower()
+    patterns = {mat.code: mat.extraction_keywords for mat in config.material_codes_extended}
+    for mat_code, keywords in patterns.items():
+        for kw in keywords:
+            if re.search(r'\b' + re.escape(kw) + r'\b', query_lower):
+                return mat_code
+    return None
+
+
+def legacy_project(query: str) -> Optional[str]:
+    for pattern in (r'(?:project|projekt|for|dla)\s+([A-Z][a-zA-Z0-9]+)', r'([A-Z][a-zA-Z0-9]+)\s+project'):
+        match = re.search(pattern, query, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_accessories(query: str) -> list[str]:
+    accessories = []
+    duct_patterns = [
+        r'[ØO⌀]\s*(\d{2,4})\s*(?:mm)?',
+        r'(\d{2,4})\s*mm\s+round\s+(?:ducts?|connections?|pipes?)',
+        r'round\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})\s*(?:mm)?\s*(?:diameter)?\)?',
+        r'circular\s+(?:ducts?|connections?|pipes?)\s*\(?(\d{2,4})',
+        r'(\d{2,4})\s*mm\s+(?:circular|round)\s+(?:ducts?|connections?|pipes?)',
+        r'(\d{2,4})\s*mm\s+diameter\s+(?:round|circular)?\s*(?:ducts?|pipes?)',
+        r'(?:round|circular)\s+(?:ducts?|pipes?)\s+(?:of\s+|with\s+)?(\d{2,4})\s*mm',
+    ]
+    for pattern in duct_patterns:
+        for m in re.findall(pattern, query, re.IGNORECASE):
+            acc = f"Round duct Ø{m}mm"
+            if acc not in accessories:
+                accessories.append(acc)
+    for pattern in [r'transition\s+piece', r'reducer', r'adapter']:
+        if re.search(pattern, query, re.IGNORECASE):
+            if not any('Round duct' in a for a in accessories):
+                accessories.append("Transition piece (type TBD)")
+    return accessories
+
+
+def legacy_turn(query: str, config):
+    """The extractor calls of one turn, legacy style: every call re-scans the query."""
+    return (
+        legacy_detect_intent_fast(query, config),
+        legacy_entity_codes(query, config),
+        legacy_project_keywords(query, config),
+        legacy_tags(query),
+        legacy_material(query, config),
+        legacy_project(query),
+        legacy_accessories(query),
+    )
+
+
+def shared_turn(query: str, config):
+    """The same extractor calls through the public functions backed by QueryFeatures."""
+    from retriever import detect_intent_fast, extract_entity_codes, extract_project_keywords
+    from logic.state import (
+        extract_tags_from_query, extract_material_from_query,
+        extract_project_from_query, extract_accessories_from_query,
+    )
+    return (
+        detect_intent_fast(query),
+        extract_entity_codes(query),
+        extract_project_keywords(query),
+        extract_tags_from_query(query),
+        extract_material_from_query(query),
+        extract_project_from_query(query),
+        extract_accessories_from_query(query),
+    )
+
+
+def _bench(fn, queries, config, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            fn(query, config)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def main(iterations: int = 2000):
+    import os
+    os.environ.setdefault("GEMINI_API_KEY", "bench-key")
+    import query_features
+    from config_loader import get_config
+
+    config = get_config()
+    shared_turn(QUERIES[0], config)   # import + compile outside the timing
+
+    legacy_us = _bench(legacy_turn, QUERIES, config, iterations)
+
+    # Cold: features cache cleared before each query (new text every turn)
+    def cold_turn(query, cfg):
+        query_features._features.clear()
+        return shared_turn(query, cfg)
+    cold_us = _bench(cold_turn, QUERIES, config, iterations)
+
+    # Warm: the same query already extracted earlier in the turn
+    warm_us = _bench(shared_turn, QUERIES, config, iterations)
+
+    print(f"legacy extractors         {legacy_us:8.1f} µs/turn")
+    print(f"QueryFeatures (new query) {cold_us:8.1f} µs/turn  ({legacy_us / cold_us:.1f}x)")
+    print(f"QueryFeatures (memoized)  {warm_us:8.1f} µs/turn  ({legacy_us / warm_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)